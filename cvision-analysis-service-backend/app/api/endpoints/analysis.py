@@ -1,13 +1,23 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Response, UploadFile, File, Form
+from sqlalchemy.orm import Session, load_only
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+import uuid
+from app.core.config import settings
 from app.database import get_db
 from app.models.database_models import CVFileModel
 from app.services.cv_analyzer import CVAnalyzer
-from app.schemas.api_schemas import CVFileResponse, AnalyzeResponse
+from app.services.rescoring import BulkRescorer
+from app.services.text_analysis_pool import text_analysis_pool
+from app.services.upload_pipeline import upload_pipeline
+from app.schemas.api_schemas import (
+    CVFileResponse, AnalyzeResponse, RescoreRequest, RescoreResponse, AnalyzeTextRequest, AnalyzeTextResponse,
+    UploadAnalysisResponse
+)
 
 router = APIRouter()
 cv_analyzer = CVAnalyzer()
+bulk_rescorer = BulkRescorer()
 
 @router.post("/analyze-pending")
 async def trigger_pending_analysis(background_tasks: BackgroundTasks):
@@ -33,12 +43,68 @@ async def analyze_single_cv(
     background_tasks.add_task(cv_analyzer.analyze_cv, cv_file, db)
     return {"message": f"Analysis started for {cv_file.FileName}", "status": "processing"}
 
+@router.post("/analyze-text", response_model=AnalyzeTextResponse)
+async def analyze_text(request: AnalyzeTextRequest):
+    """Analyze raw CV texts without storing anything (live previews)"""
+    if len(request.texts) > settings.TEXT_ANALYSIS_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.TEXT_ANALYSIS_MAX_TEXTS} texts per request")
+    if any(len(text) > settings.TEXT_ANALYSIS_MAX_CHARS for text in request.texts):
+        raise HTTPException(status_code=413, detail=f"Texts are limited to {settings.TEXT_ANALYSIS_MAX_CHARS} characters")
+    
+    try:
+        return AnalyzeTextResponse(**await text_analysis_pool.analyze(request.texts, profile=request.profile))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to analyze texts: {str(e)}")
+
+@router.post("/upload", response_model=UploadAnalysisResponse)
+async def upload_cv(
+    file: UploadFile = File(...),
+    user_id: str = Form(...),
+    db: Session = Depends(get_db)
+):
+    """Store a CV and analyze it in the request instead of waiting for the pending processor"""
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user_id")
+    
+    try:
+        result = await upload_pipeline.ingest(file, user_uuid, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process upload: {str(e)}")
+    
+    if result is None:
+        raise HTTPException(status_code=400, detail="Invalid file: unsupported type or too large")
+    return UploadAnalysisResponse(**result)
+
 @router.get("/pending-cvs", response_model=List[CVFileResponse])
-async def get_pending_cvs(limit: int = 10, db: Session = Depends(get_db)):
-    pending_cvs = db.query(CVFileModel).filter(
+async def get_pending_cvs(
+    response: Response,
+    limit: int = Query(default=10, ge=1, le=settings.PENDING_CVS_MAX_PAGE),
+    after_id: Optional[str] = Query(default=None, description="Return CVs after this id (keyset pagination)"),
+    db: Session = Depends(get_db)
+):
+    query = db.query(CVFileModel).options(
+        load_only(
+            CVFileModel.Id, CVFileModel.FileName, CVFileModel.FilePath, CVFileModel.FileType,
+            CVFileModel.AnalysisStatus, CVFileModel.UploadedAt, CVFileModel.UserId
+        )
+    ).filter(
         CVFileModel.AnalysisStatus == "Pending",
         CVFileModel.IsDeleted == False
-    ).limit(limit).all()
+    )
+    
+    if after_id:
+        try:
+            query = query.filter(CVFileModel.Id > uuid.UUID(after_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="after_id must be a CV file id")
+    
+    pending_cvs = query.order_by(CVFileModel.Id).limit(limit).all()
+    
+    # Cursor for the next page; absent on the last page
+    if len(pending_cvs) == limit:
+        response.headers["X-Next-After-Id"] = str(pending_cvs[-1].Id)
     
     return [
         CVFileResponse(
@@ -51,4 +117,26 @@ async def get_pending_cvs(limit: int = 10, db: Session = Depends(get_db)):
             userId=str(cv.UserId)
         )
         for cv in pending_cvs
-    ]
\ No newline at end of file
+    ]
+
+@router.post("/rescore", response_model=RescoreResponse)
+async def rescore_analyses(request: RescoreRequest, db: Session = Depends(get_db)):
+    """Recompute every CV score from stored sub-scores with the configured weights
+
+    Weight overrides preview their effect and require ``dry_run``.
+    """
+    weights = {
+        name: value for name, value in {
+            'skills': request.skills_weight,
+            'experience': request.experience_weight,
+            'education': request.education_weight,
+            'format': request.format_weight
+        }.items() if value is not None
+    }
+    
+    try:
+        return RescoreResponse(**await run_in_threadpool(bulk_rescorer.rescore, db, weights=weights, dry_run=request.dry_run))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rescore analyses: {str(e)}")
@@ -1,15 +1,30 @@
 # app/api/endpoints/job_matching.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse, JSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Optional
 from loguru import logger
+from datetime import datetime
+import json
+import uuid
+
+import numpy as np
 
 from app.database import get_db
-from app.services.job_matcher import JobMatcher
+from app.models import JobProfileModel
+from app.services.job_matcher import JobMatcher, MATCH_ITEM_FIELDS
+from app.services.skill_normalizer import skill_normalizer
+from app.services.feature_store import feature_store
+from app.services.corpus_snapshot import corpus_snapshots
+from app.services.statistics_service import statistics_service
+from app.services.tfidf_model import tfidf_model
+from app.services.dedup_index import dedup_index
 from app.schemas.api_schemas import (
     JobMatchResponse, 
     CVAllJobsMatchResponse, 
     TopCVMatchesResponse,
+    BulkMatchRequest,
     APIResponse
 )
 
@@ -62,6 +77,10 @@ async def match_cv_with_job(
 @router.post("/match/{cv_analysis_id}/with-all-jobs")
 async def match_cv_with_all_jobs(
     cv_analysis_id: str,
+    limit: Optional[int] = Query(default=None, ge=1, description="Return only the best N matches"),
+    min_score: Optional[float] = Query(default=None, ge=0, le=100, description="Minimum match percentage"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated match fields to include"),
+    compact: bool = Query(default=False, description="Serialize matches as plain JSON without response models"),
     db: Session = Depends(get_db)
 ) -> APIResponse[CVAllJobsMatchResponse]:
     """
@@ -70,11 +89,33 @@ async def match_cv_with_all_jobs(
     try:
         logger.info(f"Matching CV {cv_analysis_id} with all job profiles")
         
-        result = await job_matcher.match_cv_with_all_jobs(cv_analysis_id, db)
+        selected_fields = None
+        if fields:
+            selected_fields = [field.strip() for field in fields.split(',') if field.strip()]
+            unknown = set(selected_fields) - set(MATCH_ITEM_FIELDS) - {'job_profile_id'}
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(MATCH_ITEM_FIELDS)}"
+                )
+        
+        result = await job_matcher.match_cv_with_all_jobs(
+            cv_analysis_id, db, limit=limit, min_score=min_score, fields=selected_fields
+        )
+        
+        if compact:
+            # Items are already plain JSON values; skip building a model per match
+            return JSONResponse(content={
+                'status_code': 200,
+                'message': "CV matched with all job profiles successfully",
+                'data': result,
+                'timestamp': datetime.utcnow().isoformat()
+            })
         
         response_data = CVAllJobsMatchResponse(
             cv_id=result['cv_id'],
             cv_title=result['cv_title'],
+            duplicate_of=result['duplicate_of'],
             total_job_profiles=result['total_job_profiles'],
             matches=result['matches'],
             best_match=result['best_match'],
@@ -87,6 +128,8 @@ async def match_cv_with_all_jobs(
             data=response_data
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Validation error in CV-All Jobs matching: {e}")
         raise HTTPException(status_code=404, detail=str(e))
@@ -94,10 +137,36 @@ async def match_cv_with_all_jobs(
         logger.error(f"Error in CV-All Jobs matching: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during matching")
 
+@router.get("/match/{cv_analysis_id}/text-ranking")
+async def rank_jobs_by_text(
+    cv_analysis_id: str,
+    limit: int = Query(default=10, ge=1, le=100, description="Number of job profiles to return"),
+    db: Session = Depends(get_db)
+) -> APIResponse[Dict[str, Any]]:
+    """
+    Rank job profiles by full-text TF-IDF similarity under the corpus model
+    """
+    try:
+        result = await job_matcher.rank_jobs_by_text(cv_analysis_id, limit, db)
+        
+        return APIResponse(
+            status_code=200,
+            message="Job profiles ranked by text similarity successfully",
+            data=result
+        )
+        
+    except ValueError as e:
+        logger.error(f"Validation error in text ranking: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in text ranking: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error during matching")
+
 @router.get("/top-matches/{job_profile_id}")
 async def get_top_matches_for_job(
     job_profile_id: str,
     limit: int = Query(default=10, ge=1, le=50, description="Number of top matches to return"),
+    exclude_duplicates: bool = Query(default=False, description="Leave out CVs that near-duplicate an earlier upload"),
     db: Session = Depends(get_db)
 ) -> APIResponse[TopCVMatchesResponse]:
     """
@@ -106,7 +175,7 @@ async def get_top_matches_for_job(
     try:
         logger.info(f"Getting top {limit} matches for job profile {job_profile_id}")
         
-        result = await job_matcher.get_top_matches_for_job(job_profile_id, limit, db)
+        result = await job_matcher.get_top_matches_for_job(job_profile_id, limit, db, exclude_duplicates)
         
         response_data = TopCVMatchesResponse(
             job_profile_id=result['job_profile_id'],
@@ -129,6 +198,70 @@ async def get_top_matches_for_job(
         logger.error(f"Error getting top matches: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during match retrieval")
 
+@router.post("/bulk-match")
+async def bulk_match(
+    request: BulkMatchRequest,
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Match many CVs with many job profiles, streamed as newline-delimited JSON (one line per CV)
+    """
+    try:
+        # Everything the stream needs is loaded up front; the generator never touches the session
+        corpus = await run_in_threadpool(corpus_snapshots.current, db)
+        
+        job_query = db.query(JobProfileModel).filter(JobProfileModel.IsDeleted == False)
+        if request.job_profile_ids == "all":
+            job_profiles = job_query.all()
+        else:
+            requested = {}
+            for job_id in request.job_profile_ids:
+                try:
+                    requested[job_id] = uuid.UUID(job_id)
+                except ValueError:
+                    requested[job_id] = None
+            
+            found = {job.Id: job for job in job_query.filter(
+                JobProfileModel.Id.in_([job_uuid for job_uuid in requested.values() if job_uuid])
+            )}
+            missing_jobs = [job_id for job_id, job_uuid in requested.items() if job_uuid not in found]
+            if missing_jobs:
+                raise HTTPException(status_code=404, detail=f"Job profiles not found: {', '.join(missing_jobs)}")
+            job_profiles = [found[job_uuid] for job_uuid in dict.fromkeys(requested.values())]
+        
+        if request.cv_analysis_ids == "all":
+            rows, missing_cvs = np.arange(len(corpus), dtype=np.int64), []
+        else:
+            rows, missing_cvs = corpus.rows_for_analysis_ids(request.cv_analysis_ids)
+        
+        logger.info(f"Bulk matching {len(rows)} CVs with {len(job_profiles)} job profiles")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error preparing bulk match: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error during bulk matching")
+    
+    def generate():
+        for analysis_id in missing_cvs:
+            yield json.dumps({'cv_analysis_id': analysis_id, 'error': 'CV analysis not found'}) + "\n"
+        
+        try:
+            for record in job_matcher.iter_bulk_matches(
+                corpus, rows, job_profiles,
+                min_score=request.min_score,
+                top_k_per_cv=request.top_k_per_cv,
+                include_details=request.include_details
+            ):
+                yield json.dumps(record) + "\n"
+                
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Error during bulk match stream: {e}")
+            yield json.dumps({'error': 'Internal server error during bulk matching'}) + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.post("/analyze-skill-gaps/{cv_analysis_id}")
 async def analyze_skill_gaps(
     cv_analysis_id: str,
@@ -140,13 +273,8 @@ async def analyze_skill_gaps(
     try:
         logger.info(f"Analyzing skill gaps for CV {cv_analysis_id}")
         
-        # Get CV keywords
-        from app.models import KeywordMatchModel
-        cv_keywords = db.query(KeywordMatchModel).filter(
-            KeywordMatchModel.CVAnalysisResultId == cv_analysis_id
-        ).all()
-        
-        cv_skills = [kw.Keyword.lower() for kw in cv_keywords if kw.IsMatched]
+        # Get CV skills from the compact feature record
+        cv_skills = feature_store.load_cv_skills(db, cv_analysis_id)
         
         # Analyze skill gaps (can be enhanced with real market data)
         skill_gaps = job_matcher.analyze_skill_gaps(cv_skills)
@@ -167,8 +295,8 @@ async def simple_skill_match(request_data: Dict[str, List[str]]):
     Simple skill matching endpoint for testing
     """
     try:
-        cv_keywords = request_data.get("cv_keywords", [])
-        job_keywords = request_data.get("job_keywords", [])
+        cv_keywords = skill_normalizer.canonicalize_skills(request_data.get("cv_keywords", []))
+        job_keywords = skill_normalizer.canonicalize_skills(request_data.get("job_keywords", []))
         
         if not cv_keywords or not job_keywords:
             raise HTTPException(status_code=400, detail="Both cv_keywords and job_keywords are required")
@@ -204,16 +332,9 @@ async def get_matching_statistics(
     Get overall matching statistics
     """
     try:
-        from app.models import CVAnalysisResultModel, JobProfileModel
-        
-        # Get basic statistics
-        total_cvs = db.query(CVAnalysisResultModel).filter(
-            CVAnalysisResultModel.IsDeleted == False
-        ).count()
-        
-        total_jobs = db.query(JobProfileModel).filter(
-            JobProfileModel.IsDeleted == False
-        ).count()
+        cached = await statistics_service.get(db)
+        total_cvs = cached['analyzed_cvs']
+        total_jobs = cached['total_job_profiles']
         
         # Calculate some basic statistics
         stats = {
@@ -231,4 +352,129 @@ async def get_matching_statistics(
         
     except Exception as e:
         logger.error(f"Error getting matching statistics: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/canonicalization-report")
+async def get_canonicalization_report() -> APIResponse[Dict[str, Any]]:
+    """
+    Report how many fuzzy matches the skill alias table turned into exact ones
+    """
+    try:
+        return APIResponse(
+            status_code=200,
+            message="Canonicalization report retrieved successfully",
+            data=job_matcher.get_canonicalization_report()
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting canonicalization report: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/corpus-snapshot")
+async def get_corpus_snapshot_status() -> APIResponse[Dict[str, Any]]:
+    """
+    Current shared corpus snapshot and the version this worker has attached
+    """
+    try:
+        return APIResponse(
+            status_code=200,
+            message="Corpus snapshot status retrieved successfully",
+            data=corpus_snapshots.status()
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting corpus snapshot status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/tfidf-model")
+async def get_tfidf_model_status() -> APIResponse[Dict[str, Any]]:
+    """
+    Corpus TF-IDF model loaded by this worker
+    """
+    try:
+        tfidf_model.ensure_loaded()
+        return APIResponse(
+            status_code=200,
+            message="TF-IDF model status retrieved successfully",
+            data=tfidf_model.status()
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting TF-IDF model status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/tfidf-model/refresh")
+async def refresh_tfidf_model(
+    full: bool = Query(default=False, description="Refit from every stored CV text instead of folding in new ones"),
+    db: Session = Depends(get_db)
+) -> APIResponse[Dict[str, Any]]:
+    """
+    Fold newly analysed CVs into the TF-IDF model, or refit it
+    """
+    try:
+        await run_in_threadpool(tfidf_model.ensure_loaded)
+        refresh = tfidf_model.fit if full or tfidf_model.fitted_at is None else tfidf_model.refresh
+        summary = await run_in_threadpool(refresh, db)
+        return APIResponse(
+            status_code=200,
+            message="TF-IDF model refreshed successfully",
+            data=summary
+        )
+        
+    except Exception as e:
+        logger.error(f"Error refreshing TF-IDF model: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/dedup")
+async def get_dedup_status(db: Session = Depends(get_db)) -> APIResponse[Dict[str, Any]]:
+    """
+    Signed CVs and near-duplicates found so far
+    """
+    try:
+        return APIResponse(
+            status_code=200,
+            message="Duplicate detection status retrieved successfully",
+            data=dedup_index.status(db)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting duplicate detection status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/dedup/backfill")
+async def backfill_dedup_signatures(db: Session = Depends(get_db)) -> APIResponse[Dict[str, Any]]:
+    """
+    Sign stored CVs analysed before duplicate detection and link their near-duplicates
+    """
+    try:
+        return APIResponse(
+            status_code=200,
+            message="CV signatures backfilled successfully",
+            data=await run_in_threadpool(dedup_index.backfill, db)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error backfilling CV signatures: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/corpus-snapshot/rebuild")
+async def rebuild_corpus_snapshot(db: Session = Depends(get_db)) -> APIResponse[Dict[str, Any]]:
+    """
+    Publish a new corpus snapshot for all workers
+    """
+    try:
+        info = await run_in_threadpool(corpus_snapshots.rebuild, db)
+        if info is None:
+            raise HTTPException(status_code=409, detail="A corpus snapshot build is already in progress")
+        
+        return APIResponse(
+            status_code=200,
+            message="Corpus snapshot published successfully",
+            data=info
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error rebuilding corpus snapshot: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error during snapshot rebuild")
@@ -1,13 +1,17 @@
 # ================================
 # app/api/endpoints/monitoring.py
 # ================================
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 from app.database import get_db
-from app.models.database_models import CVFileModel, CVAnalysisResultModel
-from app.schemas.api_schemas import ServiceStats, ProcessingStats
-from app.services.pending_processor import PendingCVProcessor
+from app.core.constants import CVStatus
+from app.schemas.api_schemas import ServiceStats, ProcessingStats, AnalyticsRollupResponse, RollupRebuildResponse, RegexGuardReport, MetricsResponse
+from app.services.statistics_service import statistics_service
+from app.services.analytics_rollups import analytics_rollups
+from app.services.regex_guard import regex_guard
+from app.services.metrics import metrics
 
 router = APIRouter()
 
@@ -15,47 +19,57 @@ router = APIRouter()
 async def get_service_statistics(db: Session = Depends(get_db)):
     """Get comprehensive service statistics"""
     try:
-        # Get CV counts by status
-        total_cvs = db.query(CVFileModel).filter(CVFileModel.IsDeleted == False).count()
-        pending_cvs = db.query(CVFileModel).filter(
-            CVFileModel.AnalysisStatus == "Pending",
-            CVFileModel.IsDeleted == False
-        ).count()
-        completed_cvs = db.query(CVFileModel).filter(
-            CVFileModel.AnalysisStatus == "Completed",
-            CVFileModel.IsDeleted == False
-        ).count()
-        failed_cvs = db.query(CVFileModel).filter(
-            CVFileModel.AnalysisStatus == "Failed",
-            CVFileModel.IsDeleted == False
-        ).count()
-        
-        # Get average score
-        avg_score_result = db.query(func.avg(CVAnalysisResultModel.Score)).filter(
-            CVAnalysisResultModel.IsDeleted == False
-        ).scalar()
-        average_score = float(avg_score_result) if avg_score_result else None
-        
-        # Get processor stats (this is a simplified version)
-        processor_stats = ProcessingStats(
-            is_running=True,  # We'll assume it's running for now
-            processed_count=completed_cvs,
-            failed_count=failed_cvs,
-            success_rate=(completed_cvs / (completed_cvs + failed_cvs) * 100) if (completed_cvs + failed_cvs) > 0 else 0
-        )
+        stats = await statistics_service.get(db)
+        status_counts = stats['status_counts']
         
         return ServiceStats(
-            total_cvs=total_cvs,
-            pending_cvs=pending_cvs,
-            completed_cvs=completed_cvs,
-            failed_cvs=failed_cvs,
-            average_score=average_score,
-            processor_stats=processor_stats
+            total_cvs=stats['total_cvs'],
+            pending_cvs=status_counts.get(CVStatus.PENDING, 0),
+            completed_cvs=status_counts.get(CVStatus.COMPLETED, 0),
+            failed_cvs=status_counts.get(CVStatus.FAILED, 0),
+            average_score=statistics_service.average_score(stats),
+            score_histogram=dict(zip(statistics_service.histogram_labels(), stats['score_histogram'])),
+            computed_at=stats['computed_at'],
+            processor_stats=ProcessingStats(**statistics_service.processor_stats(stats))
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
+@router.get("/analytics/rollups", response_model=AnalyticsRollupResponse)
+async def get_analytics_rollups(
+    months: Optional[int] = Query(default=None, ge=1, le=120, description="Upload months to include (all time if omitted)"),
+    top_keywords: int = Query(default=8, ge=1, le=100, description="Number of top keywords"),
+    db: Session = Depends(get_db)
+):
+    """Dashboard keyword, score and monthly aggregates from the pre-aggregated rollups"""
+    try:
+        return AnalyticsRollupResponse(**analytics_rollups.read(db, months=months, top_keywords=top_keywords))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read analytics rollups: {str(e)}")
+
+@router.post("/analytics/rollups/rebuild", response_model=RollupRebuildResponse)
+async def rebuild_analytics_rollups(db: Session = Depends(get_db)):
+    """Recompute the rollups from KeywordMatches and CVAnalysisResults"""
+    try:
+        return RollupRebuildResponse(**await run_in_threadpool(analytics_rollups.rebuild, db))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild analytics rollups: {str(e)}")
+
+@router.get("/regex-budget", response_model=RegexGuardReport)
+async def get_regex_budget_report():
+    """Analyzer patterns that timed out or ran out of document budget in this process"""
+    return RegexGuardReport(
+        timeout_seconds=regex_guard.timeout,
+        document_budget_seconds=regex_guard.document_budget,
+        patterns=regex_guard.report()
+    )
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics():
+    """In-process latency metrics (upload-to-score for the inline upload path and the poller)"""
+    return MetricsResponse(latencies=metrics.snapshot())
+
 @router.get("/processor-status")
 async def get_processor_status():
     """Get background processor status"""
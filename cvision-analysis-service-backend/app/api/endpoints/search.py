@@ -0,0 +1,75 @@
+# ================================
+# app/api/endpoints/search.py
+# ================================
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Any
+from app.database import get_db
+from app.core.config import settings
+from app.schemas.api_schemas import (
+    CVSearchResponse, SearchIndexRebuildResponse, CandidateFilterRequest, CandidateFilterResponse
+)
+from app.services.search_index import search_index
+from app.services.facet_store import facet_store, FLAG_FACETS
+
+router = APIRouter()
+
+@router.get("/search/cvs", response_model=CVSearchResponse)
+async def search_cvs(
+    q: str = Query(..., min_length=1, max_length=500, description='Query, e.g. \'"machine learning" AND (python OR scala), 5+ years\''),
+    page: int = Query(default=1, ge=1, description="Page number"),
+    page_size: int = Query(default=20, ge=1, le=settings.SEARCH_MAX_PAGE_SIZE, description="Hits per page")
+):
+    """BM25-ranked full-text search over parsed CV text (phrases, AND/OR/NOT, prefix*)"""
+    try:
+        return CVSearchResponse(**await run_in_threadpool(search_index.search, q, page, page_size))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search CVs: {str(e)}")
+
+@router.get("/search/index")
+async def get_search_index_status() -> Dict[str, Any]:
+    """Size of the full-text search index"""
+    try:
+        return await run_in_threadpool(search_index.status)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read search index status: {str(e)}")
+
+@router.post("/search/index/rebuild", response_model=SearchIndexRebuildResponse)
+async def rebuild_search_index(db: Session = Depends(get_db)):
+    """Re-index every analysed CV (after bulk re-analysis or to drop deleted CVs)"""
+    try:
+        return SearchIndexRebuildResponse(**await run_in_threadpool(search_index.rebuild, db))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild search index: {str(e)}")
+
+@router.post("/search/candidates/filter", response_model=CandidateFilterResponse)
+async def filter_candidates(
+    request: CandidateFilterRequest,
+    refresh: bool = Query(default=False, description="Reload the facet columns from the database first"),
+    db: Session = Depends(get_db)
+):
+    """Filter analysed CVs by score, experience, degree, skills and profile links, with facet counts"""
+    try:
+        if refresh:
+            facet_store.invalidate()
+        columns = await facet_store.get(db)
+        return CandidateFilterResponse(**facet_store.filter(
+            columns,
+            min_score=request.min_score,
+            max_score=request.max_score,
+            min_years=request.min_years,
+            max_years=request.max_years,
+            min_degree=request.min_degree.lower() if request.min_degree else None,
+            skills=request.skills,
+            flags={name: getattr(request, name) for name in FLAG_FACETS},
+            limit=request.limit,
+            offset=request.offset,
+            top_skills=request.top_skills
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to filter candidates: {str(e)}")
@@ -32,9 +32,32 @@ class Settings(BaseSettings):
     BATCH_SIZE: int = 5  # Number of CVs to process in one batch
     PROCESSING_INTERVAL: int = 30  # Seconds between batch processing
     MAX_RETRIES: int = 3
+    PROCESSING_TIMEOUT: int = 900  # Seconds before a CV left Processing (e.g. by a worker that died) is picked up again
+    
+    # Corpus-wide reads are paged by primary key in chunks of this many rows
+    SCAN_CHUNK_SIZE: int = 5000
+    PENDING_CVS_MAX_PAGE: int = 500
+    
+    # /statistics and /matching-statistics cache (seconds)
+    STATISTICS_CACHE_TTL: int = 30
+    
+    # Bulk re-analysis from stored ParsedText
+    REANALYSIS_WORKERS: int = 0  # 0 = one per CPU core
+    REANALYSIS_CHUNK_SIZE: int = 200
+    REANALYSIS_CHECKPOINT_PATH: str = "data/reanalysis_checkpoint.json"
+    REANALYSIS_LOCK_TIMEOUT: int = 900  # seconds without a checkpoint before a runner's lock is stale
+    REANALYZE_ON_SKILL_RULES_CHANGE: bool = False  # re-analyze stale analyses at startup (otherwise: reanalyze_corpus.py --if-stale)
     
     # NLP Model settings
     SPACY_MODEL: str = "en_core_web_sm"
+    NER_ENRICHMENT_ENABLED: bool = False  # spaCy NER instead of regexes for institutions and job titles
+    NER_BATCH_SIZE: int = 64
+    NER_PROCESSES: int = 1
+    NER_MAX_CHARS: int = 5000  # per section doc
+
+    # Analyzer regex limits (catastrophic backtracking on garbage text)
+    REGEX_TIMEOUT_SECONDS: float = 1.0
+    REGEX_DOCUMENT_BUDGET_SECONDS: float = 10.0
     
     # CV Analysis scoring weights
     SKILLS_WEIGHT: float = 0.4
@@ -45,6 +68,62 @@ class Settings(BaseSettings):
     # Keyword matching settings
     MIN_KEYWORD_CONFIDENCE: float = 0.7
     FUZZY_MATCH_THRESHOLD: int = 80
+    FUZZY_QUERY_CACHE_SIZE: int = 10000  # Neighbour sets kept for skills outside the vocabulary
+    
+    # Skill embedding table (memory-mapped .npy shared by all worker processes)
+    SKILL_EMBEDDINGS_PATH: str = "data/skill_embeddings"  # Versioned tables plus a CURRENT pointer
+    SKILL_EMBEDDING_DIM: int = 256
+    
+    # Matching corpus snapshot (versioned mmapped arrays shared by uvicorn workers)
+    CORPUS_SNAPSHOT_DIR: str = "data/corpus_snapshots"
+    CORPUS_SNAPSHOT_MAX_AGE: int = 300  # Seconds before the snapshot is rebuilt in the background (matching lags by up to this)
+    CORPUS_SNAPSHOT_KEEP: int = 1  # Superseded versions kept on disk
+    
+    # Sharded corpus scoring
+    MATCH_SHARDS: int = 0  # 0 = one per CPU core, 1 = score in-process
+    MATCH_MIN_SHARD_SIZE: int = 20000  # Smaller corpora are scored in-process
+    MATCH_BATCH_SIZE: int = 5000  # CVs per batch in bulk matching
+    
+    # Corpus TF-IDF model for full-text CV-to-profile ranking
+    TFIDF_MODEL_PATH: str = "data/tfidf_model.npz"
+    TFIDF_N_FEATURES: int = 2 ** 18  # Hashed term space
+    TFIDF_CHUNK_SIZE: int = 1000  # CV texts vectorized per chunk
+    TFIDF_REFRESH_INTERVAL: int = 300  # Seconds between incremental refreshes
+    TFIDF_REFIT_INTERVAL: int = 24 * 3600  # Seconds between full refits
+    
+    # Near-duplicate CV detection (MinHash + LSH)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.9  # Estimated Jaccard similarity of word shingles
+    DEDUP_NUM_PERM: int = 128  # MinHash values per signature
+    DEDUP_LSH_BANDS: int = 16  # Bands of DEDUP_NUM_PERM / DEDUP_LSH_BANDS values each
+    DEDUP_SHINGLE_SIZE: int = 5  # Words per shingle
+    
+    # Faceted candidate filtering
+    FACET_STORE_TTL: int = 300  # Seconds before the in-memory facet columns are reloaded
+    
+    # Full-text CV search index
+    SEARCH_INDEX_PATH: str = "data/search_index.sqlite"  # Not a volume; rebuilt at startup when missing or empty
+    SEARCH_INDEX_CHUNK_SIZE: int = 1000  # CVs written per transaction on rebuild
+    SEARCH_MAX_PAGE_SIZE: int = 100
+    SEARCH_INDEX_MMAP_BYTES: int = 1024 * 1024 * 1024  # Index pages read through mmap
+    
+    # Stateless text analysis (/api/analyze-text)
+    TEXT_ANALYSIS_WORKERS: int = 2  # Analyzer processes shared by all requests
+    TEXT_ANALYSIS_TASK_SIZE: int = 8  # Texts sent to a worker at once
+    TEXT_ANALYSIS_MAX_TEXTS: int = 50  # Texts per request
+    TEXT_ANALYSIS_MAX_CHARS: int = 100000  # Characters per text
+    TEXT_ANALYSIS_CACHE_SIZE: int = 5000  # Results kept by content hash
+    
+    # Inline upload analysis (/api/upload)
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes read, hashed and written per step
+    UPLOAD_HASH_CACHE_SIZE: int = 10000  # Recent file hashes mapped to their analysed CV
+    METRICS_WINDOW: int = 1000  # Recent observations behind latency percentiles
+    
+    # Pending processor read-ahead of CV files
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_BYTE_BUDGET: int = 64 * 1024 * 1024  # File bytes held in memory ahead of analysis
+    PREFETCH_MMAP_THRESHOLD: int = 4 * 1024 * 1024  # Files this large are memory-mapped instead of copied
+    PREFETCH_THREADS: int = 4  # Files read concurrently
     
     # Logging settings
     LOG_LEVEL: str = "INFO"
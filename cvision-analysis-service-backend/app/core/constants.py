@@ -44,6 +44,20 @@ class AnalysisMetrics:
     AVERAGE_THRESHOLD = 60
     POOR_THRESHOLD = 40
 
+# Analysis pipeline profiles (which stages run)
+class AnalysisProfiles:
+    FULL = "full"    # every stage, for detailed reports
+    QUICK = "quick"  # skills and a skills-only score, for bulk triage
+
+# Highest degree found in a CV (stored as an ordinal for filtering and rescoring)
+class DegreeLevels:
+    NONE = 0
+    CERTIFICATE = 1
+    ASSOCIATE = 2
+    BACHELOR = 3
+    MASTER = 4
+    DOCTORATE = 5
+
 # Common CV Keywords and Skills
 COMMON_SKILLS = [
     # .NET & Microsoft Tech
@@ -51,7 +65,7 @@ COMMON_SKILLS = [
     "azure", "azure devops", "mssql", "sql server", "signalr", "wcf", "wpf", "winforms",
     
     # Web Technologies
-    "javascript", "typescript", "html", "css", "react", "angular", "vue", "nodejs", "next.js",
+    "javascript", "typescript", "html", "css", "react", "angular", "vue", "nodejs", "next.js", "nuxt.js", "express",
     "tailwind", "bootstrap", "jquery", "ajax", "json", "xml", "rest", "restful", "api",
     
     # Backend Technologies  
@@ -95,6 +109,61 @@ COMMON_SKILLS = [
     "kanban", "jira", "confluence", "product management"
 ]
 
+# Alternative spellings mapped to the canonical skill name used in COMMON_SKILLS
+# (every target is a COMMON_SKILLS entry and no source is)
+SKILL_ALIASES = {
+    # JavaScript ecosystem
+    "node": "nodejs", "node.js": "nodejs", "node js": "nodejs",
+    "react.js": "react", "reactjs": "react", "react js": "react",
+    "vue.js": "vue", "vuejs": "vue", "vue js": "vue",
+    "angularjs": "angular", "angular.js": "angular",
+    "nextjs": "next.js", "next js": "next.js",
+    "nuxt": "nuxt.js", "nuxtjs": "nuxt.js",
+    "express.js": "express", "expressjs": "express",
+    "js": "javascript", "es6": "javascript", "ecmascript": "javascript",
+    "ts": "typescript",
+    "tailwindcss": "tailwind", "tailwind css": "tailwind",
+    "html5": "html", "css3": "css",
+    
+    # .NET & Microsoft Tech
+    "dotnet": ".net", "dot net": ".net",
+    "dotnet core": ".net core", "net core": ".net core", "netcore": ".net core", ".netcore": ".net core",
+    "asp.net core": "asp.net", "aspnet": "asp.net", "asp net": "asp.net", "aspnet core": "asp.net",
+    "c sharp": "c#", "csharp": "c#",
+    "entityframework": "entity framework", "entity framework core": "entity framework", "ef core": "entity framework",
+    "web api": "webapi", "asp.net web api": "webapi",
+    "ms sql": "sql server", "ms sql server": "sql server", "microsoft sql server": "sql server",
+    
+    # Languages
+    "golang": "go", "cpp": "c++", "python3": "python", "python 3": "python",
+    "obj-c": "objective-c", "objective c": "objective-c",
+    
+    # Databases
+    "postgres": "postgresql", "postgre sql": "postgresql",
+    "mongo": "mongodb", "mongo db": "mongodb",
+    "elastic search": "elasticsearch", "dynamo db": "dynamodb",
+    
+    # DevOps & Cloud
+    "k8s": "kubernetes", "docker-compose": "docker compose",
+    "ci cd": "ci/cd", "cicd": "ci/cd", "ci-cd": "ci/cd",
+    "rabbit mq": "rabbitmq", "apache kafka": "kafka",
+    "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp", "microsoft azure": "azure",
+    
+    # Data, testing & architecture
+    "ml": "machine learning", "artificial intelligence": "ai",
+    "ms excel": "excel", "microsoft excel": "excel",
+    "unit tests": "unit testing", "integration tests": "integration testing",
+    "test driven development": "tdd", "behavior driven development": "bdd", "behaviour driven development": "bdd",
+    "micro services": "microservices", "micro-services": "microservices",
+    "ddd": "domain driven design", "domain-driven design": "domain driven design",
+    "solid principles": "solid",
+    "rest api": "rest", "restful api": "rest"
+}
+
+# Aliases that are also everyday words or units ("node" in a graph, "500 ml", "10 ts");
+# only trusted inside a skills section
+SECTION_ONLY_SKILL_ALIASES = {"node", "js", "ts", "ml"}
+
 EDUCATION_KEYWORDS = [
     "bachelor", "master", "phd", "degree", "university", "college", "certification",
     "diploma", "gpa", "magna cum laude", "summa cum laude", "honors"
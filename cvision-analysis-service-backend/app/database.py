@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, Query
 from sqlalchemy.pool import StaticPool
+from typing import Any, Iterator, List, Sequence
 from loguru import logger
 from app.core.config import settings
 
@@ -36,6 +37,48 @@ def get_db() -> Session:
     finally:
         db.close()
 
+def scan_in_chunks(query: Query, key_column, chunk_size: int = None, after: Any = None) -> Iterator[List[Any]]:
+    """Read a large query as keyset-paginated chunks ordered by ``key_column``
+    
+    Each chunk is one bounded ``WHERE key > last ORDER BY key`` round trip
+    streamed with ``yield_per``, so memory does not grow with the table and the
+    connection is free again before the caller handles the chunk.
+    """
+    chunk_size = chunk_size or settings.SCAN_CHUNK_SIZE
+    key_name = key_column.key
+    
+    while True:
+        page = query if after is None else query.filter(key_column > after)
+        chunk = list(page.order_by(key_column).limit(chunk_size).yield_per(chunk_size))
+        if not chunk:
+            return
+        
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        after = getattr(chunk[-1], key_name)
+
+def _add_missing_columns(tables: Sequence[Any]):
+    """ALTER in columns added to the service-owned tables after they were created
+    
+    ``create_all`` only creates missing tables and never changes existing ones.
+    Columns added later must be nullable so they can be added in place.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as connection:
+        for table in tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"{table.name}.{column.name} is NOT NULL and needs a migration")
+                
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {quote(table.name)} ADD {quote(column.name)} {column_type} NULL"))
+                logger.info(f"Added column {table.name}.{column.name}")
+
 def init_db():
     """Initialize database (create tables if they don't exist)"""
     try:
@@ -48,6 +91,21 @@ def init_db():
         from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, JobProfileModel
         logger.info("Database models imported successfully")
         
+        # Side tables owned by the analysis service are created here instead
+        from app.models import (
+            CVAnalysisFeatureModel, SkillVocabularyModel, AnalyticsRollupModel, CVSignatureModel, CVSignatureBandModel
+        )
+        service_tables = [
+            CVAnalysisFeatureModel.__table__,
+            SkillVocabularyModel.__table__,
+            AnalyticsRollupModel.__table__,
+            CVSignatureModel.__table__,
+            CVSignatureBandModel.__table__
+        ]
+        Base.metadata.create_all(bind=engine, tables=service_tables)
+        _add_missing_columns(service_tables)
+        logger.info("Analysis service tables verified")
+        
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
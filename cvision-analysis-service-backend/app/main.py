@@ -6,7 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 # Import API routers
-from app.api.endpoints import health, analysis, job_matching, monitoring
+from app.api.endpoints import health, analysis, job_matching, monitoring, search
+from app.services.text_analysis_pool import text_analysis_pool
 
 # Create FastAPI app
 app = FastAPI(
@@ -31,6 +32,7 @@ app.include_router(health.router, tags=["Health"])
 app.include_router(analysis.router, prefix="/api", tags=["Analysis"])
 app.include_router(job_matching.router, prefix="/api/job-matching", tags=["Job Matching"])
 app.include_router(monitoring.router, prefix="/api", tags=["Monitoring"])
+app.include_router(search.router, prefix="/api", tags=["Search"])
 
 @app.on_event("startup")
 async def startup_event():
@@ -43,6 +45,7 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event handler"""
     logger.info("👋 CVision Analysis Service shutting down...")
+    text_analysis_pool.shutdown()
 
 @app.get("/")
 async def root():
@@ -1,4 +1,4 @@
 # Import all models from database_models.py
-from .database_models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, JobProfileModel
+from .database_models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, JobProfileModel, CVAnalysisFeatureModel, SkillVocabularyModel, AnalyticsRollupModel, CVSignatureModel, CVSignatureBandModel
 
-__all__ = ["CVFileModel", "CVAnalysisResultModel", "KeywordMatchModel", "JobProfileModel"]
\ No newline at end of file
+__all__ = ["CVFileModel", "CVAnalysisResultModel", "KeywordMatchModel", "JobProfileModel", "CVAnalysisFeatureModel", "SkillVocabularyModel", "AnalyticsRollupModel", "CVSignatureModel", "CVSignatureBandModel"]
\ No newline at end of file
@@ -2,7 +2,7 @@
 # ================================
 # app/models.py
 # ================================
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, Boolean, Text, LargeBinary, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -46,6 +46,7 @@ class CVAnalysisResultModel(Base):
     # Relationships
     cv_file = relationship("CVFileModel", back_populates="analysis_result")
     keyword_matches = relationship("KeywordMatchModel", back_populates="analysis_result")
+    features = relationship("CVAnalysisFeatureModel", back_populates="analysis_result", uselist=False)
     
     @property
     def MissingSections(self) -> List[str]:
@@ -91,6 +92,68 @@ class KeywordMatchModel(Base):
     # Relationship
     analysis_result = relationship("CVAnalysisResultModel", back_populates="keyword_matches")
 
+class CVAnalysisFeatureModel(Base):
+    """Sub-scores and key features of an analysis (owned by the analysis service)"""
+    __tablename__ = "CVAnalysisFeatures"
+    
+    CVAnalysisResultId = Column(UNIQUEIDENTIFIER, ForeignKey("CVAnalysisResults.Id"), primary_key=True)
+    SkillsScore = Column(Float, nullable=False, default=0)
+    ExperienceScore = Column(Float, nullable=False, default=0)
+    EducationScore = Column(Float, nullable=False, default=0)
+    FormatScore = Column(Float, nullable=False, default=0)
+    SkillCount = Column(Integer, nullable=False, default=0)
+    YearsOfExperience = Column(Float, nullable=False, default=0)
+    TopDegreeLevel = Column(Integer, nullable=False, default=0)  # DegreeLevels ordinal
+    HasEmail = Column(Boolean, nullable=False, default=False)
+    HasPhone = Column(Boolean, nullable=False, default=False)
+    HasLinkedIn = Column(Boolean, nullable=False, default=False)
+    HasGitHub = Column(Boolean, nullable=False, default=False)
+    SkillIds = Column(LargeBinary, nullable=True)  # Sorted little-endian uint32 SkillVocabulary ids
+    VocabularyVersion = Column(Integer, nullable=True)  # Highest vocabulary id when encoded
+    SkillRules = Column(String(16), nullable=True)  # Skill-normalizer fingerprint the keywords were derived under
+    CreatedAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    UpdatedAt = Column(DateTime, nullable=True)
+    
+    # Relationship
+    analysis_result = relationship("CVAnalysisResultModel", back_populates="features")
+
+class SkillVocabularyModel(Base):
+    """Append-only skill vocabulary referenced by packed feature records (owned by the analysis service)"""
+    __tablename__ = "SkillVocabulary"
+    
+    Id = Column(Integer, primary_key=True, autoincrement=True)
+    Term = Column(String(255), nullable=False, unique=True)
+    CreatedAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class AnalyticsRollupModel(Base):
+    """Pre-aggregated dashboard counters kept up to date by delta updates (owned by the analysis service)"""
+    __tablename__ = "AnalyticsRollups"
+    
+    Dimension = Column(String(32), primary_key=True)  # keyword, score, analyses
+    Month = Column(String(7), primary_key=True)  # YYYY-MM of the CV upload
+    BucketKey = Column(String(255), primary_key=True)  # keyword, score value, or "" for analyses
+    Count = Column(Integer, nullable=False, default=0)
+    ScoreSum = Column(Integer, nullable=False, default=0)
+    UpdatedAt = Column(DateTime, nullable=True)
+
+class CVSignatureModel(Base):
+    """MinHash signature of a CV's text and its near-duplicate link (owned by the analysis service)"""
+    __tablename__ = "CVSignatures"
+    
+    CVFileId = Column(UNIQUEIDENTIFIER, ForeignKey("CVFiles.Id"), primary_key=True)
+    Signature = Column(LargeBinary, nullable=False)  # Little-endian uint32 MinHash values
+    DuplicateOfId = Column(UNIQUEIDENTIFIER, nullable=True, index=True)  # Earliest CVFile with near-identical text
+    Similarity = Column(Float, nullable=True)  # Estimated Jaccard similarity to DuplicateOfId
+    CreatedAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    UpdatedAt = Column(DateTime, nullable=True)
+
+class CVSignatureBandModel(Base):
+    """LSH band buckets of CV signatures; CVs sharing a bucket are near-duplicate candidates"""
+    __tablename__ = "CVSignatureBands"
+    
+    BandKey = Column(BigInteger, primary_key=True, autoincrement=False)  # Hash of (band number, band values)
+    CVFileId = Column(UNIQUEIDENTIFIER, ForeignKey("CVFiles.Id"), primary_key=True, index=True)
+
 class JobProfileModel(Base):
     """Job Profile model matching .NET Entity"""
     __tablename__ = "JobProfiles"
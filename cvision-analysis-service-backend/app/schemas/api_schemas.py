@@ -2,7 +2,7 @@
 # app/schemas/api_schemas.py
 # ================================
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, Literal
 from datetime import datetime
 import uuid
 
@@ -26,6 +26,42 @@ class AnalyzeResponse(BaseModel):
     message: str = Field(..., description="Response message")
     status: str = Field(..., description="Analysis status")
 
+class AnalyzeTextRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, description="Raw CV texts to analyze")
+    profile: Literal["full", "quick"] = Field("full", description="Analysis stages: full report, or quick skills-only triage")
+
+class TextAnalysisResult(BaseModel):
+    content_hash: str = Field(..., description="SHA-256 of the profile and text")
+    cached: bool = Field(..., description="Served from the result cache")
+    failed: bool = Field(..., description="Analysis failed for this text")
+    score: int = Field(..., description="Overall score (skills-only for the quick profile)")
+    skills: List[str] = Field(..., description="Canonical skills found")
+    sub_scores: Dict[str, Optional[float]] = Field(..., description="Skills/experience/education/format scores (null when not computed)")
+    years_of_experience: Optional[float] = Field(None, description="Years of experience found")
+    top_degree_level: Optional[int] = Field(None, description="Highest degree level found")
+    missing_sections: List[str] = Field(..., description="Important sections not found")
+    format_issues: List[str] = Field(..., description="Format problems found")
+    profile: str = Field(..., description="Analysis profile used")
+    stage_timings: Dict[str, float] = Field(..., description="Milliseconds per analysis stage")
+
+class AnalyzeTextResponse(BaseModel):
+    results: List[TextAnalysisResult] = Field(..., description="One result per submitted text, in order")
+    total_texts: int = Field(..., description="Texts submitted")
+    unique_texts: int = Field(..., description="Distinct texts after deduplication")
+    cache_hits: int = Field(..., description="Distinct texts answered from the cache")
+    took_ms: float = Field(..., description="Server time")
+
+class UploadAnalysisResponse(BaseModel):
+    cv_file_id: str = Field(..., description="Created CV file ID")
+    file_name: str = Field(..., description="Stored filename")
+    status: str = Field(..., description="Analysis status")
+    score: Optional[int] = Field(None, description="Overall score (null if the analysis failed)")
+    duplicate_of: Optional[str] = Field(None, description="Earlier CV whose analysis was reused")
+    sha256: str = Field(..., description="SHA-256 of the uploaded file")
+    size_bytes: int = Field(..., description="Uploaded file size")
+    cache_hit: bool = Field(..., description="Byte-identical to a recent upload; its extracted text was reused")
+    latency_ms: float = Field(..., description="Upload-to-score time")
+
 class CVFileResponse(BaseModel):
     id: str = Field(..., description="CV file ID")
     fileName: str = Field(..., description="Original filename")
@@ -73,8 +109,139 @@ class ServiceStats(BaseModel):
     completed_cvs: int = Field(..., description="Completed CVs")
     failed_cvs: int = Field(..., description="Failed CVs")
     average_score: Optional[float] = Field(None, description="Average CV score")
+    score_histogram: Optional[Dict[str, int]] = Field(None, description="Analysed CVs per score range")
+    computed_at: Optional[datetime] = Field(None, description="When the cached counts were last read from the database")
     processor_stats: ProcessingStats = Field(..., description="Background processor stats")
 
+# Analytics Rollup Schemas
+class TopKeywordStat(BaseModel):
+    keyword: str = Field(..., description="Keyword")
+    count: int = Field(..., description="Occurrences across analyses")
+
+class MonthlyAnalysisStat(BaseModel):
+    month: str = Field(..., description="Upload month (YYYY-MM)")
+    analyses: int = Field(..., description="Analyses of CVs uploaded that month")
+    average_score: Optional[float] = Field(None, description="Average score")
+
+class AnalyticsRollupResponse(BaseModel):
+    since_month: Optional[str] = Field(None, description="First month included (all time if empty)")
+    total_analyses: int = Field(..., description="Analyses in the window")
+    average_score: Optional[float] = Field(None, description="Average score in the window")
+    top_keywords: List[TopKeywordStat] = Field(..., description="Most frequent keywords")
+    score_histogram: Dict[str, int] = Field(..., description="Analyses per score range")
+    score_distribution: Dict[str, int] = Field(..., description="Percentage per score band (excellent/good/average/poor)")
+    monthly: List[MonthlyAnalysisStat] = Field(..., description="Analyses per month")
+
+class RollupRebuildResponse(BaseModel):
+    dimensions: List[str] = Field(..., description="Rebuilt dimensions")
+    rows: int = Field(..., description="Rollup rows written")
+    seconds: float = Field(..., description="Rebuild time")
+
+# Regex Guard Schemas
+class RegexBudgetHit(BaseModel):
+    pattern: str = Field(..., description="Analyzer pattern")
+    timeouts: int = Field(..., description="Calls aborted by the per-pattern timeout")
+    skipped: int = Field(..., description="Calls skipped because the document budget was spent")
+    max_seconds: float = Field(..., description="Longest aborted call")
+    last_document_id: Optional[str] = Field(None, description="Last document that hit the limit")
+    last_hit_at: datetime = Field(..., description="When the limit was last hit")
+
+class RegexGuardReport(BaseModel):
+    timeout_seconds: float = Field(..., description="Per-pattern timeout")
+    document_budget_seconds: float = Field(..., description="Regex time budget per document")
+    patterns: List[RegexBudgetHit] = Field(..., description="Patterns that hit a limit in this process, worst first")
+
+# Metrics Schemas
+class LatencyStats(BaseModel):
+    count: int = Field(..., description="Observations since startup")
+    mean_ms: Optional[float] = Field(None, description="Mean since startup")
+    p50_ms: Optional[float] = Field(None, description="Median over the recent window")
+    p95_ms: Optional[float] = Field(None, description="95th percentile over the recent window")
+    p99_ms: Optional[float] = Field(None, description="99th percentile over the recent window")
+    max_ms: Optional[float] = Field(None, description="Slowest since startup")
+    window: int = Field(..., description="Observations in the recent window")
+
+class MetricsResponse(BaseModel):
+    latencies: Dict[str, LatencyStats] = Field(..., description="Latency metrics by name, e.g. upload_to_score.inline")
+
+# Full-text Search Schemas
+class CVSearchHit(BaseModel):
+    cv_id: str = Field(..., description="CV file ID")
+    analysis_id: Optional[str] = Field(None, description="Analysis result ID")
+    file_name: Optional[str] = Field(None, description="CV file name")
+    years_of_experience: float = Field(..., description="Years of experience found by the analysis")
+    score: float = Field(..., description="BM25 relevance (higher is better)")
+    snippet: str = Field(..., description="Matching excerpt, terms in [brackets]")
+
+class CVSearchResponse(BaseModel):
+    query: str = Field(..., description="Query as submitted")
+    fts_query: str = Field(..., description="Full-text expression that was run")
+    min_years: Optional[float] = Field(None, description="Experience filter taken from the query")
+    total: int = Field(..., description="Matching CVs")
+    page: int = Field(..., description="Page number")
+    page_size: int = Field(..., description="Hits per page")
+    hits: List[CVSearchHit] = Field(..., description="Hits on this page, best first")
+    took_ms: float = Field(..., description="Index time")
+
+class SearchIndexRebuildResponse(BaseModel):
+    documents: int = Field(..., description="CVs indexed")
+    size_bytes: int = Field(..., description="Index file size")
+    seconds: float = Field(..., description="Rebuild time")
+
+# Faceted Filtering Schemas
+class CandidateFilterRequest(BaseModel):
+    min_score: Optional[int] = Field(None, ge=0, le=100, description="Lowest CV score")
+    max_score: Optional[int] = Field(None, ge=0, le=100, description="Highest CV score")
+    min_years: Optional[float] = Field(None, ge=0, description="Fewest years of experience")
+    max_years: Optional[float] = Field(None, ge=0, description="Most years of experience")
+    min_degree: Optional[str] = Field(None, description="Lowest degree: none, certificate, associate, bachelor, master, doctorate")
+    skills: Optional[List[str]] = Field(None, description="Skills every candidate must have")
+    has_email: Optional[bool] = Field(None, description="Email address present")
+    has_phone: Optional[bool] = Field(None, description="Phone number present")
+    has_linkedin: Optional[bool] = Field(None, description="LinkedIn profile present")
+    has_github: Optional[bool] = Field(None, description="GitHub profile present")
+    limit: int = Field(20, ge=0, le=500, description="Candidates to return")
+    offset: int = Field(0, ge=0, description="Candidates to skip")
+    top_skills: int = Field(20, ge=0, le=200, description="Skills to count in the skills facet")
+
+class FacetedCandidate(BaseModel):
+    analysis_id: str = Field(..., description="Analysis result ID")
+    cv_id: str = Field(..., description="CV file ID")
+    file_name: str = Field(..., description="CV file name")
+    score: int = Field(..., description="CV score")
+    years_of_experience: float = Field(..., description="Years of experience")
+    degree: str = Field(..., description="Highest degree level")
+    has_email: bool = Field(..., description="Email address present")
+    has_phone: bool = Field(..., description="Phone number present")
+    has_linkedin: bool = Field(..., description="LinkedIn profile present")
+    has_github: bool = Field(..., description="GitHub profile present")
+    skills: List[str] = Field(..., description="Canonical skills")
+
+class CandidateFilterResponse(BaseModel):
+    total: int = Field(..., description="Candidates matching every filter")
+    candidates: List[FacetedCandidate] = Field(..., description="Requested page, best score first")
+    facets: Dict[str, Dict[str, int]] = Field(..., description="Counts per facet value, each with the other filters applied")
+    corpus_size: int = Field(..., description="CVs in the facet store")
+    loaded_at: datetime = Field(..., description="When the facet store was loaded")
+    took_ms: float = Field(..., description="Filter time")
+
+# Rescoring Schemas
+class RescoreRequest(BaseModel):
+    skills_weight: Optional[float] = Field(None, ge=0, description="Skills weight (defaults to SKILLS_WEIGHT)")
+    experience_weight: Optional[float] = Field(None, ge=0, description="Experience weight (defaults to EXPERIENCE_WEIGHT)")
+    education_weight: Optional[float] = Field(None, ge=0, description="Education weight (defaults to EDUCATION_WEIGHT)")
+    format_weight: Optional[float] = Field(None, ge=0, description="Format weight (defaults to FORMAT_WEIGHT)")
+    dry_run: bool = Field(False, description="Compute new scores without writing them (required with weight overrides)")
+
+class RescoreResponse(BaseModel):
+    weights: Dict[str, float] = Field(..., description="Weights used for rescoring")
+    total_analyses: int = Field(..., description="Analyses with persisted sub-scores")
+    changed_scores: int = Field(..., description="Analyses whose score changed")
+    average_score_before: Optional[float] = Field(None, description="Average score before rescoring")
+    average_score_after: Optional[float] = Field(None, description="Average score after rescoring")
+    dry_run: bool = Field(..., description="Whether scores were written")
+    timings_seconds: Dict[str, float] = Field(..., description="Load/compute/write timings")
+
 # Error Response Schema
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error type")
@@ -121,21 +288,24 @@ class JobMatchResponse(BaseModel):
 
 class JobProfileMatchSummary(BaseModel):
     job_profile_id: str = Field(..., description="Job profile ID")
-    job_title: str = Field(..., description="Job profile title")
-    match_percentage: float = Field(..., description="Match percentage")
-    total_job_keywords: int = Field(..., description="Total job keywords")
-    matched_keywords_count: int = Field(..., description="Count of matched keywords")
-    matched_keywords: List[str] = Field(..., description="Matched keywords")
-    missing_keywords: List[str] = Field(..., description="Missing keywords")
+    # Everything but the id may be left out by field selection
+    job_title: Optional[str] = Field(None, description="Job profile title")
+    match_percentage: Optional[float] = Field(None, description="Match percentage")
+    total_job_keywords: Optional[int] = Field(None, description="Total job keywords")
+    matched_keywords_count: Optional[int] = Field(None, description="Count of matched keywords")
+    matched_keywords: Optional[List[str]] = Field(None, description="Matched keywords")
+    missing_keywords: Optional[List[str]] = Field(None, description="Missing keywords")
     semantic_similarity: Optional[float] = Field(None, description="Semantic similarity")
     weighted_score: Optional[float] = Field(None, description="Weighted score")
     category_scores: Optional[Dict[str, Any]] = Field(None, description="Category scores")
+    recommendations: Optional[List[str]] = Field(None, description="Recommendations")
 
 class CVAllJobsMatchResponse(BaseModel):
     cv_id: str = Field(..., description="CV ID")
     cv_title: str = Field(..., description="CV title/filename")
+    duplicate_of: Optional[str] = Field(None, description="Earlier CV this one near-duplicates, if any")
     total_job_profiles: int = Field(..., description="Total job profiles analyzed")
-    matches: List[JobProfileMatchSummary] = Field(..., description="All job matches")
+    matches: List[JobProfileMatchSummary] = Field(..., description="Best job matches")
     best_match: Optional[JobProfileMatchSummary] = Field(None, description="Best matching job")
     average_match_percentage: float = Field(..., description="Average match percentage")
 
@@ -150,6 +320,7 @@ class CVMatchSummary(BaseModel):
     semantic_similarity: Optional[float] = Field(None, description="Semantic similarity")
     weighted_score: Optional[float] = Field(None, description="Weighted score")
     cv_score: int = Field(..., description="Overall CV score")
+    duplicate_of: Optional[str] = Field(None, description="Earlier CV this one near-duplicates, if any")
 
 class TopCVMatchesResponse(BaseModel):
     job_profile_id: str = Field(..., description="Job profile ID")
@@ -158,6 +329,13 @@ class TopCVMatchesResponse(BaseModel):
     top_matches: List[CVMatchSummary] = Field(..., description="Top CV matches")
     average_match_percentage: float = Field(..., description="Average match percentage")
 
+class BulkMatchRequest(BaseModel):
+    cv_analysis_ids: Union[Literal["all"], List[str]] = Field("all", description="CV analysis IDs, or \"all\"")
+    job_profile_ids: Union[Literal["all"], List[str]] = Field("all", description="Job profile IDs, or \"all\"")
+    min_score: Optional[float] = Field(None, ge=0, le=100, description="Only return matches at or above this percentage")
+    top_k_per_cv: Optional[int] = Field(None, ge=1, description="Only return the best K jobs for each CV")
+    include_details: bool = Field(False, description="Include matched/missing keywords for returned pairs")
+
 # Generic API Response wrapper
 from typing import TypeVar, Generic
 T = TypeVar('T')
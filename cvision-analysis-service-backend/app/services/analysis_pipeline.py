@@ -0,0 +1,100 @@
+# app/services/analysis_pipeline.py
+import time
+from typing import List, Dict, Any, Tuple, Callable, Iterable, Optional
+
+from app.services.regex_guard import regex_guard
+
+# Context key holding a document's regex budget from one run to the next
+REGEX_BUDGET = "regex_budget"
+
+class Stage:
+    """One named analysis step: reads ``inputs`` from the context and writes ``outputs``"""
+
+    def __init__(self, name: str, func: Callable, inputs: Tuple[str, ...], outputs: Tuple[str, ...]):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+class AnalysisPipeline:
+    """Registry of analysis stages, run by named profiles
+
+    Stages are registered with the ``stage`` decorator on analyzer methods.
+    A profile is an ordered list of stage names; ``plan`` checks that every
+    input a stage declares is produced by an earlier stage or supplied up
+    front. ``run`` skips stages whose outputs are already in the context and
+    records the wall time of each stage that ran. Every stage run for a
+    document, over one call or several, shares that document's regex budget.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Stage] = {}
+        self._profiles: Dict[str, Tuple[str, ...]] = {}
+        self._plans: Dict[Tuple[str, Tuple[str, ...]], List[Stage]] = {}
+
+    def stage(self, name: str, inputs: Iterable[str], outputs: Iterable[str]):
+        """Register the decorated function as a stage"""
+        def register(func: Callable) -> Callable:
+            if name in self._stages:
+                raise ValueError(f"Analysis stage '{name}' is already registered")
+            self._stages[name] = Stage(name, func, tuple(inputs), tuple(outputs))
+            return func
+        return register
+
+    def add_profile(self, name: str, stage_names: Iterable[str]):
+        self._profiles[name] = tuple(stage_names)
+        self._plans.clear()
+
+    @property
+    def profiles(self) -> List[str]:
+        return list(self._profiles)
+
+    def plan(self, profile: str, provided: Iterable[str]) -> List[Stage]:
+        """Stages of a profile in order, validated against what the caller provides"""
+        provided = tuple(sorted(provided))
+        key = (profile, provided)
+        if key not in self._plans:
+            if profile not in self._profiles:
+                raise ValueError(f"Unknown analysis profile '{profile}' (available: {', '.join(self._profiles)})")
+            self._plans[key] = self._resolve(self._profiles[profile], provided, f"profile '{profile}'")
+        return self._plans[key]
+
+    def run(self, owner: Any, profile: str, context: Dict[str, Any],
+            timings: Optional[Dict[str, float]] = None, document_id: Any = None) -> Dict[str, Any]:
+        """Run a profile's stages on ``context`` in place; per-stage milliseconds go to ``timings``"""
+        return self._execute(owner, self.plan(profile, context.keys()), context, timings, document_id)
+
+    def run_stages(self, owner: Any, stage_names: Iterable[str], context: Dict[str, Any],
+                   timings: Optional[Dict[str, float]] = None, document_id: Any = None) -> Dict[str, Any]:
+        """Run specific stages, e.g. to prepare inputs for a whole batch before the profile runs"""
+        return self._execute(owner, self._resolve(stage_names, context.keys(), "run_stages"), context, timings, document_id)
+
+    def _resolve(self, stage_names: Iterable[str], provided: Iterable[str], label: str) -> List[Stage]:
+        available = set(provided)
+        stages = []
+        for stage_name in stage_names:
+            stage = self._stages[stage_name]
+            missing = [name for name in stage.inputs if name not in available]
+            if missing:
+                raise ValueError(f"Stage '{stage_name}' in {label} needs {missing}, which no earlier stage produces")
+            available.update(stage.outputs)
+            stages.append(stage)
+        return stages
+
+    @staticmethod
+    def _execute(owner: Any, stages: List[Stage], context: Dict[str, Any],
+                 timings: Optional[Dict[str, float]], document_id: Any) -> Dict[str, Any]:
+        timings = {} if timings is None else timings
+        with regex_guard.document(document_id, context.get(REGEX_BUDGET)) as budget:
+            context[REGEX_BUDGET] = budget
+            for stage in stages:
+                if all(name in context for name in stage.outputs):
+                    # Supplied by the caller (e.g. sections already extracted for a batch)
+                    continue
+                started = time.perf_counter()
+                values = stage.func(owner, *(context[name] for name in stage.inputs))
+                timings[stage.name] = round((time.perf_counter() - started) * 1000, 3)
+                if len(stage.outputs) == 1:
+                    values = (values,)
+                context.update(zip(stage.outputs, values))
+        return context
@@ -0,0 +1,313 @@
+# app/services/analysis_store.py
+from typing import List, Dict, Any, Optional
+from loguru import logger
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, CVAnalysisFeatureModel
+from app.core.config import settings
+from app.core.constants import CVStatus, DegreeLevels, AnalysisProfiles
+from app.services.skill_vocabulary import skill_vocabulary, pack_skill_ids
+from app.services.skill_normalizer import skill_normalizer
+from app.services.analytics_rollups import analytics_rollups
+from app.services.search_index import search_index
+from app.services.dedup_index import dedup_index
+
+class DuplicateCheck:
+    """Near-duplicate lookup for one CV text"""
+
+    def __init__(self, signature=None, match: Optional[Dict[str, Any]] = None,
+                 original_analysis: Optional[CVAnalysisResultModel] = None):
+        self.signature = signature  # MinHash signature, registered once the CV is stored
+        self.match = match  # Earlier CV the text near-duplicates
+        self.original_analysis = original_analysis  # Its analysis, copied instead of analysing again
+
+class AnalysisStore:
+    """Persistence of CV analyses, shared by every path that analyses a stored CV
+
+    The background processor, the inline upload path and the bulk
+    re-analyzer all write through here, so keyword matches, features,
+    rollups, duplicate links and the search index are kept the same way.
+    Nothing here loads NLP models.
+    """
+
+    def check_duplicate(self, cv_file: CVFileModel, text: str, db: Session) -> DuplicateCheck:
+        """MinHash signature of the text and the earlier analysed CV it near-duplicates, if any"""
+        if not settings.DEDUP_ENABLED:
+            return DuplicateCheck()
+        try:
+            signature = dedup_index.signature(text)
+            if signature is None:
+                return DuplicateCheck()
+            match = dedup_index.find_duplicate(db, signature, exclude_cv_file_id=cv_file.Id)
+            original_analysis = db.query(CVAnalysisResultModel).filter(
+                CVAnalysisResultModel.CVFileId == match['duplicate_of'],
+                CVAnalysisResultModel.IsDeleted == False
+            ).first() if match else None
+            return DuplicateCheck(signature, match, original_analysis)
+        except Exception as e:
+            logger.error(f"Error looking up near-duplicates of CV {cv_file.Id}: {e}")
+            return DuplicateCheck()
+
+    def complete(self, cv_file: CVFileModel, text: str, db: Session, duplicate: DuplicateCheck,
+                 analysis_result: Optional[Dict[str, Any]] = None) -> CVAnalysisResultModel:
+        """Store the text and its analysis (or a copy of the original's) and mark the CV Completed
+
+        Only full-profile analyses are stored: the feature record has no way to
+        tell a stage that did not run from one that found nothing.
+        """
+        profile = (analysis_result or {}).get('profile', AnalysisProfiles.FULL)
+        if profile != AnalysisProfiles.FULL:
+            raise ValueError(f"Refusing to store a '{profile}' profile analysis for CV {cv_file.Id}")
+
+        cv_file.ParsedText = text
+
+        if duplicate.original_analysis is not None:
+            logger.info(f"CV {cv_file.Id} duplicates {duplicate.match['duplicate_of']} "
+                        f"(similarity {duplicate.match['similarity']}), reusing its analysis")
+            result = self.copy(cv_file, duplicate.original_analysis, db)
+        elif analysis_result is not None:
+            result = self.save(cv_file, analysis_result, db)
+        else:
+            raise ValueError(f"No analysis to store for CV {cv_file.Id}")
+
+        if duplicate.signature is not None:
+            dedup_index.register(
+                db, cv_file.Id, duplicate.signature,
+                duplicate.match['duplicate_of'] if duplicate.match else None,
+                duplicate.match['similarity'] if duplicate.match else None
+            )
+
+        cv_file.AnalysisStatus = CVStatus.COMPLETED
+        cv_file.UpdatedAt = datetime.utcnow()
+        db.commit()
+
+        self.index_for_search(cv_file, result.Id, text, db)
+        return result
+
+    def fail(self, cv_file: CVFileModel, db: Session):
+        """Mark a CV whose analysis could not be completed"""
+        db.rollback()
+        cv_file.AnalysisStatus = CVStatus.FAILED
+        cv_file.UpdatedAt = datetime.utcnow()
+        db.commit()
+
+    def save(self, cv_file: CVFileModel, analysis_result: Dict[str, Any], db: Session) -> CVAnalysisResultModel:
+        """Save analysis results to database"""
+        try:
+            # Create or update analysis result
+            existing_result = db.query(CVAnalysisResultModel).filter(
+                CVAnalysisResultModel.CVFileId == cv_file.Id
+            ).first()
+
+            # Dashboard rollups: take out what the previous analysis contributed
+            previous = analytics_rollups.stored_contributions(db, [existing_result.Id]) if existing_result else {}
+
+            if existing_result:
+                # Update existing result
+                result = existing_result
+                result.UpdatedAt = datetime.utcnow()
+            else:
+                # Create new result
+                result = CVAnalysisResultModel(CVFileId=cv_file.Id)
+
+            # Set analysis data
+            result.Score = analysis_result['score']
+            result.MissingSections = analysis_result['missing_sections']
+            result.FormatIssues = analysis_result['format_issues']
+
+            if not existing_result:
+                db.add(result)
+            db.flush()  # Get the ID
+
+            # Save keyword matches
+            self._save_keyword_matches(result.Id, analysis_result.get('skills_analysis', {}), db)
+
+            # Save sub-scores and features so scores can be recomputed without re-analysis
+            self._save_analysis_features(result.Id, analysis_result, db)
+
+            keywords = [
+                (record['Keyword'], record['Count'])
+                for record in self.build_keyword_records(result.Id, analysis_result.get('skills_analysis', {}))
+            ]
+            analytics_rollups.record(
+                db, previous, analytics_rollups.contribution(keywords, result.Score, cv_file.UploadedAt)
+            )
+
+            db.commit()
+            logger.info(f"Saved analysis results for CV file: {cv_file.Id}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error saving analysis results: {e}")
+            db.rollback()
+            raise
+
+    def copy(self, cv_file: CVFileModel, original_analysis: CVAnalysisResultModel, db: Session) -> CVAnalysisResultModel:
+        """Save a copy of another CV's analysis (score, keyword matches, features) for this CV"""
+        try:
+            existing_result = db.query(CVAnalysisResultModel).filter(
+                CVAnalysisResultModel.CVFileId == cv_file.Id
+            ).first()
+            previous = analytics_rollups.stored_contributions(db, [existing_result.Id]) if existing_result else {}
+
+            if existing_result:
+                result = existing_result
+                result.UpdatedAt = datetime.utcnow()
+            else:
+                result = CVAnalysisResultModel(CVFileId=cv_file.Id)
+                db.add(result)
+            result.Score = original_analysis.Score
+            result.MissingSectionsJson = original_analysis.MissingSectionsJson
+            result.FormatIssuesJson = original_analysis.FormatIssuesJson
+            db.flush()
+
+            db.query(KeywordMatchModel).filter(
+                KeywordMatchModel.CVAnalysisResultId == result.Id
+            ).delete()
+            keyword_rows = db.query(KeywordMatchModel).filter(
+                KeywordMatchModel.CVAnalysisResultId == original_analysis.Id,
+                KeywordMatchModel.IsDeleted == False
+            ).all()
+            for row in keyword_rows:
+                db.add(KeywordMatchModel(
+                    CVAnalysisResultId=result.Id, Keyword=row.Keyword, IsMatched=row.IsMatched,
+                    Count=row.Count, MatchCount=row.MatchCount, Relevance=row.Relevance
+                ))
+
+            original_features = db.query(CVAnalysisFeatureModel).filter(
+                CVAnalysisFeatureModel.CVAnalysisResultId == original_analysis.Id
+            ).first()
+            if original_features:
+                record = {
+                    column.name: getattr(original_features, column.name)
+                    for column in CVAnalysisFeatureModel.__table__.columns
+                    if column.name not in ('CVAnalysisResultId', 'CreatedAt', 'UpdatedAt')
+                }
+                features = db.query(CVAnalysisFeatureModel).filter(
+                    CVAnalysisFeatureModel.CVAnalysisResultId == result.Id
+                ).first()
+                if features:
+                    for column, value in record.items():
+                        setattr(features, column, value)
+                    features.UpdatedAt = datetime.utcnow()
+                else:
+                    db.add(CVAnalysisFeatureModel(CVAnalysisResultId=result.Id, **record))
+            db.flush()
+
+            keywords = [(row.Keyword, row.Count) for row in keyword_rows if row.IsMatched]
+            analytics_rollups.record(
+                db, previous, analytics_rollups.contribution(keywords, result.Score, cv_file.UploadedAt)
+            )
+
+            db.commit()
+            logger.info(f"Copied analysis {original_analysis.Id} to CV file: {cv_file.Id}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error copying analysis results: {e}")
+            db.rollback()
+            raise
+
+    def index_for_search(self, cv_file: CVFileModel, analysis_id: Any, text: str, db: Session):
+        """Add the CV to the full-text search index (a failure here does not fail the analysis)"""
+        try:
+            years = db.query(CVAnalysisFeatureModel.YearsOfExperience).filter(
+                CVAnalysisFeatureModel.CVAnalysisResultId == analysis_id
+            ).scalar()
+            search_index.upsert(cv_file.Id, analysis_id, cv_file.FileName, text, years or 0)
+        except Exception as e:
+            logger.error(f"Error indexing CV {cv_file.Id} for search: {e}")
+
+    def build_keyword_records(self, analysis_result_id: str, skills_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build keyword match rows for an analysis"""
+        records = []
+        for match in skills_analysis.get('skill_matches', []):
+            # Calculate relevance score based on confidence and match type
+            relevance_score = int(match.get('confidence', 1.0) * 100)
+
+            records.append({
+                'CVAnalysisResultId': analysis_result_id,
+                'Keyword': match['keyword'],
+                'IsMatched': True,
+                'Count': 1,  # Count of occurrences
+                'MatchCount': 1,  # Keep for backward compatibility
+                'Relevance': relevance_score  # Relevance score (0-100)
+            })
+        return records
+
+    def build_feature_record(self, analysis_result_id: str, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten sub-scores and key features of an analysis into a feature row"""
+        skills_analysis = analysis_result.get('skills_analysis', {})
+        experience_analysis = analysis_result.get('experience_analysis', {})
+        education_analysis = analysis_result.get('education_analysis', {})
+        format_analysis = analysis_result.get('format_analysis', {})
+
+        return {
+            'CVAnalysisResultId': analysis_result_id,
+            'SkillsScore': float(skills_analysis.get('skills_score', 0)),
+            'ExperienceScore': float(experience_analysis.get('experience_score', 0)),
+            'EducationScore': float(education_analysis.get('education_score', 0)),
+            'FormatScore': float(format_analysis.get('format_score', 0)),
+            'SkillCount': int(skills_analysis.get('skills_count', 0)),
+            'YearsOfExperience': float(experience_analysis.get('years_of_experience', 0)),
+            'TopDegreeLevel': int(education_analysis.get('top_degree_level', DegreeLevels.NONE)),
+            'HasEmail': bool(format_analysis.get('has_email', False)),
+            'HasPhone': bool(format_analysis.get('has_phone', False)),
+            'HasLinkedIn': bool(format_analysis.get('has_linkedin', False)),
+            'HasGitHub': bool(format_analysis.get('has_github', False))
+        }
+
+    def build_skill_id_fields(self, skills_analysis: Dict[str, Any], db: Session) -> Dict[str, Any]:
+        """Pack the stored keywords as vocabulary ids for the compact feature record, with the rules they came from"""
+        keywords = [match['keyword'] for match in skills_analysis.get('skill_matches', [])]
+        skill_ids = skill_vocabulary.encode(keywords, db)
+        return {
+            'SkillIds': pack_skill_ids(skill_ids),
+            'VocabularyVersion': skill_vocabulary.version,
+            'SkillRules': skill_normalizer.fingerprint
+        }
+
+    def _save_keyword_matches(self, analysis_result_id: str, skills_analysis: Dict[str, Any], db: Session):
+        """Save keyword matches to database"""
+        try:
+            # Delete existing keyword matches
+            db.query(KeywordMatchModel).filter(
+                KeywordMatchModel.CVAnalysisResultId == analysis_result_id
+            ).delete()
+
+            # Add new keyword matches
+            for record in self.build_keyword_records(analysis_result_id, skills_analysis):
+                db.add(KeywordMatchModel(**record))
+
+            db.flush()
+
+        except Exception as e:
+            logger.error(f"Error saving keyword matches: {e}")
+            raise
+
+    def _save_analysis_features(self, analysis_result_id: str, analysis_result: Dict[str, Any], db: Session):
+        """Save analysis sub-scores and features to database"""
+        try:
+            record = self.build_feature_record(analysis_result_id, analysis_result)
+            record.update(self.build_skill_id_fields(analysis_result.get('skills_analysis', {}), db))
+
+            features = db.query(CVAnalysisFeatureModel).filter(
+                CVAnalysisFeatureModel.CVAnalysisResultId == analysis_result_id
+            ).first()
+
+            if features:
+                for column, value in record.items():
+                    setattr(features, column, value)
+                features.UpdatedAt = datetime.utcnow()
+            else:
+                db.add(CVAnalysisFeatureModel(**record))
+
+            db.flush()
+
+        except Exception as e:
+            logger.error(f"Error saving analysis features: {e}")
+            raise
+
+# Shared instance
+analysis_store = AnalysisStore()
@@ -0,0 +1,269 @@
+# app/services/analytics_rollups.py
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from sqlalchemy import and_, bindparam, extract, func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from loguru import logger
+from datetime import datetime
+
+from app.core.constants import AnalysisMetrics
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, AnalyticsRollupModel
+from app.services.statistics_service import StatisticsService, HISTOGRAM_BUCKETS, score_bucket
+
+# Rollup dimensions
+KEYWORD = "keyword"
+SCORE = "score"
+ANALYSES = "analyses"
+DIMENSIONS = (KEYWORD, SCORE, ANALYSES)
+
+# Month of analyses without an upload date; sorts after every "YYYY-MM"
+UNKNOWN_MONTH = "unknown"
+
+# (dimension, month, bucket key) -> [count, score sum]
+RollupKey = Tuple[str, str, str]
+Deltas = Dict[RollupKey, List[int]]
+
+def month_key(value: Optional[datetime]) -> str:
+    return f"{value:%Y-%m}" if value else UNKNOWN_MONTH
+
+class AnalyticsRollups:
+    """Keyword, score and monthly counters maintained as analyses are saved
+
+    Every save subtracts what the previous version of an analysis contributed
+    and adds the new one in the same transaction, so re-analysis never double
+    counts. Months follow the CV upload date, as in the .NET analytics service.
+    Analyses deleted on the .NET side are only dropped by ``rebuild``.
+    """
+
+    def contribution(self, keywords: Iterable[Tuple[str, int]], score: int, uploaded_at: Optional[datetime]) -> Deltas:
+        """What one analysis adds to the rollups"""
+        month = month_key(uploaded_at)
+        deltas: Deltas = defaultdict(lambda: [0, 0])
+        for keyword, count in keywords:
+            deltas[(KEYWORD, month, keyword)][0] += count or 0
+        deltas[(SCORE, month, str(score))][0] += 1
+        deltas[(ANALYSES, month, "")][0] += 1
+        deltas[(ANALYSES, month, "")][1] += score
+        return deltas
+
+    def stored_contributions(self, db: Session, analysis_ids: List[Any]) -> Deltas:
+        """Current contribution of saved analyses, read before they are overwritten"""
+        deltas: Deltas = defaultdict(lambda: [0, 0])
+        for start in range(0, len(analysis_ids), 1000):
+            ids = analysis_ids[start:start + 1000]
+            months = {}
+            for analysis_id, score, uploaded_at in db.query(
+                CVAnalysisResultModel.Id, CVAnalysisResultModel.Score, CVFileModel.UploadedAt
+            ).join(
+                CVFileModel, CVFileModel.Id == CVAnalysisResultModel.CVFileId
+            ).filter(
+                CVAnalysisResultModel.Id.in_(ids),
+                CVAnalysisResultModel.IsDeleted == False
+            ):
+                months[analysis_id] = month_key(uploaded_at)
+                self.merge(deltas, self.contribution([], score, uploaded_at))
+
+            for analysis_id, keyword, count in db.query(
+                KeywordMatchModel.CVAnalysisResultId, KeywordMatchModel.Keyword, KeywordMatchModel.Count
+            ).filter(
+                KeywordMatchModel.CVAnalysisResultId.in_(ids),
+                KeywordMatchModel.IsMatched == True
+            ):
+                if analysis_id in months:
+                    deltas[(KEYWORD, months[analysis_id], keyword)][0] += count or 0
+        return deltas
+
+    @staticmethod
+    def merge(target: Deltas, other: Deltas, sign: int = 1) -> Deltas:
+        for key, (count, score_sum) in other.items():
+            target[key][0] += sign * count
+            target[key][1] += sign * score_sum
+        return target
+
+    def apply(self, db: Session, deltas: Deltas):
+        """Add deltas to the stored counters (callers commit)"""
+        changes = {key: value for key, value in deltas.items() if value[0] or value[1]}
+        if not changes:
+            return
+
+        self._ensure_rows(db, list(changes))
+        table = AnalyticsRollupModel.__table__
+        db.execute(
+            update(table).where(and_(
+                table.c.Dimension == bindparam('b_dimension'),
+                table.c.Month == bindparam('b_month'),
+                table.c.BucketKey == bindparam('b_key')
+            )).values(
+                Count=table.c.Count + bindparam('b_count'),
+                ScoreSum=table.c.ScoreSum + bindparam('b_score_sum'),
+                UpdatedAt=bindparam('b_now')
+            ),
+            [
+                {'b_dimension': dimension, 'b_month': month, 'b_key': key,
+                 'b_count': count, 'b_score_sum': score_sum, 'b_now': datetime.utcnow()}
+                for (dimension, month, key), (count, score_sum) in changes.items()
+            ]
+        )
+
+    def record(self, db: Session, before: Deltas, after: Deltas):
+        """Replace old contributions with new ones"""
+        self.apply(db, self.merge(self.merge(defaultdict(lambda: [0, 0]), after), before, sign=-1))
+
+    def rebuild(self, db: Session, dimensions: Iterable[str] = DIMENSIONS) -> Dict[str, Any]:
+        """Recompute the rollups from the raw tables"""
+        try:
+            started = time.perf_counter()
+            dimensions = [dimension for dimension in DIMENSIONS if dimension in set(dimensions)]
+            year = extract('year', CVFileModel.UploadedAt)
+            month = extract('month', CVFileModel.UploadedAt)
+
+            def grouped(*columns, joins_keywords: bool = False):
+                query = db.query(year, month, *columns).select_from(CVAnalysisResultModel).join(
+                    CVFileModel, CVFileModel.Id == CVAnalysisResultModel.CVFileId
+                )
+                if joins_keywords:
+                    query = query.join(
+                        KeywordMatchModel, KeywordMatchModel.CVAnalysisResultId == CVAnalysisResultModel.Id
+                    ).filter(KeywordMatchModel.IsMatched == True)
+                return query.filter(CVAnalysisResultModel.IsDeleted == False)
+
+            now = datetime.utcnow()
+            rows = []
+            if KEYWORD in dimensions:
+                for y, m, keyword, count in grouped(
+                    KeywordMatchModel.Keyword, func.sum(KeywordMatchModel.Count), joins_keywords=True
+                ).group_by(year, month, KeywordMatchModel.Keyword):
+                    rows.append(self._row(KEYWORD, y, m, keyword, count or 0, 0, now))
+            if SCORE in dimensions:
+                for y, m, score, count in grouped(
+                    CVAnalysisResultModel.Score, func.count(CVAnalysisResultModel.Id)
+                ).group_by(year, month, CVAnalysisResultModel.Score):
+                    rows.append(self._row(SCORE, y, m, str(score), count, 0, now))
+            if ANALYSES in dimensions:
+                for y, m, count, score_sum in grouped(
+                    func.count(CVAnalysisResultModel.Id), func.sum(CVAnalysisResultModel.Score)
+                ).group_by(year, month):
+                    rows.append(self._row(ANALYSES, y, m, "", count, score_sum or 0, now))
+
+            db.query(AnalyticsRollupModel).filter(
+                AnalyticsRollupModel.Dimension.in_(dimensions)
+            ).delete(synchronize_session=False)
+            db.bulk_insert_mappings(AnalyticsRollupModel, rows)
+            db.commit()
+
+            summary = {
+                'dimensions': dimensions,
+                'rows': len(rows),
+                'seconds': round(time.perf_counter() - started, 3)
+            }
+            logger.info(f"Rebuilt analytics rollups: {summary}")
+            return summary
+
+        except Exception as e:
+            logger.error(f"Error rebuilding analytics rollups: {e}")
+            db.rollback()
+            raise
+
+    def read(self, db: Session, months: Optional[int] = None, top_keywords: int = 10) -> Dict[str, Any]:
+        """Dashboard aggregates over the last ``months`` upload months (all time if None)"""
+        since = None
+        if months:
+            today = datetime.utcnow()
+            index = today.year * 12 + today.month - months
+            since = f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+        def in_window(query):
+            if since is None:
+                return query
+            return query.filter(AnalyticsRollupModel.Month >= since, AnalyticsRollupModel.Month != UNKNOWN_MONTH)
+
+        keyword_rows = in_window(db.query(
+            AnalyticsRollupModel.BucketKey, func.sum(AnalyticsRollupModel.Count).label('total')
+        ).filter(
+            AnalyticsRollupModel.Dimension == KEYWORD
+        )).group_by(AnalyticsRollupModel.BucketKey).having(
+            func.sum(AnalyticsRollupModel.Count) > 0
+        ).order_by(func.sum(AnalyticsRollupModel.Count).desc(), AnalyticsRollupModel.BucketKey).limit(top_keywords).all()
+
+        score_counts = defaultdict(int)
+        for score, count in in_window(db.query(
+            AnalyticsRollupModel.BucketKey, AnalyticsRollupModel.Count
+        ).filter(AnalyticsRollupModel.Dimension == SCORE)):
+            score_counts[int(score)] += count
+
+        monthly = [
+            {'month': month, 'analyses': count, 'average_score': round(score_sum / count, 1) if count else None}
+            for month, count, score_sum in in_window(db.query(
+                AnalyticsRollupModel.Month, AnalyticsRollupModel.Count, AnalyticsRollupModel.ScoreSum
+            ).filter(
+                AnalyticsRollupModel.Dimension == ANALYSES, AnalyticsRollupModel.Count > 0
+            )).order_by(AnalyticsRollupModel.Month)
+        ]
+
+        histogram = [0] * HISTOGRAM_BUCKETS
+        for score, count in score_counts.items():
+            histogram[score_bucket(score)] += count
+
+        total_analyses = sum(item['analyses'] for item in monthly)
+        score_sum = sum(score * count for score, count in score_counts.items())
+        return {
+            'since_month': since,
+            'total_analyses': total_analyses,
+            'average_score': round(score_sum / total_analyses, 1) if total_analyses else None,
+            'top_keywords': [{'keyword': keyword, 'count': int(total)} for keyword, total in keyword_rows],
+            'score_histogram': dict(zip(StatisticsService.histogram_labels(), histogram)),
+            'score_distribution': self._score_distribution(score_counts),
+            'monthly': monthly
+        }
+
+    def _score_distribution(self, score_counts: Dict[int, int]) -> Dict[str, int]:
+        """Percentages in the .NET ScoreDistributionDTO bands (scores above 0 only)"""
+        scored = {score: count for score, count in score_counts.items() if score > AnalysisMetrics.MIN_SCORE}
+        total = sum(scored.values())
+        bands = {
+            'excellent': sum(c for s, c in scored.items() if s >= 90),
+            'good': sum(c for s, c in scored.items() if 75 <= s < 90),
+            'average': sum(c for s, c in scored.items() if 60 <= s < 75),
+            'poor': sum(c for s, c in scored.items() if s < 60)
+        }
+        return {band: round(count / total * 100) if total else 0 for band, count in bands.items()}
+
+    def _ensure_rows(self, db: Session, keys: List[RollupKey]):
+        """Insert zero rows for keys that have none yet; a concurrent writer may win the race"""
+        existing = set()
+        for start in range(0, len(keys), 1000):
+            chunk = keys[start:start + 1000]
+            existing.update(db.query(
+                AnalyticsRollupModel.Dimension, AnalyticsRollupModel.Month, AnalyticsRollupModel.BucketKey
+            ).filter(
+                AnalyticsRollupModel.Dimension.in_({key[0] for key in chunk}),
+                AnalyticsRollupModel.Month.in_({key[1] for key in chunk}),
+                AnalyticsRollupModel.BucketKey.in_({key[2] for key in chunk})
+            ).all())
+
+        missing = [key for key in keys if tuple(key) not in existing]
+        if not missing:
+            return
+
+        rows = [{'Dimension': d, 'Month': m, 'BucketKey': k, 'Count': 0, 'ScoreSum': 0} for d, m, k in missing]
+        try:
+            with db.begin_nested():
+                db.bulk_insert_mappings(AnalyticsRollupModel, rows)
+        except IntegrityError:
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        db.bulk_insert_mappings(AnalyticsRollupModel, [row])
+                except IntegrityError:
+                    pass
+
+    @staticmethod
+    def _row(dimension: str, year, month, key: str, count: int, score_sum: int, now: datetime) -> Dict[str, Any]:
+        month_value = f"{int(year):04d}-{int(month):02d}" if year is not None else UNKNOWN_MONTH
+        return {'Dimension': dimension, 'Month': month_value, 'BucketKey': key,
+                'Count': int(count), 'ScoreSum': int(score_sum), 'UpdatedAt': now}
+
+# Shared instance
+analytics_rollups = AnalyticsRollups()
@@ -0,0 +1,299 @@
+# app/services/bulk_reanalyzer.py
+import os
+import json
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, CVAnalysisFeatureModel
+from app.core.config import settings
+from app.core.constants import CVStatus
+from app.services.analytics_rollups import analytics_rollups
+from app.services.analysis_store import analysis_store
+from app.services.skill_normalizer import skill_normalizer
+
+LOCK_SUFFIX = ".lock"
+
+# One analyzer per worker process, created by the pool initializer
+_worker_analyzer = None
+
+def _init_worker():
+    """Load the NLP models once per worker process"""
+    global _worker_analyzer
+    from app.services.cv_content_analyzer import CVContentAnalyzer
+    from app.services.ner_enricher import ner_enricher
+    _worker_analyzer = CVContentAnalyzer()
+    # The pool already spreads batches over the cores; NER stays in-process
+    ner_enricher.n_process = 1
+
+def _reanalyze_batch(items: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Run content analysis for a batch of stored texts inside a worker"""
+    results = _worker_analyzer.analyze_batch(items)
+    for _, analysis_result in results:
+        # Section bodies are only needed during analysis; don't ship them back to the parent
+        analysis_result.pop('sections', None)
+    return results
+
+class BulkReanalyzer:
+    """Re-derive keywords and scores for every completed CV from stored ParsedText
+
+    Each feature record stores the skill-normalizer fingerprint its keywords
+    were derived under, so ``run_if_stale`` finds the analyses that predate the
+    current rules in the database and re-analyzes only those. The checkpoint
+    records the fingerprint of the pass; a pass under other skill rules is not
+    resumed but started over.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = None, checkpoint_path: str = None):
+        self.workers = workers or settings.REANALYSIS_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or settings.REANALYSIS_CHUNK_SIZE
+        self.checkpoint_path = Path(checkpoint_path or settings.REANALYSIS_CHECKPOINT_PATH)
+
+    def run(self, resume: bool = True, limit: Optional[int] = None, stale_only: bool = False) -> Dict[str, Any]:
+        """Stream ParsedText in keyset-paginated chunks through a process pool
+
+        With ``stale_only`` only CVs whose analysis predates the current skill rules are re-analyzed.
+        """
+        checkpoint = self._load_checkpoint() if resume else self._new_checkpoint()
+        db = SessionLocal()
+        started = time.perf_counter()
+        processed_this_run = 0
+
+        try:
+            total_remaining = self._count_remaining(db, checkpoint['last_id'], stale_only)
+            remaining = min(total_remaining, limit) if limit else total_remaining
+            logger.info(f"Bulk re-analysis: {remaining} CVs to process with {self.workers} workers "
+                        f"(resuming after {checkpoint['last_id'] or 'start'})")
+
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+                while processed_this_run < remaining:
+                    batch_size = min(self.chunk_size, remaining - processed_this_run)
+                    chunk = self._fetch_chunk(db, checkpoint['last_id'], batch_size, stale_only)
+                    if not chunk:
+                        break
+
+                    # Whole sub-batches per task so each worker's NER pass can batch too
+                    step = max(1, len(chunk) // (self.workers * 4))
+                    results = [
+                        item
+                        for batch in executor.map(_reanalyze_batch, [chunk[i:i + step] for i in range(0, len(chunk), step)])
+                        for item in batch
+                    ]
+                    failed = self._write_results(db, results)
+
+                    processed_this_run += len(chunk)
+                    checkpoint['last_id'] = chunk[-1][0]
+                    checkpoint['processed'] += len(chunk)
+                    checkpoint['failed'] += failed
+                    self._save_checkpoint(checkpoint)
+
+                    self._log_progress(processed_this_run, remaining, started)
+
+            # A run cut short by --limit stays resumable
+            if processed_this_run >= total_remaining:
+                checkpoint['completed_at'] = datetime.utcnow().isoformat()
+            self._save_checkpoint(checkpoint)
+
+        finally:
+            db.close()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'processed_this_run': processed_this_run,
+            'processed_total': checkpoint['processed'],
+            'failed_total': checkpoint['failed'],
+            'last_id': checkpoint['last_id'],
+            'elapsed_seconds': round(elapsed, 2),
+            'throughput_per_second': round(processed_this_run / elapsed, 2) if elapsed > 0 else 0.0
+        }
+
+    def needs_run(self) -> bool:
+        """Whether some stored analyses predate the current skill rules"""
+        db = SessionLocal()
+        try:
+            return self._base_query(db, None, stale_only=True).with_entities(CVFileModel.Id).first() is not None
+        finally:
+            db.close()
+
+    def run_if_stale(self) -> Optional[Dict[str, Any]]:
+        """Bring stored analyses up to the current skill rules, once across processes"""
+        if not self.needs_run():
+            return None
+
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.checkpoint_path.with_name(self.checkpoint_path.name + LOCK_SUFFIX)
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # A runner that died leaves its lock behind; a live one saves a checkpoint every chunk
+            last_activity = max(lock_path.stat().st_mtime,
+                                self.checkpoint_path.stat().st_mtime if self.checkpoint_path.exists() else 0)
+            if time.time() - last_activity < settings.REANALYSIS_LOCK_TIMEOUT:
+                return None
+            lock_path.unlink(missing_ok=True)
+            return self.run_if_stale()
+
+        try:
+            os.write(lock_fd, str(os.getpid()).encode())
+            if not self.needs_run():
+                # Another process finished the pass while we waited for the lock
+                return None
+            logger.info(f"Skill rules {skill_normalizer.fingerprint} not yet applied to the stored analyses; re-analyzing")
+            return self.run(resume=True, stale_only=True)
+        finally:
+            os.close(lock_fd)
+            lock_path.unlink(missing_ok=True)
+
+    def _base_query(self, db: Session, last_id: Optional[str], stale_only: bool = False):
+        query = db.query(CVFileModel.Id, CVFileModel.ParsedText).filter(
+            CVFileModel.AnalysisStatus == CVStatus.COMPLETED,
+            CVFileModel.IsDeleted == False,
+            CVFileModel.ParsedText != None
+        )
+        if stale_only:
+            query = query.outerjoin(
+                CVAnalysisResultModel, CVAnalysisResultModel.CVFileId == CVFileModel.Id
+            ).outerjoin(
+                CVAnalysisFeatureModel, CVAnalysisFeatureModel.CVAnalysisResultId == CVAnalysisResultModel.Id
+            ).filter(or_(
+                CVAnalysisFeatureModel.SkillRules == None,
+                CVAnalysisFeatureModel.SkillRules != skill_normalizer.fingerprint
+            ))
+        if last_id:
+            query = query.filter(CVFileModel.Id > uuid.UUID(last_id))
+        return query
+
+    def _count_remaining(self, db: Session, last_id: Optional[str], stale_only: bool = False) -> int:
+        return self._base_query(db, last_id, stale_only).with_entities(CVFileModel.Id).count()
+
+    def _fetch_chunk(self, db: Session, last_id: Optional[str], size: int, stale_only: bool = False) -> List[Tuple[str, str]]:
+        """Next page of (id, text) ordered by primary key"""
+        rows = self._base_query(db, last_id, stale_only).order_by(CVFileModel.Id).limit(size).all()
+        return [(str(cv_file_id), parsed_text) for cv_file_id, parsed_text in rows]
+
+    @staticmethod
+    def _failed(analysis_result: Dict[str, Any]) -> bool:
+        return 'analysis_error' in analysis_result.get('missing_sections', [])
+
+    def _write_results(self, db: Session, results: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Write a chunk of analyses with a handful of bulk statements"""
+        try:
+            now = datetime.utcnow()
+            file_ids = [uuid.UUID(cv_file_id) for cv_file_id, _ in results]
+            existing = {
+                str(result.CVFileId): result
+                for result in db.query(CVAnalysisResultModel).filter(CVAnalysisResultModel.CVFileId.in_(file_ids))
+            }
+
+            # Rollup contributions of the analyses about to be replaced
+            previous = analytics_rollups.stored_contributions(db, [
+                existing[cv_file_id].Id for cv_file_id, analysis_result in results
+                if cv_file_id in existing and not self._failed(analysis_result)
+            ])
+            uploaded_at = dict(db.query(CVFileModel.Id, CVFileModel.UploadedAt).filter(CVFileModel.Id.in_(file_ids)).all())
+            
+            failed = 0
+            analysis_ids = []
+            keyword_records = []
+            feature_records = []
+            contributions = defaultdict(lambda: [0, 0])
+
+            for cv_file_id, analysis_result in results:
+                if self._failed(analysis_result):
+                    failed += 1
+                    continue
+
+                result = existing.get(cv_file_id)
+                if result is None:
+                    result = CVAnalysisResultModel(Id=uuid.uuid4(), CVFileId=uuid.UUID(cv_file_id))
+                    db.add(result)
+                else:
+                    result.UpdatedAt = now
+
+                result.Score = analysis_result['score']
+                result.MissingSections = analysis_result['missing_sections']
+                result.FormatIssues = analysis_result['format_issues']
+
+                analysis_ids.append(result.Id)
+                records = analysis_store.build_keyword_records(result.Id, analysis_result.get('skills_analysis', {}))
+                keyword_records.extend(records)
+                analytics_rollups.merge(contributions, analytics_rollups.contribution(
+                    [(record['Keyword'], record['Count']) for record in records],
+                    result.Score, uploaded_at.get(result.CVFileId)
+                ))
+                feature_record = analysis_store.build_feature_record(result.Id, analysis_result)
+                feature_record.update(analysis_store.build_skill_id_fields(
+                    analysis_result.get('skills_analysis', {}), db
+                ))
+                feature_records.append(feature_record)
+
+            db.flush()
+
+            if analysis_ids:
+                db.query(KeywordMatchModel).filter(
+                    KeywordMatchModel.CVAnalysisResultId.in_(analysis_ids)
+                ).delete(synchronize_session=False)
+                db.query(CVAnalysisFeatureModel).filter(
+                    CVAnalysisFeatureModel.CVAnalysisResultId.in_(analysis_ids)
+                ).delete(synchronize_session=False)
+
+                db.bulk_insert_mappings(KeywordMatchModel, keyword_records)
+                db.bulk_insert_mappings(CVAnalysisFeatureModel, feature_records)
+                analytics_rollups.record(db, previous, contributions)
+
+            db.commit()
+            return failed
+
+        except Exception as e:
+            logger.error(f"Error writing re-analysis chunk: {e}")
+            db.rollback()
+            raise
+
+    def _log_progress(self, done: int, total: int, started: float):
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        logger.info(f"Re-analyzed {done}/{total} CVs | {rate:.1f} CVs/s | ETA {eta / 60:.1f} min")
+
+    def _new_checkpoint(self) -> Dict[str, Any]:
+        return {
+            'last_id': None,
+            'processed': 0,
+            'failed': 0,
+            'started_at': datetime.utcnow().isoformat(),
+            'completed_at': None,
+            'skill_rules': skill_normalizer.fingerprint
+        }
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        try:
+            if self.checkpoint_path.exists():
+                with open(self.checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+                    return json.load(checkpoint_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+        return None
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        """Resume from the last fully written chunk of a pass under the same skill rules, or start fresh"""
+        checkpoint = self._read_checkpoint()
+        if (checkpoint is not None and not checkpoint.get('completed_at')
+                and checkpoint.get('skill_rules') == skill_normalizer.fingerprint):
+            return checkpoint
+        return self._new_checkpoint()
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Atomically replace the checkpoint file"""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(tmp_path, self.checkpoint_path)
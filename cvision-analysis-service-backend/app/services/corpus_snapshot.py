@@ -0,0 +1,289 @@
+# app/services/corpus_snapshot.py
+import os
+import time
+import uuid
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.feature_store import feature_store, CorpusFeatures
+from app.services.skill_vocabulary import skill_vocabulary, SKILL_ID_DTYPE
+from app.services.skill_embeddings import SkillEmbeddingTable
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "build.lock"
+
+class _UuidColumn(Sequence):
+    """UUIDs stored as an (n, 16) uint8 array"""
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, row: int) -> uuid.UUID:
+        return uuid.UUID(bytes=self.data[row].tobytes())
+
+class _StringColumn(Sequence):
+    """UTF-8 strings stored as one byte blob plus offsets"""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes().decode("utf-8")
+
+class _DatetimeColumn(Sequence):
+    """Datetimes stored as datetime64[us] (NaT for missing)"""
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, row: int) -> Optional[datetime]:
+        return self.data[row].item()
+
+def _uuid_bytes(value: Any) -> bytes:
+    return (value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))).bytes
+
+def _pack_strings(values: List[str]):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+class CorpusSnapshotStore:
+    """Versioned, memory-mapped matching corpus shared by every worker process
+
+    A builder writes a new version into its own directory and then atomically
+    replaces the ``CURRENT`` pointer. Readers map the arrays read-only, so N
+    uvicorn workers share one copy in the page cache. Superseded versions are
+    unlinked; on POSIX their pages are released when the last mapping closes.
+
+    A version older than ``max_age`` keeps being served while a background
+    thread builds its successor, so matching may miss analyses completed in
+    the last ``max_age`` seconds plus one build (``POST
+    /corpus-snapshot/rebuild`` publishes at once).
+    """
+
+    def __init__(self, root: str = None, max_age: int = None, keep: int = None):
+        self.root = Path(root or settings.CORPUS_SNAPSHOT_DIR)
+        self.max_age = settings.CORPUS_SNAPSHOT_MAX_AGE if max_age is None else max_age
+        self.keep = settings.CORPUS_SNAPSHOT_KEEP if keep is None else keep
+        self._attached: Optional[CorpusFeatures] = None
+        self._attached_version: Optional[str] = None
+        self._embeddings: Optional[SkillEmbeddingTable] = None
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+    def current(self, db: Session) -> CorpusFeatures:
+        """Attached snapshot; only a missing one is built by the caller (blocking, run off the event loop)"""
+        version = self._read_current()
+        if version is None:
+            self.rebuild(db)
+            version = self._read_current()
+            if version is None:
+                # Nobody has published yet and another worker holds the build lock
+                return self._in_memory_corpus(db)
+        elif self._age(version) > self.max_age:
+            self.refresh_in_background()
+
+        return self.attach(version)
+
+    def refresh_in_background(self) -> bool:
+        """Rebuild on a thread with its own session, unless this process already is"""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return False
+            self._refresher = threading.Thread(target=self._refresh, name="corpus-snapshot-refresh", daemon=True)
+            self._refresher.start()
+            return True
+
+    def _refresh(self):
+        # Only one worker rebuilds; the rest keep serving the previous version
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    def attach(self, version: str) -> CorpusFeatures:
+        """Map a published version read-only (cached per process)"""
+        with self._lock:
+            if self._attached_version != version:
+                self._attached = self._load(self.root / version)
+                self._attached_version = version
+                logger.info(f"Attached corpus snapshot {version} ({len(self._attached)} CVs)")
+            return self._attached
+
+    def rebuild(self, db: Session) -> Optional[Dict[str, Any]]:
+        """Publish a new version unless another process is already building one"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock_path = self.root / LOCK_FILE
+        try:
+            lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # A builder that died leaves its lock behind
+            if time.time() - lock_path.stat().st_mtime < max(self.max_age, 60):
+                return None
+            lock_path.unlink(missing_ok=True)
+            return self.rebuild(db)
+
+        try:
+            os.write(lock_fd, str(os.getpid()).encode())
+            return self.publish(db)
+        except Exception as e:
+            logger.error(f"Error publishing corpus snapshot: {e}")
+            return None
+        finally:
+            os.close(lock_fd)
+            lock_path.unlink(missing_ok=True)
+
+    def publish(self, db: Session) -> Dict[str, Any]:
+        """Build a new version from the database and make it current (callers hold the build lock)"""
+        started = time.perf_counter()
+        corpus = self._in_memory_corpus(db)
+
+        version = f"{datetime.utcnow():%Y%m%d%H%M%S%f}-{os.getpid()}"
+        staging = self.root / f"{version}.tmp"
+        staging.mkdir(parents=True, exist_ok=True)
+
+        term_offsets, term_blob = _pack_strings(['' if term is None else term for term in corpus.terms])
+        name_offsets, name_blob = _pack_strings(list(corpus.file_names))
+
+        arrays = {
+            'indptr': corpus.indptr,
+            'indices': corpus.indices,
+            'scores': np.asarray(corpus.scores, dtype=np.int32),
+            'analysis_ids': np.frombuffer(b"".join(_uuid_bytes(v) for v in corpus.analysis_ids), dtype=np.uint8).reshape(-1, 16),
+            'cv_file_ids': np.frombuffer(b"".join(_uuid_bytes(v) for v in corpus.cv_file_ids), dtype=np.uint8).reshape(-1, 16),
+            'created_at': np.array([d if d is not None else 'NaT' for d in corpus.created_at], dtype='datetime64[us]'),
+            'file_name_offsets': name_offsets,
+            'file_name_blob': name_blob,
+            'term_offsets': term_offsets,
+            'term_blob': term_blob,
+            'term_vectors': self._term_vectors(corpus.terms)
+        }
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array)
+        with open(staging / "meta.json", "w", encoding="utf-8") as meta_file:
+            json.dump({'version': version, 'cv_count': len(corpus), 'vocabulary_version': skill_vocabulary.version}, meta_file)
+
+        os.replace(staging, self.root / version)
+        self._write_current(version)
+        self._collect_garbage(version)
+
+        info = {
+            'version': version,
+            'cv_count': len(corpus),
+            'size_bytes': sum(array.nbytes for array in arrays.values()),
+            'build_seconds': round(time.perf_counter() - started, 3)
+        }
+        logger.info(f"Published corpus snapshot {version}: {info['cv_count']} CVs, {info['size_bytes'] / 1024:.0f} KiB")
+        return info
+
+    def status(self) -> Dict[str, Any]:
+        """Current version and what this process has attached"""
+        version = self._read_current()
+        return {
+            'current_version': version,
+            'age_seconds': round(self._age(version), 1) if version else None,
+            'attached_version': self._attached_version,
+            'attached_cv_count': len(self._attached) if self._attached is not None else 0,
+            'versions_on_disk': sorted(p.name for p in self.root.iterdir() if p.is_dir()) if self.root.exists() else []
+        }
+
+    def _in_memory_corpus(self, db: Session) -> CorpusFeatures:
+        """Corpus straight from the database, with legacy (KeywordMatches-only) rows encoded too"""
+        corpus = feature_store.load_corpus(db)
+        if not corpus.legacy_skills:
+            return corpus
+
+        runs = [
+            skill_vocabulary.encode(corpus.legacy_skills[row], db) if row in corpus.legacy_skills else corpus.skill_ids(row)
+            for row in range(len(corpus))
+        ]
+        db.commit()
+
+        indptr = np.zeros(len(runs) + 1, dtype=np.int64)
+        np.cumsum([len(run) for run in runs], out=indptr[1:])
+        indices = np.concatenate(runs).astype(SKILL_ID_DTYPE) if runs else np.empty(0, dtype=SKILL_ID_DTYPE)
+        return CorpusFeatures(
+            corpus.analysis_ids, corpus.cv_file_ids, corpus.file_names, corpus.scores, corpus.created_at,
+            indptr, indices, skill_vocabulary.lookup_table()
+        )
+
+    def _term_vectors(self, terms: np.ndarray) -> np.ndarray:
+        """Embedding row per vocabulary id (zero rows for unused ids)"""
+        if self._embeddings is None:
+            self._embeddings = SkillEmbeddingTable.load_or_build()
+
+        present = [term_id for term_id, term in enumerate(terms) if term]
+        vectors = np.zeros((len(terms), self._embeddings.dim), dtype=np.float32)
+        if present:
+            vectors[present] = self._embeddings.embed([terms[term_id] for term_id in present])
+        return vectors
+
+    def _load(self, directory: Path) -> CorpusFeatures:
+        arrays = {path.stem: np.load(path, mmap_mode='r') for path in directory.glob("*.npy")}
+        terms = _StringColumn(arrays['term_offsets'], arrays['term_blob'])
+        return CorpusFeatures(
+            analysis_ids=_UuidColumn(arrays['analysis_ids']),
+            cv_file_ids=_UuidColumn(arrays['cv_file_ids']),
+            file_names=_StringColumn(arrays['file_name_offsets'], arrays['file_name_blob']),
+            scores=arrays['scores'],
+            created_at=_DatetimeColumn(arrays['created_at']),
+            indptr=arrays['indptr'],
+            indices=arrays['indices'],
+            # The vocabulary is small; decode it once per process
+            terms=np.array([terms[i] or None for i in range(len(terms))], dtype=object),
+            source=str(directory),
+            term_vectors=arrays['term_vectors']
+        )
+
+    def _read_current(self) -> Optional[str]:
+        try:
+            version = (self.root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+            return version if (self.root / version).is_dir() else None
+        except OSError:
+            return None
+
+    def _write_current(self, version: str):
+        tmp_path = self.root / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+        tmp_path.write_text(version, encoding="utf-8")
+        os.replace(tmp_path, self.root / CURRENT_FILE)
+
+    def _age(self, version: str) -> float:
+        try:
+            return time.time() - (self.root / version / "meta.json").stat().st_mtime
+        except OSError:
+            return float('inf')
+
+    def _collect_garbage(self, current: str):
+        """Remove superseded versions beyond the ones kept for readers mid-swap"""
+        versions = sorted(p for p in self.root.iterdir() if p.is_dir() and p.name != current)
+        stale = [p for p in versions if p.name.endswith(".tmp")]
+        complete = [p for p in versions if not p.name.endswith(".tmp")]
+        stale.extend(complete[:max(len(complete) - self.keep, 0)])
+
+        for directory in stale:
+            shutil.rmtree(directory, ignore_errors=True)
+
+# Shared instance (one per worker process)
+corpus_snapshots = CorpusSnapshotStore()
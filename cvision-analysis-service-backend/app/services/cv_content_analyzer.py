@@ -0,0 +1,672 @@
+# app/services/cv_content_analyzer.py
+import re
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from loguru import logger
+
+# NLP and analysis
+import spacy
+import nltk
+
+from app.core.config import settings
+from app.core.constants import CVSections, MatchTypes, DegreeLevels, AnalysisProfiles, COMMON_SKILLS
+from app.services.skill_normalizer import skill_normalizer
+from app.services.text_extractor import text_extractor, FileSource
+from app.services.ner_enricher import ner_enricher
+from app.services.text_statistics import text_statistics
+from app.services.regex_guard import regex_guard
+from app.services.analysis_pipeline import AnalysisPipeline
+
+# Stages are registered on the analyzer methods below; profiles pick which of them run
+analysis_pipeline = AnalysisPipeline()
+RESULT_KEYS = ('score', 'skills_analysis', 'experience_analysis', 'education_analysis', 'format_analysis', 'missing_sections', 'sections')
+
+class CVContentAnalyzer:
+    """Database-free CV analysis: text extraction, section parsing and scoring
+
+    Used directly by offline tools and worker processes; ``CVAnalyzer`` adds
+    persistence on top.
+    """
+    
+    def __init__(self):
+        self.nlp = None
+        self._load_nlp_model()
+        self._download_nltk_data()
+    
+    def _load_nlp_model(self):
+        """Load spaCy NLP model"""
+        try:
+            self.nlp = spacy.load(settings.SPACY_MODEL)
+            logger.info(f"Loaded spaCy model: {settings.SPACY_MODEL}")
+        except OSError:
+            logger.warning(f"spaCy model {settings.SPACY_MODEL} not found. Install with: python -m spacy download {settings.SPACY_MODEL}")
+            # Fallback to basic English model
+            try:
+                self.nlp = spacy.load("en_core_web_sm")
+            except OSError:
+                logger.error("No spaCy model available. Please install en_core_web_sm")
+                self.nlp = None
+    
+    def _download_nltk_data(self):
+        """Download required NLTK data"""
+        try:
+            nltk.download('punkt', quiet=True)
+            nltk.download('stopwords', quiet=True)
+            nltk.download('averaged_perceptron_tagger', quiet=True)
+        except Exception as e:
+            logger.warning(f"Failed to download NLTK data: {e}")
+
+    def _extract_text_from_file(self, source: FileSource, file_type: str, limit_pages: Optional[int] = None) -> str:
+        """Extract text from PDF or DOCX files (a path, or the file's bytes or memory map)"""
+        return text_extractor.extract(source, file_type, limit_pages=limit_pages)
+
+    def analyze_batch(self, items: List[Tuple[str, str]], profile: str = AnalysisProfiles.FULL) -> List[Tuple[str, Dict[str, Any]]]:
+        """Analyze (cv_file_id, text) pairs, sharing one NER pass across the batch"""
+        prepared = []
+        for cv_file_id, text in items:
+            context, stage_timings = {'text': text or ""}, {}
+            analysis_pipeline.run_stages(self, ("clean", "sections"), context, stage_timings, document_id=cv_file_id)
+            prepared.append((cv_file_id, context, stage_timings))
+
+        entities = {}
+        if settings.NER_ENRICHMENT_ENABLED and profile != AnalysisProfiles.QUICK:
+            try:
+                started = time.perf_counter()
+                entities = ner_enricher.enrich(
+                    (cv_file_id, context['cleaned_text'], context['sections']) for cv_file_id, context, _ in prepared
+                )
+                # One pass for the whole batch; each CV is charged its share
+                ner_ms = round((time.perf_counter() - started) * 1000 / len(prepared), 3)
+                for _, _, stage_timings in prepared:
+                    stage_timings['ner'] = ner_ms
+            except Exception as e:
+                logger.warning(f"NER enrichment failed, falling back to patterns: {e}")
+
+        return [
+            (cv_file_id, self._analyze_cv_content(
+                context['text'], cv_file_id, entities.get(cv_file_id), context, profile, stage_timings
+            ))
+            for cv_file_id, context, stage_timings in prepared
+        ]
+
+    def _analyze_cv_content(self, text: str, cv_file_id: str, entities: Optional[Dict[str, List[str]]] = None,
+                            prepared: Optional[Dict[str, Any]] = None, profile: str = AnalysisProfiles.FULL,
+                            stage_timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Perform comprehensive CV analysis
+
+        ``entities`` (from the NER enricher) replaces the institution and job
+        title patterns; ``prepared`` holds stage outputs computed beforehand
+        (cleaned text, sections) and what their patterns left of the document's
+        regex budget. ``profile`` selects the pipeline stages; their timings (ms)
+        are returned in ``stage_timings``.
+        """
+        context = dict(prepared or {})
+        context.update(text=text, entities=entities)
+        # An unknown profile is a caller error, not a failed analysis
+        analysis_pipeline.plan(profile, context.keys())
+        
+        stage_timings = {} if stage_timings is None else stage_timings
+        try:
+            analysis_pipeline.run(self, profile, context, stage_timings, document_id=cv_file_id)
+            
+            result = {key: context[key] for key in RESULT_KEYS if key in context}
+            result.setdefault('missing_sections', [])
+            result['format_issues'] = context.get('format_analysis', {}).get('issues', [])
+            result['profile'] = profile
+            result['stage_timings'] = stage_timings
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in CV content analysis: {e}")
+            return {
+                'score': 0,
+                'missing_sections': ['analysis_error'],
+                'format_issues': ['Failed to analyze CV content'],
+                'sections': {},
+                'profile': profile,
+                'stage_timings': stage_timings
+            }
+
+    @analysis_pipeline.stage("clean", inputs=("text",), outputs=("cleaned_text",))
+    def _clean_text(self, text: str) -> str:
+        """Clean and normalize text"""
+        # Remove extra whitespace
+        text = regex_guard.sub(r'\s+', ' ', text)
+        # Remove special characters but keep necessary punctuation
+        text = regex_guard.sub(r'[^\w\s\-.,@()]+', '', text)
+        return text.strip()
+
+    @analysis_pipeline.stage("sections", inputs=("cleaned_text",), outputs=("sections",))
+    def _extract_cv_sections(self, text: str) -> Dict[str, str]:
+        """Extract different sections from CV"""
+        sections = {}
+        
+        # Common section headers and their variations
+        section_patterns = {
+            CVSections.PERSONAL_INFO: [
+                r'personal\s+information', r'contact\s+information', r'personal\s+details'
+            ],
+            CVSections.SUMMARY: [
+                r'summary', r'profile', r'objective', r'about\s+me', r'career\s+objective'
+            ],
+            CVSections.EXPERIENCE: [
+                r'experience', r'work\s+experience', r'professional\s+experience', 
+                r'employment\s+history', r'career\s+history'
+            ],
+            CVSections.EDUCATION: [
+                r'education', r'educational\s+background', r'academic\s+background',
+                r'qualifications', r'academic\s+qualifications'
+            ],
+            CVSections.SKILLS: [
+                r'skills', r'technical\s+skills', r'core\s+competencies', 
+                r'key\s+skills', r'abilities'
+            ],
+            CVSections.CERTIFICATIONS: [
+                r'certifications', r'certificates', r'training', r'courses'
+            ],
+            CVSections.PROJECTS: [
+                r'projects', r'key\s+projects', r'notable\s+projects'
+            ],
+            CVSections.LANGUAGES: [
+                r'languages', r'language\s+skills'
+            ]
+        }
+        
+        text_lower = text.lower()
+        lines = text.split('\n')
+        
+        for section_name, patterns in section_patterns.items():
+            for pattern in patterns:
+                matches = regex_guard.finditer(pattern, text_lower)
+                if matches:
+                    # Find the section content
+                    start_pos = matches[0].end()
+                    
+                    # Find next section or end of text
+                    next_section_pos = len(text)
+                    for other_section, other_patterns in section_patterns.items():
+                        if other_section != section_name:
+                            for other_pattern in other_patterns:
+                                other_matches = regex_guard.finditer(other_pattern, text_lower[start_pos:])
+                                if other_matches:
+                                    candidate_pos = start_pos + other_matches[0].start()
+                                    if candidate_pos < next_section_pos:
+                                        next_section_pos = candidate_pos
+                    
+                    section_content = text[start_pos:next_section_pos].strip()
+                    sections[section_name] = section_content
+                    break
+        
+        return sections
+
+    @analysis_pipeline.stage("skills", inputs=("cleaned_text", "sections"), outputs=("skills_analysis",))
+    def _analyze_skills(self, text: str, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Analyze skills mentioned in CV"""
+        skills_text = sections.get(CVSections.SKILLS, text)
+        found_skills = []
+        skill_matches = []
+        
+        text_lower = text.lower()
+        matched_keywords = set()
+        
+        def add_match(skill: str, confidence: float, match_type: str):
+            # Keywords are stored in canonical form so job matching gets exact set hits
+            keyword = skill_normalizer.canonicalize(skill)
+            found_skills.append(keyword)
+            if keyword not in matched_keywords:
+                matched_keywords.add(keyword)
+                skill_matches.append({
+                    'keyword': keyword,
+                    'confidence': confidence,
+                    'match_type': match_type
+                })
+        
+        # Direct exact match on the known skill list
+        for skill in COMMON_SKILLS:
+            if skill.lower() in text_lower:
+                add_match(skill, 1.0, MatchTypes.EXACT)
+        
+        # Alternative spellings ("node.js", "netcore", "k8s") resolve to their canonical skill;
+        # ambiguous short ones ("node", "ts", "ml") only count inside the skills section
+        skills_section = sections.get(CVSections.SKILLS)
+        for _, canonical in skill_normalizer.find_aliases(text_lower, skills_section.lower() if skills_section else None):
+            add_match(canonical, 1.0, MatchTypes.EXACT)
+        
+        # Enhanced pattern matching for specific technologies
+        enhanced_patterns = [
+            # Programming Languages
+            r'\b(python|java|javascript|typescript|c#|c\+\+|php|ruby|go|rust|swift|kotlin|c|scala|dart)\b',
+            # .NET Technologies  
+            r'\b(\.?net\s*core?|asp\.?net|entity\s*framework|blazor|mvc|webapi|signalr)\b',
+            # Frontend Frameworks
+            r'\b(react|angular|vue\.?js|next\.?js|nuxt\.?js|svelte|ember)\b',
+            # Backend Frameworks
+            r'\b(django|fastapi|flask|spring|laravel|rails|express\.?js)\b',
+            # Databases
+            r'\b(postgresql|mysql|mongodb|redis|elasticsearch|mssql|sql\s*server|sqlite|oracle)\b',
+            # DevOps & Tools
+            r'\b(docker|kubernetes|jenkins|git|github|gitlab|ci/cd|nginx|apache|rabbitmq)\b',
+            # Cloud Platforms
+            r'\b(aws|azure|gcp|google\s*cloud|amazon\s*web\s*services|heroku|vercel)\b',
+            # Styling & Design
+            r'\b(tailwind|bootstrap|sass|scss|less|css3|html5)\b'
+        ]
+        
+        for pattern in enhanced_patterns:
+            matches = regex_guard.finditer(pattern, text_lower, re.IGNORECASE)
+            for match in matches:
+                add_match(match.group().strip(), 1.0, MatchTypes.EXACT)
+        
+        # Calculate enhanced skills score
+        unique_skills = list(set(found_skills + [s['keyword'] for s in skill_matches]))
+        skills_score = min(len(unique_skills) * 3, 100)  # More realistic scoring
+        
+        return {
+            'found_skills': unique_skills,
+            'skill_matches': skill_matches,
+            'skills_count': len(unique_skills),
+            'skills_score': skills_score
+        }
+
+    @analysis_pipeline.stage("experience", inputs=("cleaned_text", "sections", "entities"), outputs=("experience_analysis",))
+    def _analyze_experience(self, text: str, sections: Dict[str, str],
+                            entities: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """Analyze work experience"""
+        experience_text = sections.get(CVSections.EXPERIENCE, text)
+        
+        # Enhanced patterns for extracting years of experience
+        year_patterns = [
+            r'(\d+)\s*\+?\s*years?\s+(?:of\s+)?experience',
+            r'experience\s+(?:of\s+)?(\d+)\s*\+?\s*years?',
+            r'(\d+)\s*\+?\s*years?\s+(?:in|with)',
+            r'(\d+)\s*\+?\s*year\s+(?:of\s+)?(?:experience|work)',
+        ]
+        
+        years_found = []
+        for pattern in year_patterns:
+            matches = regex_guard.finditer(pattern, text.lower())
+            for match in matches:
+                years_found.append(int(match.group(1)))
+        
+        # Enhanced job position detection
+        job_titles = [
+            r'(?:full-stack|front-end|back-end|senior|junior|lead|principal)?\s*(?:software\s+)?(?:engineer|developer|programmer)',
+            r'(?:software\s+)?(?:architect|analyst|consultant|specialist)',
+            r'(?:project\s+)?(?:manager|director|coordinator|lead)',
+            r'(?:data\s+)?(?:scientist|analyst|engineer)',
+            r'(?:devops|system\s+administrator|it\s+specialist)',
+            r'intern(?:ship)?'
+        ]
+        
+        job_count = 0
+        if entities is not None:
+            job_count = len(entities['job_titles'])
+        else:
+            for pattern in job_titles:
+                matches = regex_guard.finditer(pattern, text.lower())
+                job_count += len(list(matches))
+        
+        # Enhanced date range detection for calculating experience duration
+        date_patterns = [
+            r'(\w+\s+\d{4})\s*[–\-−—]\s*(\w+\s+\d{4}|present|current)',
+            r'(\d{4})\s*[–\-−—]\s*(\d{4}|present|current)',
+            r'(\w+\s+\d{4})\s*[–\-−—]\s*(present|current)',
+            r'(august\s+2024)\s*[–\-−—]\s*(january\s+2025)',
+            r'(january\s+2024)\s*[–\-−—]\s*(february\s+2024)',
+            r'(january\s+2022)\s*[–\-−—]\s*(present|current)',
+        ]
+        
+        work_periods = []
+        for pattern in date_patterns:
+            matches = regex_guard.finditer(pattern, text, re.IGNORECASE)
+            for match in matches:
+                start_date = match.group(1)
+                end_date = match.group(2)
+                work_periods.append((start_date, end_date))
+        
+        # Calculate total experience from date ranges
+        calculated_years = 0
+        current_year = 2025  # Current year
+        current_month = 8   # Current month (August)
+        
+        # Month name to number mapping
+        months = {
+            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+        }
+        
+        for start_date, end_date in work_periods:
+            try:
+                # Extract start year and month
+                start_year_match = regex_guard.search(r'\d{4}', start_date)
+                start_month_match = regex_guard.search(r'(january|february|march|april|may|june|july|august|september|october|november|december)', start_date.lower())
+                
+                if start_year_match:
+                    start_year = int(start_year_match.group())
+                    start_month = months.get(start_month_match.group(), 1) if start_month_match else 1
+                    
+                    # Extract end year and month
+                    if end_date.lower() in ['present', 'current']:
+                        end_year = current_year
+                        end_month = current_month
+                    else:
+                        end_year_match = regex_guard.search(r'\d{4}', end_date)
+                        end_month_match = regex_guard.search(r'(january|february|march|april|may|june|july|august|september|october|november|december)', end_date.lower())
+                        
+                        if end_year_match:
+                            end_year = int(end_year_match.group())
+                            end_month = months.get(end_month_match.group(), 12) if end_month_match else 12
+                        else:
+                            end_year = current_year
+                            end_month = current_month
+                    
+                    # Calculate total months and convert to years
+                    total_months = (end_year - start_year) * 12 + (end_month - start_month)
+                    period_years = max(0, total_months / 12)
+                    calculated_years += period_years
+                    
+            except (ValueError, AttributeError):
+                continue
+        
+        # Use the maximum of explicitly mentioned years or calculated years
+        total_years = max(max(years_found) if years_found else 0, calculated_years)
+        
+        # Enhanced scoring
+        experience_score = 0
+        if total_years > 0:
+            experience_score += min(total_years * 15, 70)  # Up to 70 points for years
+        if job_count > 0:
+            experience_score += min(job_count * 10, 30)   # Up to 30 points for positions
+        
+        experience_score = min(experience_score, 100)
+        
+        experience_result = {
+            'years_of_experience': total_years,
+            'job_positions_count': job_count,
+            'work_periods': work_periods,
+            'experience_score': experience_score
+        }
+        if entities is not None:
+            experience_result['job_titles'] = list(dict.fromkeys(entities['job_titles']))
+            experience_result['organizations'] = entities['organizations']
+        return experience_result
+
+    @analysis_pipeline.stage("education", inputs=("cleaned_text", "sections", "entities"), outputs=("education_analysis",))
+    def _analyze_education(self, text: str, sections: Dict[str, str],
+                           entities: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """Analyze educational background"""
+        education_text = sections.get(CVSections.EDUCATION, text)
+        
+        degrees_found = []
+        institutions_found = []
+        
+        # Enhanced degree patterns
+        degree_patterns = [
+            # Bachelor's degrees
+            r'\b(?:bachelor[\'s]*|bs|ba|bsc|be|btech|b\.?\s*tech|b\.?\s*sc|b\.?\s*a)\s*(?:degree|of)?\s*(?:in|of)?\s*\w*',
+            # Master's degrees  
+            r'\b(?:master[\'s]*|ms|ma|msc|me|mtech|mba|m\.?\s*tech|m\.?\s*sc|m\.?\s*a)\s*(?:degree|of)?\s*(?:in|of)?\s*\w*',
+            # PhD and Doctorate
+            r'\b(?:phd|ph\.?\s*d\.?|doctorate|doctoral)\s*(?:degree|of)?\s*(?:in|of)?\s*\w*',
+            # Associate and other degrees
+            r'\b(?:associate|diploma|certificate)\s*(?:degree|of)?\s*(?:in|of)?\s*\w*',
+            # Specific degree mentions
+            r'\b(?:economics|computer\s*science|information\s*management|engineering|business)\s*(?:bachelor|master|degree)',
+        ]
+        
+        for pattern in degree_patterns:
+            matches = regex_guard.finditer(pattern, text.lower(), re.IGNORECASE)
+            for match in matches:
+                degree = match.group().strip()
+                if degree and degree not in degrees_found:
+                    degrees_found.append(degree)
+        
+        # Enhanced institution patterns
+        institution_patterns = [
+            # University patterns with specific names
+            r'\b(?:anadolu|dumlup[iı]nar|\w+)\s+university\b',
+            r'\b42\s+kocaeli\b',
+            r'\b(?:école|ecole)\s+42\b',
+            r'\buniversity\s+of\s+\w+\b',
+            # College patterns
+            r'\b\w+\s+(?:college|institut[eo]?|school)\b',
+            # Technical schools
+            r'\b(?:technical\s+)?(?:institute|academy|school)\s+of\s+\w+\b',
+        ]
+        
+        if entities is not None:
+            institutions_found = list(entities['institutions'])
+        else:
+            for pattern in institution_patterns:
+                matches = regex_guard.finditer(pattern, text, re.IGNORECASE)
+                for match in matches:
+                    institution = match.group().strip()
+                    if institution and institution not in institutions_found:
+                        institutions_found.append(institution)
+        
+        # Extract graduation years and calculate recency bonus
+        graduation_years = []
+        year_patterns = [
+            r'(?:graduated|graduation|completed).*?(\d{4})',
+            r'(\d{4})\s*[-–]\s*(?:\d{4}|present|current)',
+            r'(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})'
+        ]
+        
+        for pattern in year_patterns:
+            matches = regex_guard.finditer(pattern, text.lower())
+            for match in matches:
+                year = int(match.group(1))
+                if 1980 <= year <= 2025:  # Reasonable year range
+                    graduation_years.append(year)
+        
+        # Calculate enhanced education score
+        education_score = 0
+        
+        # Base score for degrees
+        degree_scores = {
+            'phd': 40, 'doctorate': 40, 'doctoral': 40,
+            'master': 30, 'mba': 35, 'ms': 30, 'ma': 30, 'msc': 30,
+            'bachelor': 25, 'bs': 25, 'ba': 25, 'bsc': 25, 'btech': 25,
+            'associate': 15, 'diploma': 15, 'certificate': 10
+        }
+        
+        degree_levels = {
+            'phd': DegreeLevels.DOCTORATE, 'doctorate': DegreeLevels.DOCTORATE, 'doctoral': DegreeLevels.DOCTORATE,
+            'master': DegreeLevels.MASTER, 'mba': DegreeLevels.MASTER, 'ms': DegreeLevels.MASTER,
+            'ma': DegreeLevels.MASTER, 'msc': DegreeLevels.MASTER,
+            'bachelor': DegreeLevels.BACHELOR, 'bs': DegreeLevels.BACHELOR, 'ba': DegreeLevels.BACHELOR,
+            'bsc': DegreeLevels.BACHELOR, 'btech': DegreeLevels.BACHELOR,
+            'associate': DegreeLevels.ASSOCIATE, 'diploma': DegreeLevels.ASSOCIATE,
+            'certificate': DegreeLevels.CERTIFICATE
+        }
+        
+        max_degree_score = 0
+        top_degree_level = DegreeLevels.NONE
+        for degree in degrees_found:
+            for degree_type, score in degree_scores.items():
+                if degree_type in degree.lower():
+                    max_degree_score = max(max_degree_score, score)
+                    top_degree_level = max(top_degree_level, degree_levels[degree_type])
+                    break
+        
+        education_score += max_degree_score
+        
+        # Bonus for multiple degrees
+        if len(degrees_found) > 1:
+            education_score += min(len(degrees_found) * 5, 20)
+        
+        # Bonus for recognized institutions
+        if institutions_found:
+            education_score += min(len(institutions_found) * 10, 30)
+        
+        # Recency bonus (more recent education gets bonus)
+        if graduation_years:
+            recent_year = max(graduation_years)
+            if recent_year >= 2020:
+                education_score += 10
+            elif recent_year >= 2015:
+                education_score += 5
+        
+        education_score = min(education_score, 100)
+        
+        return {
+            'degrees_found': degrees_found,
+            'institutions_found': institutions_found,
+            'graduation_years': graduation_years,
+            'top_degree_level': top_degree_level,
+            'education_score': education_score
+        }
+
+    @analysis_pipeline.stage("format", inputs=("text", "sections"), outputs=("format_analysis",))
+    def _analyze_format(self, text: str, sections: Dict[str, str]) -> Dict[str, Any]:
+        """Analyze CV format and structure"""
+        issues = []
+        
+        # Word, sentence and syllable counts in one pass; readability follows from them
+        statistics = text_statistics.analyze(text)
+        
+        # Enhanced readability check
+        readability_score = statistics['flesch_reading_ease']
+        if readability_score < 20:
+            issues.append("CV text is very difficult to read")
+        elif readability_score < 40:
+            issues.append("CV text could be more readable")
+        
+        # Check length
+        word_count = statistics['token_count']
+        if word_count < 150:
+            issues.append("CV is too short (less than 150 words)")
+        elif word_count > 3000:
+            issues.append("CV is too long (more than 3000 words)")
+        
+        # Enhanced contact information patterns
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        phone_patterns = [
+            r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+            r'\+?\d{2,3}\s?\d{3}\s?\d{3}\s?\d{2}\s?\d{2}',  # International format
+            r'\(\+\d{2}\)\s?\d{3}\s?\d{3}\s?\d{2}\s?\d{2}'   # Turkish format
+        ]
+        
+        has_email = bool(regex_guard.search(email_pattern, text))
+        has_phone = any(regex_guard.search(pattern, text) for pattern in phone_patterns)
+        
+        if not has_email:
+            issues.append("No email address found")
+        if not has_phone:
+            issues.append("No phone number found")
+        
+        # Check for professional links
+        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
+        github_pattern = r'github\.com/[\w-]+'
+        
+        has_linkedin = bool(regex_guard.search(linkedin_pattern, text, re.IGNORECASE))
+        has_github = bool(regex_guard.search(github_pattern, text, re.IGNORECASE))
+        
+        # Check for section headers (structure quality)
+        expected_sections = ['experience', 'education', 'skills', 'summary', 'projects']
+        found_section_headers = 0
+        
+        for section in expected_sections:
+            if regex_guard.search(rf'\b{section}\b', text, re.IGNORECASE):
+                found_section_headers += 1
+        
+        if found_section_headers < 3:
+            issues.append("Missing important CV sections")
+        
+        # Check for dates (shows experience timeline)
+        date_patterns = [
+            r'\d{4}\s*[-–]\s*(?:\d{4}|present|current)',
+            r'(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}'
+        ]
+        
+        has_dates = any(regex_guard.search(pattern, text, re.IGNORECASE) for pattern in date_patterns)
+        if not has_dates:
+            issues.append("No date information found in work experience")
+        
+        # Check for bullet points or structure indicators
+        structure_indicators = ['-', '•', '◦', '▪', '▫', '○', '●']
+        has_structure = any(indicator in text for indicator in structure_indicators)
+        
+        # Calculate enhanced format score
+        format_score = 100
+        
+        # Penalties for issues
+        format_score -= len(issues) * 12
+        
+        # Bonuses for good formatting
+        if has_linkedin:
+            format_score += 5
+        if has_github:
+            format_score += 5
+        if found_section_headers >= 4:
+            format_score += 10
+        if has_structure:
+            format_score += 5
+        if 200 <= word_count <= 1500:  # Optimal length
+            format_score += 10
+        if readability_score >= 60:  # Good readability
+            format_score += 10
+        
+        format_score = max(min(format_score, 100), 0)
+        
+        return {
+            'readability_score': readability_score,
+            'readability_grade': statistics['flesch_kincaid_grade'],
+            'word_count': word_count,
+            'sentence_count': statistics['sentence_count'],
+            'has_email': has_email,
+            'has_phone': has_phone,
+            'has_linkedin': has_linkedin,
+            'has_github': has_github,
+            'section_headers_found': found_section_headers,
+            'has_dates': has_dates,
+            'has_structure': has_structure,
+            'issues': issues,
+            'format_score': format_score
+        }
+
+    @analysis_pipeline.stage("missing_sections", inputs=("sections",), outputs=("missing_sections",))
+    def _find_missing_sections(self, sections: Dict[str, str]) -> List[str]:
+        """Find missing important sections"""
+        required_sections = [
+            CVSections.EXPERIENCE,
+            CVSections.EDUCATION,
+            CVSections.SKILLS
+        ]
+        
+        missing = []
+        for section in required_sections:
+            if section not in sections or not sections[section].strip():
+                missing.append(section)
+        
+        return missing
+
+    @analysis_pipeline.stage("score", inputs=("skills_analysis", "experience_analysis", "education_analysis", "format_analysis"), outputs=("score",))
+    def _calculate_overall_score(self, skills_analysis: Dict, experience_analysis: Dict, 
+                               education_analysis: Dict, format_analysis: Dict) -> int:
+        """Calculate weighted overall score"""
+        skills_score = skills_analysis.get('skills_score', 0)
+        experience_score = experience_analysis.get('experience_score', 0)
+        education_score = education_analysis.get('education_score', 0)
+        format_score = format_analysis.get('format_score', 0)
+        
+        overall_score = (
+            skills_score * settings.SKILLS_WEIGHT +
+            experience_score * settings.EXPERIENCE_WEIGHT +
+            education_score * settings.EDUCATION_WEIGHT +
+            format_score * settings.FORMAT_WEIGHT
+        )
+        
+        return int(min(overall_score, 100))
+
+    @analysis_pipeline.stage("skills_score", inputs=("skills_analysis",), outputs=("score",))
+    def _calculate_skills_only_score(self, skills_analysis: Dict) -> int:
+        """Triage score from the skills sub-score alone (quick profile)"""
+        return int(min(skills_analysis.get('skills_score', 0), 100))
+
+analysis_pipeline.add_profile(AnalysisProfiles.FULL, (
+    "clean", "sections", "skills", "experience", "education", "format", "score", "missing_sections"
+))
+analysis_pipeline.add_profile(AnalysisProfiles.QUICK, (
+    "clean", "sections", "skills", "skills_score", "missing_sections"
+))
@@ -0,0 +1,212 @@
+# app/services/dedup_index.py
+import re
+import time
+import zlib
+import hashlib
+from typing import List, Dict, Any, Optional, Iterable
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+
+from app.core.config import settings
+from app.database import scan_in_chunks
+from app.models import CVFileModel, CVSignatureModel, CVSignatureBandModel
+
+SIGNATURE_DTYPE = np.dtype('<u4')
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+# Letters only: phone numbers, dates and punctuation do not change the shingles
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+# Candidates read per lookup; identical copies all link to the same original anyway
+MAX_CANDIDATES = 1000
+
+class DedupIndex:
+    """Near-duplicate CV detection with MinHash signatures and LSH banding
+
+    A CV's text becomes a set of word shingles, summarised by a MinHash
+    signature whose agreement with another signature estimates their Jaccard
+    similarity. The signature is cut into bands; each band hashes to a
+    bucket stored in CVSignatureBands, so candidates come from an indexed
+    lookup of a few bucket keys instead of a comparison with every CV.
+    """
+
+    def __init__(self, num_perm: int = None, bands: int = None, shingle_size: int = None,
+                 threshold: float = None, seed: int = 1):
+        self.num_perm = num_perm or settings.DEDUP_NUM_PERM
+        self.bands = bands or settings.DEDUP_LSH_BANDS
+        self.shingle_size = shingle_size or settings.DEDUP_SHINGLE_SIZE
+        self.threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+        if self.num_perm % self.bands:
+            raise ValueError(f"{self.num_perm} MinHash values do not split into {self.bands} bands")
+        self.rows_per_band = self.num_perm // self.bands
+
+        # Fixed seed: every process must produce the same signature for the same text
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+
+    # Signatures
+
+    def shingles(self, text: str) -> np.ndarray:
+        """CRC32 hashes of the text's overlapping word shingles"""
+        words = WORD_PATTERN.findall((text or "").lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        size = min(self.shingle_size, len(words))
+        hashes = {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(len(words) - size + 1)
+        }
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text (None when it has no words)"""
+        hashes = self.shingles(text)
+        if not len(hashes):
+            return None
+        # (a * x + b) mod p stays below 2**64 for 32-bit a, b and x
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return (permuted & np.uint64(0xFFFFFFFF)).min(axis=1).astype(SIGNATURE_DTYPE)
+
+    @staticmethod
+    def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+        return float(np.count_nonzero(signature == other)) / len(signature)
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per band"""
+        keys = []
+        for band in range(self.bands):
+            values = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            digest = hashlib.blake2b(band.to_bytes(2, "little") + values.tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    # Index
+
+    def find_duplicate(self, db: Session, signature: np.ndarray, exclude_cv_file_id: Any = None) -> Optional[Dict[str, Any]]:
+        """Most similar indexed CV at or above the threshold, resolved to its original"""
+        candidate_ids = [
+            cv_file_id for (cv_file_id,) in db.query(CVSignatureBandModel.CVFileId).filter(
+                CVSignatureBandModel.BandKey.in_(self.band_keys(signature))
+            ).distinct().limit(MAX_CANDIDATES + 1)
+            if cv_file_id != exclude_cv_file_id
+        ]
+        if not candidate_ids:
+            return None
+
+        best = None
+        for cv_file_id, blob, duplicate_of_id, uploaded_at in db.query(
+            CVSignatureModel.CVFileId, CVSignatureModel.Signature, CVSignatureModel.DuplicateOfId, CVFileModel.UploadedAt
+        ).join(
+            CVFileModel, CVFileModel.Id == CVSignatureModel.CVFileId
+        ).filter(
+            CVSignatureModel.CVFileId.in_(candidate_ids[:MAX_CANDIDATES]),
+            CVFileModel.IsDeleted == False
+        ):
+            original = duplicate_of_id or cv_file_id
+            if original == exclude_cv_file_id:
+                # A copy of the CV being checked: it stays the original
+                continue
+            similarity = self.similarity(signature, np.frombuffer(blob, dtype=SIGNATURE_DTYPE))
+            if similarity < self.threshold:
+                continue
+            # Most similar first, then the earliest upload
+            rank = (similarity, -(uploaded_at or datetime.max).timestamp())
+            if best is None or rank > best[0]:
+                best = (rank, {
+                    'duplicate_of': original,
+                    'matched_cv_file_id': cv_file_id,
+                    'similarity': round(similarity, 4)
+                })
+
+        return best[1] if best else None
+
+    def register(self, db: Session, cv_file_id: Any, signature: np.ndarray,
+                 duplicate_of: Any = None, similarity: Optional[float] = None):
+        """Store (or replace) a CV's signature, buckets and duplicate link (callers commit)"""
+        record = db.query(CVSignatureModel).filter(CVSignatureModel.CVFileId == cv_file_id).first()
+        if record is None:
+            record = CVSignatureModel(CVFileId=cv_file_id)
+            db.add(record)
+        else:
+            record.UpdatedAt = datetime.utcnow()
+        record.Signature = signature.astype(SIGNATURE_DTYPE).tobytes()
+        record.DuplicateOfId = duplicate_of
+        record.Similarity = similarity
+
+        db.query(CVSignatureBandModel).filter(CVSignatureBandModel.CVFileId == cv_file_id).delete(synchronize_session=False)
+        db.bulk_insert_mappings(CVSignatureBandModel, [
+            {'BandKey': key, 'CVFileId': cv_file_id} for key in set(self.band_keys(signature))
+        ])
+        db.flush()
+
+    def duplicate_links(self, db: Session, cv_file_ids: Iterable[Any]) -> Dict[str, str]:
+        """CV file id -> id of the earlier CV it duplicates, for the given CVs that are duplicates"""
+        ids = list(dict.fromkeys(cv_file_ids))
+        links = {}
+        for start in range(0, len(ids), 1000):
+            for cv_file_id, duplicate_of_id in db.query(CVSignatureModel.CVFileId, CVSignatureModel.DuplicateOfId).filter(
+                CVSignatureModel.CVFileId.in_(ids[start:start + 1000]),
+                CVSignatureModel.DuplicateOfId != None
+            ):
+                links[str(cv_file_id)] = str(duplicate_of_id)
+        return links
+
+    def backfill(self, db: Session, chunk_size: int = 500) -> Dict[str, Any]:
+        """Sign stored CV texts that have no signature yet
+
+        Existing analyses are kept; only the duplicate links are recorded. A
+        link points at whichever copy was signed first.
+        """
+        started = time.perf_counter()
+        signed = duplicates = 0
+        query = db.query(CVFileModel.Id, CVFileModel.ParsedText).outerjoin(
+            CVSignatureModel, CVSignatureModel.CVFileId == CVFileModel.Id
+        ).filter(
+            CVSignatureModel.CVFileId == None,
+            CVFileModel.ParsedText != None,
+            CVFileModel.IsDeleted == False
+        )
+
+        try:
+            for chunk in scan_in_chunks(query, CVFileModel.Id, chunk_size):
+                for cv_file_id, text in chunk:
+                    signature = self.signature(text)
+                    if signature is None:
+                        continue
+                    duplicate = self.find_duplicate(db, signature, exclude_cv_file_id=cv_file_id)
+                    self.register(
+                        db, cv_file_id, signature,
+                        duplicate['duplicate_of'] if duplicate else None,
+                        duplicate['similarity'] if duplicate else None
+                    )
+                    signed += 1
+                    duplicates += duplicate is not None
+                db.commit()
+        except Exception as e:
+            logger.error(f"Error backfilling CV signatures: {e}")
+            db.rollback()
+            raise
+
+        summary = {'signed': signed, 'duplicates': duplicates, 'seconds': round(time.perf_counter() - started, 3)}
+        logger.info(f"Backfilled CV signatures: {summary}")
+        return summary
+
+    def status(self, db: Session) -> Dict[str, Any]:
+        signed, duplicates = db.query(
+            func.count(CVSignatureModel.CVFileId), func.count(CVSignatureModel.DuplicateOfId)
+        ).one()
+        return {
+            'signed_cvs': signed,
+            'duplicate_cvs': duplicates,
+            'threshold': self.threshold,
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'shingle_size': self.shingle_size
+        }
+
+# Shared instance
+dedup_index = DedupIndex()
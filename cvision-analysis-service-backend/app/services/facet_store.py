@@ -0,0 +1,300 @@
+# app/services/facet_store.py
+import time
+import asyncio
+from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.constants import DegreeLevels, AnalysisMetrics
+from app.database import scan_in_chunks
+from app.models import CVFileModel, CVAnalysisResultModel, CVAnalysisFeatureModel
+from app.services.skill_normalizer import skill_normalizer
+from app.services.skill_vocabulary import skill_vocabulary, SKILL_ID_DTYPE
+from app.services.statistics_service import StatisticsService, HISTOGRAM_BUCKETS
+
+DEGREE_NAMES = {
+    DegreeLevels.NONE: 'none',
+    DegreeLevels.CERTIFICATE: 'certificate',
+    DegreeLevels.ASSOCIATE: 'associate',
+    DegreeLevels.BACHELOR: 'bachelor',
+    DegreeLevels.MASTER: 'master',
+    DegreeLevels.DOCTORATE: 'doctorate'
+}
+DEGREE_LEVELS = {name: level for level, name in DEGREE_NAMES.items()}
+
+# Years-of-experience facet buckets: [0, 1), [1, 3), [3, 5), [5, 10), [10, ...)
+YEARS_EDGES = (1, 3, 5, 10)
+YEARS_LABELS = ("0-1", "1-3", "3-5", "5-10", "10+")
+
+FLAG_FACETS = ('has_email', 'has_phone', 'has_linkedin', 'has_github')
+
+class FacetColumns:
+    """Filterable features of every analysed CV as parallel numpy columns
+
+    Skills are kept twice: per row (CSR, for showing a candidate's skills) and
+    per skill (a posting list of rows, expanded to a row bitmask when a filter
+    needs it). Filters are boolean masks over the rows.
+    """
+
+    def __init__(self, analysis_ids: List[Any], cv_file_ids: List[Any], file_names: List[str],
+                 scores: np.ndarray, years: np.ndarray, degrees: np.ndarray, flags: Dict[str, np.ndarray],
+                 indptr: np.ndarray, indices: np.ndarray, terms: np.ndarray):
+        self.analysis_ids = analysis_ids
+        self.cv_file_ids = cv_file_ids
+        self.file_names = file_names
+        self.scores = scores
+        self.years = years
+        self.degrees = degrees
+        self.flags = flags
+        self.indptr = indptr
+        self.indices = indices
+        self.terms = terms
+        self.loaded_at = datetime.utcnow()
+
+        # Bucket columns so facet counts are a single bincount
+        self.score_buckets = np.clip(scores // (AnalysisMetrics.MAX_SCORE // HISTOGRAM_BUCKETS), 0, HISTOGRAM_BUCKETS - 1).astype(np.int8)
+        self.years_buckets = np.searchsorted(np.asarray(YEARS_EDGES, dtype=np.float32), years, side='right').astype(np.int8)
+
+        # Row posting list per skill id
+        row_of = np.repeat(np.arange(len(scores), dtype=np.int32), np.diff(indptr))
+        order = np.argsort(indices, kind='stable')
+        self.skill_rows = row_of[order]
+        self.skill_indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        self.skill_totals = np.bincount(indices, minlength=len(terms))
+        np.cumsum(self.skill_totals, out=self.skill_indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.analysis_ids)
+
+    def skill_mask(self, skill_id: Optional[int]) -> np.ndarray:
+        """Rows that have a skill (none for unknown skills)"""
+        mask = np.zeros(len(self), dtype=bool)
+        if skill_id is not None and skill_id < len(self.skill_indptr) - 1:
+            mask[self.skill_rows[self.skill_indptr[skill_id]:self.skill_indptr[skill_id + 1]]] = True
+        return mask
+
+    def skill_counts(self, mask: np.ndarray) -> np.ndarray:
+        """Rows under ``mask`` per skill id
+
+        Reads only the skill runs of the selected rows, or of the unselected
+        ones (subtracted from the totals) when that is the smaller side.
+        """
+        rows = np.flatnonzero(mask)
+        if len(rows) <= len(self) // 2:
+            return self._row_skill_counts(rows)
+        return self.skill_totals - self._row_skill_counts(np.flatnonzero(~mask))
+
+    def _row_skill_counts(self, rows: np.ndarray) -> np.ndarray:
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(len(self.terms), dtype=np.int64)
+        # Positions of every selected row's run, concatenated
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+        return np.bincount(self.indices[positions], minlength=len(self.terms))
+
+    def skills(self, row: int) -> List[str]:
+        return self.terms[self.indices[self.indptr[row]:self.indptr[row + 1]]].tolist()
+
+    def nbytes(self) -> int:
+        arrays = [self.scores, self.years, self.degrees, self.indptr, self.indices, self.skill_rows,
+                  self.skill_indptr, self.score_buckets, self.years_buckets, *self.flags.values()]
+        return int(sum(array.nbytes for array in arrays))
+
+class FacetStore:
+    """In-memory columnar copy of CVAnalysisFeatures for faceted candidate filtering
+
+    The columns are reloaded from the database when older than the TTL;
+    concurrent requests wait on one reload. Analyses without a feature record
+    are not included until they are re-analysed.
+    """
+
+    def __init__(self, ttl: int = None, chunk_size: int = None):
+        self.ttl = settings.FACET_STORE_TTL if ttl is None else ttl
+        self.chunk_size = chunk_size or settings.SCAN_CHUNK_SIZE
+        self._columns: Optional[FacetColumns] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: Session) -> FacetColumns:
+        """Current columns, reloading them if they have expired"""
+        if self._is_fresh():
+            return self._columns
+
+        async with self._lock:
+            if not self._is_fresh():
+                self._columns = await run_in_threadpool(self.load, db)
+                self._loaded_at = time.monotonic()
+            return self._columns
+
+    def invalidate(self):
+        self._loaded_at = 0.0
+
+    def load(self, db: Session) -> FacetColumns:
+        started = time.perf_counter()
+        analysis_ids, cv_file_ids, file_names = [], [], []
+        scores, years, degrees, blobs = [], [], [], []
+        flags = {name: [] for name in FLAG_FACETS}
+
+        query = db.query(
+            CVAnalysisResultModel.Id,
+            CVAnalysisResultModel.CVFileId,
+            CVFileModel.FileName,
+            CVAnalysisResultModel.Score,
+            CVAnalysisFeatureModel.YearsOfExperience,
+            CVAnalysisFeatureModel.TopDegreeLevel,
+            CVAnalysisFeatureModel.HasEmail,
+            CVAnalysisFeatureModel.HasPhone,
+            CVAnalysisFeatureModel.HasLinkedIn,
+            CVAnalysisFeatureModel.HasGitHub,
+            CVAnalysisFeatureModel.SkillIds
+        ).join(
+            CVAnalysisFeatureModel, CVAnalysisFeatureModel.CVAnalysisResultId == CVAnalysisResultModel.Id
+        ).outerjoin(
+            CVFileModel, CVFileModel.Id == CVAnalysisResultModel.CVFileId
+        ).filter(
+            CVAnalysisResultModel.IsDeleted == False
+        )
+
+        for chunk in scan_in_chunks(query, CVAnalysisResultModel.Id, self.chunk_size):
+            for analysis_id, cv_file_id, file_name, score, years_value, degree, *row_flags, blob in chunk:
+                analysis_ids.append(analysis_id)
+                cv_file_ids.append(cv_file_id)
+                file_names.append(file_name or 'Unknown')
+                scores.append(score)
+                years.append(years_value or 0)
+                degrees.append(degree or DegreeLevels.NONE)
+                for name, value in zip(FLAG_FACETS, row_flags):
+                    flags[name].append(bool(value))
+                blobs.append(blob or b"")
+
+        lengths = np.fromiter((len(blob) // SKILL_ID_DTYPE.itemsize for blob in blobs), dtype=np.int64, count=len(blobs))
+        indptr = np.zeros(len(blobs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.frombuffer(b"".join(blobs), dtype=SKILL_ID_DTYPE)
+        skill_vocabulary.ensure(np.unique(indices), db)
+
+        columns = FacetColumns(
+            analysis_ids, cv_file_ids, file_names,
+            np.asarray(scores, dtype=np.int16),
+            np.asarray(years, dtype=np.float32),
+            np.asarray(degrees, dtype=np.int8),
+            {name: np.asarray(values, dtype=bool) for name, values in flags.items()},
+            indptr, indices, skill_vocabulary.lookup_table()
+        )
+        logger.info(f"Loaded facet columns for {len(columns)} CVs in {time.perf_counter() - started:.2f}s "
+                    f"({columns.nbytes() / 1024:.0f} KiB of arrays)")
+        return columns
+
+    def filter(self, columns: FacetColumns, min_score: Optional[int] = None, max_score: Optional[int] = None,
+               min_years: Optional[float] = None, max_years: Optional[float] = None,
+               min_degree: Optional[str] = None, skills: Optional[List[str]] = None,
+               flags: Optional[Dict[str, Optional[bool]]] = None,
+               limit: int = 20, offset: int = 0, top_skills: int = 20) -> Dict[str, Any]:
+        """Candidates matching every filter, best score first, with facet counts
+
+        Each facet is counted with every filter except its own applied, so the
+        counts show how many candidates a change to that facet would give.
+        """
+        started = time.perf_counter()
+        masks: Dict[str, np.ndarray] = {}
+
+        if min_score is not None or max_score is not None:
+            masks['score'] = self._range(columns.scores, min_score, max_score)
+        if min_years is not None or max_years is not None:
+            masks['years'] = self._range(columns.years, min_years, max_years)
+        if min_degree is not None:
+            if min_degree not in DEGREE_LEVELS:
+                raise ValueError(f"Unknown degree level: {min_degree}")
+            masks['degree'] = columns.degrees >= DEGREE_LEVELS[min_degree]
+        for name, value in (flags or {}).items():
+            if name not in FLAG_FACETS:
+                raise ValueError(f"Unknown flag facet: {name}")
+            if value is not None:
+                masks[name] = columns.flags[name] == value
+        if skills:
+            skill_mask = np.ones(len(columns), dtype=bool)
+            for skill in skill_normalizer.canonicalize_skills(skills):
+                skill_mask &= columns.skill_mask(skill_vocabulary.find(skill))
+            masks['skills'] = skill_mask
+
+        combined = self._all(masks, len(columns))
+
+        def excluding(facet: str) -> np.ndarray:
+            return combined if facet not in masks else self._all(
+                {name: mask for name, mask in masks.items() if name != facet}, len(columns)
+            )
+
+        score_counts = np.bincount(columns.score_buckets[excluding('score')], minlength=HISTOGRAM_BUCKETS)
+        years_counts = np.bincount(columns.years_buckets[excluding('years')], minlength=len(YEARS_LABELS))
+        degree_counts = np.bincount(columns.degrees[excluding('degree')], minlength=max(DEGREE_NAMES) + 1)
+        skill_counts = columns.skill_counts(excluding('skills'))
+
+        facets = {
+            'score': dict(zip(StatisticsService.histogram_labels(), score_counts.tolist())),
+            'years_of_experience': dict(zip(YEARS_LABELS, years_counts.tolist())),
+            'degree': {name: int(degree_counts[level]) for level, name in DEGREE_NAMES.items()}
+        }
+        for name in FLAG_FACETS:
+            with_flag = int(np.count_nonzero(columns.flags[name] & excluding(name)))
+            facets[name] = {'true': with_flag, 'false': int(np.count_nonzero(excluding(name))) - with_flag}
+
+        top = np.argsort(-skill_counts, kind='stable')[:top_skills]
+        facets['skills'] = {columns.terms[i]: int(skill_counts[i]) for i in top if skill_counts[i] > 0}
+
+        # Best score first, ties in load order: select the first offset + limit, then sort only those
+        rows = np.flatnonzero(combined)
+        order_key = -columns.scores[rows].astype(np.int64) * len(columns) + rows
+        if offset + limit < len(rows):
+            head = np.argpartition(order_key, offset + limit)[:offset + limit]
+            rows, order_key = rows[head], order_key[head]
+        rows = rows[np.argsort(order_key)][offset:offset + limit]
+
+        return {
+            'total': int(np.count_nonzero(combined)),
+            'candidates': [self._candidate(columns, int(row)) for row in rows],
+            'facets': facets,
+            'corpus_size': len(columns),
+            'loaded_at': columns.loaded_at,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def _candidate(self, columns: FacetColumns, row: int) -> Dict[str, Any]:
+        return {
+            'analysis_id': str(columns.analysis_ids[row]),
+            'cv_id': str(columns.cv_file_ids[row]),
+            'file_name': columns.file_names[row],
+            'score': int(columns.scores[row]),
+            'years_of_experience': float(columns.years[row]),
+            'degree': DEGREE_NAMES.get(int(columns.degrees[row]), 'none'),
+            **{name: bool(columns.flags[name][row]) for name in FLAG_FACETS},
+            'skills': columns.skills(row)
+        }
+
+    @staticmethod
+    def _range(values: np.ndarray, low, high) -> np.ndarray:
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    @staticmethod
+    def _all(masks: Dict[str, np.ndarray], size: int) -> np.ndarray:
+        combined = np.ones(size, dtype=bool)
+        for mask in masks.values():
+            combined &= mask
+        return combined
+
+    def _is_fresh(self) -> bool:
+        return self._columns is not None and time.monotonic() - self._loaded_at < self.ttl
+
+# Shared instance
+facet_store = FacetStore()
@@ -0,0 +1,165 @@
+# app/services/feature_store.py
+import uuid
+from typing import List, Dict, Any, Tuple
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+
+from app.core.config import settings
+from app.database import scan_in_chunks
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, CVAnalysisFeatureModel
+from app.services.skill_normalizer import skill_normalizer
+from app.services.skill_vocabulary import skill_vocabulary, unpack_skill_ids, SKILL_ID_DTYPE
+
+class CorpusFeatures:
+    """Skill sets of every analysed CV in CSR form plus the columns matching needs
+
+    Row ``i`` owns ``indices[indptr[i]:indptr[i + 1]]``, a sorted run of
+    vocabulary ids, instead of a list of ``KeywordMatchModel`` objects.
+    """
+
+    def __init__(self, analysis_ids: List[uuid.UUID], cv_file_ids: List[uuid.UUID], file_names: List[str],
+                 scores: np.ndarray, created_at: List[datetime], indptr: np.ndarray, indices: np.ndarray,
+                 terms: np.ndarray, legacy_skills: Dict[int, List[str]] = None,
+                 source: str = None, term_vectors: np.ndarray = None):
+        self.analysis_ids = analysis_ids
+        self.cv_file_ids = cv_file_ids
+        self.file_names = file_names
+        self.scores = scores
+        self.created_at = created_at
+        self.indptr = indptr
+        self.indices = indices
+        self.terms = terms
+        # Rows analysed before feature records existed, keyed by row number
+        self.legacy_skills = legacy_skills or {}
+        # Snapshot directory and per-term embedding rows when loaded from a snapshot
+        self.source = source
+        self.term_vectors = term_vectors
+        self._row_index: Dict[str, int] = None
+
+    def __len__(self) -> int:
+        return len(self.analysis_ids)
+
+    def skill_ids(self, row: int) -> np.ndarray:
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def skills(self, row: int) -> List[str]:
+        """Canonical skill names of one row"""
+        if row in self.legacy_skills:
+            return self.legacy_skills[row]
+        return self.terms[self.skill_ids(row)].tolist()
+
+    def rows_for_analysis_ids(self, analysis_ids: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Row numbers for analysis ids, plus the ids not in the corpus"""
+        if self._row_index is None:
+            self._row_index = {str(analysis_id).lower(): row for row, analysis_id in enumerate(self.analysis_ids)}
+
+        rows, missing = [], []
+        for analysis_id in analysis_ids:
+            row = self._row_index.get(str(analysis_id).lower())
+            if row is None:
+                missing.append(analysis_id)
+            else:
+                rows.append(row)
+        return np.asarray(rows, dtype=np.int64), missing
+
+    def nbytes(self) -> int:
+        """Approximate size of the array part of the corpus"""
+        return int(self.scores.nbytes + self.indptr.nbytes + self.indices.nbytes)
+
+class FeatureStore:
+    """Load compact per-CV feature records for matching"""
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or settings.SCAN_CHUNK_SIZE
+
+    def load_corpus(self, db: Session) -> CorpusFeatures:
+        """Whole corpus in one narrow scan (KeywordMatches only for legacy rows)"""
+        analysis_ids, cv_file_ids, file_names, scores, created_at = [], [], [], [], []
+        blobs = []
+        legacy_rows = {}
+
+        query = db.query(
+            CVAnalysisResultModel.Id,
+            CVAnalysisResultModel.CVFileId,
+            CVFileModel.FileName,
+            CVAnalysisResultModel.Score,
+            CVAnalysisResultModel.CreatedAt,
+            CVAnalysisFeatureModel.SkillIds
+        ).outerjoin(
+            CVFileModel, CVFileModel.Id == CVAnalysisResultModel.CVFileId
+        ).outerjoin(
+            CVAnalysisFeatureModel, CVAnalysisFeatureModel.CVAnalysisResultId == CVAnalysisResultModel.Id
+        ).filter(
+            CVAnalysisResultModel.IsDeleted == False
+        )
+        
+        row_number = 0
+        for chunk in scan_in_chunks(query, CVAnalysisResultModel.Id, self.chunk_size):
+            for analysis_id, cv_file_id, file_name, score, created, blob in chunk:
+                analysis_ids.append(analysis_id)
+                cv_file_ids.append(cv_file_id)
+                file_names.append(file_name or 'Unknown')
+                scores.append(score)
+                created_at.append(created)
+                if blob is None:
+                    legacy_rows[analysis_id] = row_number
+                    blobs.append(b"")
+                else:
+                    blobs.append(blob)
+                row_number += 1
+        
+        lengths = np.fromiter((len(blob) // SKILL_ID_DTYPE.itemsize for blob in blobs), dtype=np.int64, count=len(blobs))
+        indptr = np.zeros(len(blobs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.frombuffer(b"".join(blobs), dtype=SKILL_ID_DTYPE)
+
+        # Terms added by other processes since this one last looked
+        skill_vocabulary.ensure(np.unique(indices), db)
+
+        corpus = CorpusFeatures(
+            analysis_ids, cv_file_ids, file_names,
+            np.asarray(scores, dtype=np.int32), created_at,
+            indptr, indices, skill_vocabulary.lookup_table(),
+            legacy_skills=self._load_legacy_skills(db, legacy_rows)
+        )
+        logger.info(f"Loaded {len(corpus)} CV feature records ({len(legacy_rows)} from keyword matches), "
+                    f"{corpus.nbytes() / 1024:.0f} KiB of arrays")
+        return corpus
+
+    def load_cv_skills(self, db: Session, analysis_id: Any) -> List[str]:
+        """Canonical skills of one analysis, from its feature record when it has one"""
+        blob = db.query(CVAnalysisFeatureModel.SkillIds).filter(
+            CVAnalysisFeatureModel.CVAnalysisResultId == analysis_id
+        ).scalar()
+
+        if blob is None:
+            keywords = db.query(KeywordMatchModel.Keyword).filter(
+                KeywordMatchModel.CVAnalysisResultId == analysis_id,
+                KeywordMatchModel.IsMatched == True
+            )
+            return skill_normalizer.canonicalize_skills(keyword for (keyword,) in keywords)
+
+        skill_ids = unpack_skill_ids(blob)
+        skill_vocabulary.ensure(skill_ids, db)
+        return skill_vocabulary.decode(skill_ids)
+
+    def _load_legacy_skills(self, db: Session, legacy_rows: Dict[Any, int]) -> Dict[int, List[str]]:
+        """Fallback to KeywordMatches for analyses without a packed skill record"""
+        skills = {row: [] for row in legacy_rows.values()}
+        ids = list(legacy_rows)
+
+        for start in range(0, len(ids), 1000):
+            keywords = db.query(KeywordMatchModel.CVAnalysisResultId, KeywordMatchModel.Keyword).filter(
+                KeywordMatchModel.CVAnalysisResultId.in_(ids[start:start + 1000]),
+                KeywordMatchModel.IsMatched == True
+            )
+            for analysis_id, keyword in keywords:
+                skills[legacy_rows[analysis_id]].append(keyword)
+
+        return {row: skill_normalizer.canonicalize_skills(keywords) for row, keywords in skills.items()}
+
+# Shared instance
+feature_store = FeatureStore()
@@ -0,0 +1,167 @@
+# app/services/file_prefetcher.py
+import os
+import mmap
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, AsyncIterator
+from loguru import logger
+
+from app.core.config import settings
+from app.models import CVFileModel
+from app.services.text_extractor import FileSource
+
+class _Prefetch:
+    """Read-ahead state of one file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size: Optional[int] = None  # Known once a worker has sized the file
+        self.reading = False  # Holds ``size`` bytes of the budget until freed
+        self.freed = False
+        self.abandoned = False  # Claimed before its read started, or no longer wanted
+        self.future: Future = Future()  # The buffer, once reading has started
+
+class FilePrefetcher:
+    """Reads CV files into memory ahead of the analysis that needs them
+
+    ``prefetch`` takes files in the order they will be analysed and reads
+    them on a small thread pool, so reading from the uploads volume overlaps
+    with analysis instead of adding to it. Reads start in that order while
+    they fit in ``byte_budget``; files from ``mmap_threshold`` bytes up are
+    memory-mapped rather than copied. ``claim`` hands a file's buffer to the
+    analysis and frees its share of the budget afterwards, which starts the
+    next reads. A file whose read has not started yet is not waited for:
+    the caller reads it from its path.
+    """
+
+    def __init__(self, byte_budget: int = None, mmap_threshold: int = None, threads: int = None):
+        self.byte_budget = byte_budget or settings.PREFETCH_BYTE_BUDGET
+        self.mmap_threshold = mmap_threshold or settings.PREFETCH_MMAP_THRESHOLD
+        self._executor = ThreadPoolExecutor(max_workers=threads or settings.PREFETCH_THREADS,
+                                            thread_name_prefix="cv-prefetch")
+        self._entries: Dict[str, _Prefetch] = {}
+        self._queue: deque = deque()  # Files not yet being read, in prefetch order
+        self._held = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, cv_files: List[CVFileModel]):
+        """Read these files in order, dropping earlier read-ahead that is no longer wanted"""
+        wanted = {str(cv_file.Id): cv_file.FilePath for cv_file in cv_files}
+        with self._lock:
+            stale = [key for key in self._entries if key not in wanted]
+            for key in stale:
+                self._abandon(self._entries.pop(key))
+
+            for key, path in wanted.items():
+                if key not in self._entries and path:
+                    self._entries[key] = entry = _Prefetch(path)
+                    self._queue.append(entry)
+                    self._executor.submit(self._size, entry)
+
+    @asynccontextmanager
+    async def claim(self, cv_file: CVFileModel) -> AsyncIterator[Optional[FileSource]]:
+        """The file's bytes or memory map while the block runs, or None to read it from its path"""
+        with self._lock:
+            entry = self._entries.pop(str(cv_file.Id), None)
+            if entry is not None and not entry.reading:
+                # Still waiting for its turn; don't wait for it
+                entry.abandoned = True
+                entry = None
+
+        source = None
+        if entry is not None:
+            source = await asyncio.wrap_future(entry.future)
+        if source is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        try:
+            yield source
+        finally:
+            if entry is not None:
+                self._free(entry, source)
+
+    def clear(self):
+        """Drop all read-ahead (e.g. when the processor stops)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            for entry in entries:
+                self._abandon(entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'held_bytes': self._held,
+                'byte_budget': self.byte_budget,
+                'queued_files': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _size(self, entry: _Prefetch):
+        """Worker thread: size the file, then start whatever reads are due"""
+        try:
+            size = os.path.getsize(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot prefetch {entry.path}: {e}")
+            size = None
+        with self._lock:
+            if size is None or size > self.byte_budget:
+                # Read from its path when claimed
+                entry.abandoned = True
+            entry.size = size
+            self._start_reads()
+
+    def _start_reads(self):
+        """Start reads in queue order while they fit in the budget (called with the lock held)"""
+        while self._queue:
+            entry = self._queue[0]
+            if not entry.abandoned:
+                if entry.size is None or self._held + entry.size > self.byte_budget:
+                    break
+                entry.reading = True
+                self._held += entry.size
+                self._executor.submit(self._load, entry)
+            self._queue.popleft()
+
+    def _load(self, entry: _Prefetch):
+        """Worker thread: read or map the file"""
+        try:
+            source = self._read(entry.path, entry.size)
+        except Exception as e:
+            logger.warning(f"Error prefetching {entry.path}: {e}")
+            source = None
+            self._free(entry, None)
+        entry.future.set_result(source)
+
+    def _read(self, path: str, size: int) -> FileSource:
+        with open(path, 'rb') as file:
+            if size < self.mmap_threshold or size == 0:  # empty files can't be mapped
+                return file.read()
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            # Start reading the pages in now rather than on first access
+            mapped.madvise(mmap.MADV_WILLNEED)
+        return mapped
+
+    def _abandon(self, entry: _Prefetch):
+        entry.abandoned = True
+        if entry.reading:
+            # Free the buffer once the read in flight finishes (or now, if it has)
+            entry.future.add_done_callback(lambda future: self._free(entry, future.result()))
+
+    def _free(self, entry: _Prefetch, source: Optional[FileSource]):
+        if isinstance(source, mmap.mmap):
+            source.close()
+        with self._lock:
+            if entry.reading and not entry.freed:
+                entry.freed = True
+                self._held -= entry.size
+                self._start_reads()
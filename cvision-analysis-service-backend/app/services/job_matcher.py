@@ -1,37 +1,44 @@
 # app/services/job_matcher.py
 import re
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import heapq
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from loguru import logger
 from datetime import datetime
 
 # NLP and similarity
-import spacy
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from fuzzywuzzy import fuzz, process
 import pandas as pd
 from collections import defaultdict, Counter
 
 # Models
-from app.models import CVAnalysisResultModel, KeywordMatchModel, JobProfileModel
+from app.models import CVFileModel, CVAnalysisResultModel, JobProfileModel
 from app.core.constants import COMMON_SKILLS
+from app.services.skill_embeddings import SkillEmbeddingTable
+from app.services.skill_index import FuzzySkillIndex
+from app.services.skill_normalizer import skill_normalizer
+from app.services.feature_store import feature_store, CorpusFeatures
+from app.services.match_scorer import ShardedMatchScorer
+from app.services.corpus_snapshot import corpus_snapshots
+from app.services.tfidf_model import tfidf_model
+from app.services.dedup_index import dedup_index
+
+# Fields of a CV-vs-all-jobs match item (job_profile_id is always included)
+MATCH_ITEM_FIELDS = (
+    'job_title', 'match_percentage', 'total_job_keywords', 'matched_keywords_count', 'matched_keywords',
+    'missing_keywords', 'semantic_similarity', 'weighted_score', 'category_scores', 'recommendations'
+)
+DEFAULT_MATCH_FIELDS = set(MATCH_ITEM_FIELDS) - {'recommendations'}
+# Fields that need the per-item detail pass
+DETAIL_MATCH_FIELDS = {'missing_keywords', 'recommendations'}
 
 class JobMatcher:
     """Advanced Job Matching Service"""
     
     def __init__(self):
-        self.nlp = None
-        self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words='english', 
-            max_features=5000,
-            ngram_range=(1, 2),  # Include bigrams for better matching
-            lowercase=True
-        )
-        self._load_nlp_model()
-        
         # Skill categories for weighted scoring
         self.skill_categories = {
             'programming_languages': {
@@ -59,15 +66,29 @@ class JobMatcher:
                 'skills': ['teamwork', 'leadership', 'communication', 'problem solving', 'analytical thinking', 'creativity']
             }
         }
+        
+        # Category skill lists use the same canonical names as stored keywords
+        for config in self.skill_categories.values():
+            config['skills'] = skill_normalizer.canonicalize_skills(config['skills'])
+        
+        # Counters for the canonicalization report
+        self.match_stats = Counter()
+        
+        # Shared, memory-mapped skill vectors for semantic similarity
+        self.skill_embeddings = SkillEmbeddingTable.load_or_build(self._embedding_vocabulary())
+        
+        # Fuzzy neighbours of every vocabulary skill, precomputed once
+        self.fuzzy_index = FuzzySkillIndex.build(self._embedding_vocabulary())
+        
+        # Vectorized whole-corpus ranking, sharded across processes for large corpora
+        self.match_scorer = ShardedMatchScorer(self)
     
-    def _load_nlp_model(self):
-        """Load spaCy NLP model for semantic analysis"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            logger.info("Loaded spaCy model for job matching")
-        except OSError:
-            logger.warning("spaCy model not available. Using simpler matching methods.")
-            self.nlp = None
+    def _embedding_vocabulary(self) -> List[str]:
+        """Default skill vocabulary for the embedding table"""
+        vocabulary = set(skill_normalizer.canonicalize_skills(COMMON_SKILLS))
+        for config in self.skill_categories.values():
+            vocabulary.update(config['skills'])
+        return sorted(vocabulary)
     
     async def match_cv_with_job(self, cv_analysis_id: str, job_profile_id: str, db: Session) -> Dict[str, Any]:
         """Match a single CV with a specific job profile"""
@@ -88,16 +109,13 @@ class JobMatcher:
             if not job_profile:
                 raise ValueError(f"Job profile not found: {job_profile_id}")
             
-            # Get CV keywords
-            cv_keywords = db.query(KeywordMatchModel).filter(
-                KeywordMatchModel.CVAnalysisResultId == cv_analysis_id
-            ).all()
-            
-            cv_skills = [kw.Keyword.lower() for kw in cv_keywords if kw.IsMatched]
-            job_skills = [skill.lower() for skill in job_profile.SuggestedKeywords]
+            # Get CV skills from the compact feature record (stored skills are canonical)
+            cv_skills = feature_store.load_cv_skills(db, cv_analysis.Id)
+            job_skills = skill_normalizer.canonicalize_skills(job_profile.SuggestedKeywords)
+            self._track_canonical_matches(job_profile.SuggestedKeywords, cv_skills, job_skills)
             
             # Perform advanced matching
-            match_result = self._calculate_advanced_match(cv_skills, job_skills, cv_analysis, job_profile)
+            match_result = self._calculate_advanced_match(cv_skills, job_skills, cv_analysis.Score)
             
             return {
                 'cv_id': str(cv_analysis.CVFileId),
@@ -119,8 +137,16 @@ class JobMatcher:
             logger.error(f"Error matching CV with job: {e}")
             raise
     
-    async def match_cv_with_all_jobs(self, cv_analysis_id: str, db: Session) -> Dict[str, Any]:
-        """Match a CV with all available job profiles"""
+    async def match_cv_with_all_jobs(self, cv_analysis_id: str, db: Session, limit: Optional[int] = None,
+                                     min_score: Optional[float] = None,
+                                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Match a CV with all available job profiles
+        
+        Every job gets its overall score, but only the best ``limit`` matches
+        at or above ``min_score`` are returned, and the per-category breakdown
+        and detail fields (keyword lists, recommendations) are only computed
+        for those.
+        """
         try:
             # Get CV analysis result
             cv_analysis = db.query(CVAnalysisResultModel).filter(
@@ -145,46 +171,47 @@ class JobMatcher:
                     'average_match_percentage': 0
                 }
             
-            # Get CV keywords
-            cv_keywords = db.query(KeywordMatchModel).filter(
-                KeywordMatchModel.CVAnalysisResultId == cv_analysis_id
-            ).all()
-            
-            cv_skills = [kw.Keyword.lower() for kw in cv_keywords if kw.IsMatched]
-            
-            # Match with each job profile
-            matches = []
-            total_score = 0
-            
+            # Get CV skills from the compact feature record (stored skills are canonical)
+            cv_skills = feature_store.load_cv_skills(db, cv_analysis.Id)
+            job_skill_lists = []
             for job_profile in job_profiles:
-                job_skills = [skill.lower() for skill in job_profile.SuggestedKeywords]
-                match_result = self._calculate_advanced_match(cv_skills, job_skills, cv_analysis, job_profile)
-                
-                match_data = {
-                    'job_profile_id': str(job_profile.Id),
-                    'job_title': job_profile.Title,
-                    'match_percentage': match_result['match_percentage'],
-                    'total_job_keywords': len(job_skills),
-                    'matched_keywords_count': len(match_result['matched_keywords']),
-                    'matched_keywords': match_result['matched_keywords'],
-                    'missing_keywords': match_result['missing_keywords'],
-                    'semantic_similarity': match_result['semantic_similarity'],
-                    'weighted_score': match_result['weighted_score'],
-                    'category_scores': match_result['category_scores']
-                }
-                
-                matches.append(match_data)
-                total_score += match_result['match_percentage']
-            
-            # Sort by match percentage
-            matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-            
-            # Calculate average
+                job_skills = skill_normalizer.canonicalize_skills(job_profile.SuggestedKeywords)
+                self._track_canonical_matches(job_profile.SuggestedKeywords, cv_skills, job_skills)
+                job_skill_lists.append(job_skills)
+            
+            # Semantic similarity against every job in one batch
+            similarities = self._calculate_semantic_similarities([cv_skills], job_skill_lists)[0]
+            
+            # Overall score of every job; the average always covers all of them
+            scored = [
+                self._score_overall(cv_skills, job_skills, semantic_similarity=float(similarity))
+                for job_skills, similarity in zip(job_skill_lists, similarities)
+            ]
+            total_score = sum(result['match_percentage'] for result in scored)
             average_match = total_score / len(job_profiles) if job_profiles else 0
             
+            # Best matches first, job order breaking ties
+            candidates = [
+                (result['match_percentage'], index) for index, result in enumerate(scored)
+                if min_score is None or result['match_percentage'] >= min_score
+            ]
+            if limit is not None:
+                selected = heapq.nlargest(limit, candidates, key=lambda c: (c[0], -c[1]))
+            else:
+                selected = sorted(candidates, key=lambda c: (-c[0], c[1]))
+            
+            wanted = set(fields) if fields else DEFAULT_MATCH_FIELDS
+            matches = []
+            for _, index in selected:
+                scored[index]['category_scores'] = self._calculate_category_scores(cv_skills, job_skill_lists[index])
+                matches.append(self._job_match_item(
+                    job_profiles[index], job_skill_lists[index], scored[index], cv_skills, cv_analysis.Score, wanted
+                ))
+            
             return {
                 'cv_id': str(cv_analysis.CVFileId),
                 'cv_title': cv_analysis.cv_file.FileName if cv_analysis.cv_file else 'Unknown',
+                'duplicate_of': dedup_index.duplicate_links(db, [cv_analysis.CVFileId]).get(str(cv_analysis.CVFileId)),
                 'total_job_profiles': len(job_profiles),
                 'matches': matches,
                 'best_match': matches[0] if matches else None,
@@ -195,7 +222,66 @@ class JobMatcher:
             logger.error(f"Error matching CV with all jobs: {e}")
             raise
     
-    async def get_top_matches_for_job(self, job_profile_id: str, limit: int, db: Session) -> Dict[str, Any]:
+    def _job_match_item(self, job_profile: JobProfileModel, job_skills: List[str], scored: Dict[str, Any],
+                        cv_skills: List[str], cv_score: int, fields: set) -> Dict[str, Any]:
+        """One entry of a CV-vs-all-jobs response, restricted to the requested fields"""
+        result = scored
+        if fields & DETAIL_MATCH_FIELDS:
+            result = self._match_details(scored, cv_skills, job_skills, cv_score)
+        
+        item = {
+            'job_profile_id': str(job_profile.Id),
+            'job_title': job_profile.Title,
+            'match_percentage': result['match_percentage'],
+            'total_job_keywords': len(job_skills),
+            'matched_keywords_count': len(result['matched_keywords']),
+            'matched_keywords': result['matched_keywords'],
+            'missing_keywords': result.get('missing_keywords'),
+            'semantic_similarity': result['semantic_similarity'],
+            'weighted_score': result['weighted_score'],
+            'category_scores': result['category_scores'],
+            'recommendations': result.get('recommendations')
+        }
+        return {key: value for key, value in item.items() if key == 'job_profile_id' or key in fields}
+    
+    async def rank_jobs_by_text(self, cv_analysis_id: str, limit: int, db: Session) -> Dict[str, Any]:
+        """Rank all job profiles by full-text TF-IDF similarity to the CV's stored text"""
+        try:
+            row = db.query(CVAnalysisResultModel.CVFileId, CVFileModel.FileName, CVFileModel.ParsedText).join(
+                CVFileModel, CVFileModel.Id == CVAnalysisResultModel.CVFileId
+            ).filter(
+                CVAnalysisResultModel.Id == cv_analysis_id
+            ).first()
+            
+            if not row:
+                raise ValueError(f"CV analysis not found: {cv_analysis_id}")
+            if not row.ParsedText:
+                raise ValueError(f"CV has no stored text: {cv_analysis_id}")
+            
+            job_profiles = db.query(JobProfileModel).filter(
+                JobProfileModel.IsDeleted == False
+            ).all()
+            titles = {str(job_profile.Id): job_profile.Title for job_profile in job_profiles}
+            
+            ranking = tfidf_model.rank_profiles(row.ParsedText, job_profiles, db)
+            return {
+                'cv_id': str(row.CVFileId),
+                'cv_title': row.FileName,
+                'duplicate_of': dedup_index.duplicate_links(db, [row.CVFileId]).get(str(row.CVFileId)),
+                'total_job_profiles': len(job_profiles),
+                'model_documents': tfidf_model.n_docs,
+                'matches': [
+                    {'job_profile_id': job_profile_id, 'job_title': titles[job_profile_id], 'similarity': round(score, 4)}
+                    for job_profile_id, score in ranking[:limit]
+                ]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error ranking jobs by text: {e}")
+            raise
+    
+    async def get_top_matches_for_job(self, job_profile_id: str, limit: int, db: Session,
+                                      exclude_duplicates: bool = False) -> Dict[str, Any]:
         """Get top CV matches for a specific job profile"""
         try:
             # Get job profile
@@ -206,12 +292,10 @@ class JobMatcher:
             if not job_profile:
                 raise ValueError(f"Job profile not found: {job_profile_id}")
             
-            # Get all CV analysis results
-            cv_analyses = db.query(CVAnalysisResultModel).filter(
-                CVAnalysisResultModel.IsDeleted == False
-            ).all()
+            # Every CV's skills and display columns from the shared snapshot
+            corpus = await run_in_threadpool(corpus_snapshots.current, db)
             
-            if not cv_analyses:
+            if not len(corpus):
                 return {
                     'job_profile_id': str(job_profile.Id),
                     'job_title': job_profile.Title,
@@ -220,78 +304,150 @@ class JobMatcher:
                     'average_match_percentage': 0
                 }
             
-            job_skills = [skill.lower() for skill in job_profile.SuggestedKeywords]
-            matches = []
-            total_score = 0
+            return self.rank_corpus_for_jobs(corpus, [job_profile], limit, db, exclude_duplicates)[0]
             
-            for cv_analysis in cv_analyses:
-                # Get CV keywords
-                cv_keywords = db.query(KeywordMatchModel).filter(
-                    KeywordMatchModel.CVAnalysisResultId == cv_analysis.Id
-                ).all()
-                
-                cv_skills = [kw.Keyword.lower() for kw in cv_keywords if kw.IsMatched]
-                match_result = self._calculate_advanced_match(cv_skills, job_skills, cv_analysis, job_profile)
+        except Exception as e:
+            logger.error(f"Error getting top matches for job: {e}")
+            raise
+    
+    def rank_corpus_for_jobs(self, corpus: CorpusFeatures, job_profiles: List[JobProfileModel], limit: int,
+                             db: Session = None, exclude_duplicates: bool = False) -> List[Dict[str, Any]]:
+        """Top CVs of the corpus for each job profile (sharded scoring, details only for the winners)
+        
+        With ``db`` each match carries its near-duplicate link. Excluding
+        duplicates widens the top-K until enough originals remain, since a
+        duplicate scores the same as the CV it copies.
+        """
+        job_skill_lists = [skill_normalizer.canonicalize_skills(job_profile.SuggestedKeywords) for job_profile in job_profiles]
+        
+        top_k = limit
+        while True:
+            rankings = self.match_scorer.top_matches(corpus, job_skill_lists, top_k)
+            links = dedup_index.duplicate_links(
+                db, (corpus.cv_file_ids[row] for ranking in rankings for _, row in ranking['top'])
+            ) if db is not None else {}
+            if not exclude_duplicates:
+                break
+            for ranking in rankings:
+                ranking['kept'] = [item for item in ranking['top'] if str(corpus.cv_file_ids[item[1]]) not in links]
+            if top_k >= len(corpus) or all(len(ranking['kept']) >= limit for ranking in rankings):
+                for ranking in rankings:
+                    ranking['top'] = ranking['kept'][:limit]
+                break
+            top_k = min(top_k * 4, len(corpus))
+        
+        results = []
+        for job_profile, job_skills, ranking in zip(job_profiles, job_skill_lists, rankings):
+            top_matches = []
+            for _, row in ranking['top']:
+                cv_score = int(corpus.scores[row])
+                match_result = self._calculate_advanced_match(corpus.skills(row), job_skills, cv_score)
                 
-                match_data = {
-                    'cv_id': str(cv_analysis.CVFileId),
-                    'cv_file_name': cv_analysis.cv_file.FileName if cv_analysis.cv_file else 'Unknown',
+                top_matches.append({
+                    'cv_id': str(corpus.cv_file_ids[row]),
+                    'cv_file_name': corpus.file_names[row],
                     'match_percentage': match_result['match_percentage'],
                     'total_job_keywords': len(job_skills),
                     'matched_keywords_count': len(match_result['matched_keywords']),
                     'matched_keywords': match_result['matched_keywords'],
-                    'analysis_date': cv_analysis.CreatedAt,
+                    'analysis_date': corpus.created_at[row],
                     'semantic_similarity': match_result['semantic_similarity'],
                     'weighted_score': match_result['weighted_score'],
-                    'cv_score': cv_analysis.Score
-                }
-                
-                matches.append(match_data)
-                total_score += match_result['match_percentage']
-            
-            # Sort by match percentage and limit results
-            matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-            top_matches = matches[:limit]
-            
-            # Calculate average
-            average_match = total_score / len(cv_analyses) if cv_analyses else 0
+                    'cv_score': cv_score,
+                    'duplicate_of': links.get(str(corpus.cv_file_ids[row]))
+                })
             
-            return {
+            results.append({
                 'job_profile_id': str(job_profile.Id),
                 'job_title': job_profile.Title,
-                'total_cvs_analyzed': len(cv_analyses),
+                'total_cvs_analyzed': len(corpus),
                 'top_matches': top_matches,
-                'average_match_percentage': round(average_match, 2)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting top matches for job: {e}")
-            raise
+                'average_match_percentage': round(ranking['average'], 2)
+            })
+        
+        return results
+    
+    def iter_bulk_matches(self, corpus: CorpusFeatures, rows: np.ndarray, job_profiles: List[JobProfileModel],
+                          min_score: Optional[float] = None, top_k_per_cv: Optional[int] = None,
+                          include_details: bool = False) -> Iterator[Dict[str, Any]]:
+        """Score the CVs x jobs cross product batch by batch, yielding one record per CV"""
+        job_skill_lists = [skill_normalizer.canonicalize_skills(job_profile.SuggestedKeywords) for job_profile in job_profiles]
+        job_ids = [str(job_profile.Id) for job_profile in job_profiles]
+        
+        for batch_rows, scores in self.match_scorer.iter_score_batches(corpus, rows, job_skill_lists):
+            # Jobs per CV, best first (job order breaks ties)
+            order = np.argsort(-scores, axis=1, kind='stable')
+            if top_k_per_cv:
+                order = order[:, :top_k_per_cv]
+            
+            for position, row in enumerate(batch_rows):
+                matches = []
+                for column in order[position]:
+                    score = float(scores[position, column])
+                    if min_score is not None and score < min_score:
+                        break
+                    
+                    match = {'job_profile_id': job_ids[column], 'match_percentage': score}
+                    if include_details:
+                        match_result = self._calculate_advanced_match(
+                            corpus.skills(row), job_skill_lists[column], int(corpus.scores[row])
+                        )
+                        match.update({
+                            'matched_keywords': match_result['matched_keywords'],
+                            'missing_keywords': match_result['missing_keywords'],
+                            'semantic_similarity': match_result['semantic_similarity'],
+                            'weighted_score': match_result['weighted_score']
+                        })
+                    matches.append(match)
+                
+                if matches:
+                    yield {
+                        'cv_analysis_id': str(corpus.analysis_ids[row]),
+                        'cv_id': str(corpus.cv_file_ids[row]),
+                        'cv_file_name': corpus.file_names[row],
+                        'matches': matches
+                    }
     
-    def _calculate_advanced_match(self, cv_skills: List[str], job_skills: List[str], 
-                                cv_analysis: CVAnalysisResultModel, job_profile: JobProfileModel) -> Dict[str, Any]:
+    def _calculate_advanced_match(self, cv_skills: List[str], job_skills: List[str], cv_score: int,
+                                semantic_similarity: Optional[float] = None) -> Dict[str, Any]:
         """Calculate advanced matching score with multiple algorithms"""
         
+        # 1-8. Score the match
+        scored = self._score_match(cv_skills, job_skills, semantic_similarity)
+        
+        # 9. Detail lists and recommendations
+        return self._match_details(scored, cv_skills, job_skills, cv_score)
+    
+    def _score_match(self, cv_skills: List[str], job_skills: List[str],
+                     semantic_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Match percentage and its components, without the detail lists"""
+        scored = self._score_overall(cv_skills, job_skills, semantic_similarity)
+        scored['category_scores'] = self._calculate_category_scores(cv_skills, job_skills)
+        return scored
+    
+    def _score_overall(self, cv_skills: List[str], job_skills: List[str],
+                       semantic_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Match percentage and its components, without the per-category breakdown"""
+        
         # 1. Exact matching
         exact_matches = self._find_exact_matches(cv_skills, job_skills)
         
         # 2. Fuzzy matching for similar skills
         fuzzy_matches = self._find_fuzzy_matches(cv_skills, job_skills, exact_matches)
         
-        # 3. Semantic matching using NLP (if available)
-        semantic_similarity = self._calculate_semantic_similarity(cv_skills, job_skills)
+        # 3. Semantic matching using skill embeddings (skipped if precomputed in a batch)
+        if semantic_similarity is None:
+            semantic_similarity = self._calculate_semantic_similarity(cv_skills, job_skills)
         
         # 4. Category-based weighted scoring
-        category_scores = self._calculate_category_scores(cv_skills, job_skills)
+        category_score = self._category_weighted_score(cv_skills, job_skills)
         
         # 5. Combine all matches
         all_matched = list(set(exact_matches + fuzzy_matches))
-        missing_keywords = [skill for skill in job_skills if skill not in all_matched]
-        extra_keywords = [skill for skill in cv_skills if skill not in job_skills]
         
         # 6. Calculate weighted final score
         weighted_score = self._calculate_weighted_score(
-            exact_matches, fuzzy_matches, semantic_similarity, category_scores, job_skills
+            exact_matches, fuzzy_matches, semantic_similarity, category_score, job_skills
         )
         
         # 7. Calculate basic percentage
@@ -301,17 +457,31 @@ class JobMatcher:
         final_percentage = (basic_percentage * 0.6 + weighted_score * 0.4)
         final_percentage = min(final_percentage, 100)
         
-        # 9. Generate recommendations
-        recommendations = self._generate_recommendations(missing_keywords, category_scores, cv_analysis)
-        
         return {
             'match_percentage': round(final_percentage, 2),
             'matched_keywords': all_matched,
+            'semantic_similarity': round(semantic_similarity, 3),
+            'weighted_score': round(weighted_score, 2)
+        }
+    
+    def _match_details(self, scored: Dict[str, Any], cv_skills: List[str], job_skills: List[str],
+                       cv_score: int) -> Dict[str, Any]:
+        """Add missing/extra keywords and recommendations to a scored match"""
+        matched = set(scored['matched_keywords'])
+        job_skill_set = set(job_skills)
+        missing_keywords = [skill for skill in job_skills if skill not in matched]
+        extra_keywords = [skill for skill in cv_skills if skill not in job_skill_set]
+        
+        recommendations = self._generate_recommendations(missing_keywords, scored['category_scores'], cv_score)
+        
+        return {
+            'match_percentage': scored['match_percentage'],
+            'matched_keywords': scored['matched_keywords'],
             'missing_keywords': missing_keywords,
             'extra_keywords': extra_keywords[:10],  # Limit to 10 for brevity
-            'semantic_similarity': round(semantic_similarity, 3),
-            'weighted_score': round(weighted_score, 2),
-            'category_scores': category_scores,
+            'semantic_similarity': scored['semantic_similarity'],
+            'weighted_score': scored['weighted_score'],
+            'category_scores': scored['category_scores'],
             'recommendations': recommendations
         }
     
@@ -323,43 +493,69 @@ class JobMatcher:
     def _find_fuzzy_matches(self, cv_skills: List[str], job_skills: List[str], exact_matches: List[str]) -> List[str]:
         """Find fuzzy matches for skills not exactly matched"""
         fuzzy_matches = []
-        unmatched_job_skills = [skill for skill in job_skills if skill not in exact_matches]
+        exact_set = set(exact_matches)
+        cv_skills_set = set(cv_skills)
         
-        for job_skill in unmatched_job_skills:
-            # Use fuzzy string matching
-            best_match = process.extractOne(job_skill, cv_skills, score_cutoff=80)
-            if best_match:
+        for job_skill in job_skills:
+            if job_skill in exact_set or job_skill in fuzzy_matches:
+                continue
+            
+            # Fuzzy ratio and partial matches (e.g., "react.js" vs "react") are precomputed neighbours
+            self.match_stats['fuzzy_lookups'] += 1
+            if self.fuzzy_index.matches_any(job_skill, cv_skills_set):
                 fuzzy_matches.append(job_skill)
-                
-            # Check for partial matches (e.g., "react.js" vs "react")
-            for cv_skill in cv_skills:
-                if (job_skill in cv_skill or cv_skill in job_skill) and len(job_skill) > 2:
-                    if job_skill not in fuzzy_matches:
-                        fuzzy_matches.append(job_skill)
-                    break
         
         return fuzzy_matches
     
+    def _track_canonical_matches(self, raw_job_skills: List[str], cv_skills: List[str], job_skills: List[str]):
+        """Count job skills that became exact matches only through canonicalizing the job keywords
+
+        Stored CV skills are already canonical, so only the job side has a raw form to compare.
+        """
+        cv_set = set(cv_skills)
+        raw_exact = len({skill.lower().strip() for skill in raw_job_skills} & cv_set)
+        canonical_exact = len(set(job_skills) & cv_set)
+        alias_matches = max(canonical_exact - raw_exact, 0)
+        
+        self.match_stats['pairs'] += 1
+        self.match_stats['exact_matches'] += canonical_exact
+        self.match_stats['alias_exact_matches'] += alias_matches
+        # Each of these used to be an extractOne scan over every CV skill
+        self.match_stats['fuzzy_comparisons_avoided'] += alias_matches * len(cv_set)
+    
+    def get_canonicalization_report(self) -> Dict[str, Any]:
+        """How much fuzzy matching the alias table has turned into exact set hits"""
+        return {
+            'pairs_matched': self.match_stats['pairs'],
+            'exact_matches': self.match_stats['exact_matches'],
+            'alias_exact_matches': self.match_stats['alias_exact_matches'],
+            'fuzzy_lookups': self.match_stats['fuzzy_lookups'],
+            'fuzzy_comparisons_avoided': self.match_stats['fuzzy_comparisons_avoided'],
+            'normalizer': skill_normalizer.get_stats(),
+            'fuzzy_index': self.fuzzy_index.stats()
+        }
+    
     def _calculate_semantic_similarity(self, cv_skills: List[str], job_skills: List[str]) -> float:
-        """Calculate semantic similarity using NLP"""
-        if not self.nlp or not cv_skills or not job_skills:
+        """Calculate semantic similarity as the cosine of mean skill vectors"""
+        if not cv_skills or not job_skills:
             return 0.0
         
         try:
-            # Create skill vectors
-            cv_text = " ".join(cv_skills)
-            job_text = " ".join(job_skills)
-            
-            cv_doc = self.nlp(cv_text)
-            job_doc = self.nlp(job_text)
-            
-            # Calculate similarity
-            return cv_doc.similarity(job_doc)
+            return self.skill_embeddings.similarity(cv_skills, job_skills)
             
         except Exception as e:
             logger.warning(f"Error calculating semantic similarity: {e}")
             return 0.0
     
+    def _calculate_semantic_similarities(self, cv_skill_lists: List[List[str]], job_skill_lists: List[List[str]]) -> np.ndarray:
+        """Calculate semantic similarity for every CV/job pair in one batch"""
+        try:
+            return self.skill_embeddings.similarity_matrix(cv_skill_lists, job_skill_lists)
+            
+        except Exception as e:
+            logger.warning(f"Error calculating semantic similarities: {e}")
+            return np.zeros((len(cv_skill_lists), len(job_skill_lists)), dtype=np.float32)
+    
     def _calculate_category_scores(self, cv_skills: List[str], job_skills: List[str]) -> Dict[str, Dict[str, Any]]:
         """Calculate scores by skill category with weights"""
         category_scores = {}
@@ -383,8 +579,23 @@ class JobMatcher:
         
         return category_scores
     
+    def _category_weighted_score(self, cv_skills: List[str], job_skills: List[str]) -> float:
+        """Weight-normalised category score, the sum ``_calculate_category_scores`` details per category"""
+        cv_skill_set = set(cv_skills)
+        category_weighted_score = 0
+        total_weight = 0
+        
+        for config in self.skill_categories.values():
+            category_job_skills = [skill for skill in job_skills if skill in config['skills']]
+            if category_job_skills:
+                matched_count = sum(1 for skill in category_job_skills if skill in cv_skill_set)
+                category_weighted_score += round(matched_count / len(category_job_skills) * config['weight'] * 100, 2)
+                total_weight += config['weight'] * 100
+        
+        return category_weighted_score / total_weight * 100 if total_weight > 0 else 0
+    
     def _calculate_weighted_score(self, exact_matches: List[str], fuzzy_matches: List[str], 
-                                semantic_similarity: float, category_scores: Dict, job_skills: List[str]) -> float:
+                                semantic_similarity: float, category_weighted_score: float, job_skills: List[str]) -> float:
         """Calculate final weighted score"""
         if not job_skills:
             return 0.0
@@ -394,17 +605,6 @@ class JobMatcher:
         fuzzy_score = len(fuzzy_matches) / len(job_skills) * 50  # Fuzzy matches get less weight
         semantic_score = semantic_similarity * 30  # Semantic bonus
         
-        # Category-based weighted score
-        category_weighted_score = 0
-        total_weight = 0
-        
-        for category_data in category_scores.values():
-            category_weighted_score += category_data['weighted_score']
-            total_weight += category_data['weight'] * 100
-        
-        if total_weight > 0:
-            category_weighted_score = category_weighted_score / total_weight * 100
-        
         # Combine all scores
         final_score = (
             exact_score * 0.4 +           # 40% for exact matches
@@ -416,7 +616,7 @@ class JobMatcher:
         return min(final_score, 100)
     
     def _generate_recommendations(self, missing_keywords: List[str], category_scores: Dict, 
-                                cv_analysis: CVAnalysisResultModel) -> List[str]:
+                                cv_score: int) -> List[str]:
         """Generate improvement recommendations based on missing skills"""
         recommendations = []
         
@@ -440,7 +640,7 @@ class JobMatcher:
                 recommendations.append(f"Strengthen your {category.replace('_', ' ')} skills")
         
         # CV quality recommendations
-        if cv_analysis.Score < 70:
+        if cv_score < 70:
             recommendations.append("Improve your CV overall score by enhancing format and content quality")
         
         return recommendations[:5]  # Limit to top 5 recommendations
@@ -0,0 +1,282 @@
+# app/services/match_scorer.py
+import os
+import heapq
+from typing import List, Dict, Any, Tuple, Iterator, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app.core.config import settings
+from app.services.feature_store import CorpusFeatures
+
+# Snapshot arrays attached by each worker process, keyed by snapshot directory
+_worker_snapshots: Dict[str, Dict[str, np.ndarray]] = {}
+
+def _attach_snapshot(source: str) -> Dict[str, np.ndarray]:
+    """Map the arrays a shard needs (once per snapshot version per worker)"""
+    arrays = _worker_snapshots.get(source)
+    if arrays is None:
+        _worker_snapshots.clear()
+        arrays = {
+            name: np.load(os.path.join(source, f"{name}.npy"), mmap_mode='r')
+            for name in ('indptr', 'indices', 'term_vectors')
+        }
+        _worker_snapshots[source] = arrays
+    return arrays
+
+def _score_snapshot_shard(source: str, start: int, stop: int, plans: List[Dict[str, Any]], top_k: int):
+    """Worker entry point: top-K of rows [start, stop) of a snapshot against every plan"""
+    arrays = _attach_snapshot(source)
+    return score_rows(arrays['indptr'], arrays['indices'], arrays['term_vectors'], start, stop, plans, top_k)
+
+def _score_snapshot_batch(source: str, rows: np.ndarray, plans: List[Dict[str, Any]]) -> np.ndarray:
+    """Worker entry point: full score matrix of selected snapshot rows"""
+    arrays = _attach_snapshot(source)
+    return score_matrix(arrays['indptr'], arrays['indices'], arrays['term_vectors'], rows, plans)
+
+def score_rows(indptr: np.ndarray, indices: np.ndarray, term_vectors: np.ndarray,
+               start: int, stop: int, plans: List[Dict[str, Any]], top_k: int) -> List[Tuple[List[Tuple[float, int]], float]]:
+    """Per plan, the top-K ``(match_percentage, row)`` pairs of a row range and the sum over it"""
+    scores = score_matrix(indptr, indices, term_vectors, slice(start, stop), plans)
+    return [
+        (_top_k(scores[:, column], start, top_k), float(scores[:, column].sum()))
+        for column in range(len(plans))
+    ]
+
+def score_matrix(indptr: np.ndarray, indices: np.ndarray, term_vectors: np.ndarray,
+                 rows: Union[slice, np.ndarray], plans: List[Dict[str, Any]]) -> np.ndarray:
+    """Match percentages of CV rows (a range or an index array) against each job plan
+
+    Reproduces ``JobMatcher._calculate_advanced_match`` with matrix products:
+    exact and fuzzy hits are ``X @ A`` against per-job skill/neighbour
+    indicator matrices, category matches are column sums and semantic
+    similarity is the cosine of summed term vectors.
+    """
+    X = _csr_rows(indptr, indices, rows, term_vectors.shape[0])
+
+    cv_vectors = np.asarray(X @ term_vectors, dtype=np.float32)
+    norms = np.linalg.norm(cv_vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    cv_vectors /= norms
+
+    scores = np.zeros((X.shape[0], len(plans)), dtype=np.float64)
+    for column, plan in enumerate(plans):
+        scores[:, column] = _score_plan(X, cv_vectors, plan, term_vectors.shape[0])
+    return scores
+
+def _csr_rows(indptr: np.ndarray, indices: np.ndarray, rows: Union[slice, np.ndarray], vocabulary_size: int) -> csr_matrix:
+    """Binary CV x vocabulary matrix for a row range or selection"""
+    if isinstance(rows, slice):
+        offset = int(indptr[rows.start])
+        row_ptr = np.asarray(indptr[rows.start:rows.stop + 1], dtype=np.int64) - offset
+        row_ids = np.asarray(indices[offset:int(indptr[rows.stop])], dtype=np.int64)
+    else:
+        starts = np.asarray(indptr[rows], dtype=np.int64)
+        stops = np.asarray(indptr[rows + 1], dtype=np.int64)
+        row_ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(stops - starts, out=row_ptr[1:])
+        row_ids = np.concatenate([indices[a:b] for a, b in zip(starts, stops)]).astype(np.int64) if len(rows) else np.empty(0, dtype=np.int64)
+
+    return csr_matrix(
+        (np.ones(len(row_ids), dtype=np.float32), row_ids, row_ptr),
+        shape=(len(row_ptr) - 1, vocabulary_size)
+    )
+
+def _score_plan(X: csr_matrix, cv_vectors: np.ndarray, plan: Dict[str, Any], vocabulary_size: int) -> np.ndarray:
+    job_skill_count = plan['job_skill_count']
+    if not job_skill_count:
+        return np.zeros(X.shape[0], dtype=np.float64)
+
+    exact_hits = _hits(X, plan['exact_ids'], plan['exact_cols'], vocabulary_size, job_skill_count)
+    neighbour_hits = _hits(X, plan['neighbour_ids'], plan['neighbour_cols'], vocabulary_size, job_skill_count)
+    exact_count = exact_hits.sum(axis=1)
+    matched_count = (exact_hits | neighbour_hits).sum(axis=1)
+    fuzzy_count = matched_count - exact_count
+
+    # Category scores: round() per category is looked up, exactly as the scalar path computes it
+    category_score = np.zeros(X.shape[0], dtype=np.float64)
+    for category in plan['categories']:
+        if len(category['ids']):
+            matched = np.asarray(X[:, category['ids']].sum(axis=1)).ravel().astype(np.int64)
+        else:
+            matched = np.zeros(X.shape[0], dtype=np.int64)
+        category_score = category_score + category['scores'][matched]
+    if plan['category_weight_total'] > 0:
+        category_score = category_score / plan['category_weight_total'] * 100
+
+    semantic = np.clip(cv_vectors @ plan['job_vector'], 0.0, 1.0).astype(np.float64)
+
+    weighted = (
+        exact_count / job_skill_count * 100 * 0.4 +
+        fuzzy_count / job_skill_count * 50 * 0.2 +
+        semantic * 30 * 0.2 +
+        category_score * 0.2
+    )
+    weighted = np.minimum(weighted, 100)
+    basic = matched_count / job_skill_count * 100
+    return np.round(np.minimum(basic * 0.6 + weighted * 0.4, 100), 2)
+
+def _hits(X: csr_matrix, ids: np.ndarray, cols: np.ndarray, vocabulary_size: int, job_skill_count: int) -> np.ndarray:
+    """Boolean (rows, job skills) matrix: does the CV hold any id mapped to that job skill"""
+    if not len(ids):
+        return np.zeros((X.shape[0], job_skill_count), dtype=bool)
+    A = csr_matrix((np.ones(len(ids), dtype=np.float32), (ids, cols)), shape=(vocabulary_size, job_skill_count))
+    return (X @ A).toarray() > 0
+
+def _top_k(scores: np.ndarray, start: int, top_k: int) -> List[Tuple[float, int]]:
+    """Best rows by score, earlier rows first on ties (the stable-sort order of the scalar path)"""
+    if not len(scores) or top_k <= 0:
+        return []
+    k = min(top_k, len(scores))
+    threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((candidates, -scores[candidates]))[:k]
+    return [(float(scores[candidates[i]]), int(candidates[i]) + start) for i in order]
+
+class ShardedMatchScorer:
+    """Rank a whole corpus against job profiles, sharded across worker processes"""
+
+    def __init__(self, matcher, shards: int = None, min_shard_size: int = None):
+        self.matcher = matcher
+        self.shards = shards or settings.MATCH_SHARDS or os.cpu_count() or 1
+        self.min_shard_size = min_shard_size or settings.MATCH_MIN_SHARD_SIZE
+        self._executor = None
+        self._term_ids_cache: Tuple[int, Dict[str, int]] = (0, {})
+
+    def top_matches(self, corpus: CorpusFeatures, job_skill_lists: List[List[str]], top_k: int) -> List[Dict[str, Any]]:
+        """Per job: the top-K ``(match_percentage, row)`` pairs and the corpus average"""
+        plans = [self.build_plan(corpus, job_skills) for job_skills in job_skill_lists]
+        if not len(corpus):
+            return [{'top': [], 'average': 0} for _ in plans]
+
+        bounds = self._shard_bounds(len(corpus), corpus.source is not None)
+        if len(bounds) == 1:
+            shard_results = [score_rows(corpus.indptr, corpus.indices, self._term_vectors(corpus), 0, len(corpus), plans, top_k)]
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_score_snapshot_shard, corpus.source, start, stop, plans, top_k)
+                for start, stop in bounds
+            ]
+            shard_results = [future.result() for future in futures]
+
+        results = []
+        for plan_index in range(len(plans)):
+            # Each shard's list is already sorted; merge them and keep the global top-K
+            merged = heapq.merge(
+                *(shard[plan_index][0] for shard in shard_results),
+                key=lambda item: (-item[0], item[1])
+            )
+            total = sum(shard[plan_index][1] for shard in shard_results)
+            results.append({
+                'top': list(merged)[:top_k],
+                'average': total / len(corpus)
+            })
+        return results
+
+    def iter_score_batches(self, corpus: CorpusFeatures, rows: np.ndarray, job_skill_lists: List[List[str]],
+                           batch_size: int = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield ``(rows, scores)`` batches of the rows x jobs cross product, in order
+
+        Snapshot-backed batches are scored ahead in the pool, with a bounded
+        number in flight so a slow consumer does not pile up score matrices.
+        """
+        batch_size = batch_size or settings.MATCH_BATCH_SIZE
+        plans = [self.build_plan(corpus, job_skills) for job_skills in job_skill_lists]
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+        if corpus.source is None or self.shards == 1 or len(rows) < self.min_shard_size:
+            term_vectors = self._term_vectors(corpus)
+            for batch in batches:
+                yield batch, score_matrix(corpus.indptr, corpus.indices, term_vectors, batch, plans)
+            return
+
+        executor = self._get_executor()
+        pending = deque()
+        for batch in batches:
+            pending.append((batch, executor.submit(_score_snapshot_batch, corpus.source, batch, plans)))
+            if len(pending) >= self.shards * 2:
+                done_batch, future = pending.popleft()
+                yield done_batch, future.result()
+        while pending:
+            done_batch, future = pending.popleft()
+            yield done_batch, future.result()
+
+    def build_plan(self, corpus: CorpusFeatures, job_skills: List[str]) -> Dict[str, Any]:
+        """Everything a shard needs to score one job, as small picklable arrays"""
+        term_ids = self._term_ids(corpus)
+        matcher = self.matcher
+
+        exact_ids, exact_cols, neighbour_ids, neighbour_cols = [], [], [], []
+        for col, job_skill in enumerate(job_skills):
+            if job_skill in term_ids:
+                exact_ids.append(term_ids[job_skill])
+                exact_cols.append(col)
+            for neighbour in matcher.fuzzy_index.neighbours(job_skill):
+                if neighbour in term_ids:
+                    neighbour_ids.append(term_ids[neighbour])
+                    neighbour_cols.append(col)
+
+        categories = []
+        category_weight_total = 0
+        for config in matcher.skill_categories.values():
+            category_job_skills = [skill for skill in job_skills if skill in config['skills']]
+            if not category_job_skills:
+                continue
+            required = len(category_job_skills)
+            categories.append({
+                'ids': np.asarray([term_ids[skill] for skill in category_job_skills if skill in term_ids], dtype=np.int64),
+                # Same rounding as _calculate_category_scores for every possible matched count
+                'scores': np.asarray([round(matched / required * config['weight'] * 100, 2) for matched in range(required + 1)])
+            })
+            category_weight_total += config['weight'] * 100
+
+        return {
+            'job_skill_count': len(job_skills),
+            'exact_ids': np.asarray(exact_ids, dtype=np.int64),
+            'exact_cols': np.asarray(exact_cols, dtype=np.int64),
+            'neighbour_ids': np.asarray(neighbour_ids, dtype=np.int64),
+            'neighbour_cols': np.asarray(neighbour_cols, dtype=np.int64),
+            'categories': categories,
+            'category_weight_total': category_weight_total,
+            'job_vector': matcher.skill_embeddings.mean_vectors([job_skills])[0]
+        }
+
+    def _term_ids(self, corpus: CorpusFeatures) -> Dict[str, int]:
+        """Term -> vocabulary id; the fuzzy index is refreshed when the vocabulary grows"""
+        cached_size, term_ids = self._term_ids_cache
+        if cached_size != len(corpus.terms):
+            term_ids = {term: term_id for term_id, term in enumerate(corpus.terms) if term}
+            self.matcher.fuzzy_index.add_terms(term_ids)
+            self._term_ids_cache = (len(corpus.terms), term_ids)
+        return term_ids
+
+    def _term_vectors(self, corpus: CorpusFeatures) -> np.ndarray:
+        if corpus.term_vectors is None:
+            present = [term_id for term_id, term in enumerate(corpus.terms) if term]
+            vectors = np.zeros((len(corpus.terms), self.matcher.skill_embeddings.dim), dtype=np.float32)
+            if present:
+                vectors[present] = self.matcher.skill_embeddings.embed([corpus.terms[term_id] for term_id in present])
+            corpus.term_vectors = vectors
+        return corpus.term_vectors
+
+    def _shard_bounds(self, size: int, shardable: bool) -> List[Tuple[int, int]]:
+        """Contiguous row ranges; in-memory corpora and small ones stay in one shard"""
+        shard_count = min(self.shards, size // self.min_shard_size) if shardable else 1
+        shard_count = max(shard_count, 1)
+        edges = np.linspace(0, size, shard_count + 1, dtype=np.int64)
+        return [(int(edges[i]), int(edges[i + 1])) for i in range(shard_count)]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting match scoring pool with {self.shards} shard workers")
+            self._executor = ProcessPoolExecutor(max_workers=self.shards)
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,64 @@
+# app/services/metrics.py
+import threading
+from collections import deque
+from typing import Dict, Any
+
+import numpy as np
+
+from app.core.config import settings
+
+class LatencyMetric:
+    """Running count and mean of one latency, with percentiles over a recent window"""
+
+    def __init__(self, window: int = None):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._recent = deque(maxlen=window or settings.METRICS_WINDOW)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = np.fromiter(self._recent, dtype=np.float64, count=len(self._recent))
+            count, total, maximum = self.count, self.total_seconds, self.max_seconds
+        p50, p95, p99 = np.percentile(recent, [50, 95, 99]) * 1000 if len(recent) else (None, None, None)
+        return {
+            'count': count,
+            'mean_ms': round(total / count * 1000, 2) if count else None,
+            'p50_ms': None if p50 is None else round(float(p50), 2),
+            'p95_ms': None if p95 is None else round(float(p95), 2),
+            'p99_ms': None if p99 is None else round(float(p99), 2),
+            'max_ms': round(maximum * 1000, 2) if count else None,
+            'window': len(recent)
+        }
+
+class MetricsRegistry:
+    """Named in-process latency metrics"""
+
+    def __init__(self):
+        self._latencies: Dict[str, LatencyMetric] = {}
+        self._lock = threading.Lock()
+
+    def latency(self, name: str) -> LatencyMetric:
+        with self._lock:
+            if name not in self._latencies:
+                self._latencies[name] = LatencyMetric()
+            return self._latencies[name]
+
+    def observe(self, name: str, seconds: float):
+        self.latency(name).observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            latencies = dict(self._latencies)
+        return {name: metric.snapshot() for name, metric in sorted(latencies.items())}
+
+# Shared instance
+metrics = MetricsRegistry()
@@ -0,0 +1,128 @@
+# app/services/ner_enricher.py
+from typing import List, Dict, Any, Iterable, Tuple, Hashable
+from loguru import logger
+
+import spacy
+
+from app.core.config import settings
+from app.core.constants import CVSections
+
+# Components the enrichment never reads; excluded at load time so they are neither built nor run
+UNUSED_COMPONENTS = [
+    "parser", "tagger", "morphologizer", "attribute_ruler", "lemmatizer", "trainable_lemmatizer",
+    "senter", "textcat", "textcat_multilabel", "spancat", "entity_linker"
+]
+
+INSTITUTION_LABEL = "INSTITUTION"
+JOB_TITLE_LABEL = "JOB_TITLE"
+
+INSTITUTION_WORDS = ["university", "universitesi", "üniversitesi", "college", "institute", "institut", "academy", "polytechnic", "school"]
+SENIORITY_WORDS = ["senior", "junior", "lead", "principal", "staff", "chief", "head", "associate", "assistant"]
+ROLE_QUALIFIERS = [
+    "software", "data", "project", "product", "program", "web", "mobile", "frontend", "backend",
+    "front", "back", "end", "full", "stack", "-", "devops", "cloud", "machine", "learning", "ml", "qa",
+    "test", "system", "systems", "network", "security", "it", "business", "marketing", "sales",
+    "ux", "ui", "research", "database", "site", "reliability", "embedded", "game", "technical"
+]
+ROLE_NOUNS = [
+    "engineer", "developer", "programmer", "architect", "analyst", "consultant", "specialist",
+    "manager", "director", "coordinator", "scientist", "administrator", "designer", "tester",
+    "intern", "internship", "officer"
+]
+
+def _ruler_patterns() -> List[Dict[str, Any]]:
+    """Token patterns for the labels the statistical NER model does not have"""
+    patterns = []
+    for case in ("IS_TITLE", "IS_UPPER"):
+        # "Anadolu University", "KOCAELI UNIVERSITESI"
+        patterns.append({"label": INSTITUTION_LABEL, "pattern": [
+            {case: True, "LOWER": {"NOT_IN": INSTITUTION_WORDS}, "OP": "+"},
+            {"LOWER": {"IN": INSTITUTION_WORDS}}
+        ]})
+        # "University of Oxford", "Institute of Technology"
+        patterns.append({"label": INSTITUTION_LABEL, "pattern": [
+            {"LOWER": {"IN": INSTITUTION_WORDS}}, {"LOWER": "of"}, {case: True, "OP": "+"}
+        ]})
+    patterns.append({"label": INSTITUTION_LABEL, "pattern": [{"LOWER": {"IN": ["école", "ecole"]}}, {"TEXT": "42"}]})
+    patterns.append({"label": INSTITUTION_LABEL, "pattern": [{"TEXT": "42"}, {"IS_TITLE": True}]})
+
+    patterns.append({"label": JOB_TITLE_LABEL, "pattern": [
+        {"LOWER": {"IN": SENIORITY_WORDS}, "OP": "*"},
+        {"LOWER": {"IN": ROLE_QUALIFIERS}, "OP": "*"},
+        {"LOWER": {"IN": ROLE_NOUNS}}
+    ]})
+    return patterns
+
+class NEREnricher:
+    """Batched spaCy NER over CV education and experience sections
+
+    Loads ``SPACY_MODEL`` with only the NER component (and the embedding layer
+    it listens to, if any), puts an EntityRuler for institutions and job titles
+    in front of it, and streams whole batches of section texts through
+    ``nlp.pipe``. Without an installed model the ruler runs on a blank pipeline.
+    """
+
+    def __init__(self, model: str = None, batch_size: int = None, n_process: int = None, max_chars: int = None):
+        self.model = model or settings.SPACY_MODEL
+        self.batch_size = batch_size or settings.NER_BATCH_SIZE
+        self.n_process = n_process or settings.NER_PROCESSES
+        self.max_chars = max_chars or settings.NER_MAX_CHARS
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = self._load_pipeline()
+        return self._nlp
+
+    def _load_pipeline(self):
+        try:
+            nlp = spacy.load(self.model, exclude=UNUSED_COMPONENTS)
+        except OSError:
+            logger.warning(f"spaCy model {self.model} not found; NER enrichment uses pattern rules only")
+            nlp = spacy.blank("en")
+
+        # Drop shared embedding layers nothing left in the pipeline listens to
+        for name in ("tok2vec", "transformer"):
+            if name in nlp.pipe_names and not getattr(nlp.get_pipe(name), "listening_components", None):
+                nlp.remove_pipe(name)
+
+        ruler_options = {"before": "ner"} if "ner" in nlp.pipe_names else {}
+        nlp.add_pipe("entity_ruler", **ruler_options).add_patterns(_ruler_patterns())
+        logger.info(f"NER enrichment pipeline: {nlp.pipe_names}")
+        return nlp
+
+    def enrich(self, items: Iterable[Tuple[Hashable, str, Dict[str, str]]]) -> Dict[Hashable, Dict[str, List[str]]]:
+        """Institutions, job titles and organisations for a batch of CVs
+
+        ``items`` are (key, cleaned text, sections). Each CV contributes its
+        education and experience sections (or the whole text when a section is
+        missing), each capped at ``max_chars``.
+        """
+        docs = []
+        entities = {}
+        for key, text, sections in items:
+            entities[key] = {'institutions': [], 'job_titles': [], 'organizations': []}
+            for section in (CVSections.EDUCATION, CVSections.EXPERIENCE):
+                docs.append(((sections.get(section) or text)[:self.max_chars], (key, section)))
+
+        # Extra processes only pay off once every one of them gets at least a full batch
+        n_process = max(1, min(self.n_process, len(docs) // self.batch_size))
+        for doc, (key, section) in self.nlp.pipe(docs, as_tuples=True, batch_size=self.batch_size, n_process=n_process):
+            found = entities[key]
+            for ent in doc.ents:
+                name = ent.text.strip()
+                if ent.label_ == JOB_TITLE_LABEL and section == CVSections.EXPERIENCE:
+                    found['job_titles'].append(name)
+                elif ent.label_ == INSTITUTION_LABEL or (
+                    ent.label_ == "ORG" and any(word in ent.lower_ for word in INSTITUTION_WORDS)
+                ):
+                    if section == CVSections.EDUCATION and name not in found['institutions']:
+                        found['institutions'].append(name)
+                elif ent.label_ == "ORG" and section == CVSections.EXPERIENCE and name not in found['organizations']:
+                    found['organizations'].append(name)
+
+        return entities
+
+# Shared instance
+ner_enricher = NEREnricher()
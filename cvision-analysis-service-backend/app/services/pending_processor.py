@@ -1,13 +1,18 @@
 # app/services/pending_processor.py
 import asyncio
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, defer, load_only
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.database import SessionLocal
 from app.models import CVFileModel
 from app.services.cv_analyzer import CVAnalyzer
+from app.services.statistics_service import statistics_service
+from app.services.tfidf_model import tfidf_model
+from app.services.metrics import metrics
+from app.services.file_prefetcher import FilePrefetcher
 from app.core.config import settings
 from app.core.constants import CVStatus
 
@@ -16,6 +21,7 @@ class PendingCVProcessor:
     
     def __init__(self):
         self.cv_analyzer = CVAnalyzer()
+        self.file_prefetcher = FilePrefetcher() if settings.PREFETCH_ENABLED else None
         self.is_running = False
         self.processed_count = 0
         self.failed_count = 0
@@ -23,6 +29,7 @@ class PendingCVProcessor:
     async def start_processing(self):
         """Start the background processing loop"""
         self.is_running = True
+        statistics_service.processor_running = True
         logger.info("Started pending CV processor")
         
         while self.is_running:
@@ -30,6 +37,8 @@ class PendingCVProcessor:
                 db = SessionLocal()
                 try:
                     await self.process_batch(db)
+                    # Fold newly analysed CVs into the corpus TF-IDF model
+                    tfidf_model.maybe_refresh(db)
                 finally:
                     db.close()
                 
@@ -52,12 +61,27 @@ class PendingCVProcessor:
             
             logger.info(f"Processing {len(pending_cvs)} pending CVs")
             
+            if self.file_prefetcher is not None:
+                # Read this batch's files, and the next batch's while the loop runs, during analysis
+                upcoming = self._get_next_pending_cvs(db, pending_cvs) if self.is_running else []
+                self.file_prefetcher.prefetch(pending_cvs + upcoming)
+            
             # Process each CV
             for cv_file in pending_cvs:
+                previous_status = cv_file.AnalysisStatus
+                previous_score = cv_file.analysis_result.Score if cv_file.analysis_result else None
                 try:
-                    success = await self.cv_analyzer.analyze_cv(cv_file, db)
+                    if self.file_prefetcher is not None:
+                        async with self.file_prefetcher.claim(cv_file) as source:
+                            success = await self.cv_analyzer.analyze_cv(cv_file, db, source=source)
+                    else:
+                        success = await self.cv_analyzer.analyze_cv(cv_file, db)
+                    score = cv_file.analysis_result.Score if cv_file.analysis_result else None
+                    statistics_service.record_analysis(previous_status, cv_file.AnalysisStatus, previous_score, score)
                     if success:
                         self.processed_count += 1
+                        if cv_file.UploadedAt:
+                            metrics.observe("upload_to_score.poller", (datetime.utcnow() - cv_file.UploadedAt).total_seconds())
                         logger.info(f"Successfully processed CV: {cv_file.FileName}")
                     else:
                         self.failed_count += 1
@@ -71,27 +95,57 @@ class PendingCVProcessor:
                     cv_file.AnalysisStatus = CVStatus.FAILED
                     cv_file.UpdatedAt = datetime.utcnow()
                     db.commit()
+                    statistics_service.record_analysis(previous_status, CVStatus.FAILED, previous_score, previous_score)
             
             logger.info(f"Batch processing completed. Processed: {self.processed_count}, Failed: {self.failed_count}")
             
         except Exception as e:
             logger.error(f"Error in batch processing: {e}")
 
+    @staticmethod
+    def _claimable():
+        """Pending CVs, and CVs whose analysis stopped in Processing more than PROCESSING_TIMEOUT ago"""
+        stalled_since = datetime.utcnow() - timedelta(seconds=settings.PROCESSING_TIMEOUT)
+        return or_(
+            CVFileModel.AnalysisStatus == CVStatus.PENDING,
+            and_(
+                CVFileModel.AnalysisStatus == CVStatus.PROCESSING,
+                func.coalesce(CVFileModel.UpdatedAt, CVFileModel.UploadedAt) < stalled_since
+            )
+        )
+
     def _get_pending_cvs(self, db: Session) -> List[CVFileModel]:
-        """Get pending CVs from database"""
+        """Get pending CVs from database, oldest upload first"""
         try:
-            return db.query(CVFileModel).filter(
-                CVFileModel.AnalysisStatus == CVStatus.PENDING,
+            # ParsedText is only written here, so don't pull it for every pending row
+            return db.query(CVFileModel).options(defer(CVFileModel.ParsedText)).filter(
+                self._claimable(),
                 CVFileModel.IsDeleted == False
-            ).limit(settings.BATCH_SIZE).all()
+            ).order_by(CVFileModel.UploadedAt, CVFileModel.Id).limit(settings.BATCH_SIZE).all()
             
         except Exception as e:
             logger.error(f"Error fetching pending CVs: {e}")
             return []
 
+    def _get_next_pending_cvs(self, db: Session, current: List[CVFileModel]) -> List[CVFileModel]:
+        """Paths of the pending CVs that make up the next batch, in the same order as ``_get_pending_cvs``"""
+        try:
+            return db.query(CVFileModel).options(load_only(CVFileModel.Id, CVFileModel.FilePath)).filter(
+                self._claimable(),
+                CVFileModel.IsDeleted == False,
+                CVFileModel.Id.notin_([cv_file.Id for cv_file in current])
+            ).order_by(CVFileModel.UploadedAt, CVFileModel.Id).limit(settings.BATCH_SIZE).all()
+            
+        except Exception as e:
+            logger.error(f"Error fetching next pending CVs: {e}")
+            return []
+
     def stop_processing(self):
         """Stop the background processing"""
         self.is_running = False
+        statistics_service.processor_running = False
+        if self.file_prefetcher is not None:
+            self.file_prefetcher.clear()
         logger.info("Stopped pending CV processor")
 
     def get_stats(self) -> dict:
@@ -108,10 +162,11 @@ class PendingCVProcessor:
 # app/services/file_processor.py
 # ================================
 import os
-import shutil
+import hashlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, BinaryIO
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from loguru import logger
 
 from app.core.config import settings
@@ -123,8 +178,15 @@ class FileProcessor:
         self.upload_folder = Path(settings.UPLOAD_FOLDER)
         self.upload_folder.mkdir(exist_ok=True)
 
-    async def save_uploaded_file(self, file: UploadFile, user_id: str) -> Optional[str]:
-        """Save uploaded CV file to disk"""
+    async def save_uploaded_file(self, file: UploadFile, user_id: str) -> Optional[Dict[str, Any]]:
+        """Stream an uploaded CV to disk, hashing and size-checking it on the way
+
+        Chunks are read from the upload and written and hashed in the
+        threadpool, so a large file never blocks the event loop. Returns the
+        saved path with the file's SHA-256 and size, or None if the file is
+        rejected (the partial file is removed).
+        """
+        file_path = None
         try:
             # Validate file
             if not self._is_valid_file(file):
@@ -134,23 +196,46 @@ class FileProcessor:
             user_folder = self.upload_folder / user_id
             user_folder.mkdir(exist_ok=True)
             
-            # Generate unique filename
-            file_extension = Path(file.filename).suffix
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{file.filename}"
-            file_path = user_folder / filename
+            # Generate unique filename (client paths are reduced to their last component)
+            original_name = Path(file.filename).name
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            file_path = user_folder / f"{timestamp}_{original_name}"
             
-            # Save file
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            digest = hashlib.sha256()
+            size = 0
+            buffer = await run_in_threadpool(open, file_path, "wb")
+            try:
+                while True:
+                    chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > settings.MAX_FILE_SIZE:
+                        raise ValueError(f"File too large: more than {settings.MAX_FILE_SIZE} bytes")
+                    await run_in_threadpool(self._write_chunk, buffer, digest, chunk)
+            finally:
+                await run_in_threadpool(buffer.close)
             
-            logger.info(f"Saved file: {file_path}")
-            return str(file_path)
+            logger.info(f"Saved file: {file_path} ({size} bytes)")
+            return {
+                'file_path': str(file_path),
+                'file_name': original_name,
+                'file_type': Path(original_name).suffix.lower().lstrip('.'),
+                'sha256': digest.hexdigest(),
+                'size_bytes': size
+            }
             
         except Exception as e:
             logger.error(f"Error saving file: {e}")
+            if file_path is not None:
+                file_path.unlink(missing_ok=True)
             return None
 
+    @staticmethod
+    def _write_chunk(buffer: BinaryIO, digest, chunk: bytes):
+        digest.update(chunk)
+        buffer.write(chunk)
+
     def _is_valid_file(self, file: UploadFile) -> bool:
         """Validate uploaded file"""
         if not file.filename:
@@ -163,7 +248,7 @@ class FileProcessor:
             return False
         
         # Check file size (if we can get it)
-        if hasattr(file, 'size') and file.size > settings.MAX_FILE_SIZE:
+        if getattr(file, 'size', None) and file.size > settings.MAX_FILE_SIZE:
             logger.warning(f"File too large: {file.size} bytes")
             return False
         
@@ -255,22 +340,17 @@ class NotificationService:
 # app/services/job_profile_matcher.py
 # ================================
 from typing import List, Dict, Any, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
 from loguru import logger
 
 from app.models import JobProfileModel
+from app.services.tfidf_model import tfidf_model, TfidfCorpusModel
 
 class JobProfileMatcher:
     """Service to match CVs against job profiles"""
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2)
-        )
+    def __init__(self, model: TfidfCorpusModel = None):
+        # Shared corpus model: same vocabulary and IDF for every CV, so scores are comparable
+        self.model = model or tfidf_model
 
     def match_cv_to_profiles(self, cv_text: str, job_profiles: List[JobProfileModel]) -> List[Tuple[str, float]]:
         """Match CV against multiple job profiles and return similarity scores"""
@@ -278,34 +358,8 @@ class JobProfileMatcher:
             if not job_profiles:
                 return []
             
-            # Prepare texts for comparison
-            texts = [cv_text]
-            profile_texts = []
-            
-            for profile in job_profiles:
-                # Combine title and keywords for matching
-                profile_text = f"{profile.Title} {' '.join(profile.SuggestedKeywords)}"
-                profile_texts.append(profile_text)
-                texts.append(profile_text)
-            
-            # Calculate TF-IDF similarity
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            cv_vector = tfidf_matrix[0:1]  # First row is CV
-            profile_vectors = tfidf_matrix[1:]  # Rest are profiles
-            
-            # Calculate cosine similarity
-            similarities = cosine_similarity(cv_vector, profile_vectors).flatten()
-            
-            # Create results with profile IDs and scores
-            results = []
-            for i, profile in enumerate(job_profiles):
-                score = float(similarities[i])
-                results.append((str(profile.Id), score))
-            
-            # Sort by similarity score (descending)
-            results.sort(key=lambda x: x[1], reverse=True)
-            
-            return results
+            # One sparse mat-vec against the pre-transformed profile vectors
+            return self.model.rank_profiles(cv_text, job_profiles)
             
         except Exception as e:
             logger.error(f"Error matching CV to profiles: {e}")
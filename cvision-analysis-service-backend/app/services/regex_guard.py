@@ -0,0 +1,136 @@
+# app/services/regex_guard.py
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator
+
+import regex
+from loguru import logger
+
+from app.core.config import settings
+
+# Time budget of the document being analysed in this thread/task
+_document_budget: contextvars.ContextVar = contextvars.ContextVar("regex_document_budget", default=None)
+
+class DocumentBudget:
+    """Pattern time a document has left; only time spent inside patterns is charged"""
+
+    def __init__(self, document_id: Any, seconds: float):
+        self.document_id = document_id
+        self.seconds = seconds
+        self.spent = 0.0
+        self.exhausted = False
+
+    def remaining(self) -> float:
+        return self.seconds - self.spent
+
+class RegexGuard:
+    """Pattern evaluation with per-call timeouts and a per-document time budget
+
+    Patterns run on the ``regex`` engine, which can abort a match after a
+    timeout; stdlib ``re`` cannot be interrupted. A call that times out keeps
+    the matches found so far, and once a document has spent its budget the
+    remaining calls return no matches. Every pattern that hit a limit is kept
+    in a per-process report.
+    """
+
+    def __init__(self, timeout: float = None, document_budget: float = None):
+        self.timeout = timeout or settings.REGEX_TIMEOUT_SECONDS
+        self.document_budget = document_budget or settings.REGEX_DOCUMENT_BUDGET_SECONDS
+        self._compiled: Dict[tuple, Any] = {}
+        self._stats: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def document(self, document_id: Any, budget: Optional[DocumentBudget] = None) -> Iterator[DocumentBudget]:
+        """Share one time budget across all patterns run for a document
+
+        Pass the budget yielded by an earlier block to keep charging it when a
+        document's stages run apart (nested calls reuse the active budget).
+        """
+        active = _document_budget.get()
+        if active is not None:
+            yield active
+            return
+        budget = budget or DocumentBudget(document_id, self.document_budget)
+        token = _document_budget.set(budget)
+        try:
+            yield budget
+        finally:
+            _document_budget.reset(token)
+
+    def finditer(self, pattern: str, text: str, flags: int = 0) -> List[Any]:
+        """All matches (those found before a timeout, if one occurs)"""
+        matches = []
+        self._run(pattern, flags, lambda compiled, timeout: matches.extend(compiled.finditer(text, timeout=timeout)))
+        return matches
+
+    def search(self, pattern: str, text: str, flags: int = 0) -> Optional[Any]:
+        return self._run(pattern, flags, lambda compiled, timeout: compiled.search(text, timeout=timeout))
+
+    def sub(self, pattern: str, replacement: str, text: str, flags: int = 0) -> str:
+        """Substitute, or return the text unchanged if the pattern runs out of time"""
+        result = self._run(pattern, flags, lambda compiled, timeout: compiled.sub(replacement, text, timeout=timeout))
+        return text if result is None else result
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Patterns that hit their timeout or were skipped on an exhausted document budget"""
+        with self._lock:
+            entries = [dict(stats) for stats in self._stats.values() if stats['timeouts'] or stats['skipped']]
+        return sorted(entries, key=lambda stats: (stats['timeouts'], stats['skipped']), reverse=True)
+
+    def _run(self, pattern: str, flags: int, call):
+        budget = _document_budget.get()
+        timeout = self.timeout
+        if budget is not None:
+            timeout = min(timeout, budget.remaining())
+            if budget.exhausted or timeout <= 0:
+                if not budget.exhausted:
+                    budget.exhausted = True
+                    logger.warning(f"Regex budget of {self.document_budget}s exhausted for document {budget.document_id}")
+                self._record(pattern, flags, 0.0, skipped=True, document_id=budget.document_id)
+                return None
+
+        compiled = self._compile(pattern, flags)
+        started = time.perf_counter()
+        try:
+            return call(compiled, timeout)
+        except TimeoutError:
+            elapsed = time.perf_counter() - started
+            document_id = budget.document_id if budget is not None else None
+            logger.warning(f"Regex timed out after {elapsed:.2f}s on document {document_id}: {pattern[:80]!r}")
+            self._record(pattern, flags, elapsed, timed_out=True, document_id=document_id)
+            return None
+        finally:
+            if budget is not None:
+                budget.spent += time.perf_counter() - started
+
+    def _compile(self, pattern: str, flags: int):
+        key = (pattern, flags)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            # VERSION0 keeps stdlib re semantics for the existing patterns
+            compiled = self._compiled[key] = regex.compile(pattern, flags | regex.VERSION0)
+        return compiled
+
+    def _record(self, pattern: str, flags: int, elapsed: float, timed_out: bool = False,
+                skipped: bool = False, document_id: Any = None):
+        with self._lock:
+            stats = self._stats.setdefault((pattern, flags), {
+                'pattern': pattern,
+                'timeouts': 0,
+                'skipped': 0,
+                'max_seconds': 0.0,
+                'last_document_id': None,
+                'last_hit_at': None
+            })
+            stats['timeouts'] += timed_out
+            stats['skipped'] += skipped
+            stats['max_seconds'] = round(max(stats['max_seconds'], elapsed), 3)
+            stats['last_document_id'] = str(document_id) if document_id is not None else None
+            stats['last_hit_at'] = datetime.utcnow()
+
+# Shared instance
+regex_guard = RegexGuard()
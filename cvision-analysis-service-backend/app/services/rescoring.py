@@ -0,0 +1,128 @@
+# app/services/rescoring.py
+import time
+from typing import Dict, Any, Optional
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+
+from app.database import scan_in_chunks
+from app.models import CVAnalysisResultModel, CVAnalysisFeatureModel
+from app.core.config import settings
+from app.core.constants import AnalysisMetrics
+from app.services.analytics_rollups import analytics_rollups, SCORE, ANALYSES
+
+class BulkRescorer:
+    """Recompute CV scores from persisted sub-scores when scoring weights change
+
+    Weights come from settings (SKILLS_WEIGHT etc.), which new analyses use
+    too. Other weights can only be tried as a dry run; writing them would
+    leave the stored scores out of line with every analysis that follows.
+    """
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or settings.SCAN_CHUNK_SIZE
+
+    def default_weights(self) -> Dict[str, float]:
+        """Weights currently configured for new analyses"""
+        return {
+            'skills': settings.SKILLS_WEIGHT,
+            'experience': settings.EXPERIENCE_WEIGHT,
+            'education': settings.EDUCATION_WEIGHT,
+            'format': settings.FORMAT_WEIGHT
+        }
+
+    def rescore(self, db: Session, weights: Optional[Dict[str, float]] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Recompute Score for the whole corpus without touching CV files"""
+        started = time.perf_counter()
+        weights = {**self.default_weights(), **(weights or {})}
+        if not dry_run and weights != self.default_weights():
+            raise ValueError("Only the configured weights can be written; change SKILLS_WEIGHT, EXPERIENCE_WEIGHT, "
+                             "EDUCATION_WEIGHT and FORMAT_WEIGHT in the settings, or pass dry_run")
+
+        result_ids, sub_scores, current_scores = self._load_sub_scores(db)
+        loaded = time.perf_counter()
+
+        # Same formula and summation order as CVAnalyzer._calculate_overall_score, so
+        # unchanged weights reproduce the stored scores exactly
+        overall = (
+            sub_scores[:, 0] * weights['skills'] +
+            sub_scores[:, 1] * weights['experience'] +
+            sub_scores[:, 2] * weights['education'] +
+            sub_scores[:, 3] * weights['format']
+        )
+        new_scores = np.minimum(overall, AnalysisMetrics.MAX_SCORE).astype(np.int64)
+        changed = np.flatnonzero(new_scores != current_scores)
+        computed = time.perf_counter()
+
+        if not dry_run and len(changed):
+            self._write_scores(db, result_ids, new_scores, changed)
+            # Score buckets move wholesale; a grouped rebuild is cheaper than per-row deltas
+            analytics_rollups.rebuild(db, dimensions=(SCORE, ANALYSES))
+        finished = time.perf_counter()
+
+        summary = {
+            'weights': weights,
+            'total_analyses': len(result_ids),
+            'changed_scores': int(len(changed)),
+            'average_score_before': round(float(current_scores.mean()), 2) if len(result_ids) else None,
+            'average_score_after': round(float(new_scores.mean()), 2) if len(result_ids) else None,
+            'dry_run': dry_run,
+            'timings_seconds': {
+                'load': round(loaded - started, 3),
+                'compute': round(computed - loaded, 3),
+                'write': round(finished - computed, 3),
+                'total': round(finished - started, 3)
+            }
+        }
+        logger.info(f"Rescored {summary['total_analyses']} analyses, {summary['changed_scores']} changed in {summary['timings_seconds']['total']}s")
+        return summary
+
+    def _load_sub_scores(self, db: Session):
+        """Stream sub-scores into numpy arrays"""
+        result_ids = []
+        sub_scores = []
+        current_scores = []
+
+        query = db.query(
+            CVAnalysisFeatureModel.CVAnalysisResultId,
+            CVAnalysisFeatureModel.SkillsScore,
+            CVAnalysisFeatureModel.ExperienceScore,
+            CVAnalysisFeatureModel.EducationScore,
+            CVAnalysisFeatureModel.FormatScore,
+            CVAnalysisResultModel.Score
+        ).join(
+            CVAnalysisResultModel, CVAnalysisResultModel.Id == CVAnalysisFeatureModel.CVAnalysisResultId
+        ).filter(
+            CVAnalysisResultModel.IsDeleted == False
+        )
+
+        for chunk in scan_in_chunks(query, CVAnalysisFeatureModel.CVAnalysisResultId, self.chunk_size):
+            for row in chunk:
+                result_ids.append(row[0])
+                sub_scores.append(row[1:5])
+                current_scores.append(row[5])
+
+        return (
+            result_ids,
+            np.asarray(sub_scores, dtype=np.float64).reshape(-1, 4),
+            np.asarray(current_scores, dtype=np.int64)
+        )
+
+    def _write_scores(self, db: Session, result_ids, new_scores: np.ndarray, changed: np.ndarray):
+        """Bulk update only the scores that actually changed"""
+        try:
+            now = datetime.utcnow()
+            for start in range(0, len(changed), self.chunk_size):
+                chunk = changed[start:start + self.chunk_size]
+                db.bulk_update_mappings(CVAnalysisResultModel, [
+                    {'Id': result_ids[i], 'Score': int(new_scores[i]), 'UpdatedAt': now}
+                    for i in chunk
+                ])
+                db.commit()
+
+        except Exception as e:
+            logger.error(f"Error writing rescored results: {e}")
+            db.rollback()
+            raise
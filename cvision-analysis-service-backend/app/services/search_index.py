@@ -0,0 +1,261 @@
+# app/services/search_index.py
+import os
+import re
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from app.core.config import settings
+from app.database import scan_in_chunks
+from app.models import CVFileModel, CVAnalysisResultModel, CVAnalysisFeatureModel
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    cv_file_id TEXT NOT NULL UNIQUE,
+    analysis_id TEXT,
+    file_name TEXT,
+    years REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_years ON documents (years);
+CREATE VIRTUAL TABLE IF NOT EXISTS cv_text USING fts5(content, tokenize = 'porter unicode61');
+"""
+
+# "5+ years", "3 years", "10+ yrs of experience"
+YEARS_FILTER = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?)(?:\s+of\s+experience)?", re.IGNORECASE)
+QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|[^\s(),"]+')
+OPERATORS = {"AND", "OR", "NOT"}
+
+def parse_query(query: str) -> Tuple[str, Optional[float]]:
+    """Recruiter query -> (FTS5 MATCH expression, minimum years of experience)
+
+    Quoted text is a phrase, AND/OR/NOT (upper case) and parentheses are kept,
+    a trailing ``*`` is a prefix search, and commas or spaces mean AND.
+    """
+    min_years = None
+    match = YEARS_FILTER.search(query)
+    if match:
+        min_years = float(match.group(1))
+        query = query[:match.start()] + " " + query[match.end():]
+
+    parts = []
+    for token in QUERY_TOKEN.findall(query):
+        if token in OPERATORS or token in ("(", ")"):
+            parts.append(token)
+        elif token.startswith('"'):
+            phrase = token.strip('"').strip()
+            if phrase:
+                parts.append('"' + phrase.replace('"', '""') + '"')
+        else:
+            prefix = token.endswith("*")
+            term = token.rstrip("*").replace('"', '""')
+            if term:
+                parts.append(f'"{term}"' + ("*" if prefix else ""))
+
+    # Drop dangling operators so "kafka AND" still searches for kafka
+    while parts and parts[-1] in OPERATORS:
+        parts.pop()
+    while parts and parts[0] in OPERATORS - {"NOT"}:
+        parts.pop(0)
+
+    return " ".join(parts), min_years
+
+class CVSearchIndex:
+    """On-disk BM25 inverted index over ParsedText (SQLite FTS5)
+
+    The analysis process writes through ``upsert`` as each CV completes; API
+    workers open short-lived read connections, and WAL mode lets them read
+    while a write is in progress. ``rebuild`` writes a fresh file and swaps it in.
+
+    The file is derived data and is not kept on a mounted volume; a fresh
+    container starts without it and ``rebuild_if_empty`` restores it.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or settings.SEARCH_INDEX_PATH)
+        self._write_lock = threading.Lock()
+
+    def search(self, query: str, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """BM25-ranked page of CVs matching a recruiter query"""
+        started = time.perf_counter()
+        fts_query, min_years = parse_query(query)
+        if not fts_query:
+            raise ValueError("Query has no search terms")
+
+        # Rank on the FTS table alone and build snippets only for the requested page.
+        # CROSS JOIN fixes the loop order: full-text match outside the experience filter,
+        # and the ranked page outside the snippet lookup (one rowid probe per hit).
+        source = "cv_text"
+        where = "cv_text MATCH ?"
+        params: List[Any] = [fts_query]
+        if min_years is not None:
+            source = "cv_text CROSS JOIN documents ON documents.id = cv_text.rowid"
+            where += " AND documents.years >= ?"
+            params.append(min_years)
+
+        try:
+            with self._connect() as connection:
+                total = connection.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+                rows = connection.execute(
+                    f"""SELECT documents.cv_file_id, documents.analysis_id, documents.file_name, documents.years,
+                               page.rank, snippet(cv_text, 0, '[', ']', '…', 16)
+                        FROM (SELECT cv_text.rowid, rank FROM {source} WHERE {where} ORDER BY rank LIMIT ? OFFSET ?) AS page
+                        CROSS JOIN cv_text ON cv_text.rowid = page.rowid
+                        JOIN documents ON documents.id = page.rowid
+                        WHERE cv_text MATCH ?
+                        ORDER BY page.rank""",
+                    params + [page_size, (page - 1) * page_size, fts_query]
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            if "fts5" in str(e) or "syntax" in str(e):
+                raise ValueError(f"Invalid search query: {e}")
+            raise
+
+        return {
+            'query': query,
+            'fts_query': fts_query,
+            'min_years': min_years,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'hits': [
+                {
+                    'cv_id': cv_file_id,
+                    'analysis_id': analysis_id,
+                    'file_name': file_name,
+                    'years_of_experience': years,
+                    # FTS5 bm25() is negative; larger is better here
+                    'score': round(-rank, 4),
+                    'snippet': snippet
+                }
+                for cv_file_id, analysis_id, file_name, years, rank, snippet in rows
+            ],
+            'took_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def upsert(self, cv_file_id: Any, analysis_id: Any, file_name: str, text: str, years: float = 0.0):
+        """Index (or re-index) one CV"""
+        self.upsert_many([(cv_file_id, analysis_id, file_name, text, years)])
+
+    def upsert_many(self, documents: Iterable[Tuple[Any, Any, str, str, float]]):
+        with self._write_lock, self._connect() as connection:
+            self._insert(connection, documents, replace=True)
+
+    def remove(self, cv_file_id: Any):
+        with self._write_lock, self._connect() as connection:
+            row = connection.execute("SELECT id FROM documents WHERE cv_file_id = ?", (str(cv_file_id),)).fetchone()
+            if row:
+                connection.execute("DELETE FROM cv_text WHERE rowid = ?", row)
+                connection.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def rebuild(self, db: Session) -> Dict[str, Any]:
+        """Index every analysed CV into a new file, then swap it in"""
+        started = time.perf_counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+
+        query = db.query(
+            CVFileModel.Id, CVAnalysisResultModel.Id, CVFileModel.FileName, CVFileModel.ParsedText,
+            CVAnalysisFeatureModel.YearsOfExperience
+        ).join(
+            CVAnalysisResultModel, CVAnalysisResultModel.CVFileId == CVFileModel.Id
+        ).outerjoin(
+            CVAnalysisFeatureModel, CVAnalysisFeatureModel.CVAnalysisResultId == CVAnalysisResultModel.Id
+        ).filter(
+            CVFileModel.ParsedText != None,
+            CVFileModel.IsDeleted == False,
+            CVAnalysisResultModel.IsDeleted == False
+        )
+
+        documents = 0
+        connection = self._open(tmp_path)
+        try:
+            for chunk in scan_in_chunks(query, CVFileModel.Id, settings.SEARCH_INDEX_CHUNK_SIZE):
+                with connection:
+                    self._insert(connection, chunk, replace=False)
+                documents += len(chunk)
+            connection.execute("INSERT INTO cv_text(cv_text) VALUES ('optimize')")
+            connection.commit()
+        finally:
+            connection.close()
+
+        with self._write_lock:
+            os.replace(tmp_path, self.path)
+            for suffix in ("-wal", "-shm"):
+                Path(str(self.path) + suffix).unlink(missing_ok=True)
+
+        summary = {
+            'documents': documents,
+            'size_bytes': self.path.stat().st_size,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+        logger.info(f"Rebuilt CV search index: {summary}")
+        return summary
+
+    def rebuild_if_empty(self, db: Session) -> Optional[Dict[str, Any]]:
+        """Rebuild when the index file is missing or holds no documents"""
+        if self.status()['documents']:
+            return None
+        logger.info(f"CV search index {self.path} is missing or empty; rebuilding it from the database")
+        return self.rebuild(db)
+
+    def status(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {'path': str(self.path), 'documents': 0, 'size_bytes': 0}
+        with self._connect() as connection:
+            documents = connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {'path': str(self.path), 'documents': documents, 'size_bytes': self.path.stat().st_size}
+
+    def _insert(self, connection: sqlite3.Connection, documents: Iterable[Tuple[Any, Any, str, str, float]], replace: bool):
+        for cv_file_id, analysis_id, file_name, text, years in documents:
+            cv_file_id = str(cv_file_id)
+            if replace:
+                row = connection.execute("SELECT id FROM documents WHERE cv_file_id = ?", (cv_file_id,)).fetchone()
+                if row:
+                    connection.execute("DELETE FROM cv_text WHERE rowid = ?", row)
+                    connection.execute("DELETE FROM documents WHERE id = ?", row)
+
+            cursor = connection.execute(
+                "INSERT INTO documents (cv_file_id, analysis_id, file_name, years) VALUES (?, ?, ?, ?)",
+                (cv_file_id, str(analysis_id) if analysis_id else None, file_name, float(years or 0))
+            )
+            connection.execute("INSERT INTO cv_text (rowid, content) VALUES (?, ?)", (cursor.lastrowid, text or ""))
+
+    def _connect(self) -> "_ClosingConnection":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return _ClosingConnection(self._open(self.path))
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(path), timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA mmap_size={settings.SEARCH_INDEX_MMAP_BYTES}")
+        connection.executescript(SCHEMA)
+        return connection
+
+class _ClosingConnection:
+    """Commit (or roll back) and close, unlike sqlite3's own context manager"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+
+# Shared instance
+search_index = CVSearchIndex()
@@ -0,0 +1,194 @@
+# app/services/skill_embeddings.py
+import os
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import List, Iterable, Optional
+from loguru import logger
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from app.core.config import settings
+from app.core.constants import COMMON_SKILLS
+
+BACKEND_CHAR_NGRAM = "char-ngram"
+BACKEND_SPACY = "spacy"
+
+CURRENT_FILE = "CURRENT"
+
+class SkillEmbeddingTable:
+    """Precomputed skill vectors stored as a memory-mapped .npy file
+
+    The vector file is opened with ``mmap_mode='r'`` so every worker process
+    shares the same pages through the OS page cache instead of holding its own
+    copy. Semantic similarity is the cosine between mean skill vectors.
+
+    Each save writes the vectors and their term list into a new version
+    directory and then replaces the ``CURRENT`` pointer, so a reader always
+    gets vectors and terms from the same version.
+    """
+
+    def __init__(self, vectors: np.ndarray, terms: List[str], backend: str = BACKEND_CHAR_NGRAM):
+        self.vectors = vectors
+        self.terms = terms
+        self.backend = backend
+        self.dim = vectors.shape[1]
+        self.term_index = {term: i for i, term in enumerate(terms)}
+        self._hasher = _build_hasher(self.dim)
+
+    @classmethod
+    def build(cls, terms: Iterable[str], nlp=None, dim: int = None) -> "SkillEmbeddingTable":
+        """Embed a skill vocabulary in memory"""
+        terms = sorted({term.lower().strip() for term in terms if term and term.strip()})
+        dim = dim or settings.SKILL_EMBEDDING_DIM
+
+        # Real word vectors only exist in the md/lg models; en_core_web_sm has none,
+        # so fall back to hashed character n-grams which at least capture spelling
+        if nlp is not None and nlp.vocab.vectors.shape[0] > 0:
+            vectors = np.vstack([nlp.make_doc(term).vector for term in terms]).astype(np.float32)
+            backend = BACKEND_SPACY
+        else:
+            vectors = _build_hasher(dim).transform(terms).toarray().astype(np.float32)
+            backend = BACKEND_CHAR_NGRAM
+
+        return cls(vectors, terms, backend)
+
+    @classmethod
+    def load(cls, path: str = None) -> "SkillEmbeddingTable":
+        """Attach to the current saved version without reading it into memory"""
+        root = Path(path or settings.SKILL_EMBEDDINGS_PATH)
+        version = _read_current(root)
+        if version is None:
+            raise FileNotFoundError(f"No skill embedding table saved in {root}")
+
+        with open(root / version / "meta.json", "r", encoding="utf-8") as meta_file:
+            metadata = json.load(meta_file)
+
+        vectors = np.load(root / version / "vectors.npy", mmap_mode="r")
+        return cls(vectors, metadata["terms"], metadata.get("backend", BACKEND_CHAR_NGRAM))
+
+    @classmethod
+    def load_or_build(cls, terms: Iterable[str] = None, path: str = None) -> "SkillEmbeddingTable":
+        """Load the shared table, building it from the default vocabulary if missing"""
+        path = Path(path or settings.SKILL_EMBEDDINGS_PATH)
+        try:
+            if _read_current(path) is not None:
+                table = cls.load(path)
+                logger.info(f"Loaded skill embedding table: {path} ({len(table.terms)} skills)")
+                return table
+        except Exception as e:
+            logger.warning(f"Failed to load skill embedding table {path}: {e}")
+
+        table = cls.build(terms if terms is not None else COMMON_SKILLS)
+        try:
+            table.save(path)
+            return cls.load(path)
+        except OSError as e:
+            logger.warning(f"Could not persist skill embedding table to {path}: {e}")
+            return table
+
+    def save(self, path: str = None) -> str:
+        """Write a new version and publish it with one pointer swap; returns the version"""
+        root = Path(path or settings.SKILL_EMBEDDINGS_PATH)
+        version = f"{datetime.utcnow():%Y%m%d%H%M%S%f}-{os.getpid()}"
+        staging = root / f"{version}.tmp"
+        staging.mkdir(parents=True, exist_ok=True)
+
+        try:
+            np.save(staging / "vectors.npy", np.ascontiguousarray(self.vectors, dtype=np.float32))
+            with open(staging / "meta.json", "w", encoding="utf-8") as meta_file:
+                json.dump({"backend": self.backend, "dim": self.dim, "terms": self.terms}, meta_file)
+            os.replace(staging, root / version)
+        except BaseException:
+            # Only this save's own staging directory is ours to remove
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        _write_current(root, version)
+        _collect_garbage(root, version)
+        logger.info(f"Saved skill embedding table: {root / version} ({len(self.terms)} skills, backend={self.backend})")
+        return version
+
+    def embed(self, skills: List[str]) -> np.ndarray:
+        """Return one vector per skill, hashing unknown skills on the fly"""
+        result = np.zeros((len(skills), self.dim), dtype=np.float32)
+        unknown_positions = []
+
+        for position, skill in enumerate(skills):
+            row = self.term_index.get(skill)
+            if row is not None:
+                result[position] = self.vectors[row]
+            else:
+                unknown_positions.append(position)
+
+        # Unknown skills can only be embedded when the table itself is hash-based
+        if unknown_positions and self.backend == BACKEND_CHAR_NGRAM:
+            hashed = self._hasher.transform([skills[i] for i in unknown_positions]).toarray()
+            result[unknown_positions] = hashed
+
+        return result
+
+    def mean_vectors(self, skill_lists: List[List[str]]) -> np.ndarray:
+        """L2-normalised mean vector per skill list (zero rows for empty lists)"""
+        means = np.zeros((len(skill_lists), self.dim), dtype=np.float32)
+
+        for i, skills in enumerate(skill_lists):
+            if skills:
+                means[i] = self.embed(skills).mean(axis=0)
+
+        norms = np.linalg.norm(means, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return means / norms
+
+    def similarity_matrix(self, left: List[List[str]], right: List[List[str]]) -> np.ndarray:
+        """Cosine similarity between every pair of skill lists, clipped to [0, 1]
+
+        Batch all jobs for one CV (``left=[cv_skills]``) or all CVs for one job
+        (``right=[job_skills]``) to amortise the embedding work.
+        """
+        if not left or not right:
+            return np.zeros((len(left), len(right)), dtype=np.float32)
+
+        similarities = self.mean_vectors(left) @ self.mean_vectors(right).T
+        return np.clip(similarities, 0.0, 1.0)
+
+    def similarity(self, left: List[str], right: List[str]) -> float:
+        """Cosine similarity between two skill lists"""
+        if not left or not right:
+            return 0.0
+        return float(self.similarity_matrix([left], [right])[0, 0])
+
+def _build_hasher(dim: int) -> HashingVectorizer:
+    """Character n-gram hasher used for the fallback backend"""
+    return HashingVectorizer(
+        analyzer="char_wb",
+        ngram_range=(2, 4),
+        n_features=dim,
+        lowercase=True,
+        norm="l2"
+    )
+
+def _read_current(root: Path) -> Optional[str]:
+    try:
+        version = (root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+        return version if (root / version).is_dir() else None
+    except OSError:
+        return None
+
+def _write_current(root: Path, version: str):
+    tmp_path = root / f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp_path.write_text(version, encoding="utf-8")
+    os.replace(tmp_path, root / CURRENT_FILE)
+
+def _collect_garbage(root: Path, current: str, keep: int = 1):
+    """Remove superseded versions, keeping ``keep`` for readers that read the old pointer
+
+    ``*.tmp`` staging directories are left alone: they belong to saves that
+    may still be running in other processes, and each save cleans up its own.
+    """
+    complete = sorted(p for p in root.iterdir() if p.is_dir() and p.name != current and not p.name.endswith(".tmp"))
+
+    for directory in complete[:max(len(complete) - keep, 0)]:
+        shutil.rmtree(directory, ignore_errors=True)
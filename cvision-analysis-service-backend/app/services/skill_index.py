@@ -0,0 +1,148 @@
+# app/services/skill_index.py
+from typing import Dict, Set, Iterable
+from collections import defaultdict, OrderedDict
+from loguru import logger
+
+from fuzzywuzzy import fuzz
+from fuzzywuzzy.utils import full_process
+
+from app.core.config import settings
+
+class FuzzySkillIndex:
+    """Trigram-postings index over the skill vocabulary with precomputed fuzzy neighbours
+
+    ``neighbours(job_skill)`` is the set of vocabulary terms that the previous
+    ``process.extractOne`` + substring scan would have accepted as a fuzzy match,
+    so matching a CV against a job becomes a set intersection.
+
+    Only the vocabulary is indexed (``add_terms`` when it grows). Skills
+    outside it are matched against the candidates their trigrams select,
+    without being added, so the index does not grow with the traffic.
+    """
+
+    def __init__(self, threshold: int = None, query_cache_size: int = None):
+        self.threshold = threshold or settings.FUZZY_MATCH_THRESHOLD
+        self.query_cache_size = query_cache_size or settings.FUZZY_QUERY_CACHE_SIZE
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._short_terms: Set[str] = set()
+        self._neighbours: Dict[str, Set[str]] = {}
+        self._query_cache: "OrderedDict[str, Set[str]]" = OrderedDict()  # Unindexed term -> neighbours
+        self.comparisons = 0
+
+    @classmethod
+    def build(cls, terms: Iterable[str], threshold: int = None) -> "FuzzySkillIndex":
+        """Index a vocabulary and precompute every neighbour set"""
+        index = cls(threshold)
+        index.add_terms(terms)
+        logger.info(f"Built fuzzy skill index: {len(index)} terms, {index.comparisons} comparisons")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._neighbours)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._neighbours
+
+    def add_terms(self, terms: Iterable[str]):
+        """Add new vocabulary terms, keeping existing neighbour sets up to date"""
+        added = False
+        for term in terms:
+            if term not in self._neighbours:
+                self._add(term)
+                added = True
+        if added:
+            self._query_cache.clear()
+
+    def neighbours(self, term: str) -> Set[str]:
+        """Indexed terms a job skill fuzzy-matches (computed without indexing it if unseen)"""
+        neighbours = self._neighbours.get(term)
+        if neighbours is not None:
+            return neighbours
+
+        neighbours = self._query_cache.get(term)
+        if neighbours is not None:
+            self._query_cache.move_to_end(term)
+            return neighbours
+
+        neighbours = {term} | {candidate for candidate in self._candidates(term) if self._is_fuzzy_match(term, candidate)}
+        self._query_cache[term] = neighbours
+        if len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+        return neighbours
+
+    def matches_any(self, job_skill: str, skills: Set[str]) -> bool:
+        """Whether a job skill fuzzy-matches any of ``skills``, indexed or not"""
+        if not self.neighbours(job_skill).isdisjoint(skills):
+            return True
+        return any(self._is_fuzzy_match(job_skill, skill) for skill in skills if skill not in self._neighbours)
+
+    def _add(self, term: str):
+        candidates = self._candidates(term)
+        neighbours = {term}
+
+        for candidate in candidates:
+            # The relation is not symmetric (substring rule depends on the job skill length)
+            if self._is_fuzzy_match(term, candidate):
+                neighbours.add(candidate)
+            if self._is_fuzzy_match(candidate, term):
+                self._neighbours[candidate].add(term)
+
+        self._neighbours[term] = neighbours
+
+        trigrams = self._trigrams(term)
+        if trigrams:
+            for trigram in trigrams:
+                self._postings[trigram].add(term)
+        else:
+            self._short_terms.add(term)
+
+    def _candidates(self, term: str) -> Set[str]:
+        """Terms sharing a trigram with ``term``, plus terms too short to have one"""
+        trigrams = self._trigrams(term)
+        if not trigrams:
+            # A short term can be a substring of anything
+            return set(self._neighbours)
+
+        candidates = set(self._short_terms)
+        for trigram in trigrams:
+            candidates.update(self._postings.get(trigram, ()))
+        return candidates
+
+    def _is_fuzzy_match(self, job_skill: str, cv_skill: str) -> bool:
+        """Same acceptance rule as the original extractOne + substring scan"""
+        if (job_skill in cv_skill or cv_skill in job_skill) and len(job_skill) > 2:
+            return True
+        self.comparisons += 1
+        return fuzz.WRatio(job_skill, cv_skill) >= self.threshold
+
+    @staticmethod
+    def _trigrams(term: str) -> Set[str]:
+        """Padded trigrams of the raw term and of each processed word
+
+        Terms with a processed token shorter than three characters (``c++`` becomes
+        ``c``, ``ci/cd`` becomes ``ci cd``) get no trigrams: WRatio's partial token
+        matching lets them hit almost any term, so they are always candidates.
+        """
+        tokens = full_process(term).split()
+        if len(term) < 3 or not tokens or min(len(token) for token in tokens) < 3:
+            return set()
+
+        trigrams = set()
+        words = [term] + tokens
+        for word in words:
+            if len(word) < 3:
+                continue
+            padded = f"  {word} "
+            trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return trigrams
+
+    def stats(self) -> Dict[str, int]:
+        """Index size and work counters"""
+        return {
+            'terms': len(self._neighbours),
+            'trigrams': len(self._postings),
+            'short_terms': len(self._short_terms),
+            'neighbour_links': sum(len(n) for n in self._neighbours.values()),
+            'cached_queries': len(self._query_cache),
+            'fuzzy_comparisons': self.comparisons
+        }
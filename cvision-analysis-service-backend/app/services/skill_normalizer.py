@@ -0,0 +1,116 @@
+# app/services/skill_normalizer.py
+import re
+import json
+import hashlib
+from typing import List, Dict, Iterable, Optional, Tuple
+from collections import Counter
+
+from app.core.constants import COMMON_SKILLS, SKILL_ALIASES, SECTION_ONLY_SKILL_ALIASES
+
+class SkillNormalizer:
+    """Map alternative skill spellings onto one canonical name
+
+    Applied when keywords are stored and when job keywords are loaded, so
+    "node.js" / "nodejs" / "node" or ".net core" / "netcore" meet as exact
+    set hits instead of going through fuzzy matching.
+
+    ``fingerprint`` changes whenever the rules do; stored keywords and scores
+    derived under other rules need a re-analysis (see ``BulkReanalyzer``).
+    """
+
+    def __init__(self, aliases: Dict[str, str] = None, canonical_skills: Iterable[str] = None,
+                 section_only_aliases: Iterable[str] = None):
+        self.aliases = {self._key(alias): canonical for alias, canonical in (aliases or SKILL_ALIASES).items()}
+        self.section_only = {self._key(alias) for alias in (
+            section_only_aliases if section_only_aliases is not None else SECTION_ONLY_SKILL_ALIASES
+        )} & set(self.aliases)
+        self.canonical = set(self.aliases.values())
+        self.canonical.update(self.aliases.get(self._key(skill), self._key(skill))
+                              for skill in (canonical_skills or COMMON_SKILLS))
+
+        # Punctuation/space-insensitive fallback: "next js", "nextjs" -> "next.js"
+        self._compact_index: Dict[str, str] = {}
+        for term in sorted(self.canonical) + sorted(self.aliases):
+            self._compact_index.setdefault(self._compact(term), self.aliases.get(term, term))
+
+        self._surface_patterns: Dict[bool, Optional[re.Pattern]] = {}
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [sorted(self.aliases.items()), sorted(self.canonical), sorted(self.section_only)]
+        ).encode()).hexdigest()[:16]
+        self.stats = Counter()
+
+    @staticmethod
+    def _key(skill: str) -> str:
+        return re.sub(r'\s+', ' ', skill.lower().strip())
+
+    @staticmethod
+    def _compact(skill: str) -> str:
+        return re.sub(r'[\s._\-]+', '', skill)
+
+    def canonicalize(self, skill: str) -> str:
+        """Canonical name for one skill (unknown skills are only lowercased)"""
+        key = self._key(skill)
+        self.stats['lookups'] += 1
+
+        canonical = self.aliases.get(key)
+        if canonical is None and key not in self.canonical:
+            canonical = self._compact_index.get(self._compact(key))
+
+        if canonical is None or canonical == key:
+            return key
+
+        self.stats['rewritten'] += 1
+        return canonical
+
+    def canonicalize_skills(self, skills: Iterable[str]) -> List[str]:
+        """Canonicalize a skill list, dropping duplicates but keeping order"""
+        result = []
+        seen = set()
+        for skill in skills:
+            if not skill or not skill.strip():
+                continue
+            canonical = self.canonicalize(skill)
+            if canonical not in seen:
+                seen.add(canonical)
+                result.append(canonical)
+        return result
+
+    def find_aliases(self, text_lower: str, skills_text_lower: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Alias spellings present in a lowercased text as (surface, canonical) pairs
+
+        Section-only aliases ("node", "ts", "ml") are looked for in
+        ``skills_text_lower`` alone, never in the free text.
+        """
+        found = {}
+        for section_only, text in ((False, text_lower), (True, skills_text_lower)):
+            pattern = self._surface_pattern(section_only)
+            if pattern is None or not text:
+                continue
+            for match in pattern.finditer(text):
+                surface = match.group(1)
+                found.setdefault(surface, self.aliases[surface])
+        return list(found.items())
+
+    def _surface_pattern(self, section_only: bool) -> Optional[re.Pattern]:
+        if section_only not in self._surface_patterns:
+            # Longest first so "asp.net core" wins over "asp.net"; custom boundaries keep
+            # short aliases like "ts" or "ml" from matching inside other words
+            surfaces = sorted((alias for alias in self.aliases if (alias in self.section_only) == section_only),
+                              key=len, reverse=True)
+            self._surface_patterns[section_only] = re.compile(
+                r'(?<![\w.+#])(' + '|'.join(re.escape(surface) for surface in surfaces) + r')(?![\w+#])'
+            ) if surfaces else None
+        return self._surface_patterns[section_only]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Lookup counters and alias table size"""
+        return {
+            'alias_count': len(self.aliases),
+            'section_only_aliases': len(self.section_only),
+            'canonical_skills': len(self.canonical),
+            'lookups': self.stats['lookups'],
+            'rewritten': self.stats['rewritten']
+        }
+
+# Shared instance used by the analyzer and the matcher
+skill_normalizer = SkillNormalizer()
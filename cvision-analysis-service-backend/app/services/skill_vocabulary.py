@@ -0,0 +1,116 @@
+# app/services/skill_vocabulary.py
+import threading
+from typing import List, Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from loguru import logger
+
+import numpy as np
+
+from app.models import SkillVocabularyModel
+from app.services.skill_normalizer import skill_normalizer
+
+# Skill ids are stored as sorted little-endian uint32 arrays
+SKILL_ID_DTYPE = np.dtype('<u4')
+
+def pack_skill_ids(skill_ids: Iterable[int]) -> bytes:
+    """Pack skill ids into the on-disk sorted uint32 format"""
+    return np.unique(np.asarray(list(skill_ids), dtype=SKILL_ID_DTYPE)).tobytes()
+
+def unpack_skill_ids(blob: bytes) -> np.ndarray:
+    """Read-only uint32 view over a packed skill id blob"""
+    return np.frombuffer(blob or b"", dtype=SKILL_ID_DTYPE)
+
+class SkillVocabulary:
+    """Process-local mirror of the append-only SkillVocabulary table
+
+    Ids never change once assigned, so the mirror only ever grows: it pulls rows
+    above the highest id it has synced, plus any specific ids a record refers to.
+    The highest known id doubles as the vocabulary version.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._terms: Dict[int, str] = {}
+        self._synced_version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return max(self._terms) if self._terms else 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def refresh(self, db: Session):
+        """Pull terms added (by any process) since the last refresh"""
+        rows = db.query(SkillVocabularyModel.Id, SkillVocabularyModel.Term).filter(
+            SkillVocabularyModel.Id > self._synced_version
+        ).all()
+        self._remember(rows)
+        if rows:
+            self._synced_version = max(self._synced_version, max(term_id for term_id, _ in rows))
+
+    def ensure(self, skill_ids: Iterable[int], db: Session):
+        """Make sure every id in a record can be decoded"""
+        unknown = [term_id for term_id in {int(term_id) for term_id in skill_ids} if term_id not in self._terms]
+        if not unknown:
+            return
+
+        self.refresh(db)
+        # Ids committed out of order by concurrent writers can sit below the synced version
+        unknown = [term_id for term_id in unknown if term_id not in self._terms]
+        for start in range(0, len(unknown), 1000):
+            self._remember(db.query(SkillVocabularyModel.Id, SkillVocabularyModel.Term).filter(
+                SkillVocabularyModel.Id.in_(unknown[start:start + 1000])
+            ).all())
+
+    def encode(self, skills: Iterable[str], db: Session) -> np.ndarray:
+        """Sorted skill ids for canonical skills, registering unseen terms"""
+        terms = skill_normalizer.canonicalize_skills(skills)
+        missing = [term for term in terms if term not in self._ids]
+
+        if missing:
+            self.refresh(db)
+            for term in missing:
+                if term not in self._ids:
+                    self._register(term, db)
+
+        return np.unique(np.asarray([self._ids[term] for term in terms], dtype=SKILL_ID_DTYPE))
+
+    def find(self, term: str) -> Optional[int]:
+        """Id of a canonical term already in the vocabulary (never registers)"""
+        return self._ids.get(term)
+
+    def decode(self, skill_ids: Iterable[int]) -> List[str]:
+        """Terms for a list of skill ids (unknown ids are skipped)"""
+        return [self._terms[int(term_id)] for term_id in skill_ids if int(term_id) in self._terms]
+
+    def lookup_table(self) -> np.ndarray:
+        """Object array mapping id -> term, for decoding many records at once"""
+        table = np.empty(self.version + 1, dtype=object)
+        for term_id, term in self._terms.items():
+            table[term_id] = term
+        return table
+
+    def _register(self, term: str, db: Session):
+        """Insert one term inside a savepoint; another writer may win the race"""
+        try:
+            with db.begin_nested():
+                row = SkillVocabularyModel(Term=term)
+                db.add(row)
+            term_id = row.Id
+        except IntegrityError:
+            term_id = db.query(SkillVocabularyModel.Id).filter(SkillVocabularyModel.Term == term).scalar()
+            logger.debug(f"Skill '{term}' was registered concurrently as {term_id}")
+
+        self._remember([(term_id, term)])
+
+    def _remember(self, rows):
+        with self._lock:
+            for term_id, term in rows:
+                self._ids[term] = term_id
+                self._terms[term_id] = term
+
+# Shared instance used by the analyzer and the feature store
+skill_vocabulary = SkillVocabulary()
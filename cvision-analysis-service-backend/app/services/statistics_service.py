@@ -0,0 +1,150 @@
+# app/services/statistics_service.py
+import time
+import asyncio
+from typing import Dict, Any, Optional, List
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from loguru import logger
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.constants import CVStatus, AnalysisMetrics
+from app.models import CVFileModel, CVAnalysisResultModel, JobProfileModel
+
+# Scores are bucketed by tens; 100 falls into the last bucket
+HISTOGRAM_BUCKETS = 10
+
+def score_bucket(score: int) -> int:
+    """Histogram bucket of a score"""
+    return min(max(int(score) // (AnalysisMetrics.MAX_SCORE // HISTOGRAM_BUCKETS), 0), HISTOGRAM_BUCKETS - 1)
+
+class StatisticsService:
+    """Service statistics from one grouped aggregate, cached per process
+
+    Concurrent requests for an expired snapshot wait on one refresh instead of
+    each querying the database. Between refreshes the background processor
+    reports each CV's status and stored score before and after it is
+    analyzed, so the cached counts move with it.
+    """
+
+    def __init__(self, ttl: int = None):
+        self.ttl = settings.STATISTICS_CACHE_TTL if ttl is None else ttl
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+        # Whether this process runs the background processor
+        self.processor_running = False
+
+    async def get(self, db: Session) -> Dict[str, Any]:
+        """Current snapshot, refreshing it if it has expired"""
+        if self._is_fresh():
+            return self._snapshot
+
+        async with self._lock:
+            # Another request may have refreshed while this one waited
+            if not self._is_fresh():
+                self._snapshot = await run_in_threadpool(self._compute, db)
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        self._loaded_at = 0.0
+
+    def record_analysis(self, previous_status: str, status: str,
+                        previous_score: Optional[int] = None, score: Optional[int] = None):
+        """Move one analyzed CV in the cached snapshot from its previous status and stored score to the new ones"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+
+        status_counts = snapshot['status_counts']
+        if not status_counts.get(previous_status):
+            # The CV arrived after the snapshot was taken
+            self.invalidate()
+            return
+        status_counts[previous_status] -= 1
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+        # A re-analysis replaces the stored score; a failed one leaves it in place
+        for stored, sign in ((previous_score, -1), (score, 1)):
+            if stored is not None:
+                snapshot['analyzed_cvs'] += sign
+                snapshot['score_sum'] += sign * stored
+                snapshot['score_histogram'][score_bucket(stored)] += sign
+
+    def processor_stats(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Background processor state with the completed and failed CV totals of a snapshot"""
+        completed = snapshot['status_counts'].get(CVStatus.COMPLETED, 0)
+        failed = snapshot['status_counts'].get(CVStatus.FAILED, 0)
+        return {
+            'is_running': self.processor_running,
+            'processed_count': completed,
+            'failed_count': failed,
+            'success_rate': (completed / (completed + failed) * 100) if (completed + failed) > 0 else 0
+        }
+
+    @staticmethod
+    def average_score(snapshot: Dict[str, Any]) -> Optional[float]:
+        return snapshot['score_sum'] / snapshot['analyzed_cvs'] if snapshot['analyzed_cvs'] else None
+
+    @staticmethod
+    def histogram_labels() -> List[str]:
+        width = AnalysisMetrics.MAX_SCORE // HISTOGRAM_BUCKETS
+        return [
+            f"{start}-{start + width - 1 if start + width < AnalysisMetrics.MAX_SCORE else AnalysisMetrics.MAX_SCORE}"
+            for start in range(0, AnalysisMetrics.MAX_SCORE, width)
+        ]
+
+    def _is_fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _compute(self, db: Session) -> Dict[str, Any]:
+        """Status counts, score sum and score histogram in one grouped query"""
+        started = time.perf_counter()
+        # A literal divisor keeps the SELECT and GROUP BY expressions identical on SQL Server
+        bucket = (CVAnalysisResultModel.Score // literal_column(str(AnalysisMetrics.MAX_SCORE // HISTOGRAM_BUCKETS))).label('bucket')
+
+        rows = db.query(
+            CVFileModel.AnalysisStatus,
+            bucket,
+            func.count(CVFileModel.Id),
+            func.count(CVAnalysisResultModel.Id),
+            func.sum(CVAnalysisResultModel.Score)
+        ).outerjoin(
+            CVAnalysisResultModel,
+            and_(CVAnalysisResultModel.CVFileId == CVFileModel.Id, CVAnalysisResultModel.IsDeleted == False)
+        ).filter(
+            CVFileModel.IsDeleted == False
+        ).group_by(
+            CVFileModel.AnalysisStatus, bucket
+        ).all()
+
+        status_counts: Dict[str, int] = {}
+        histogram = [0] * HISTOGRAM_BUCKETS
+        analyzed = score_sum = 0
+        for status, bucket_index, file_count, result_count, bucket_score_sum in rows:
+            status_counts[status] = status_counts.get(status, 0) + file_count
+            if result_count:
+                analyzed += result_count
+                score_sum += bucket_score_sum or 0
+                histogram[min(max(int(bucket_index), 0), HISTOGRAM_BUCKETS - 1)] += result_count
+
+        total_jobs = db.query(func.count(JobProfileModel.Id)).filter(
+            JobProfileModel.IsDeleted == False
+        ).scalar()
+
+        logger.debug(f"Statistics refreshed in {time.perf_counter() - started:.3f}s")
+        return {
+            'status_counts': status_counts,
+            'total_cvs': sum(status_counts.values()),
+            'analyzed_cvs': analyzed,
+            'score_sum': score_sum,
+            'score_histogram': histogram,
+            'total_job_profiles': total_jobs or 0,
+            'computed_at': datetime.utcnow()
+        }
+
+# Shared instance
+statistics_service = StatisticsService()
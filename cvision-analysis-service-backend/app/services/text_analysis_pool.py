@@ -0,0 +1,177 @@
+# app/services/text_analysis_pool.py
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Tuple, Optional
+from loguru import logger
+
+from app.core.config import settings
+from app.core.constants import AnalysisProfiles
+
+# One analyzer per worker process, created by the pool initializer
+_worker_analyzer = None
+
+def _init_worker():
+    """Load the NLP models once per worker process"""
+    global _worker_analyzer
+    from app.services.cv_content_analyzer import CVContentAnalyzer
+    from app.services.ner_enricher import ner_enricher
+    _worker_analyzer = CVContentAnalyzer()
+    # The pool already spreads tasks over the cores; NER stays in-process
+    ner_enricher.n_process = 1
+
+def _analyze_texts(items: List[Tuple[str, str]], profile: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Analyze (content hash, text) pairs inside a worker and return compact summaries"""
+    return [
+        (content_hash, _summarize(analysis_result))
+        for content_hash, analysis_result in _worker_analyzer.analyze_batch(items, profile=profile)
+    ]
+
+def _analyze_file(file_path: str, file_type: str, cv_file_id: str, profile: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Extract and analyze one stored file inside a worker: (text, full analysis) or (None, None)"""
+    text = _worker_analyzer._extract_text_from_file(file_path, file_type)
+    if not text:
+        return None, None
+    return text, _analyze_text(text, cv_file_id, profile)
+
+def _analyze_text(text: str, cv_file_id: str, profile: str) -> Dict[str, Any]:
+    """Analyze one stored CV's text inside a worker and return the full analysis"""
+    [(_, analysis_result)] = _worker_analyzer.analyze_batch([(cv_file_id, text)], profile=profile)
+    # Section bodies are only needed during analysis; don't ship them back to the parent
+    analysis_result.pop('sections', None)
+    return analysis_result
+
+def _summarize(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Preview fields only: no section bodies or other copies of the text"""
+    skills_analysis = analysis_result.get('skills_analysis') or {}
+    experience_analysis = analysis_result.get('experience_analysis') or {}
+    education_analysis = analysis_result.get('education_analysis') or {}
+    format_analysis = analysis_result.get('format_analysis') or {}
+    return {
+        'score': analysis_result['score'],
+        'skills': sorted(skills_analysis.get('found_skills', [])),
+        'sub_scores': {
+            'skills': skills_analysis.get('skills_score'),
+            'experience': experience_analysis.get('experience_score'),
+            'education': education_analysis.get('education_score'),
+            'format': format_analysis.get('format_score')
+        },
+        'years_of_experience': experience_analysis.get('years_of_experience'),
+        'top_degree_level': education_analysis.get('top_degree_level'),
+        'missing_sections': analysis_result['missing_sections'],
+        'format_issues': analysis_result['format_issues'],
+        'profile': analysis_result.get('profile'),
+        'stage_timings': analysis_result.get('stage_timings', {}),
+        'failed': 'analysis_error' in analysis_result['missing_sections']
+    }
+
+class TextAnalysisPool:
+    """Database-free analysis of raw CV texts on a shared process pool
+
+    Texts are keyed by the SHA-256 of their content (and profile): duplicates
+    in a request are analysed once, and results are kept in an LRU cache so
+    a preview of unchanged text is answered without reaching the pool.
+    """
+
+    def __init__(self, workers: int = None, task_size: int = None, cache_size: int = None):
+        self.workers = workers or settings.TEXT_ANALYSIS_WORKERS
+        self.task_size = task_size or settings.TEXT_ANALYSIS_TASK_SIZE
+        self.cache_size = cache_size or settings.TEXT_ANALYSIS_CACHE_SIZE
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(text: str, profile: str) -> str:
+        return hashlib.sha256(f"{profile}\0{text}".encode("utf-8")).hexdigest()
+
+    async def analyze(self, texts: List[str], profile: str = AnalysisProfiles.FULL) -> Dict[str, Any]:
+        """Results in request order, each flagged with whether it came from the cache"""
+        started = time.perf_counter()
+        hashes = [self.content_hash(text, profile) for text in texts]
+        unique = dict(zip(hashes, texts))
+
+        results = {}
+        with self._cache_lock:
+            for content_hash in unique:
+                if content_hash in self._cache:
+                    self._cache.move_to_end(content_hash)
+                    results[content_hash] = self._cache[content_hash]
+        cache_hits = len(results)
+
+        pending = [(content_hash, text) for content_hash, text in unique.items() if content_hash not in results]
+        computed_hashes = {content_hash for content_hash, _ in pending}
+        if pending:
+            computed = await self._run(pending, profile)
+            results.update(computed)
+            self._remember(computed)
+
+        return {
+            'results': [
+                dict(results[content_hash], content_hash=content_hash, cached=content_hash not in computed_hashes)
+                for content_hash in hashes
+            ],
+            'total_texts': len(texts),
+            'unique_texts': len(unique),
+            'cache_hits': cache_hits,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    async def analyze_file(self, file_path: str, file_type: str, cv_file_id: Any,
+                           profile: str = AnalysisProfiles.FULL) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Extract and analyze a stored CV file in a worker; returns (text, full analysis result)"""
+        [result] = await self._gather([(_analyze_file, file_path, file_type, str(cv_file_id), profile)])
+        return result
+
+    async def analyze_text(self, text: str, cv_file_id: Any,
+                           profile: str = AnalysisProfiles.FULL) -> Dict[str, Any]:
+        """Analyze the already extracted text of a stored CV in a worker; returns the full analysis result"""
+        [result] = await self._gather([(_analyze_text, text, str(cv_file_id), profile)])
+        return result
+
+    async def _run(self, pending: List[Tuple[str, str]], profile: str) -> Dict[str, Dict[str, Any]]:
+        batches = await self._gather([
+            (_analyze_texts, pending[start:start + self.task_size], profile)
+            for start in range(0, len(pending), self.task_size)
+        ])
+        return {content_hash: summary for batch in batches for content_hash, summary in batch}
+
+    async def _gather(self, calls: List[tuple]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await asyncio.gather(*(loop.run_in_executor(executor, *call) for call in calls))
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; start a fresh one on the next request
+            logger.error("Text analysis pool broke; it will be restarted")
+            self.shutdown()
+            raise
+
+    def _remember(self, computed: Dict[str, Dict[str, Any]]):
+        with self._cache_lock:
+            for content_hash, summary in computed.items():
+                if not summary['failed']:
+                    self._cache[content_hash] = summary
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                logger.info(f"Starting text analysis pool with {self.workers} workers")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            return self._executor
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+# Shared instance
+text_analysis_pool = TextAnalysisPool()
@@ -0,0 +1,132 @@
+# app/services/text_extractor.py
+import io
+import os
+import mmap
+from typing import Optional, Union, BinaryIO
+from loguru import logger
+
+# Document processing
+from pypdf import PdfReader
+from docx import Document
+import pdfplumber
+
+# A file path, the file's bytes, or a read-only memory map of it
+FileSource = Union[str, bytes, mmap.mmap]
+
+class _MappedFile(io.RawIOBase):
+    """Seekable read-only file over a memory map (zipfile needs ``seekable``, which mmap lacks)
+
+    Closing it leaves the map open; the map belongs to whoever created it.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mapped[self._position:self._position + len(buffer)]
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._mapped)}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+class TextExtractor:
+    """Extract plain text from PDF and DOCX files, given a path or an in-memory copy"""
+
+    def extract(self, source: FileSource, file_type: str, limit_pages: Optional[int] = None) -> str:
+        """Extract text from PDF or DOCX files (``limit_pages`` caps PDF pages read)"""
+        try:
+            if isinstance(source, str) and not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+
+            # Remove dot if present and normalize to lowercase
+            clean_file_type = file_type.lower().lstrip('.')
+
+            if clean_file_type == "pdf":
+                return self._extract_from_pdf(source, limit_pages)
+            elif clean_file_type in ["docx", "doc"]:
+                return self._extract_from_docx(source)
+            else:
+                raise ValueError(f"Unsupported file type: {file_type}")
+
+        except Exception as e:
+            logger.error(f"Error extracting text from {self._describe(source)}: {e}")
+            return ""
+
+    @staticmethod
+    def _open(source: FileSource) -> BinaryIO:
+        """Binary file object over any source (buffers are wrapped, not copied)"""
+        if isinstance(source, mmap.mmap):
+            return _MappedFile(source)
+        if isinstance(source, bytes):
+            return io.BytesIO(source)
+        return open(source, 'rb')
+
+    @staticmethod
+    def _describe(source: FileSource) -> str:
+        if isinstance(source, str):
+            return source
+        return f"in-memory file ({len(source)} bytes)"
+
+    def _extract_from_pdf(self, source: FileSource, limit_pages: Optional[int] = None) -> str:
+        """Extract text from PDF using pdfplumber (more accurate than pypdf)"""
+        text = ""
+        try:
+            with self._open(source) as file, pdfplumber.open(file) as pdf:
+                for page in pdf.pages[:limit_pages]:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text += page_text + "\n"
+
+            # Fallback to pypdf if pdfplumber fails
+            if not text.strip():
+                with self._open(source) as file:
+                    pdf_reader = PdfReader(file)
+                    for page in pdf_reader.pages[:limit_pages]:
+                        text += page.extract_text() + "\n"
+
+        except Exception as e:
+            logger.error(f"Error extracting PDF text: {e}")
+
+        return text.strip()
+
+    def _extract_from_docx(self, source: FileSource) -> str:
+        """Extract text from DOCX files"""
+        try:
+            with self._open(source) as file:
+                doc = Document(file)
+            text = []
+
+            # Extract text from paragraphs
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    text.append(paragraph.text)
+
+            # Extract text from tables
+            for table in doc.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        if cell.text.strip():
+                            text.append(cell.text)
+
+            return "\n".join(text)
+
+        except Exception as e:
+            logger.error(f"Error extracting DOCX text: {e}")
+            return ""
+
+# Shared instance
+text_extractor = TextExtractor()
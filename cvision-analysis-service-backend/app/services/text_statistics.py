@@ -0,0 +1,112 @@
+# app/services/text_statistics.py
+import re
+from typing import Dict, Any
+
+VOWEL_GROUP = re.compile(r"[aeiouyâêîôûäëïöüıéèàáíóú]+")
+NON_LETTER = re.compile(r"[^\w]|[\d_]")
+SPLIT_VOWELS = re.compile(r"(?<![tsc])i[ao]")
+SILENT_INNER_E = re.compile(r"(?<=[^aeiouy])e(?=(?:ly|ment|ful|ness|less)$)")
+SENTENCE_END = ".!?"
+
+# Words whose vowel groups miscount, and the words CVs use most, looked up instead of estimated
+COMMON_SYLLABLES = {
+    # Silent-e exceptions and other heuristic misses
+    "the": 1, "be": 1, "he": 1, "she": 1, "we": 1, "me": 1, "are": 1, "were": 1, "where": 1, "there": 1,
+    "here": 1, "one": 1, "once": 1, "some": 1, "done": 1, "gone": 1, "none": 1, "come": 1, "every": 2,
+    "business": 2, "idea": 3, "area": 3, "create": 2, "created": 3, "creating": 3, "real": 1, "via": 2,
+    "science": 2, "scientist": 3, "client": 2, "clients": 2, "quiet": 2, "react": 2,
+    "people": 2, "little": 2, "able": 2, "table": 2, "simple": 2, "single": 2, "multiple": 3,
+    "agile": 2, "mobile": 2, "profile": 2, "scalable": 3, "reliable": 4, "available": 4, "responsible": 4,
+    "node": 1, "code": 1, "role": 1, "scale": 1, "service": 2, "services": 3, "database": 3, "databases": 4,
+    "made": 1, "used": 1, "based": 1, "released": 2, "improved": 2, "achieved": 2, "managed": 2,
+    "developed": 3, "designed": 2, "implemented": 4, "maintained": 2, "delivered": 3, "reduced": 2,
+    "increased": 2, "worked": 1, "led": 1, "built": 1, "using": 2, "various": 3, "experience": 4,
+    "experienced": 4, "university": 5, "education": 4, "engineer": 3, "engineering": 4, "developer": 4,
+    "development": 4, "software": 2, "management": 3, "manager": 3, "project": 2, "projects": 2,
+    "team": 1, "teams": 1, "data": 2, "analysis": 4, "analyst": 3, "analytics": 4, "technology": 4,
+    "technologies": 4, "computer": 3, "application": 4, "applications": 4, "system": 2, "systems": 2,
+    "skills": 1, "language": 2, "languages": 3, "python": 2, "java": 2, "javascript": 3, "cloud": 1,
+    "machine": 2, "learning": 2, "senior": 2, "junior": 2, "intern": 2, "internship": 3, "present": 2,
+    "current": 2, "bachelor": 3, "master": 2, "degree": 2, "certificate": 4, "communication": 5,
+    "collaborated": 5, "stakeholder": 3, "stakeholders": 3, "graduate": 3, "graduated": 4, "ratio": 2,
+    "solutions": 3, "performance": 3, "architecture": 4, "infrastructure": 4, "microservices": 5,
+    "api": 3, "apis": 3, "ai": 2, "ui": 2, "ux": 2, "sql": 3, "aws": 3,
+}
+
+def count_syllables(word: str) -> int:
+    """Syllables in one lower-case, letters-only word"""
+    known = COMMON_SYLLABLES.get(word)
+    if known is not None:
+        return known
+
+    syllables = len(VOWEL_GROUP.findall(word))
+    # "ia"/"io" are two syllables ("reliability", "scenario") outside -tion, -sion, -cial, -tial
+    syllables += len(SPLIT_VOWELS.findall(word))
+    # Silent e before a suffix ("closely", "management", "careful")
+    syllables -= len(SILENT_INNER_E.findall(word))
+
+    if syllables > 1:
+        # Silent final e ("code", "manage"), but not "-le" after a consonant ("table")
+        if word.endswith("e") and not (word.endswith("le") and len(word) > 2 and word[-3] not in "aeiouy"):
+            syllables -= 1
+        # "-es" and "-ed" are silent unless the stem ends in a sibilant or t/d ("features", "services", "created")
+        elif word.endswith("es") and len(word) > 3 and word[-3] not in "aeiouysxzcgh":
+            syllables -= 1
+        elif word.endswith("ed") and len(word) > 3 and word[-3] not in "aeiouytd":
+            syllables -= 1
+    return max(syllables, 1)
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    if not words:
+        return 0.0
+    return round(206.835 - 1.015 * (words / max(sentences, 1)) - 84.6 * (syllables / words), 2)
+
+def flesch_kincaid_grade(words: int, sentences: int, syllables: int) -> float:
+    if not words:
+        return 0.0
+    return round(0.39 * (words / max(sentences, 1)) + 11.8 * (syllables / words) - 15.59, 2)
+
+class TextStatistics:
+    """Token, word, sentence and syllable counts from one whitespace tokenization
+
+    Replaces textstat, which re-tokenized each text for every metric and kept
+    whole CV texts alive in its ``lru_cache``. Only counts are returned; no
+    reference to the text outlives the call.
+    """
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        tokens = words = sentences = syllables = 0
+        sentence_words = 0
+
+        for token in (text or "").split():
+            tokens += 1
+            word = NON_LETTER.sub("", token.lower())
+            if word:
+                words += 1
+                sentence_words += 1
+                syllables += count_syllables(word)
+            elif any(char.isdigit() for char in token):
+                # Years and other numbers read as one short word, as in textstat
+                words += 1
+                sentence_words += 1
+                syllables += 1
+            if token[-1] in SENTENCE_END:
+                # Like textstat, fragments of one or two words ("Ankara, Turkey.") are not sentences
+                if sentence_words > 2:
+                    sentences += 1
+                sentence_words = 0
+        if sentence_words > 2:
+            sentences += 1
+        sentences = max(sentences, 1)
+
+        return {
+            'token_count': tokens,
+            'word_count': words,
+            'sentence_count': sentences,
+            'syllable_count': syllables,
+            'flesch_reading_ease': flesch_reading_ease(words, sentences, syllables),
+            'flesch_kincaid_grade': flesch_kincaid_grade(words, sentences, syllables)
+        }
+
+# Shared instance
+text_statistics = TextStatistics()
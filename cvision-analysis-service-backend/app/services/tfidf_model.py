@@ -0,0 +1,234 @@
+# app/services/tfidf_model.py
+import os
+import time
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from loguru import logger
+from datetime import datetime
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from app.core.config import settings
+from app.database import scan_in_chunks
+from app.models import CVFileModel, JobProfileModel
+
+def _build_vectorizer(n_features: int) -> HashingVectorizer:
+    # Raw term counts; IDF weighting and normalisation are applied from the corpus statistics
+    return HashingVectorizer(
+        n_features=n_features,
+        stop_words='english',
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm=None
+    )
+
+def profile_text(profile: JobProfileModel) -> str:
+    """Text a job profile is ranked on (title plus suggested keywords)"""
+    return f"{profile.Title} {' '.join(profile.SuggestedKeywords)}"
+
+class TfidfCorpusModel:
+    """Corpus-level TF-IDF over stored CV texts, persisted to disk
+
+    Terms are hashed, so the model is just a document-frequency vector and a
+    document count: new CVs are folded in by adding their term presence, and
+    every process scores with the same IDF. A periodic full refit drops the
+    counts of re-analysed or deleted CVs. Job profile vectors are transformed
+    once per model version, so ranking a CV is one sparse mat-vec.
+    """
+
+    def __init__(self, path: str = None, n_features: int = None):
+        self.path = Path(path or settings.TFIDF_MODEL_PATH)
+        self.n_features = n_features or settings.TFIDF_N_FEATURES
+        self.vectorizer = _build_vectorizer(self.n_features)
+
+        self.doc_freq = np.zeros(self.n_features, dtype=np.int64)
+        self.n_docs = 0
+        self.watermark: Optional[datetime] = None  # Latest CV change folded in
+        self.fitted_at: Optional[datetime] = None  # Last full refit
+        self.version = 0
+        self._idf: Optional[np.ndarray] = None
+        self._loaded_mtime: Optional[float] = None
+        self._last_refresh = 0.0
+        self._profiles: Optional[Tuple[Any, List[str], csr_matrix]] = None
+        self._lock = threading.Lock()
+
+    # Fitting
+
+    def fit(self, db: Session) -> Dict[str, Any]:
+        """Full refit from every stored ParsedText"""
+        with self._lock:
+            started = time.perf_counter()
+            doc_freq = np.zeros(self.n_features, dtype=np.int64)
+            n_docs, watermark = self._accumulate(db, doc_freq, None)
+
+            self.doc_freq, self.n_docs = doc_freq, n_docs
+            self.watermark = watermark
+            self.fitted_at = datetime.utcnow()
+            self._changed()
+            self.save()
+            return self._summary('fit', n_docs, started)
+
+    def refresh(self, db: Session) -> Dict[str, Any]:
+        """Fold in CVs analysed since the last fit or refresh"""
+        with self._lock:
+            started = time.perf_counter()
+            n_docs, watermark = self._accumulate(db, self.doc_freq, self.watermark)
+            if n_docs:
+                self.n_docs += n_docs
+                self.watermark = watermark
+                self._changed()
+                self.save()
+            self._last_refresh = time.monotonic()
+            return self._summary('refresh', n_docs, started)
+
+    def maybe_refresh(self, db: Session):
+        """Scheduled upkeep: refit when too old, otherwise fold in new CVs"""
+        try:
+            self.ensure_loaded(db)
+            if self.fitted_at is None or (datetime.utcnow() - self.fitted_at).total_seconds() > settings.TFIDF_REFIT_INTERVAL:
+                self.fit(db)
+            elif time.monotonic() - self._last_refresh > settings.TFIDF_REFRESH_INTERVAL:
+                self.refresh(db)
+        except Exception as e:
+            logger.error(f"Error refreshing TF-IDF model: {e}")
+
+    def _accumulate(self, db: Session, doc_freq: np.ndarray, since: Optional[datetime]) -> Tuple[int, Optional[datetime]]:
+        """Add term presence of stored texts (changed after ``since``) to ``doc_freq``"""
+        changed_at = func.coalesce(CVFileModel.UpdatedAt, CVFileModel.UploadedAt)
+        query = db.query(CVFileModel.Id, CVFileModel.ParsedText, changed_at.label('changed_at')).filter(
+            CVFileModel.ParsedText != None,
+            CVFileModel.IsDeleted == False
+        )
+        if since is not None:
+            query = query.filter(changed_at > since)
+
+        n_docs, watermark = 0, since
+        for chunk in scan_in_chunks(query, CVFileModel.Id, settings.TFIDF_CHUNK_SIZE):
+            counts = self.vectorizer.transform([text for _, text, _ in chunk])
+            doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+            n_docs += len(chunk)
+            changed = [changed_at for _, _, changed_at in chunk if changed_at is not None]
+            if changed and (watermark is None or max(changed) > watermark):
+                watermark = max(changed)
+        return n_docs, watermark
+
+    # Scoring
+
+    @property
+    def idf(self) -> np.ndarray:
+        if self._idf is None:
+            # Smoothed IDF, as TfidfVectorizer(smooth_idf=True)
+            self._idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1.0
+        return self._idf
+
+    def transform(self, texts: List[str]) -> csr_matrix:
+        """L2-normalised TF-IDF rows under the corpus IDF"""
+        counts = self.vectorizer.transform(texts)
+        counts.data *= self.idf[counts.indices]
+        return normalize(counts, norm='l2', copy=False)
+
+    def profile_matrix(self, job_profiles: List[JobProfileModel]) -> Tuple[List[str], csr_matrix]:
+        """Pre-transformed profile vectors, rebuilt only when the profiles or the model change"""
+        key = (self.version, tuple((str(p.Id), p.UpdatedAt or p.CreatedAt) for p in job_profiles))
+        cached = self._profiles
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        profile_ids = [str(profile.Id) for profile in job_profiles]
+        matrix = self.transform([profile_text(profile) for profile in job_profiles]).tocsr()
+        self._profiles = (key, profile_ids, matrix)
+        return profile_ids, matrix
+
+    def rank_profiles(self, cv_text: str, job_profiles: List[JobProfileModel], db: Session = None) -> List[Tuple[str, float]]:
+        """(profile id, cosine similarity) for every profile, best first"""
+        if not job_profiles:
+            return []
+        if db is not None:
+            self.ensure_loaded(db)
+
+        profile_ids, matrix = self.profile_matrix(job_profiles)
+        scores = (matrix @ self.transform([cv_text]).T).toarray().ravel()
+        order = np.argsort(-scores, kind='stable')
+        return [(profile_ids[i], float(scores[i])) for i in order]
+
+    # Persistence
+
+    def ensure_loaded(self, db: Session = None):
+        """Pick up a model saved by another process; fit one if none exists yet"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime is None:
+            if self.fitted_at is None and db is not None:
+                logger.info("No TF-IDF model on disk, fitting one from stored CV texts")
+                self.fit(db)
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def save(self):
+        """Write the model atomically (callers hold the lock)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as model_file:
+            np.savez(
+                model_file,
+                doc_freq=self.doc_freq,
+                n_docs=np.int64(self.n_docs),
+                n_features=np.int64(self.n_features),
+                watermark=np.datetime64(self.watermark or 'NaT', 'us'),
+                fitted_at=np.datetime64(self.fitted_at or 'NaT', 'us')
+            )
+        os.replace(tmp_path, self.path)
+        self._loaded_mtime = self.path.stat().st_mtime
+        logger.info(f"Saved TF-IDF model: {self.path} ({self.n_docs} documents)")
+
+    def load(self):
+        with self._lock:
+            with np.load(self.path) as data:
+                if int(data['n_features']) != self.n_features:
+                    logger.warning(f"TF-IDF model {self.path} has {int(data['n_features'])} features, expected {self.n_features}; ignoring it")
+                    return
+                self.doc_freq = data['doc_freq'].astype(np.int64)
+                self.n_docs = int(data['n_docs'])
+                self.watermark = data['watermark'].item()
+                self.fitted_at = data['fitted_at'].item()
+            self._loaded_mtime = self.path.stat().st_mtime
+            self._changed()
+            logger.info(f"Loaded TF-IDF model: {self.path} ({self.n_docs} documents)")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path),
+            'documents': self.n_docs,
+            'n_features': self.n_features,
+            'nonzero_terms': int(np.count_nonzero(self.doc_freq)),
+            'watermark': self.watermark,
+            'fitted_at': self.fitted_at,
+            'version': self.version
+        }
+
+    def _changed(self):
+        self.version += 1
+        self._idf = None
+
+    def _summary(self, action: str, n_docs: int, started: float) -> Dict[str, Any]:
+        summary = {
+            'action': action,
+            'documents_added': n_docs,
+            'total_documents': self.n_docs,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+        logger.info(f"TF-IDF model {action}: {summary}")
+        return summary
+
+# Shared instance (one per process)
+tfidf_model = TfidfCorpusModel()
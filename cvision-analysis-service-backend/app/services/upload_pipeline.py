@@ -0,0 +1,151 @@
+# app/services/upload_pipeline.py
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.core.config import settings
+from app.core.constants import CVStatus
+from app.models import CVFileModel, CVAnalysisResultModel, CVSignatureModel
+from app.services.pending_processor import FileProcessor
+from app.services.analysis_store import analysis_store
+from app.services.text_analysis_pool import text_analysis_pool
+from app.services.statistics_service import statistics_service
+from app.services.metrics import metrics
+
+class UploadPipeline:
+    """Upload path that scores a CV in the request instead of leaving it Pending
+
+    The body is streamed to disk and hashed, a byte-identical recent upload
+    is looked up by that hash, and otherwise extraction and analysis are sent
+    straight to the shared worker pool. Persistence goes through
+    ``analysis_store`` like the background processor, so duplicate
+    detection, rollups and the search index stay in step; it runs in the
+    threadpool so its commits don't hold up the event loop.
+
+    The CV is Processing while the request runs; if the process dies
+    first, the background processor picks it up again once
+    PROCESSING_TIMEOUT has passed.
+    """
+
+    def __init__(self, cache_size: int = None):
+        self.file_processor = FileProcessor()
+        self.cache_size = cache_size or settings.UPLOAD_HASH_CACHE_SIZE
+        self._recent: "OrderedDict[str, Any]" = OrderedDict()  # file SHA-256 -> analysed CV file id
+        self._lock = threading.Lock()
+
+    async def ingest(self, file: UploadFile, user_id: uuid.UUID, db: Session) -> Optional[Dict[str, Any]]:
+        """Save, analyze and persist one upload; None if the file is rejected"""
+        started = time.perf_counter()
+        saved = await self.file_processor.save_uploaded_file(file, str(user_id))
+        if saved is None:
+            return None
+
+        cv_file = await run_in_threadpool(self._create, user_id, saved, db)
+
+        # A byte-identical recent upload: reuse its text, and duplicate detection copies its analysis
+        extracted_text = None
+        original_id = self._lookup(saved['sha256'])
+        if original_id is not None:
+            extracted_text = await run_in_threadpool(self._parsed_text, original_id, db)
+        cache_hit = extracted_text is not None
+
+        success = await self._analyze(cv_file, saved, extracted_text, db)
+        elapsed = time.perf_counter() - started
+        statistics_service.invalidate()
+
+        score = duplicate_of = None
+        if success:
+            self._remember(saved['sha256'], cv_file.Id)
+            metrics.observe("upload_to_score.inline", elapsed)
+            score, duplicate_of = await run_in_threadpool(self._outcome, cv_file, db)
+        logger.info(f"Upload {cv_file.Id} analysed inline in {elapsed * 1000:.0f} ms (cache hit: {cache_hit})")
+
+        return {
+            'cv_file_id': str(cv_file.Id),
+            'file_name': saved['file_name'],
+            'status': cv_file.AnalysisStatus,
+            'score': score,
+            'duplicate_of': str(duplicate_of) if duplicate_of else None,
+            'sha256': saved['sha256'],
+            'size_bytes': saved['size_bytes'],
+            'cache_hit': cache_hit,
+            'latency_ms': round(elapsed * 1000, 2)
+        }
+
+    async def _analyze(self, cv_file: CVFileModel, saved: Dict[str, Any], extracted_text: Optional[str],
+                       db: Session) -> bool:
+        """Analyze in the worker pool unless a duplicate's analysis can be copied, then persist"""
+        try:
+            analysis_result = None
+            if extracted_text is None:
+                extracted_text, analysis_result = await text_analysis_pool.analyze_file(
+                    saved['file_path'], saved['file_type'], cv_file.Id
+                )
+                if not extracted_text:
+                    raise ValueError("Failed to extract text from CV")
+
+            # A hash hit with no analysis to copy (e.g. dedup disabled) is analysed from its reused text
+            duplicate = await run_in_threadpool(analysis_store.check_duplicate, cv_file, extracted_text, db)
+            if duplicate.original_analysis is None and analysis_result is None:
+                analysis_result = await text_analysis_pool.analyze_text(extracted_text, cv_file.Id)
+
+            await run_in_threadpool(analysis_store.complete, cv_file, extracted_text, db, duplicate, analysis_result)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error analyzing upload {cv_file.FileName}: {e}")
+            await run_in_threadpool(analysis_store.fail, cv_file, db)
+            return False
+
+    @staticmethod
+    def _create(user_id: uuid.UUID, saved: Dict[str, Any], db: Session) -> CVFileModel:
+        cv_file = CVFileModel(
+            UserId=user_id,
+            FileName=saved['file_name'],
+            FilePath=saved['file_path'],
+            FileType=saved['file_type'],
+            AnalysisStatus=CVStatus.PROCESSING,
+            UpdatedAt=datetime.utcnow()
+        )
+        db.add(cv_file)
+        db.commit()
+        return cv_file
+
+    @staticmethod
+    def _parsed_text(cv_file_id: Any, db: Session) -> Optional[str]:
+        return db.query(CVFileModel.ParsedText).filter(
+            CVFileModel.Id == cv_file_id,
+            CVFileModel.IsDeleted == False
+        ).scalar()
+
+    @staticmethod
+    def _outcome(cv_file: CVFileModel, db: Session):
+        """Stored score and near-duplicate original of a completed upload"""
+        score = db.query(CVAnalysisResultModel.Score).filter(CVAnalysisResultModel.CVFileId == cv_file.Id).scalar()
+        duplicate_of = db.query(CVSignatureModel.DuplicateOfId).filter(CVSignatureModel.CVFileId == cv_file.Id).scalar()
+        return score, duplicate_of
+
+    def _lookup(self, sha256: str) -> Optional[Any]:
+        with self._lock:
+            original_id = self._recent.get(sha256)
+            if original_id is not None:
+                self._recent.move_to_end(sha256)
+            return original_id
+
+    def _remember(self, sha256: str, cv_file_id: Any):
+        with self._lock:
+            # Keep the first upload as the original
+            self._recent.setdefault(sha256, cv_file_id)
+            self._recent.move_to_end(sha256)
+            while len(self._recent) > self.cache_size:
+                self._recent.popitem(last=False)
+
+# Shared instance
+upload_pipeline = UploadPipeline()
@@ -3,11 +3,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from loguru import logger
 import asyncio
+import threading
 
-from app.database import init_db
+from app.database import init_db, SessionLocal
 from app.services.pending_processor import PendingCVProcessor
+from app.services.bulk_reanalyzer import BulkReanalyzer
+from app.services.text_analysis_pool import text_analysis_pool
+from app.services.search_index import search_index
 from app.core.config import settings
-from app.api.endpoints import health, analysis, monitoring, job_matching
+from app.api.endpoints import health, analysis, monitoring, job_matching, search
 
 # Logging konfigürasyonu
 logger.add(
@@ -17,6 +21,25 @@ logger.add(
     level="INFO"
 )
 
+def _reanalyze_if_skill_rules_changed():
+    """Re-derive stored keywords and scores once the skill rules have changed"""
+    try:
+        result = BulkReanalyzer().run_if_stale()
+        if result:
+            logger.info(f"Re-analysis for the current skill rules finished: {result}")
+    except Exception as e:
+        logger.error(f"Re-analysis for the current skill rules failed: {e}")
+
+def _rebuild_search_index_if_empty():
+    """Restore the full-text index in a container that started without it"""
+    db = SessionLocal()
+    try:
+        search_index.rebuild_if_empty(db)
+    except Exception as e:
+        logger.error(f"Rebuilding the CV search index failed: {e}")
+    finally:
+        db.close()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -27,10 +50,18 @@ async def lifespan(app: FastAPI):
     processor = PendingCVProcessor()
     task = asyncio.create_task(processor.start_processing())
     
+    # A fresh container has no index file (data/ is not a volume); searches find nothing until this finishes
+    threading.Thread(target=_rebuild_search_index_if_empty, name="search-index-rebuild", daemon=True).start()
+    
+    # Opt-in (otherwise run scripts/reanalyze_corpus.py --if-stale); resumable, so it need not hold up shutdown
+    if settings.REANALYZE_ON_SKILL_RULES_CHANGE:
+        threading.Thread(target=_reanalyze_if_skill_rules_changed, name="skill-rules-reanalysis", daemon=True).start()
+    
     yield
     
     logger.info("Shutting down CV Analysis Service...")
     task.cancel()
+    text_analysis_pool.shutdown()
 
 # FastAPI app oluştur
 app = FastAPI(
@@ -54,6 +85,7 @@ app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(analysis.router, prefix="/api", tags=["analysis"])
 app.include_router(monitoring.router, prefix="/api", tags=["monitoring"])
 app.include_router(job_matching.router, prefix="/api/job-matching", tags=["job-matching"])
+app.include_router(search.router, prefix="/api", tags=["search"])
 
 if __name__ == "__main__":
     import uvicorn
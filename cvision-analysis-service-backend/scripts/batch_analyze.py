@@ -0,0 +1,175 @@
+# ================================
+# scripts/batch_analyze.py
+# ================================
+#!/usr/bin/env python3
+
+"""Analyze a directory (or manifest) of CV files offline and write one JSON line per CV
+
+Runs without a database: only text extraction and content analysis are used.
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Iterator, Set, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.constants import AnalysisProfiles
+
+# One analyzer per worker process, created by the pool initializer
+_worker_analyzer = None
+_worker_limit_pages = None
+_worker_profile = None
+
+def _init_worker(limit_pages: Optional[int], profile: str):
+    """Load the NLP models once per worker process"""
+    global _worker_analyzer, _worker_limit_pages, _worker_profile
+    from app.services.cv_content_analyzer import CVContentAnalyzer
+    _worker_analyzer = CVContentAnalyzer()
+    _worker_limit_pages = limit_pages
+    _worker_profile = profile
+
+def analyze_file(path: str) -> Dict[str, Any]:
+    """Extract and analyze one file inside a worker"""
+    started = time.perf_counter()
+    record = {'path': path, 'file_name': os.path.basename(path)}
+
+    text = _worker_analyzer._extract_text_from_file(path, Path(path).suffix, limit_pages=_worker_limit_pages)
+    if not text:
+        record.update({'status': 'failed', 'error': 'Failed to extract text from CV'})
+    else:
+        [(_, analysis)] = _worker_analyzer.analyze_batch([(path, text)], profile=_worker_profile)
+        skills_analysis = analysis.get('skills_analysis', {})
+        experience_analysis = analysis.get('experience_analysis', {})
+        education_analysis = analysis.get('education_analysis', {})
+        format_analysis = analysis.get('format_analysis', {})
+
+        record.update({
+            'status': 'failed' if 'analysis_error' in analysis['missing_sections'] else 'completed',
+            'score': analysis['score'],
+            'skills_score': skills_analysis.get('skills_score', 0),
+            'experience_score': experience_analysis.get('experience_score', 0),
+            'education_score': education_analysis.get('education_score', 0),
+            'format_score': format_analysis.get('format_score', 0),
+            'skills': skills_analysis.get('found_skills', []),
+            'years_of_experience': experience_analysis.get('years_of_experience', 0),
+            'top_degree_level': education_analysis.get('top_degree_level', 0),
+            'missing_sections': analysis['missing_sections'],
+            'format_issues': analysis['format_issues'],
+            'text_length': len(text),
+            'profile': analysis.get('profile'),
+            'stage_timings': analysis.get('stage_timings', {})
+        })
+
+    record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+def iter_inputs(source: str, recursive: bool = True) -> Iterator[str]:
+    """Yield CV paths from a directory, or from a manifest with one path per line"""
+    source_path = Path(source)
+    extensions = {ext.lower() for ext in settings.ALLOWED_EXTENSIONS}
+
+    if source_path.is_dir():
+        pattern = "**/*" if recursive else "*"
+        for path in source_path.glob(pattern):
+            if path.is_file() and path.suffix.lower() in extensions:
+                yield str(path)
+    else:
+        with open(source_path, "r", encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+def load_done_paths(output: Optional[str]) -> Set[str]:
+    """Paths already present in an existing output file (for --resume)"""
+    done = set()
+    if not output or not os.path.exists(output):
+        return done
+
+    with open(output, "r", encoding="utf-8") as existing:
+        for line in existing:
+            try:
+                done.add(json.loads(line)['path'])
+            except (ValueError, KeyError):
+                # Partial last line from an interrupted run
+                continue
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of CV files or a manifest file with one path per line")
+    parser.add_argument("-o", "--output", default=None, help="JSONL output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Files queued at once (default: 4 per worker)")
+    parser.add_argument("--limit-pages", type=int, default=None, help="Only read the first N pages of each PDF")
+    parser.add_argument("--profile", choices=[AnalysisProfiles.FULL, AnalysisProfiles.QUICK], default=AnalysisProfiles.FULL,
+                        help="Analysis stages to run: full report, or quick skills-only triage")
+    parser.add_argument("--resume", action="store_true", help="Skip files already present in --output")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not descend into subdirectories")
+    args = parser.parse_args()
+
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+
+    max_in_flight = args.max_in_flight or args.workers * 4
+    done_paths = load_done_paths(args.output) if args.resume else set()
+    if done_paths:
+        logger.info(f"Resuming: {len(done_paths)} files already analyzed")
+
+    output = open(args.output, "a" if args.resume else "w", encoding="utf-8") if args.output else sys.stdout
+    counts = {'completed': 0, 'failed': 0, 'skipped': 0}
+    started = time.perf_counter()
+
+    def write(record: Dict[str, Any]):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        counts[record['status']] += 1
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.limit_pages, args.profile)) as executor:
+            in_flight = {}
+            for path in iter_inputs(args.source, recursive=not args.no_recursive):
+                if path in done_paths:
+                    counts['skipped'] += 1
+                    continue
+
+                # Bounded queue keeps memory flat regardless of corpus size
+                if len(in_flight) >= max_in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        _collect(future, in_flight.pop(future), write)
+                    output.flush()
+
+                in_flight[executor.submit(analyze_file, path)] = path
+
+            for future in list(in_flight):
+                _collect(future, in_flight.pop(future), write)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+
+    elapsed = time.perf_counter() - started
+    processed = counts['completed'] + counts['failed']
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Analyzed {processed} CVs ({counts['completed']} completed, {counts['failed']} failed, "
+                f"{counts['skipped']} skipped) in {elapsed:.1f}s | {rate:.1f} CVs/s")
+
+def _collect(future, path: str, write):
+    try:
+        write(future.result())
+    except Exception as e:
+        logger.error(f"Error analyzing {path}: {e}")
+        write({'path': path, 'file_name': os.path.basename(path), 'status': 'failed', 'error': str(e)})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# ================================
+# scripts/benchmark_corpus_scan.py
+# ================================
+#!/usr/bin/env python3
+
+"""Compare peak memory of corpus-wide reads on a synthetic SQLite stand-in database
+
+Each mode runs in a fresh process so its peak RSS is measured in isolation:
+
+  all      the old pattern, ``.all()`` over CVAnalysisResultModel
+  chunked  keyset-paginated chunks (scan_in_chunks) with running aggregates
+  corpus   feature_store.load_corpus, the compact arrays used for matching
+"""
+
+import sys
+import os
+import time
+import uuid
+import random
+import resource
+import argparse
+import multiprocessing
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("chunked", "corpus", "all")
+
+def _prepare(db_path: str):
+    """Point the app at the stand-in database (must run before any app import)"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(db_path)}"
+    os.environ.setdefault("DEBUG", "false")
+
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+
+    @compiles(UNIQUEIDENTIFIER, "sqlite")
+    def _uuid_as_char(type_, compiler, **kw):
+        return "CHAR(32)"
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def generate(db_path: str, rows: int, vocabulary_size: int = 2000, batch: int = 10000):
+    """Create the stand-in tables and fill them with synthetic CVs"""
+    _prepare(db_path)
+    from app.database import Base, engine
+    from app.models import CVFileModel, CVAnalysisResultModel, CVAnalysisFeatureModel, SkillVocabularyModel
+    from app.services.skill_vocabulary import pack_skill_ids
+
+    tables = [t.__table__ for t in (CVFileModel, CVAnalysisResultModel, CVAnalysisFeatureModel, SkillVocabularyModel)]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+
+    rng = random.Random(42)
+    started = time.perf_counter()
+    now = datetime.utcnow()
+
+    with engine.begin() as connection:
+        connection.execute(SkillVocabularyModel.__table__.insert(), [
+            {'Id': term_id, 'Term': f"skill-{term_id}", 'CreatedAt': now} for term_id in range(1, vocabulary_size + 1)
+        ])
+
+    for start in range(0, rows, batch):
+        files, results, features = [], [], []
+        for i in range(start, min(start + batch, rows)):
+            file_id, result_id = uuid.uuid4(), uuid.uuid4()
+            created = now - timedelta(minutes=i)
+            files.append({
+                'Id': file_id, 'UserId': file_id, 'FileName': f"cv-{i}.pdf", 'FilePath': f"/cvs/cv-{i}.pdf",
+                'FileType': 'pdf', 'ParsedText': "lorem ipsum " * 200, 'AnalysisStatus': 'Completed',
+                'UploadedAt': created, 'CreatedAt': created, 'IsDeleted': False
+            })
+            results.append({
+                'Id': result_id, 'CVFileId': file_id, 'Score': rng.randint(20, 95),
+                'MissingSectionsJson': '["summary"]', 'FormatIssuesJson': '[]', 'CreatedAt': created, 'IsDeleted': False
+            })
+            features.append({
+                'CVAnalysisResultId': result_id,
+                'SkillsScore': 50.0, 'ExperienceScore': 50.0, 'EducationScore': 50.0, 'FormatScore': 50.0,
+                'SkillIds': pack_skill_ids(rng.sample(range(1, vocabulary_size + 1), rng.randint(5, 30))),
+                'VocabularyVersion': vocabulary_size, 'CreatedAt': created
+            })
+
+        with engine.begin() as connection:
+            connection.execute(CVFileModel.__table__.insert(), files)
+            connection.execute(CVAnalysisResultModel.__table__.insert(), results)
+            connection.execute(CVAnalysisFeatureModel.__table__.insert(), features)
+        print(f"  generated {min(start + batch, rows)}/{rows} rows", end="\r", flush=True)
+
+    print(f"\nGenerated {rows} CVs in {time.perf_counter() - started:.1f}s")
+
+def _run_mode(db_path: str, mode: str, chunk_size: int, queue):
+    _prepare(db_path)
+    from loguru import logger
+    logger.remove()
+
+    from app.database import SessionLocal, scan_in_chunks
+    from app.models import CVAnalysisResultModel
+    from app.services.feature_store import FeatureStore
+
+    db = SessionLocal()
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    try:
+        if mode == "all":
+            results = db.query(CVAnalysisResultModel).filter(CVAnalysisResultModel.IsDeleted == False).all()
+            count, total = len(results), sum(result.Score for result in results)
+        elif mode == "chunked":
+            count = total = 0
+            query = db.query(CVAnalysisResultModel.Id, CVAnalysisResultModel.Score).filter(
+                CVAnalysisResultModel.IsDeleted == False
+            )
+            for chunk in scan_in_chunks(query, CVAnalysisResultModel.Id, chunk_size):
+                count += len(chunk)
+                total += sum(score for _, score in chunk)
+        else:
+            corpus = FeatureStore(chunk_size).load_corpus(db)
+            count, total = len(corpus), int(corpus.scores.sum())
+    finally:
+        db.close()
+
+    queue.put({
+        'mode': mode,
+        'rows': count,
+        'average_score': round(total / count, 2) if count else 0,
+        'seconds': round(time.perf_counter() - started, 2),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'peak_rss_growth_mb': round(_peak_rss_mb() - baseline, 1)
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="data/benchmark_corpus.db", help="SQLite stand-in database")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic CVs to generate")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild the database even if it exists")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per keyset chunk")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    if args.regenerate or not os.path.exists(args.db):
+        generate(args.db, args.rows)
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'mode':<8} {'rows':>9} {'seconds':>8} {'peak MB':>8} {'growth MB':>10}")
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        if mode not in MODES:
+            parser.error(f"unknown mode: {mode}")
+
+        queue = context.Queue()
+        process = context.Process(target=_run_mode, args=(args.db, mode, args.chunk_size, queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print(f"{mode:<8} failed (exit code {process.exitcode}; killed for memory?)")
+            continue
+
+        result = queue.get()
+        print(f"{mode:<8} {result['rows']:>9} {result['seconds']:>8} "
+              f"{result['peak_rss_mb']:>8} {result['peak_rss_growth_mb']:>10}")
+
+if __name__ == "__main__":
+    main()
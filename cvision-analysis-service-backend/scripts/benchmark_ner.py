@@ -0,0 +1,90 @@
+# ================================
+# scripts/benchmark_ner.py
+# ================================
+#!/usr/bin/env python3
+
+"""Throughput of institution / job title extraction on synthetic CVs
+
+Compares the regex patterns in the content analyzer with the batched spaCy
+NER enrichment at several process counts, and reports CVs per second. Uses
+SPACY_MODEL when it is installed, otherwise the pattern-only pipeline.
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INSTITUTIONS = [
+    "Anadolu University", "Dumlupınar University", "University of Oxford", "Kocaeli Üniversitesi",
+    "Massachusetts Institute of Technology", "Boston College", "École 42", "Middle East Technical University"
+]
+TITLES = [
+    "Senior Software Engineer", "Data Scientist", "Backend Developer", "Project Manager",
+    "Full Stack Developer", "DevOps Engineer", "Business Analyst", "Software Engineering Intern"
+]
+EMPLOYERS = ["Google", "Trendyol", "Microsoft", "Aselsan", "Getir", "Siemens", "Amazon", "Turkcell"]
+FILLER = (
+    "designed and maintained services across teams worked closely with stakeholders delivered "
+    "features improved reliability mentored engineers led the migration and reduced costs"
+).split()
+
+def synthetic_cv(rng: random.Random) -> str:
+    lines = ["Summary", " ".join(rng.choices(FILLER, k=40)), "Work Experience"]
+    for _ in range(rng.randint(1, 5)):
+        start = rng.randint(2008, 2022)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(EMPLOYERS)}, January {start} - March {start + rng.randint(1, 3)}")
+        lines.append(" ".join(rng.choices(FILLER, k=rng.randint(40, 120))))
+    lines.append("Education")
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"Bachelor of Computer Engineering, {rng.choice(INSTITUTIONS)}, {rng.randint(2000, 2020)}")
+    lines += ["Skills", "Python, SQL, Docker, Kubernetes"]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=2000, help="Synthetic CVs")
+    parser.add_argument("--batch-size", type=int, default=64, help="nlp.pipe batch size")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="nlp.pipe process counts to try")
+    parser.add_argument("--max-chars", type=int, default=5000, help="Characters per section doc")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from loguru import logger
+    logger.remove()
+    from app.services.cv_content_analyzer import CVContentAnalyzer
+    from app.services.ner_enricher import NEREnricher
+
+    rng = random.Random(42)
+    texts = [synthetic_cv(rng) for _ in range(args.documents)]
+
+    # The pattern methods need no models, so skip loading them
+    analyzer = CVContentAnalyzer.__new__(CVContentAnalyzer)
+    prepared = []
+    for i, text in enumerate(texts):
+        cleaned_text = analyzer._clean_text(text)
+        prepared.append((i, cleaned_text, analyzer._extract_cv_sections(cleaned_text)))
+
+    def regex_pass():
+        for _, cleaned_text, sections in prepared:
+            analyzer._analyze_experience(cleaned_text, sections)
+            analyzer._analyze_education(cleaned_text, sections)
+
+    runs = [("regex experience+education", regex_pass)]
+    for n_process in args.processes:
+        enricher = NEREnricher(batch_size=args.batch_size, n_process=n_process, max_chars=args.max_chars)
+        enricher.nlp  # load outside the timing
+        runs.append((f"nlp.pipe n_process={n_process}", lambda enricher=enricher: enricher.enrich(prepared)))
+
+    print(f"{args.documents} CVs, NER pipeline: {NEREnricher().nlp.pipe_names}")
+    print(f"{'method':<28} {'seconds':>8} {'CVs/s':>9}")
+    for name, run in runs:
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<28} {elapsed:>8.2f} {args.documents / elapsed:>9.1f}")
+
+if __name__ == "__main__":
+    main()
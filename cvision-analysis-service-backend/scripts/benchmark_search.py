@@ -0,0 +1,113 @@
+# ================================
+# scripts/benchmark_search.py
+# ================================
+#!/usr/bin/env python3
+
+"""Latency of the full-text CV search index on a synthetic corpus
+
+Builds an index of synthetic CVs (no database needed), then runs a mix of
+term, phrase, boolean, prefix and experience-filtered queries and reports
+p50/p95/p99 latency against a p95 target.
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SKILLS = [
+    "python", "java", "scala", "kotlin", "golang", "rust", "javascript", "typescript", "react", "angular",
+    "django", "flask", "fastapi", "spring", "kafka", "spark", "hadoop", "airflow", "docker", "kubernetes",
+    "terraform", "aws", "azure", "gcp", "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "graphql",
+    "machine learning", "deep learning", "data engineering", "computer vision", "natural language processing",
+    "project management", "scrum", "ci/cd", "microservices", "distributed systems"
+]
+FILLER = (
+    "responsible for designing building and maintaining services across teams worked closely with "
+    "stakeholders delivered features improved reliability mentored engineers led migration reduced costs"
+).split()
+
+QUERIES = [
+    "python",
+    "kafka AND spark",
+    '"machine learning"',
+    '"machine learning" AND (python OR scala)',
+    '"machine learning" AND (python OR scala), 5+ years',
+    "kubernetes NOT azure",
+    "micro*",
+    '"distributed systems" kafka 8+ years',
+    "react OR angular OR typescript",
+    '"data engineering" airflow spark',
+]
+
+def synthetic_cv(rng: random.Random, i: int):
+    years = rng.randint(0, 25)
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    words = []
+    for _ in range(rng.randint(150, 600)):
+        words.append(rng.choice(skills) if rng.random() < 0.08 else rng.choice(FILLER))
+    text = f"Candidate {i}\nExperience: {years} years\nSkills: {', '.join(skills)}\n" + " ".join(words)
+    return f"cv-{i}", f"analysis-{i}", f"cv-{i}.pdf", text, years
+
+def build(index, documents: int, batch: int = 5000):
+    rng = random.Random(42)
+    started = time.perf_counter()
+    for start in range(0, documents, batch):
+        with index._connect() as connection:
+            index._insert(connection, (synthetic_cv(rng, i) for i in range(start, min(start + batch, documents))), replace=False)
+        print(f"  indexed {min(start + batch, documents)}/{documents} CVs", end="\r", flush=True)
+    with index._connect() as connection:
+        connection.execute("INSERT INTO cv_text(cv_text) VALUES ('optimize')")
+    print(f"\nIndexed {documents} CVs in {time.perf_counter() - started:.1f}s "
+          f"({os.path.getsize(index.path) / 2 ** 20:.0f} MB)")
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", default="data/benchmark_search_index.sqlite", help="Index file")
+    parser.add_argument("--documents", type=int, default=100_000, help="Synthetic CVs to index")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild the index even if it exists")
+    parser.add_argument("--rounds", type=int, default=20, help="Times each query is run")
+    parser.add_argument("--page-size", type=int, default=20, help="Hits per page")
+    parser.add_argument("--target-p95-ms", type=float, default=100.0, help="p95 latency target")
+    args = parser.parse_args()
+
+    # The index is a standalone file; the app database is never queried here
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from loguru import logger
+    logger.remove()
+    from app.services.search_index import CVSearchIndex
+
+    if args.regenerate and os.path.exists(args.index):
+        os.remove(args.index)
+    index = CVSearchIndex(args.index)
+    if not os.path.exists(args.index):
+        build(index, args.documents)
+
+    rng = random.Random(7)
+    all_samples = []
+    print(f"{'query':<52} {'hits':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for query in QUERIES:
+        samples = []
+        for _ in range(args.rounds):
+            page = rng.randint(1, 5)
+            started = time.perf_counter()
+            result = index.search(query, page=page, page_size=args.page_size)
+            samples.append((time.perf_counter() - started) * 1000)
+        all_samples.extend(samples)
+        print(f"{query[:52]:<52} {result['total']:>7} {percentile(samples, 0.5):>8.1f} {percentile(samples, 0.95):>8.1f}")
+
+    p95 = percentile(all_samples, 0.95)
+    print(f"\nall queries: p50 {percentile(all_samples, 0.5):.1f} ms, p95 {p95:.1f} ms, "
+          f"p99 {percentile(all_samples, 0.99):.1f} ms, mean {statistics.mean(all_samples):.1f} ms")
+    print(f"p95 target {args.target_p95_ms:.0f} ms: {'met' if p95 <= args.target_p95_ms else 'MISSED'}")
+    sys.exit(0 if p95 <= args.target_p95_ms else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# ================================
+# scripts/build_skill_embeddings.py
+# ================================
+#!/usr/bin/env python3
+
+"""Build the memory-mapped skill embedding table used for semantic matching"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from app.core.config import settings
+
+def collect_vocabulary(include_database: bool = True) -> set:
+    """Collect skills from the defaults, job profiles and stored keyword matches"""
+    from app.services.job_matcher import JobMatcher
+
+    vocabulary = set(JobMatcher()._embedding_vocabulary())
+
+    if include_database:
+        from app.database import SessionLocal
+        from app.models import JobProfileModel, KeywordMatchModel
+
+        db = SessionLocal()
+        try:
+            for job_profile in db.query(JobProfileModel).filter(JobProfileModel.IsDeleted == False):
+                vocabulary.update(skill.lower() for skill in job_profile.SuggestedKeywords)
+
+            for (keyword,) in db.query(KeywordMatchModel.Keyword).distinct():
+                vocabulary.add(keyword.lower())
+        finally:
+            db.close()
+
+    return vocabulary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=settings.SKILL_EMBEDDINGS_PATH, help="Embedding table directory (a new version is published into it)")
+    parser.add_argument("--spacy-model", default=None, help="spaCy model with word vectors (e.g. en_core_web_md)")
+    parser.add_argument("--no-database", action="store_true", help="Only embed the built-in skill list")
+    args = parser.parse_args()
+
+    from app.services.skill_embeddings import SkillEmbeddingTable
+
+    nlp = None
+    if args.spacy_model:
+        import spacy
+        nlp = spacy.load(args.spacy_model, exclude=["parser", "ner", "tagger", "lemmatizer"])
+
+    vocabulary = collect_vocabulary(include_database=not args.no_database)
+    table = SkillEmbeddingTable.build(vocabulary, nlp=nlp)
+    table.save(args.output)
+
+    logger.info(f"Embedded {len(table.terms)} skills with backend '{table.backend}' into {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# ================================
+# scripts/reanalyze_corpus.py
+# ================================
+#!/usr/bin/env python3
+
+"""Re-analyze every completed CV from its stored ParsedText (resumable)"""
+
+import sys
+import os
+import json
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from app.core.config import settings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU core)")
+    parser.add_argument("--chunk-size", type=int, default=settings.REANALYSIS_CHUNK_SIZE, help="CVs read and written per chunk")
+    parser.add_argument("--checkpoint", default=settings.REANALYSIS_CHECKPOINT_PATH, help="Checkpoint file used to resume")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first CV")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many CVs")
+    parser.add_argument("--if-stale", action="store_true",
+                        help="Only re-analyze CVs whose analysis predates the current skill rules")
+    args = parser.parse_args()
+
+    from app.services.bulk_reanalyzer import BulkReanalyzer
+
+    reanalyzer = BulkReanalyzer(workers=args.workers, chunk_size=args.chunk_size, checkpoint_path=args.checkpoint)
+    if args.if_stale and not reanalyzer.needs_run():
+        logger.info("Every stored analysis is up to date with the current skill rules")
+        return
+    summary = reanalyzer.run(resume=not args.restart, limit=args.limit, stale_only=args.if_stale)
+
+    logger.info(f"Re-analysis finished: {json.dumps(summary)}")
+
+if __name__ == "__main__":
+    main()
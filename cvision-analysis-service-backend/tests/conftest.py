@@ -0,0 +1,111 @@
+# tests/conftest.py
+import math
+import os
+import sys
+import uuid
+from pathlib import Path
+
+# Production runs on MSSQL; the tests use an in-memory SQLite database, shared with the
+# threads endpoints run in
+os.environ.setdefault("DATABASE_URL", "sqlite://?check_same_thread=false")
+os.environ.setdefault("DEBUG", "false")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+from sqlalchemy.ext.compiler import compiles
+
+@compiles(UNIQUEIDENTIFIER, "sqlite")
+def _compile_uniqueidentifier(type_, compiler, **kw):
+    return "CHAR(32)"
+
+_uuid_bind_processor = UNIQUEIDENTIFIER.bind_processor
+
+def _bind_processor(self, dialect):
+    """Accept GUID strings in filters, as MSSQL does (endpoints pass ids straight from the URL)"""
+    process = _uuid_bind_processor(self, dialect)
+    if dialect.name != "sqlite" or process is None:
+        return process
+    return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+
+UNIQUEIDENTIFIER.bind_processor = _bind_processor
+
+@pytest.fixture
+def db():
+    """Session on a fresh schema, dropped again after the test"""
+    from app.database import Base, engine, SessionLocal
+    from app.services.skill_vocabulary import skill_vocabulary
+    import app.models  # noqa: F401  (registers every table)
+
+    # The shared vocabulary caches term ids of whichever schema it last read
+    skill_vocabulary.__init__()
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        # SQLAlchemy's SQLite FLOOR is math.floor, which fails on NULL where SQL Server returns NULL
+        connection.connection.driver_connection.create_function(
+            "floor", 1, lambda value: None if value is None else math.floor(value)
+        )
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(autouse=True)
+def search_index_path(tmp_path, monkeypatch):
+    """Keep the full-text index written by completed analyses out of the data directory"""
+    from app.services.search_index import search_index
+    monkeypatch.setattr(search_index, "path", tmp_path / "search_index.sqlite")
+
+@pytest.fixture(scope="session")
+def embeddings_path(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("skill_embeddings"))
+
+@pytest.fixture(scope="session")
+def job_matching(embeddings_path):
+    """Job-matching endpoint module, with its skill tables built outside the data directory"""
+    from app.core.config import settings
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "SKILL_EMBEDDINGS_PATH", embeddings_path)
+        from app.api.endpoints import job_matching
+    return job_matching
+
+def _client(router, prefix, db):
+    """Test client for one router, on the test session"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.database import get_db
+
+    app = FastAPI()
+    app.include_router(router, prefix=prefix)
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+@pytest.fixture
+def job_matching_client(db, job_matching, embeddings_path, tmp_path, monkeypatch):
+    """Client for the job-matching routes, with a private corpus snapshot directory"""
+    from app.core.config import settings
+    from app.services.corpus_snapshot import CorpusSnapshotStore
+    import app.services.job_matcher as job_matcher_module
+
+    monkeypatch.setattr(settings, "SKILL_EMBEDDINGS_PATH", embeddings_path)
+    snapshots = CorpusSnapshotStore(root=str(tmp_path / "snapshots"))
+    monkeypatch.setattr(job_matching, "corpus_snapshots", snapshots)
+    monkeypatch.setattr(job_matcher_module, "corpus_snapshots", snapshots)
+    return _client(job_matching.router, "/api/job-matching", db)
+
+@pytest.fixture(scope="session")
+def analysis_endpoints():
+    from app.api.endpoints import analysis
+    return analysis
+
+@pytest.fixture
+def analysis_client(db, analysis_endpoints):
+    return _client(analysis_endpoints.router, "/api", db)
+
+@pytest.fixture
+def search_client(db):
+    from app.api.endpoints import search
+    return _client(search.router, "/api", db)
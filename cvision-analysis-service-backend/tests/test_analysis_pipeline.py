@@ -0,0 +1,45 @@
+# tests/test_analysis_pipeline.py
+import pytest
+
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.regex_guard import regex_guard
+
+pipeline = AnalysisPipeline()
+
+class Owner:
+    @pipeline.stage("clean", inputs=("text",), outputs=("cleaned_text",))
+    def clean(self, text):
+        # Catastrophic backtracking on the trailing "b"
+        regex_guard.search(r"(a|aa)+$", text)
+        return text.strip()
+
+    @pipeline.stage("count", inputs=("cleaned_text",), outputs=("count",))
+    def count(self, text):
+        return len(regex_guard.finditer(r"a", text))
+
+pipeline.add_profile("full", ["clean", "count"])
+pipeline.add_profile("count_only", ["count"])
+
+def test_plan_rejects_missing_inputs():
+    with pytest.raises(ValueError, match="needs \\['cleaned_text'\\]"):
+        pipeline.plan("count_only", ["text"])
+    with pytest.raises(ValueError, match="Unknown analysis profile"):
+        pipeline.plan("missing", ["text"])
+
+def test_supplied_outputs_are_not_recomputed():
+    timings = {}
+    context = pipeline.run(Owner(), "full", {'text': "aaa", 'cleaned_text': "aa"}, timings)
+    assert context['count'] == 2
+    assert list(timings) == ["count"]
+
+def test_budget_spans_separate_runs_of_a_document(monkeypatch):
+    monkeypatch.setattr(regex_guard, "document_budget", 0.05)
+    owner = Owner()
+
+    # Preparation spends the budget; the profile run later continues with what is left
+    context = pipeline.run_stages(owner, ["clean"], {'text': "a" * 40 + "b"}, document_id="pipeline-cv")
+    context = pipeline.run(owner, "full", context, document_id="pipeline-cv")
+    assert context['count'] == 0
+
+    fresh = pipeline.run(owner, "count_only", {'cleaned_text': "aaa"}, document_id="other-cv")
+    assert fresh['count'] == 3
@@ -0,0 +1,74 @@
+# tests/test_analytics_rollups.py
+import uuid
+from datetime import datetime
+
+from app.models import CVFileModel, AnalyticsRollupModel
+from app.services.analysis_store import analysis_store
+from app.services.analytics_rollups import analytics_rollups
+
+def _add_cv(db, uploaded_at):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                          FileType="pdf", AnalysisStatus="Completed", UploadedAt=uploaded_at)
+    db.add(cv_file)
+    db.commit()
+    return cv_file
+
+def _analysis(score, keywords):
+    return {
+        'score': score,
+        'missing_sections': [],
+        'format_issues': [],
+        'skills_analysis': {'skill_matches': [{'keyword': keyword} for keyword in keywords]}
+    }
+
+def _rollups(db):
+    return {
+        (row.Dimension, row.Month, row.BucketKey): (row.Count, row.ScoreSum)
+        for row in db.query(AnalyticsRollupModel) if row.Count or row.ScoreSum
+    }
+
+def test_incremental_counters_equal_a_rebuild(db):
+    september, october = _add_cv(db, datetime(2026, 9, 3)), _add_cv(db, datetime(2026, 10, 5))
+    analysis_store.save(september, _analysis(70, ["python", "docker"]), db)
+    analysis_store.save(october, _analysis(55, ["python"]), db)
+    # Re-analysis replaces the earlier contribution instead of adding to it
+    analysis_store.save(september, _analysis(82, ["python", "kubernetes"]), db)
+
+    recorded = _rollups(db)
+    assert recorded[("analyses", "2026-09", "")] == (1, 82)
+    assert recorded[("keyword", "2026-09", "python")] == (1, 0)
+    assert ("keyword", "2026-09", "docker") not in recorded
+    assert ("score", "2026-09", "70") not in recorded
+
+    analytics_rollups.rebuild(db)
+    assert _rollups(db) == recorded
+
+def test_read_summarizes_the_counters(db):
+    for uploaded_at, score, keywords in [
+        (datetime(2026, 9, 3), 92, ["python", "docker"]),
+        (datetime(2026, 9, 20), 64, ["python"]),
+        (datetime(2026, 10, 5), 40, ["excel"])
+    ]:
+        analysis_store.save(_add_cv(db, uploaded_at), _analysis(score, keywords), db)
+
+    summary = analytics_rollups.read(db)
+    assert summary['total_analyses'] == 3
+    assert summary['average_score'] == round((92 + 64 + 40) / 3, 1)
+    assert summary['top_keywords'][0] == {'keyword': "python", 'count': 2}
+    assert summary['monthly'] == [
+        {'month': "2026-09", 'analyses': 2, 'average_score': 78.0},
+        {'month': "2026-10", 'analyses': 1, 'average_score': 40.0}
+    ]
+    assert summary['score_distribution'] == {'excellent': 33, 'good': 0, 'average': 33, 'poor': 33}
+
+def test_window_leaves_out_analyses_without_an_upload_month(db):
+    this_month = datetime.utcnow()
+    analysis_store.save(_add_cv(db, this_month), _analysis(80, ["python"]), db)
+    analytics_rollups.record(db, {}, analytics_rollups.contribution([("python", 1)], 20, None))
+    db.commit()
+
+    assert [item['month'] for item in analytics_rollups.read(db)['monthly']] == [f"{this_month:%Y-%m}", "unknown"]
+    recent = analytics_rollups.read(db, months=1)
+    assert recent['monthly'] == [{'month': f"{this_month:%Y-%m}", 'analyses': 1, 'average_score': 80.0}]
+    assert (recent['total_analyses'], recent['average_score']) == (1, 80.0)
+    assert recent['top_keywords'] == [{'keyword': "python", 'count': 1}]
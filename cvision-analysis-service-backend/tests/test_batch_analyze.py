@@ -0,0 +1,43 @@
+# tests/test_batch_analyze.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from docx import Document
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "batch_analyze.py"
+
+def _write_cv(path, lines):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+def _run(*args):
+    subprocess.run([sys.executable, str(SCRIPT), *map(str, args)], check=True, capture_output=True, timeout=300)
+
+def _records(output):
+    return {Path(record['path']).name: record for record in map(json.loads, output.read_text().splitlines())}
+
+def test_directory_is_analysed_to_jsonl_and_resumed(tmp_path):
+    cvs = tmp_path / "cvs"
+    (cvs / "nested").mkdir(parents=True)
+    _write_cv(cvs / "backend.docx", ["Experience: five years of python and django", "Skills: python, django, docker"])
+    (cvs / "nested" / "broken.pdf").write_bytes(b"not a pdf")
+    (cvs / "notes.txt").write_text("not a CV type")
+    output = tmp_path / "out.jsonl"
+
+    _run(cvs, "-o", output, "-w", 2)
+    records = _records(output)
+    assert set(records) == {"backend.docx", "broken.pdf"}
+    assert records["backend.docx"]['status'] == "completed"
+    assert {"python", "django"} <= set(records["backend.docx"]['skills'])
+    assert (records["broken.pdf"]['status'], records["broken.pdf"]['error']) == ("failed", "Failed to extract text from CV")
+
+    # Resuming only analyses files missing from the output
+    _write_cv(cvs / "frontend.docx", ["Skills: react, javascript, git"])
+    _run(cvs, "-o", output, "-w", 1, "--resume")
+    lines = output.read_text().splitlines()
+    assert len(lines) == 3
+    assert Path(json.loads(lines[-1])['path']).name == "frontend.docx"
@@ -0,0 +1,90 @@
+# tests/test_bulk_matching.py
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models import CVFileModel, JobProfileModel
+from app.services.analysis_store import analysis_store
+
+CVS = {
+    "backend.pdf": ["python", "django", "postgresql", "docker"],
+    "frontend.pdf": ["javascript", "react", "git"],
+    "designer.pdf": ["photoshop", "illustrator"]
+}
+JOBS = {
+    "Backend developer": ["python", "django", "docker", "aws"],
+    "Frontend developer": ["javascript", "react", "vue", "git"]
+}
+
+@pytest.fixture
+def corpus(db):
+    analysis_ids = {}
+    for file_name, keywords in CVS.items():
+        cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName=file_name, FilePath=file_name,
+                              FileType="pdf", AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+        db.add(cv_file)
+        db.commit()
+        result = analysis_store.save(cv_file, {
+            'score': 70, 'missing_sections': [], 'format_issues': [],
+            'skills_analysis': {'skill_matches': [{'keyword': keyword} for keyword in keywords]}
+        }, db)
+        analysis_ids[file_name] = str(result.Id)
+
+    job_ids = {}
+    for title, keywords in JOBS.items():
+        job = JobProfileModel(Id=uuid.uuid4(), Title=title)
+        job.SuggestedKeywords = keywords
+        db.add(job)
+        job_ids[title] = str(job.Id)
+    db.commit()
+    return analysis_ids, job_ids
+
+def _bulk_match(client, **request):
+    response = client.post("/api/job-matching/bulk-match", json=request)
+    assert response.status_code == 200, response.text
+    assert response.headers['content-type'].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_every_cv_gets_its_jobs_best_first(job_matching_client, job_matching, corpus):
+    analysis_ids, job_ids = corpus
+    records = {record['cv_file_name']: record for record in _bulk_match(job_matching_client)}
+    assert set(records) == set(CVS)
+
+    for file_name, record in records.items():
+        assert record['cv_analysis_id'] == analysis_ids[file_name]
+        scores = [match['match_percentage'] for match in record['matches']]
+        assert scores == sorted(scores, reverse=True) and len(scores) == len(JOBS)
+        # Same percentages as matching the pair on its own
+        for match in record['matches']:
+            title = next(title for title, job_id in job_ids.items() if job_id == match['job_profile_id'])
+            expected = job_matching.job_matcher._score_match(CVS[file_name], JOBS[title])['match_percentage']
+            assert match['match_percentage'] == pytest.approx(expected, abs=0.011)
+
+    assert records["backend.pdf"]['matches'][0]['job_profile_id'] == job_ids["Backend developer"]
+    assert records["frontend.pdf"]['matches'][0]['job_profile_id'] == job_ids["Frontend developer"]
+
+def test_matches_are_trimmed_and_detailed_on_request(job_matching_client, corpus):
+    analysis_ids, job_ids = corpus
+    records = _bulk_match(job_matching_client, min_score=40, top_k_per_cv=1, include_details=True)
+
+    # The designer matches no job well enough and gets no line
+    assert {record['cv_file_name'] for record in records} == {"backend.pdf", "frontend.pdf"}
+    for record in records:
+        [match] = record['matches']
+        assert match['match_percentage'] >= 40
+        assert {'matched_keywords', 'missing_keywords', 'semantic_similarity'} <= set(match)
+    backend = next(record for record in records if record['cv_file_name'] == "backend.pdf")
+    assert backend['matches'][0]['missing_keywords'] == ["aws"]
+
+def test_unknown_ids(job_matching_client, corpus):
+    analysis_ids, job_ids = corpus
+    response = job_matching_client.post("/api/job-matching/bulk-match", json={'job_profile_ids': [str(uuid.uuid4())]})
+    assert response.status_code == 404
+
+    # Unknown CVs are reported in-band; the known ones still stream
+    missing = str(uuid.uuid4())
+    records = _bulk_match(job_matching_client, cv_analysis_ids=[missing, analysis_ids["backend.pdf"]])
+    assert records[0] == {'cv_analysis_id': missing, 'error': "CV analysis not found"}
+    assert [record['cv_file_name'] for record in records[1:]] == ["backend.pdf"]
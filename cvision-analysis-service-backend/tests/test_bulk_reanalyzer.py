@@ -0,0 +1,79 @@
+# tests/test_bulk_reanalyzer.py
+import json
+import uuid
+from datetime import datetime
+
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, CVAnalysisFeatureModel, AnalyticsRollupModel
+from app.services.analytics_rollups import analytics_rollups
+from app.services.bulk_reanalyzer import BulkReanalyzer
+
+TEXTS = [
+    "Experience: five years of python and django. Skills: python, django, docker.",
+    "Experience: java developer for three years. Skills: java, spring, mysql.",
+    "Education: bachelor of science. Skills: react, javascript, git."
+]
+
+def _rollups(db):
+    return {
+        (row.Dimension, row.Month, row.BucketKey): (row.Count, row.ScoreSum)
+        for row in db.query(AnalyticsRollupModel) if row.Count or row.ScoreSum
+    }
+
+def test_interrupted_pass_resumes_after_its_checkpoint(db, tmp_path):
+    cv_file_ids = sorted(uuid.uuid4() for _ in TEXTS)
+    for cv_file_id, text in zip(cv_file_ids, TEXTS):
+        db.add(CVFileModel(Id=cv_file_id, UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf", FileType="pdf",
+                           ParsedText=text, AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1)))
+    # A stale analysis that the pass replaces
+    db.add(CVAnalysisResultModel(CVFileId=cv_file_ids[0], Score=1))
+    db.commit()
+    analytics_rollups.rebuild(db)
+
+    checkpoint_path = tmp_path / "checkpoint.json"
+    reanalyzer = BulkReanalyzer(workers=1, chunk_size=1, checkpoint_path=str(checkpoint_path))
+
+    first = reanalyzer.run(limit=2)
+    checkpoint = json.loads(checkpoint_path.read_text())
+    assert first['processed_this_run'] == 2
+    assert checkpoint['last_id'] == str(cv_file_ids[1]) and checkpoint['completed_at'] is None
+    assert reanalyzer.needs_run()
+
+    second = reanalyzer.run()
+    assert (second['processed_this_run'], second['processed_total'], second['failed_total']) == (1, 3, 0)
+    assert json.loads(checkpoint_path.read_text())['completed_at']
+    assert not reanalyzer.needs_run()
+
+    db.expire_all()
+    results = {result.CVFileId: result for result in db.query(CVAnalysisResultModel)}
+    assert set(results) == set(cv_file_ids) and results[cv_file_ids[0]].Score > 1
+    assert db.query(CVAnalysisFeatureModel).count() == 3
+    keywords = {row.Keyword for row in db.query(KeywordMatchModel)}
+    assert {"python", "java", "react"} <= keywords
+
+    # Bulk writes keep the rollups in step with the stored analyses
+    recorded = _rollups(db)
+    analytics_rollups.rebuild(db)
+    assert _rollups(db) == recorded
+
+def test_only_analyses_under_other_skill_rules_are_stale(db, tmp_path):
+    cv_file_ids = sorted(uuid.uuid4() for _ in TEXTS)
+    for cv_file_id, text in zip(cv_file_ids, TEXTS):
+        db.add(CVFileModel(Id=cv_file_id, UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf", FileType="pdf",
+                           ParsedText=text, AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1)))
+    db.commit()
+
+    # The fingerprint lives with the analyses, so a fresh checkpoint directory changes nothing
+    reanalyzer = BulkReanalyzer(workers=1, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    reanalyzer.run()
+    fresh = BulkReanalyzer(workers=1, checkpoint_path=str(tmp_path / "elsewhere" / "checkpoint.json"))
+    assert not fresh.needs_run() and fresh.run_if_stale() is None
+
+    stale = db.query(CVAnalysisFeatureModel).join(CVAnalysisResultModel).filter(
+        CVAnalysisResultModel.CVFileId == cv_file_ids[1]
+    ).one()
+    stale.SkillRules = "0" * 16
+    db.commit()
+
+    assert fresh.needs_run()
+    assert fresh.run_if_stale()['processed_this_run'] == 1
+    assert not fresh.needs_run()
@@ -0,0 +1,87 @@
+# tests/test_corpus_snapshot.py
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.models import CVFileModel
+from app.services.analysis_store import analysis_store
+from app.services.corpus_snapshot import CorpusSnapshotStore, LOCK_FILE
+
+CVS = [("backend.pdf", 81, ["python", "django", "docker"]), ("frontend.pdf", 64, ["react", "javascript"])]
+
+@pytest.fixture
+def corpus_db(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SKILL_EMBEDDINGS_PATH", str(tmp_path / "embeddings"))
+    for file_name, score, keywords in CVS:
+        cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName=file_name, FilePath=file_name,
+                              FileType="pdf", AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+        db.add(cv_file)
+        db.commit()
+        analysis_store.save(cv_file, {
+            'score': score, 'missing_sections': [], 'format_issues': [],
+            'skills_analysis': {'skill_matches': [{'keyword': keyword} for keyword in keywords]}
+        }, db)
+    return db
+
+def _summary(corpus):
+    return sorted(
+        (corpus.file_names[row], int(corpus.scores[row]), sorted(corpus.skills(row)), str(corpus.cv_file_ids[row]))
+        for row in range(len(corpus))
+    )
+
+def test_published_snapshot_maps_the_database_corpus(corpus_db, tmp_path):
+    store = CorpusSnapshotStore(root=str(tmp_path / "snapshots"))
+    corpus = store.current(corpus_db)
+
+    assert corpus.source is not None
+    assert _summary(corpus) == _summary(store._in_memory_corpus(corpus_db))
+    assert [summary[:3] for summary in _summary(corpus)] == [
+        ("backend.pdf", 81, ["django", "docker", "python"]), ("frontend.pdf", 64, ["javascript", "react"])
+    ]
+    # A second reader in the same process reuses the mapping
+    assert store.current(corpus_db) is corpus
+
+def test_only_one_builder_publishes_at_a_time(corpus_db, tmp_path):
+    store = CorpusSnapshotStore(root=str(tmp_path / "snapshots"), max_age=60)
+    store.root.mkdir(parents=True)
+    lock_path = store.root / LOCK_FILE
+    lock_path.write_text("other worker")
+
+    # Held by a live builder: nothing is published and readers fall back to the database
+    assert store.rebuild(corpus_db) is None
+    assert store.status()['current_version'] is None
+    assert store.current(corpus_db).source is None
+
+    # A lock left by a builder that died is taken over
+    stale = time.time() - 120
+    os.utime(lock_path, (stale, stale))
+    assert store.rebuild(corpus_db)['cv_count'] == 2
+    assert not lock_path.exists()
+
+def test_superseded_versions_are_collected(corpus_db, tmp_path):
+    store = CorpusSnapshotStore(root=str(tmp_path / "snapshots"), keep=1)
+    versions = [store.rebuild(corpus_db)['version'] for _ in range(3)]
+
+    # The current version plus one superseded version for readers mid-swap
+    assert store.status()['current_version'] == versions[-1]
+    assert store.status()['versions_on_disk'] == versions[1:]
+
+def test_stale_snapshot_is_served_while_it_is_rebuilt(corpus_db, tmp_path):
+    store = CorpusSnapshotStore(root=str(tmp_path / "snapshots"), max_age=60)
+    old_version = store.rebuild(corpus_db)['version']
+    expired = time.time() - 120
+    os.utime(store.root / old_version / "meta.json", (expired, expired))
+
+    # The caller gets the previous version at once; a background thread publishes the next
+    corpus = store.current(corpus_db)
+    assert store.status()['attached_version'] == old_version
+    store._refresher.join(timeout=30)
+
+    new_version = store.status()['current_version']
+    assert new_version != old_version
+    assert _summary(store.current(corpus_db)) == _summary(corpus)
+    assert store.status()['attached_version'] == new_version
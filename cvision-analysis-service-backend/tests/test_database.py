@@ -0,0 +1,23 @@
+# tests/test_database.py
+from sqlalchemy import Column, MetaData, Table, inspect
+
+from app.database import Base, engine, init_db
+from app.models import CVAnalysisFeatureModel
+
+def test_init_db_adds_columns_missing_from_existing_tables():
+    # CVAnalysisFeatures as first created, before SkillIds and VocabularyVersion
+    features = CVAnalysisFeatureModel.__table__
+    legacy = Table(features.name, MetaData(), *[
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in features.columns if column.name not in ("SkillIds", "VocabularyVersion")
+    ])
+    legacy.create(bind=engine)
+    try:
+        init_db()
+        columns = {column['name'] for column in inspect(engine).get_columns(features.name)}
+        assert {"SkillIds", "VocabularyVersion"} <= columns
+
+        # Idempotent once the columns exist
+        init_db()
+    finally:
+        Base.metadata.drop_all(bind=engine)
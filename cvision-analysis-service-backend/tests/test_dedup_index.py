@@ -0,0 +1,96 @@
+# tests/test_dedup_index.py
+import uuid
+from datetime import datetime
+
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel, CVAnalysisFeatureModel, AnalyticsRollupModel
+from app.services.analytics_rollups import analytics_rollups
+from app.services.analysis_store import analysis_store
+from app.services.dedup_index import DedupIndex
+
+CV_TEXT = """
+Jane Doe, senior backend engineer. Experience: six years building payment services in python
+and django at a fintech company, leading a team of four engineers, designing event driven
+pipelines on kafka and postgresql, moving the monolith to docker and kubernetes, and cutting
+p99 latency of the checkout api by half. Before that, three years as a java developer on an
+inventory system for a retail chain, writing spring boot services and reporting jobs.
+Education: bachelor of science in computer engineering. Skills: python, django, java, spring,
+postgresql, kafka, docker, kubernetes, aws, terraform, git, ci/cd, agile, scrum.
+"""
+
+OTHER_TEXT = """
+John Smith, graphic designer. Ten years of brand identity work for publishing houses and
+small studios, producing book covers, packaging and exhibition posters, running print
+production with external vendors and mentoring junior designers. Education: master of fine
+arts. Skills: illustrator, photoshop, indesign, typography, colour theory, art direction.
+"""
+
+def _add_cv(db, text, uploaded_at=datetime(2026, 9, 1)):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                          FileType="pdf", ParsedText=text, AnalysisStatus="Completed", UploadedAt=uploaded_at)
+    db.add(cv_file)
+    db.commit()
+    return cv_file
+
+def _rollups(db):
+    return {
+        (row.Dimension, row.Month, row.BucketKey): (row.Count, row.ScoreSum)
+        for row in db.query(AnalyticsRollupModel) if row.Count or row.ScoreSum
+    }
+
+def test_identical_text_matches_its_original(db):
+    index = DedupIndex()
+    original = _add_cv(db, CV_TEXT)
+    index.register(db, original.Id, index.signature(CV_TEXT))
+
+    signature = index.signature(CV_TEXT)
+    assert index.similarity(signature, index.signature(CV_TEXT)) == 1.0
+
+    duplicate = index.find_duplicate(db, signature)
+    assert duplicate == {'duplicate_of': original.Id, 'matched_cv_file_id': original.Id, 'similarity': 1.0}
+
+def test_small_edits_still_match():
+    index = DedupIndex()
+    edited = CV_TEXT.replace("Jane Doe", "Jane Q. Doe") + "\nPhone: 555 0100, 2026-10-19"
+    assert index.similarity(index.signature(CV_TEXT), index.signature(edited)) >= index.threshold
+
+def test_text_below_the_threshold_does_not_match(db):
+    index = DedupIndex()
+    original = _add_cv(db, CV_TEXT)
+    index.register(db, original.Id, index.signature(CV_TEXT))
+
+    # Same experience, different education and skills: about half the shingles in common
+    rewritten = CV_TEXT.split("Education:")[0] + " ".join(OTHER_TEXT.split()[:40])
+    assert index.similarity(index.signature(CV_TEXT), index.signature(rewritten)) < index.threshold
+    assert index.find_duplicate(db, index.signature(rewritten)) is None
+    assert index.find_duplicate(db, index.signature(OTHER_TEXT)) is None
+
+def test_a_cv_is_not_its_own_duplicate(db):
+    index = DedupIndex()
+    original = _add_cv(db, CV_TEXT)
+    index.register(db, original.Id, index.signature(CV_TEXT))
+
+    assert index.find_duplicate(db, index.signature(CV_TEXT), exclude_cv_file_id=original.Id) is None
+
+def test_copying_an_analysis_updates_rollups_once(db):
+    original = _add_cv(db, CV_TEXT)
+    source = CVAnalysisResultModel(Id=uuid.uuid4(), CVFileId=original.Id, Score=72)
+    db.add_all([source, CVAnalysisFeatureModel(CVAnalysisResultId=source.Id, SkillsScore=80, SkillCount=2)] + [
+        KeywordMatchModel(CVAnalysisResultId=source.Id, Keyword=keyword, IsMatched=True, Count=1, MatchCount=1, Relevance=100)
+        for keyword in ("python", "django")
+    ])
+    db.commit()
+    analytics_rollups.rebuild(db)
+
+    copy = _add_cv(db, CV_TEXT, uploaded_at=datetime(2026, 10, 1))
+    result = analysis_store.copy(copy, source, db)
+    # Copying again over the same CV replaces its contribution instead of adding to it
+    analysis_store.copy(copy, source, db)
+
+    assert result.Score == 72
+    rollups = _rollups(db)
+    assert rollups[("analyses", "2026-10", "")] == (1, 72)
+    assert rollups[("keyword", "2026-10", "python")] == (1, 0)
+    assert rollups[("score", "2026-10", "72")] == (1, 0)
+
+    analytics_rollups.rebuild(db)
+    assert _rollups(db) == rollups
@@ -0,0 +1,82 @@
+# tests/test_facet_store.py
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.constants import DegreeLevels
+from app.models import CVFileModel
+from app.services.analysis_store import analysis_store
+from app.services.facet_store import FacetStore
+
+# file name: (score, years, degree, has_github, skills)
+CVS = {
+    "senior.pdf": (92, 12, DegreeLevels.MASTER, True, ["python", "django", "docker"]),
+    "backend.pdf": (75, 4, DegreeLevels.BACHELOR, True, ["python", "docker"]),
+    "junior.pdf": (58, 0.5, DegreeLevels.BACHELOR, False, ["python"]),
+    "frontend.pdf": (81, 6, DegreeLevels.ASSOCIATE, False, ["javascript", "react"]),
+    "designer.pdf": (40, 2, DegreeLevels.NONE, False, ["photoshop"])
+}
+
+@pytest.fixture
+def columns(db):
+    for file_name, (score, years, degree, has_github, skills) in CVS.items():
+        cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName=file_name, FilePath=file_name,
+                              FileType="pdf", AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+        db.add(cv_file)
+        db.commit()
+        analysis_store.save(cv_file, {
+            'score': score, 'missing_sections': [], 'format_issues': [],
+            'experience_analysis': {'years_of_experience': years},
+            'education_analysis': {'top_degree_level': degree},
+            'format_analysis': {'has_email': True, 'has_github': has_github},
+            'skills_analysis': {'skill_matches': [{'keyword': skill} for skill in skills]}
+        }, db)
+    return FacetStore(ttl=60, chunk_size=2).load(db)
+
+def _files(result):
+    return [candidate['file_name'] for candidate in result['candidates']]
+
+def test_filters_combine_and_rank_by_score(columns):
+    store = FacetStore()
+    assert len(columns) == len(CVS)
+    assert _files(store.filter(columns)) == ["senior.pdf", "frontend.pdf", "backend.pdf", "junior.pdf", "designer.pdf"]
+
+    result = store.filter(columns, skills=["Python", "docker"], min_years=3)
+    assert (result['total'], _files(result)) == (2, ["senior.pdf", "backend.pdf"])
+    assert result['candidates'][0]['degree'] == "master"
+    assert set(result['candidates'][0]['skills']) == {"python", "django", "docker"}
+
+    assert _files(store.filter(columns, min_degree="bachelor", flags={'has_github': False})) == ["junior.pdf"]
+    assert _files(store.filter(columns, min_score=50, max_score=80)) == ["backend.pdf", "junior.pdf"]
+    assert store.filter(columns, skills=["cobol"])['total'] == 0
+
+    page = store.filter(columns, limit=2, offset=1)
+    assert (page['total'], _files(page)) == (len(CVS), ["frontend.pdf", "backend.pdf"])
+
+    with pytest.raises(ValueError):
+        store.filter(columns, min_degree="phd")
+
+def test_each_facet_is_counted_without_its_own_filter(columns):
+    facets = FacetStore().filter(columns, skills=["python"], min_years=1)['facets']
+
+    # Python CVs of any experience
+    assert facets['years_of_experience'] == {"0-1": 1, "1-3": 0, "3-5": 1, "5-10": 0, "10+": 1}
+    # CVs with at least a year of experience, whatever their skills
+    assert facets['skills'] == {"python": 2, "docker": 2, "django": 1, "javascript": 1, "react": 1, "photoshop": 1}
+    # Other facets use both filters
+    assert facets['degree']['master'] == facets['degree']['bachelor'] == 1
+    assert facets['has_github'] == {'true': 2, 'false': 0}
+    assert facets['has_email'] == {'true': 2, 'false': 0}
+    assert facets['score']["90-100"] == facets['score']["70-79"] == 1
+
+def test_endpoint(search_client, columns, monkeypatch):
+    from app.api.endpoints import search
+    monkeypatch.setattr(search, "facet_store", FacetStore(ttl=60))
+
+    response = search_client.post("/api/search/candidates/filter", json={'skills': ["react"], 'min_degree': "Associate"})
+    assert response.status_code == 200, response.text
+    assert [candidate['file_name'] for candidate in response.json()['candidates']] == ["frontend.pdf"]
+
+    response = search_client.post("/api/search/candidates/filter", json={'min_degree': "phd"})
+    assert response.status_code == 400
@@ -0,0 +1,113 @@
+# tests/test_file_prefetcher.py
+import asyncio
+import mmap
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import app.services.pending_processor as pending_processor
+from app.core.config import settings
+from app.models import CVFileModel
+from app.services.file_prefetcher import FilePrefetcher
+
+def _cv_files(tmp_path, sizes):
+    cv_files = []
+    for number, size in enumerate(sizes):
+        path = tmp_path / f"cv{number}.pdf"
+        path.write_bytes(bytes([number]) * size)
+        cv_files.append(SimpleNamespace(Id=uuid.uuid4(), FilePath=str(path)))
+    return cv_files
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "prefetcher did not settle"
+        time.sleep(0.01)
+
+async def _claim(prefetcher, cv_file):
+    async with prefetcher.claim(cv_file) as source:
+        return source if source is None else bytes(source), type(source)
+
+def test_claim_returns_prefetched_bytes_and_maps_large_files(tmp_path):
+    prefetcher = FilePrefetcher(byte_budget=1000, mmap_threshold=100, threads=2)
+    small, large = _cv_files(tmp_path, [10, 200])
+    prefetcher.prefetch([small, large])
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 210)
+
+    assert asyncio.run(_claim(prefetcher, small)) == (bytes([0]) * 10, bytes)
+    assert asyncio.run(_claim(prefetcher, large)) == (bytes([1]) * 200, mmap.mmap)
+
+    # Claimed buffers are released
+    assert prefetcher.stats()['held_bytes'] == 0
+    assert (prefetcher.hits, prefetcher.misses) == (2, 0)
+
+def test_reads_start_in_order_within_the_budget(tmp_path):
+    prefetcher = FilePrefetcher(byte_budget=250, mmap_threshold=10_000, threads=4)
+    first, second, third = _cv_files(tmp_path, [100, 100, 100])
+    prefetcher.prefetch([first, second, third])
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 200)
+
+    # The third file does not fit until the first is claimed and freed
+    assert asyncio.run(_claim(prefetcher, first))[0] == bytes([0]) * 100
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 200)
+    assert asyncio.run(_claim(prefetcher, second))[0] == bytes([1]) * 100
+    assert asyncio.run(_claim(prefetcher, third))[0] == bytes([2]) * 100
+    assert prefetcher.misses == 0
+
+def test_files_not_yet_read_are_read_from_their_path(tmp_path):
+    prefetcher = FilePrefetcher(byte_budget=150, mmap_threshold=10_000, threads=2)
+    first, second = _cv_files(tmp_path, [100, 100])
+    prefetcher.prefetch([first, second])
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 100)
+
+    # Claiming the second before the first is freed doesn't wait for its read
+    assert asyncio.run(_claim(prefetcher, second)) == (None, type(None))
+    assert asyncio.run(_claim(prefetcher, first))[0] == bytes([0]) * 100
+    assert (prefetcher.hits, prefetcher.misses) == (1, 1)
+
+def test_dropped_read_ahead_frees_its_budget(tmp_path):
+    prefetcher = FilePrefetcher(byte_budget=1000, mmap_threshold=10_000, threads=2)
+    first, second = _cv_files(tmp_path, [100, 100])
+    prefetcher.prefetch([first, second])
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 200)
+
+    prefetcher.prefetch([second])
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 100)
+    prefetcher.clear()
+    _wait_for(lambda: prefetcher.stats()['held_bytes'] == 0)
+
+def test_pending_batches_are_taken_oldest_first(db, monkeypatch):
+    monkeypatch.setattr(pending_processor, "CVAnalyzer", lambda: None)
+    monkeypatch.setattr(settings, "BATCH_SIZE", 2)
+    processor = pending_processor.PendingCVProcessor()
+
+    uploaded = datetime(2026, 10, 1)
+    ids = [uuid.uuid4() for _ in range(3)]
+    uploaded_at = {ids[0]: uploaded, ids[1]: uploaded, ids[2]: uploaded + timedelta(hours=1)}
+    # Two share an upload time and are ordered by id
+    expected = sorted(ids[:2]) + [ids[2]]
+
+    # Inserted in reverse, so insertion order alone would give the wrong batches
+    for cv_file_id in reversed(expected):
+        db.add(CVFileModel(Id=cv_file_id, UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                           FileType="pdf", AnalysisStatus="Pending", UploadedAt=uploaded_at[cv_file_id]))
+    db.commit()
+
+    current = processor._get_pending_cvs(db)
+    upcoming = processor._get_next_pending_cvs(db, current)
+    assert [cv_file.Id for cv_file in current + upcoming] == expected
+
+def test_cvs_left_processing_are_reclaimed_after_the_timeout(db, monkeypatch):
+    monkeypatch.setattr(pending_processor, "CVAnalyzer", lambda: None)
+    processor = pending_processor.PendingCVProcessor()
+
+    now = datetime.utcnow()
+    stalled, running = uuid.uuid4(), uuid.uuid4()
+    updated_at = {stalled: now - timedelta(seconds=settings.PROCESSING_TIMEOUT + 60), running: now}
+    for cv_file_id, updated in updated_at.items():
+        db.add(CVFileModel(Id=cv_file_id, UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                           FileType="pdf", AnalysisStatus="Processing", UploadedAt=updated, UpdatedAt=updated))
+    db.commit()
+
+    assert [cv_file.Id for cv_file in processor._get_pending_cvs(db)] == [stalled]
@@ -0,0 +1,43 @@
+# tests/test_keyset_pagination.py
+import uuid
+
+from app.database import scan_in_chunks
+from app.models import CVFileModel
+
+def _add_cvs(db, count, status="Pending"):
+    ids = [uuid.uuid4() for _ in range(count)]
+    for cv_file_id in ids:
+        db.add(CVFileModel(Id=cv_file_id, UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                           FileType="pdf", AnalysisStatus=status, ParsedText="text"))
+    db.commit()
+    return sorted(ids)
+
+def test_scan_reads_every_row_once_in_bounded_chunks(db):
+    ids = _add_cvs(db, 7)
+    query = db.query(CVFileModel.Id)
+
+    chunks = list(scan_in_chunks(query, CVFileModel.Id, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [row.Id for chunk in chunks for row in chunk] == ids
+
+    # An exact multiple ends on an empty page; a cursor resumes after it
+    assert [len(chunk) for chunk in scan_in_chunks(query, CVFileModel.Id, chunk_size=7)] == [7]
+    resumed = scan_in_chunks(query, CVFileModel.Id, chunk_size=3, after=ids[4])
+    assert [row.Id for chunk in resumed for row in chunk] == ids[5:]
+
+def test_pending_cvs_pages_follow_the_cursor(db, analysis_client):
+    ids = _add_cvs(db, 5)
+    _add_cvs(db, 2, status="Completed")
+
+    seen, params = [], {'limit': 2}
+    while True:
+        response = analysis_client.get("/api/pending-cvs", params=params)
+        assert response.status_code == 200
+        seen.extend(item['id'] for item in response.json())
+        cursor = response.headers.get("X-Next-After-Id")
+        if cursor is None:
+            break
+        params['after_id'] = cursor
+
+    assert seen == [str(cv_file_id) for cv_file_id in ids]
+    assert analysis_client.get("/api/pending-cvs", params={'after_id': "not-an-id"}).status_code == 400
@@ -0,0 +1,86 @@
+# tests/test_match_all_jobs.py
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models import CVFileModel, JobProfileModel
+from app.services.analysis_store import analysis_store
+
+CV_SKILLS = ["python", "django", "postgresql", "docker", "git"]
+JOBS = {
+    "Backend developer": ["python", "django", "docker", "aws"],
+    "Data engineer": ["python", "postgresql", "kafka", "spark"],
+    "Frontend developer": ["javascript", "react", "vue", "git"],
+    "Designer": ["photoshop", "illustrator"]
+}
+
+@pytest.fixture
+def analysis_id(db):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="backend.pdf", FilePath="backend.pdf",
+                          FileType="pdf", AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+    db.add(cv_file)
+    db.commit()
+    result = analysis_store.save(cv_file, {
+        'score': 70, 'missing_sections': [], 'format_issues': [],
+        'skills_analysis': {'skill_matches': [{'keyword': keyword} for keyword in CV_SKILLS]}
+    }, db)
+
+    for title, keywords in JOBS.items():
+        job = JobProfileModel(Id=uuid.uuid4(), Title=title)
+        job.SuggestedKeywords = keywords
+        db.add(job)
+    db.commit()
+    return str(result.Id)
+
+def _match(client, analysis_id, **params):
+    response = client.post(f"/api/job-matching/match/{analysis_id}/with-all-jobs", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()['data']
+
+def test_limit_and_min_score_keep_the_best_matches(job_matching_client, analysis_id):
+    everything = _match(job_matching_client, analysis_id)
+    scores = [match['match_percentage'] for match in everything['matches']]
+    assert len(scores) == len(JOBS) and scores == sorted(scores, reverse=True)
+
+    best_two = _match(job_matching_client, analysis_id, limit=2)
+    assert best_two['matches'] == everything['matches'][:2]
+    assert best_two['best_match'] == everything['best_match']
+
+    threshold = scores[1]
+    above = _match(job_matching_client, analysis_id, min_score=threshold)
+    assert [match['match_percentage'] for match in above['matches']] == [s for s in scores if s >= threshold]
+
+    # The average always covers every job profile
+    assert best_two['average_match_percentage'] == above['average_match_percentage'] == everything['average_match_percentage']
+    assert best_two['total_job_profiles'] == len(JOBS)
+
+def test_fields_select_what_each_match_carries(job_matching_client, analysis_id):
+    data = _match(job_matching_client, analysis_id, limit=1, fields="match_percentage,missing_keywords", compact=True)
+    assert data['matches'] == [{
+        'job_profile_id': data['matches'][0]['job_profile_id'],
+        'match_percentage': data['matches'][0]['match_percentage'],
+        'missing_keywords': ["aws"]
+    }]
+
+    response = job_matching_client.post(
+        f"/api/job-matching/match/{analysis_id}/with-all-jobs", params={'fields': "match_percentage,salary"}
+    )
+    assert response.status_code == 400
+    assert "salary" in response.json()['detail']
+
+def test_category_detail_is_built_only_for_returned_matches(job_matching_client, job_matching, analysis_id, monkeypatch):
+    matcher = job_matching.job_matcher
+    everything = _match(job_matching_client, analysis_id)
+
+    detailed = []
+    build_details = matcher._calculate_category_scores
+    def spy(cv_skills, job_skills):
+        detailed.append(job_skills)
+        return build_details(cv_skills, job_skills)
+    monkeypatch.setattr(matcher, "_calculate_category_scores", spy)
+
+    best_two = _match(job_matching_client, analysis_id, limit=2)
+    assert len(detailed) == 2
+    assert best_two['matches'] == everything['matches'][:2]
+    assert best_two['matches'][0]['category_scores'] == everything['matches'][0]['category_scores']
@@ -0,0 +1,73 @@
+# tests/test_match_scorer.py
+import random
+import uuid
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.feature_store import CorpusFeatures
+from app.services.match_scorer import ShardedMatchScorer, score_matrix
+
+TERMS = [None, "python", "django", "flask", "java", "spring", "javascript", "react", "react.js", "vue",
+         "postgresql", "postgres", "mysql", "docker", "kubernetes", "aws", "git", "leadership", "excel"]
+
+JOBS = [
+    ["python", "django", "postgresql", "docker", "aws"],
+    ["javascript", "react", "git", "leadership"],
+    ["java", "spring", "mysql", "kubernetes", "excel", "teamwork"]
+]
+
+@pytest.fixture(scope="module")
+def matcher(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "SKILL_EMBEDDINGS_PATH", str(tmp_path_factory.mktemp("embeddings")))
+        from app.services.job_matcher import JobMatcher
+        return JobMatcher()
+
+def _corpus(size=90, seed=7):
+    rng = random.Random(seed)
+    rows = [sorted(rng.sample(range(1, len(TERMS)), rng.randint(0, 6))) for _ in range(size)]
+    # Repeated skill sets tie on score; ties must keep corpus order across shards
+    rows += rows[:10]
+
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    return CorpusFeatures(
+        analysis_ids=[uuid.uuid4() for _ in rows], cv_file_ids=[uuid.uuid4() for _ in rows],
+        file_names=["cv.pdf"] * len(rows), scores=np.full(len(rows), 50), created_at=[None] * len(rows),
+        indptr=indptr, indices=np.asarray([term for row in rows for term in row], dtype=np.int64),
+        terms=np.array(TERMS, dtype=object)
+    )
+
+def test_vectorized_scores_match_the_scalar_path(matcher):
+    corpus = _corpus()
+    scorer = ShardedMatchScorer(matcher, shards=1)
+    plans = [scorer.build_plan(corpus, job_skills) for job_skills in JOBS]
+    scores = score_matrix(corpus.indptr, corpus.indices, scorer._term_vectors(corpus), slice(0, len(corpus)), plans)
+
+    for row in range(len(corpus)):
+        for column, job_skills in enumerate(JOBS):
+            expected = matcher._score_match(corpus.skills(row), job_skills)['match_percentage']
+            assert scores[row, column] == pytest.approx(expected, abs=0.011)
+
+def test_sharded_ranking_equals_a_single_shard(matcher, tmp_path):
+    corpus = _corpus()
+    single = ShardedMatchScorer(matcher, shards=1).top_matches(corpus, JOBS, top_k=15)
+
+    # A snapshot-backed corpus is split over worker processes that map the arrays themselves
+    for name in ('indptr', 'indices'):
+        np.save(tmp_path / f"{name}.npy", getattr(corpus, name))
+    np.save(tmp_path / "term_vectors.npy", corpus.term_vectors)
+    corpus.source = str(tmp_path)
+
+    scorer = ShardedMatchScorer(matcher, shards=3, min_shard_size=20)
+    assert len(scorer._shard_bounds(len(corpus), True)) == 3
+    try:
+        sharded = scorer.top_matches(corpus, JOBS, top_k=15)
+    finally:
+        scorer.shutdown()
+
+    for expected, actual in zip(single, sharded):
+        assert actual['top'] == expected['top']
+        assert actual['average'] == pytest.approx(expected['average'])
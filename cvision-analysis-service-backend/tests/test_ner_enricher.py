@@ -0,0 +1,69 @@
+# tests/test_ner_enricher.py
+import pytest
+
+from app.core.config import settings
+from app.core.constants import CVSections
+from app.services.cv_content_analyzer import CVContentAnalyzer
+from app.services.ner_enricher import NEREnricher
+import app.services.cv_content_analyzer as cv_content_analyzer_module
+
+CV_TEXTS = {
+    "ayse": "Education: BSc Computer Engineering, Anadolu University, 2018. "
+            "Experience: Senior Backend Developer at Trendyol, 2019-2024.",
+    "john": "Education: MSc, University of Oxford, 2015. "
+            "Experience: Data Scientist at Monzo 2016-2020, Lead Data Engineer 2020-2024."
+}
+
+@pytest.fixture
+def enricher(monkeypatch):
+    # No spaCy model is installed here: the pattern rules run on a blank pipeline
+    enricher = NEREnricher(model="no_such_spacy_model", batch_size=2, n_process=4, max_chars=200)
+    calls = []
+    pipe = enricher.nlp.pipe
+
+    def counting_pipe(docs, **kwargs):
+        # spaCy calls pipe() again itself for as_tuples; record only the enricher's call, and stay in-process
+        if kwargs.get('as_tuples'):
+            calls.append(kwargs)
+            kwargs = {**kwargs, 'n_process': 1}
+        return pipe(docs, **kwargs)
+
+    monkeypatch.setattr(enricher.nlp, "pipe", counting_pipe)
+    enricher.calls = calls
+    return enricher
+
+def test_one_pipe_call_per_batch(enricher):
+    items = [
+        ("ayse", CV_TEXTS["ayse"], {
+            CVSections.EDUCATION: "BSc Computer Engineering, Anadolu University, 2018",
+            CVSections.EXPERIENCE: "Senior Backend Developer at Trendyol, 2019-2024. Studied at Anadolu University."
+        }),
+        # No sections: the whole text stands in for both
+        ("john", CV_TEXTS["john"], {})
+    ]
+    entities = enricher.enrich(items)
+
+    assert len(enricher.calls) == 1
+    # Four section docs are two batches of two: two processes, not four
+    assert enricher.calls[0]['n_process'] == 2 and enricher.calls[0]['batch_size'] == 2
+
+    # Institutions only from education, job titles only from experience
+    assert entities["ayse"]['institutions'] == ["Anadolu University"]
+    assert entities["ayse"]['job_titles'] == ["Senior Backend Developer"]
+    assert entities["john"]['institutions'] == ["University of Oxford"]
+    assert entities["john"]['job_titles'] == ["Data Scientist", "Lead Data Engineer"]
+
+def test_sections_are_capped(enricher):
+    text = "Experience: " + "filler " * 100 + "Software Engineer"
+    entities = enricher.enrich([("long", text, {})])
+    assert entities["long"]['job_titles'] == []
+
+def test_analyze_batch_shares_one_ner_pass(enricher, monkeypatch):
+    monkeypatch.setattr(settings, "NER_ENRICHMENT_ENABLED", True)
+    monkeypatch.setattr(cv_content_analyzer_module, "ner_enricher", enricher)
+
+    results = dict(CVContentAnalyzer().analyze_batch(list(CV_TEXTS.items())))
+    assert len(enricher.calls) == 1
+    assert results["ayse"]['education_analysis']['institutions_found'] == ["Anadolu University"]
+    assert results["john"]['experience_analysis']['job_titles'] == ["Data Scientist", "Lead Data Engineer"]
+    assert results["john"]['experience_analysis']['job_positions_count'] == 2
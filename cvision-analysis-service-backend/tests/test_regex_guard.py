@@ -0,0 +1,59 @@
+# tests/test_regex_guard.py
+import pytest
+
+from app.services.regex_guard import RegexGuard, regex_guard
+
+# Catastrophic backtracking: the number of ways to split the a's grows exponentially
+CATASTROPHIC = r"(a|aa)+$"
+SLOW_TEXT = "a" * 40 + "b"
+
+def _entries(guard, document_id):
+    return {entry['pattern']: entry for entry in guard.report() if entry['last_document_id'] == document_id}
+
+def test_pattern_times_out_and_keeps_the_text():
+    guard = RegexGuard(timeout=0.05, document_budget=10)
+    assert guard.search(CATASTROPHIC, SLOW_TEXT) is None
+    assert guard.sub(CATASTROPHIC, "", SLOW_TEXT) == SLOW_TEXT
+    assert guard.report()[0]['timeouts'] == 2
+
+def test_exhausted_budget_skips_the_remaining_patterns():
+    guard = RegexGuard(timeout=1.0, document_budget=0.05)
+    with guard.document("cv-1"):
+        assert guard.search(CATASTROPHIC, SLOW_TEXT) is None
+        assert guard.search(r"b", SLOW_TEXT) is None
+
+    entries = _entries(guard, "cv-1")
+    assert entries[CATASTROPHIC]['timeouts'] == 1
+    assert entries["b"]['skipped'] == 1
+
+    # A new document starts with a full budget
+    with guard.document("cv-2"):
+        assert guard.search(r"b", SLOW_TEXT) is not None
+
+def test_budget_carries_over_between_blocks():
+    guard = RegexGuard(timeout=1.0, document_budget=0.05)
+    with guard.document("cv-1") as budget:
+        guard.search(CATASTROPHIC, SLOW_TEXT)
+    assert budget.remaining() <= 0
+
+    with guard.document("cv-1", budget):
+        assert guard.search(r"b", SLOW_TEXT) is None
+    assert _entries(guard, "cv-1")["b"]['skipped'] == 1
+
+@pytest.fixture(scope="module")
+def content_analyzer():
+    from app.services.cv_content_analyzer import CVContentAnalyzer
+    return CVContentAnalyzer()
+
+def test_pathological_text_stops_at_the_document_budget(content_analyzer, monkeypatch):
+    monkeypatch.setattr(regex_guard, "document_budget", 0.02)
+    text = "Experience " + "x\t " * 400000
+
+    [(_, result)] = content_analyzer.analyze_batch([("pathological-cv", text)])
+    assert 'analysis_error' not in result['missing_sections']
+
+    # Text cleaning spends the budget; nothing after it (sections, skills, format) runs a pattern
+    entries = _entries(regex_guard, "pathological-cv")
+    assert entries[r"\s+"]['timeouts'] == 1
+    assert entries[r"\bexperience\b"]['skipped'] >= 1
+    assert all(entry['skipped'] for pattern, entry in entries.items() if pattern != r"\s+")
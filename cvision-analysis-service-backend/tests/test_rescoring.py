@@ -0,0 +1,40 @@
+# tests/test_rescoring.py
+import uuid
+
+import pytest
+
+from app.models import CVFileModel, CVAnalysisResultModel, CVAnalysisFeatureModel
+from app.services.rescoring import BulkRescorer
+
+def _add_analysis(db, score, sub_scores):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                          FileType="pdf", AnalysisStatus="Completed")
+    result = CVAnalysisResultModel(Id=uuid.uuid4(), CVFileId=cv_file.Id, Score=score)
+    skills, experience, education, format_score = sub_scores
+    db.add_all([cv_file, result, CVAnalysisFeatureModel(
+        CVAnalysisResultId=result.Id, SkillsScore=skills, ExperienceScore=experience,
+        EducationScore=education, FormatScore=format_score
+    )])
+    db.commit()
+    return result
+
+def test_configured_weights_reproduce_stored_scores(db):
+    # 80*0.4 + 50*0.3 + 60*0.2 + 90*0.1 = 68
+    _add_analysis(db, 68, (80, 50, 60, 90))
+
+    summary = BulkRescorer().rescore(db)
+    assert summary['total_analyses'] == 1
+    assert summary['changed_scores'] == 0
+
+def test_weight_overrides_are_dry_run_only(db):
+    result = _add_analysis(db, 68, (80, 50, 60, 90))
+
+    preview = BulkRescorer().rescore(db, weights={'skills': 1.0}, dry_run=True)
+    assert preview['average_score_after'] == 100.0
+    assert preview['changed_scores'] == 1
+
+    with pytest.raises(ValueError):
+        BulkRescorer().rescore(db, weights={'skills': 1.0})
+
+    db.refresh(result)
+    assert result.Score == 68
@@ -0,0 +1,87 @@
+# tests/test_search_index.py
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models import CVFileModel
+from app.services.analysis_store import analysis_store
+from app.services.search_index import CVSearchIndex, parse_query
+
+DOCUMENTS = [
+    ("kafka.pdf", "Built streaming pipelines on kafka. Kafka consumers in python, kafka connect and spark.", 6),
+    ("python.pdf", "Python developer, django and postgresql. Some kafka experience.", 2),
+    ("design.pdf", "Graphic designer: typography, branding, print production.", 9),
+    ("frontend.pdf", "Frontend engineer, react and typescript.", 4),
+    ("support.pdf", "IT support technician, windows and networking.", 3)
+]
+
+@pytest.fixture
+def index(tmp_path):
+    index = CVSearchIndex(path=str(tmp_path / "search.sqlite"))
+    index.upsert_many((uuid.uuid4(), uuid.uuid4(), file_name, text, years) for file_name, text, years in DOCUMENTS)
+    return index
+
+def _files(result):
+    return [hit['file_name'] for hit in result['hits']]
+
+def test_query_syntax():
+    assert parse_query('"machine learning" AND pyth* 5+ years') == ('"machine learning" AND "pyth"*', 5.0)
+    assert parse_query("kafka, spark OR (flink NOT storm) AND") == ('"kafka" "spark" OR ( "flink" NOT "storm" )', None)
+    assert parse_query("3 yrs of experience") == ("", 3.0)
+
+def test_hits_are_ranked_by_bm25_and_filtered_by_experience(index):
+    result = index.search("kafka")
+    assert _files(result) == ["kafka.pdf", "python.pdf"]
+    assert result['hits'][0]['score'] > result['hits'][1]['score'] > 0
+    assert "[kafka]" in result['hits'][0]['snippet'].lower()
+
+    assert _files(index.search("kafka 5+ years")) == ["kafka.pdf"]
+    assert _files(index.search("python NOT spark")) == ["python.pdf"]
+    assert _files(index.search("typo*")) == ["design.pdf"]
+
+    page = index.search("kafka", page=2, page_size=1)
+    assert (page['total'], _files(page)) == (2, ["python.pdf"])
+
+    with pytest.raises(ValueError):
+        index.search("AND OR")
+
+def test_reindexing_replaces_a_cv(index):
+    cv_file_id = uuid.uuid4()
+    index.upsert(cv_file_id, None, "moved.pdf", "kafka administrator", 1)
+    index.upsert(cv_file_id, None, "moved.pdf", "flutter developer", 1)
+    assert "moved.pdf" not in _files(index.search("kafka"))
+    assert _files(index.search("flutter")) == ["moved.pdf"]
+
+    index.remove(cv_file_id)
+    assert index.search("flutter")['total'] == 0
+    assert index.status()['documents'] == len(DOCUMENTS)
+
+def test_rebuild_indexes_every_analysed_cv(db, tmp_path):
+    for file_name, text, years in DOCUMENTS:
+        cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName=file_name, FilePath=file_name,
+                              FileType="pdf", ParsedText=text, AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+        db.add(cv_file)
+        db.commit()
+        analysis_store.save(cv_file, {
+            'score': 60, 'missing_sections': [], 'format_issues': [],
+            'experience_analysis': {'years_of_experience': years}
+        }, db)
+
+    index = CVSearchIndex(path=str(tmp_path / "rebuilt.sqlite"))
+    assert index.rebuild(db)['documents'] == len(DOCUMENTS)
+    assert _files(index.search("kafka 5 years")) == ["kafka.pdf"]
+
+def test_a_missing_or_empty_index_is_rebuilt(db, tmp_path):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="kafka.pdf", FilePath="kafka.pdf",
+                          FileType="pdf", ParsedText=DOCUMENTS[0][1], AnalysisStatus="Completed", UploadedAt=datetime(2026, 10, 1))
+    db.add(cv_file)
+    db.commit()
+    analysis_store.save(cv_file, {'score': 60, 'missing_sections': [], 'format_issues': []}, db)
+
+    index = CVSearchIndex(path=str(tmp_path / "fresh.sqlite"))
+    assert index.rebuild_if_empty(db)['documents'] == 1
+    assert index.rebuild_if_empty(db) is None
+
+    index.remove(cv_file.Id)
+    assert index.rebuild_if_empty(db)['documents'] == 1
@@ -0,0 +1,66 @@
+# tests/test_skill_embeddings.py
+import numpy as np
+import pytest
+
+import app.services.skill_embeddings as skill_embeddings
+from app.services.skill_embeddings import SkillEmbeddingTable, CURRENT_FILE
+
+def _versions(root):
+    return sorted(p.name for p in root.iterdir() if p.is_dir())
+
+def test_load_returns_the_saved_table(tmp_path):
+    table = SkillEmbeddingTable.build(["python", "django", "docker"], dim=32)
+    table.save(tmp_path)
+
+    loaded = SkillEmbeddingTable.load(tmp_path)
+    assert loaded.terms == table.terms
+    np.testing.assert_array_equal(np.asarray(loaded.vectors), table.vectors)
+
+def test_save_publishes_vectors_and_terms_together(tmp_path, monkeypatch):
+    first = SkillEmbeddingTable.build(["python", "django"], dim=32)
+    first.save(tmp_path)
+
+    # A save that dies before the pointer swap leaves the published version untouched
+    def fail_swap(root, version):
+        raise OSError("disk full")
+    monkeypatch.setattr(skill_embeddings, "_write_current", fail_swap)
+    with pytest.raises(OSError):
+        SkillEmbeddingTable.build(["python", "django", "react", "vue"], dim=32).save(tmp_path)
+
+    loaded = SkillEmbeddingTable.load(tmp_path)
+    assert loaded.terms == first.terms
+    assert loaded.vectors.shape[0] == len(loaded.terms)
+
+def test_superseded_versions_stay_readable_until_collected(tmp_path):
+    versions = [
+        SkillEmbeddingTable.build(terms, dim=32).save(tmp_path)
+        for terms in (["python"], ["python", "java"], ["python", "java", "go"])
+    ]
+
+    # The current version plus one superseded version for readers mid-swap
+    assert _versions(tmp_path) == versions[1:]
+    assert (tmp_path / CURRENT_FILE).read_text() == versions[-1]
+
+    loaded = SkillEmbeddingTable.load(tmp_path)
+    assert loaded.terms == ["go", "java", "python"]
+    assert loaded.vectors.shape == (3, 32)
+
+def test_load_or_build_publishes_a_missing_table(tmp_path):
+    table = SkillEmbeddingTable.load_or_build(["kubernetes", "helm"], path=tmp_path)
+    assert table.terms == ["helm", "kubernetes"]
+    assert len(_versions(tmp_path)) == 1
+
+def test_saves_leave_other_staging_directories_alone(tmp_path, monkeypatch):
+    # Another process is still writing its version
+    in_progress = tmp_path / "20261019000000000000-4242.tmp"
+    in_progress.mkdir()
+    version = SkillEmbeddingTable.build(["python"], dim=32).save(tmp_path)
+    assert in_progress.is_dir()
+
+    # A save that fails removes only its own staging directory
+    def fail_save(path, array):
+        raise OSError("disk full")
+    monkeypatch.setattr(skill_embeddings.np, "save", fail_save)
+    with pytest.raises(OSError):
+        SkillEmbeddingTable.build(["python", "java"], dim=32).save(tmp_path)
+    assert set(_versions(tmp_path)) == {in_progress.name, version}
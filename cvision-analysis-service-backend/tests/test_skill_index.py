@@ -0,0 +1,59 @@
+# tests/test_skill_index.py
+from fuzzywuzzy import fuzz
+
+from app.services.skill_index import FuzzySkillIndex
+
+VOCABULARY = [
+    "python", "java", "javascript", "typescript", "go", "golang", "c", "c++", "c#", "r",
+    "react", "react.js", "reactjs", "react native", "vue", "vue.js", "angular", "angularjs",
+    "node.js", "nodejs", "express", "django", "flask", "fastapi", "spring", "spring boot",
+    "sql", "mysql", "nosql", "postgresql", "postgres", "mongodb", "redis",
+    "html", "html5", "css", "css3", "scss", "git", "github", "gitlab", "ci/cd",
+    "docker", "docker compose", "kubernetes", "k8s", "aws", "amazon web services",
+    "machine learning", "deep learning", "data analysis", "power bi", "excel"
+]
+
+UNSEEN = ["reactjs hooks", "postgre", "kubernete", "js", "golang developer", "ms excel", "c/c++", "next.js"]
+
+def _reference(job_skill: str, cv_skill: str, threshold: int = 80) -> bool:
+    """The pairwise rule the index replaced: substring check or extractOne's WRatio cutoff
+
+    WRatio is the best of ``fuzz.ratio`` and the scaled ``partial_ratio``/token
+    ratios, on the same processed strings extractOne compares.
+    """
+    if (job_skill in cv_skill or cv_skill in job_skill) and len(job_skill) > 2:
+        return True
+    return fuzz.WRatio(job_skill, cv_skill) >= threshold
+
+def _brute_force(job_skill: str):
+    return {job_skill} | {term for term in VOCABULARY if _reference(job_skill, term)}
+
+def test_neighbours_match_the_pairwise_scan():
+    index = FuzzySkillIndex.build(VOCABULARY, threshold=80)
+    for term in VOCABULARY:
+        assert index.neighbours(term) == _brute_force(term), term
+
+def test_unseen_terms_are_matched_without_growing_the_index():
+    index = FuzzySkillIndex.build(VOCABULARY, threshold=80)
+    for term in UNSEEN:
+        assert index.neighbours(term) == _brute_force(term), term
+
+    assert len(index) == len(set(VOCABULARY))
+    assert all(term not in index for term in UNSEEN)
+
+def test_matches_any_checks_skills_outside_the_vocabulary():
+    index = FuzzySkillIndex.build(VOCABULARY, threshold=80)
+    for job_skill in VOCABULARY + UNSEEN:
+        for cv_skills in ({"reactjs hooks"}, {"postgre", "excel"}, {"c/c++"}, {"kotlin"}):
+            expected = any(_reference(job_skill, cv_skill) for cv_skill in cv_skills)
+            assert index.matches_any(job_skill, cv_skills) == expected, (job_skill, cv_skills)
+
+    assert len(index) == len(set(VOCABULARY))
+
+def test_adding_vocabulary_refreshes_cached_queries():
+    index = FuzzySkillIndex.build(["python", "java"], threshold=80)
+    assert index.neighbours("postgre") == {"postgre"}
+
+    index.add_terms(["postgresql"])
+    assert index.neighbours("postgre") == {"postgre", "postgresql"}
+    assert index.neighbours("postgresql") == {"postgresql"}
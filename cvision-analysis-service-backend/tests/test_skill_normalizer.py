@@ -0,0 +1,78 @@
+# tests/test_skill_normalizer.py
+import json
+from collections import Counter
+from types import SimpleNamespace
+
+from app.core.constants import COMMON_SKILLS, SKILL_ALIASES
+from app.services.skill_normalizer import SkillNormalizer, skill_normalizer
+from app.services.bulk_reanalyzer import BulkReanalyzer
+from app.services.job_matcher import JobMatcher
+
+def _canonical(pairs):
+    return {canonical for _, canonical in pairs}
+
+def test_canonicalize_meets_alias_and_compact_spellings():
+    assert skill_normalizer.canonicalize("Node.js") == "nodejs"
+    assert skill_normalizer.canonicalize("ASP.NET Core") == "asp.net"
+    assert skill_normalizer.canonicalize("next js") == "next.js"
+    assert skill_normalizer.canonicalize("Kotlin") == "kotlin"
+    assert skill_normalizer.canonicalize_skills(["K8s", "kubernetes", " "]) == ["kubernetes"]
+
+def test_aliases_lead_from_other_spellings_to_common_skills():
+    common = set(COMMON_SKILLS)
+    assert {canonical for canonical in SKILL_ALIASES.values()} <= common
+    assert not common & set(SKILL_ALIASES)
+    assert skill_normalizer.canonicalize("MSSQL") == "mssql"
+    assert skill_normalizer.canonicalize("expressjs") == "express"
+
+def test_ambiguous_aliases_are_ignored_in_free_text():
+    text = ("logged timestamps every 10 ts, dosed 500 ml, wrote html and css3, "
+            "each node of the graph, built with asp.net core")
+    found = _canonical(skill_normalizer.find_aliases(text))
+
+    assert found == {"css", "asp.net"}
+
+def test_ambiguous_aliases_count_inside_the_skills_section():
+    text = "experience: led a team of 5. skills: ts, node, ml, k8s"
+    found = _canonical(skill_normalizer.find_aliases(text, "ts, node, ml, k8s"))
+
+    assert found == {"typescript", "nodejs", "machine learning", "kubernetes"}
+
+def test_longest_alias_wins():
+    assert skill_normalizer.find_aliases("asp.net core developer") == [("asp.net core", "asp.net")]
+
+def test_fingerprint_follows_the_rules():
+    same = SkillNormalizer()
+    changed = SkillNormalizer(aliases={"golang": "go"})
+
+    assert same.fingerprint == skill_normalizer.fingerprint
+    assert changed.fingerprint != skill_normalizer.fingerprint
+
+def test_canonical_match_metric_compares_raw_job_keywords():
+    matcher = SimpleNamespace(match_stats=Counter())
+    cv_skills = ["nodejs", "react", "docker"]
+    raw_job_skills = ["Node.js", "React", "Kubernetes"]
+
+    JobMatcher._track_canonical_matches(matcher, raw_job_skills, cv_skills,
+                                        skill_normalizer.canonicalize_skills(raw_job_skills))
+
+    assert matcher.match_stats['exact_matches'] == 2
+    assert matcher.match_stats['alias_exact_matches'] == 1
+    assert matcher.match_stats['fuzzy_comparisons_avoided'] == 3
+
+def test_checkpoint_from_other_skill_rules_starts_a_new_pass(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+    reanalyzer = BulkReanalyzer(workers=1, checkpoint_path=str(checkpoint_path))
+
+    checkpoint = reanalyzer._new_checkpoint()
+    checkpoint.update(last_id="00000000-0000-0000-0000-000000000042", processed=42)
+    checkpoint_path.write_text(json.dumps(checkpoint))
+    assert reanalyzer._load_checkpoint()['last_id'] == checkpoint['last_id']
+
+    # A finished pass is not resumed
+    checkpoint_path.write_text(json.dumps(dict(checkpoint, completed_at="2026-10-19T00:00:00")))
+    assert reanalyzer._load_checkpoint()['last_id'] is None
+
+    # Nor is progress under other rules
+    checkpoint_path.write_text(json.dumps(dict(checkpoint, skill_rules="0123456789abcdef")))
+    assert reanalyzer._load_checkpoint()['last_id'] is None
@@ -0,0 +1,91 @@
+# tests/test_statistics_service.py
+import asyncio
+import uuid
+
+from app.models import CVFileModel, CVAnalysisResultModel, JobProfileModel
+from app.services.statistics_service import StatisticsService
+
+def _add_cv(db, status, score=None, deleted=False):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                          FileType="pdf", AnalysisStatus=status, IsDeleted=deleted)
+    db.add(cv_file)
+    if score is not None:
+        db.add(CVAnalysisResultModel(CVFileId=cv_file.Id, Score=score))
+    db.commit()
+
+def _seed(db):
+    for score in (0, 9, 55, 91, 100):
+        _add_cv(db, "Completed", score)
+    _add_cv(db, "Pending")
+    _add_cv(db, "Pending")
+    _add_cv(db, "Failed")
+    _add_cv(db, "Completed", 70, deleted=True)
+    db.add_all([JobProfileModel(Title="Backend"), JobProfileModel(Title="Old", IsDeleted=True)])
+    db.commit()
+
+def test_one_aggregate_gives_counts_and_histogram(db):
+    _seed(db)
+    snapshot = asyncio.run(StatisticsService(ttl=60).get(db))
+
+    assert snapshot['status_counts'] == {"Completed": 5, "Pending": 2, "Failed": 1}
+    assert snapshot['total_cvs'] == 8
+    assert (snapshot['analyzed_cvs'], snapshot['score_sum']) == (5, 255)
+    # 100 falls into the last bucket
+    assert snapshot['score_histogram'] == [2, 0, 0, 0, 0, 1, 0, 0, 0, 2]
+    assert snapshot['total_job_profiles'] == 1
+    assert StatisticsService.histogram_labels()[0] == "0-9" and StatisticsService.histogram_labels()[-1] == "90-100"
+
+def test_snapshot_is_cached_until_it_expires(db, monkeypatch):
+    _seed(db)
+    service = StatisticsService(ttl=60)
+    computed = []
+    compute = service._compute
+    monkeypatch.setattr(service, "_compute", lambda session: computed.append(1) or compute(session))
+
+    async def concurrent_requests():
+        return await asyncio.gather(*(service.get(db) for _ in range(5)))
+
+    # Concurrent requests for a missing snapshot share one refresh
+    snapshots = asyncio.run(concurrent_requests())
+    assert len(computed) == 1 and all(snapshot is snapshots[0] for snapshot in snapshots)
+
+    _add_cv(db, "Pending")
+    assert asyncio.run(service.get(db))['total_cvs'] == 8
+    service.invalidate()
+    assert asyncio.run(service.get(db))['total_cvs'] == 9
+    assert len(computed) == 2
+
+def test_processed_cvs_move_the_cached_counts(db):
+    _seed(db)
+    service = StatisticsService(ttl=60)
+    asyncio.run(service.get(db))
+
+    service.record_analysis("Pending", "Completed", None, 80)
+    service.record_analysis("Pending", "Failed")
+    snapshot = asyncio.run(service.get(db))
+    assert snapshot['status_counts'] == {"Completed": 6, "Pending": 0, "Failed": 2}
+    assert (snapshot['analyzed_cvs'], snapshot['score_histogram'][8]) == (6, 1)
+    assert StatisticsService.average_score(snapshot) == (255 + 80) / 6
+
+    # A re-analysis replaces its stored score instead of adding another analysed CV
+    service.record_analysis("Completed", "Completed", 55, 65)
+    assert snapshot['status_counts']["Completed"] == 6
+    assert (snapshot['analyzed_cvs'], snapshot['score_sum']) == (6, 255 + 80 + 10)
+    assert (snapshot['score_histogram'][5], snapshot['score_histogram'][6]) == (0, 1)
+
+    # Completed and failed totals, as before the counts were cached
+    assert service.processor_stats(snapshot) == {
+        'is_running': False, 'processed_count': 6, 'failed_count': 2, 'success_rate': 75
+    }
+
+def test_a_cv_the_snapshot_has_not_seen_refreshes_it(db):
+    _seed(db)
+    service = StatisticsService(ttl=60)
+    asyncio.run(service.get(db))
+
+    # Inline uploads start out Processing, which this snapshot has no CV in
+    service.record_analysis("Processing", "Completed", None, 90)
+    _add_cv(db, "Completed", 90)
+    snapshot = asyncio.run(service.get(db))
+    assert snapshot['status_counts'] == {"Completed": 6, "Pending": 2, "Failed": 1}
+    assert snapshot['analyzed_cvs'] == 6
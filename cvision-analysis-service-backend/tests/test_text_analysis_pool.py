@@ -0,0 +1,76 @@
+# tests/test_text_analysis_pool.py
+import asyncio
+
+from app.services.text_analysis_pool import TextAnalysisPool
+
+class FakePool(TextAnalysisPool):
+    """Analyses in-process and records which texts reached the "workers\""""
+
+    def __init__(self, **kwargs):
+        super().__init__(workers=1, **kwargs)
+        self.analysed = []
+
+    async def _run(self, pending, profile):
+        self.analysed.extend(text for _, text in pending)
+        return {
+            content_hash: {'score': len(text), 'failed': text.startswith("broken")}
+            for content_hash, text in pending
+        }
+
+def _analyze(pool, texts, profile="full"):
+    return asyncio.run(pool.analyze(texts, profile))
+
+def test_duplicate_texts_are_analysed_once():
+    pool = FakePool()
+    response = _analyze(pool, ["alpha", "beta", "alpha"])
+
+    assert pool.analysed == ["alpha", "beta"]
+    assert [result['score'] for result in response['results']] == [5, 4, 5]
+    assert response['results'][0]['content_hash'] == response['results'][2]['content_hash']
+    assert (response['total_texts'], response['unique_texts'], response['cache_hits']) == (3, 2, 0)
+
+def test_repeated_texts_come_from_the_cache():
+    pool = FakePool()
+    _analyze(pool, ["alpha"])
+    response = _analyze(pool, ["alpha", "gamma"])
+
+    assert pool.analysed == ["alpha", "gamma"]
+    assert [result['cached'] for result in response['results']] == [True, False]
+    assert response['cache_hits'] == 1
+
+def test_profile_is_part_of_the_key():
+    pool = FakePool()
+    _analyze(pool, ["alpha"], profile="full")
+    _analyze(pool, ["alpha"], profile="quick")
+    assert pool.analysed == ["alpha", "alpha"]
+
+def test_least_recently_used_result_is_evicted():
+    pool = FakePool(cache_size=2)
+    _analyze(pool, ["a", "b"])
+    _analyze(pool, ["a"])  # "b" is now the least recently used
+    _analyze(pool, ["c"])
+
+    pool.analysed.clear()
+    _analyze(pool, ["a", "b", "c"])
+    assert pool.analysed == ["b"]
+
+def test_failed_analyses_are_not_cached():
+    pool = FakePool()
+    _analyze(pool, ["broken text"])
+    response = _analyze(pool, ["broken text"])
+
+    assert pool.analysed == ["broken text", "broken text"]
+    assert response['cache_hits'] == 0
+
+def test_worker_returns_compact_summaries():
+    pool = TextAnalysisPool(workers=1)
+    try:
+        response = _analyze(pool, ["Experience: five years of Python and Docker. Skills: python, docker, sql."])
+    finally:
+        pool.shutdown()
+
+    [result] = response['results']
+    assert not result['failed']
+    assert {"python", "docker"} <= set(result['skills'])
+    assert set(result['sub_scores']) == {'skills', 'experience', 'education', 'format'}
+    assert 'sections' not in result
@@ -0,0 +1,66 @@
+# tests/test_text_statistics.py
+import pytest
+
+from app.services.text_statistics import count_syllables, text_statistics
+
+SAMPLE_CVS = [
+    """Jane Doe. Senior Software Engineer. Istanbul, Turkey. jane.doe@example.com
+Experience. Senior Backend Engineer, Acme Payments, 2019 - Present. Designed and implemented a
+microservices architecture for card payments, which reduced checkout latency by forty percent.
+Led a team of five engineers and mentored two junior developers. Built event driven pipelines
+with Kafka and PostgreSQL. Software Developer, Retail Systems, 2016 - 2019. Developed inventory
+and reporting services in Java and Spring Boot. Improved test coverage from thirty to eighty
+percent. Education. Bachelor of Science in Computer Engineering, Middle East Technical
+University, 2016. Skills. Python, Django, Java, Spring, PostgreSQL, Kafka, Docker, Kubernetes,
+AWS, Terraform, Git, CI/CD, Agile, Scrum.""",
+    """John Smith. Data Analyst. London, United Kingdom.
+Summary. Data analyst with four years of experience turning messy operational data into clear
+reports that managers actually read. I enjoy working closely with stakeholders, asking simple
+questions, and building dashboards that people use every day.
+Experience. Data Analyst, City Logistics, 2021 - Present. Maintained the weekly delivery
+performance report and automated it with Python and SQL. Created a Power BI dashboard for the
+operations team. Analyst Intern, Green Energy Ltd, 2020. Cleaned sensor data and wrote short
+summaries for the engineering team.
+Education. Master of Science in Statistics, University of Leeds, 2020. Bachelor of Arts in
+Economics, 2019.
+Skills. SQL, Python, pandas, Excel, Power BI, Tableau, statistics, communication.""",
+    """Maria Garcia. Frontend Developer.
+Profile. Frontend developer focused on accessible, responsive web applications. Comfortable
+with React, TypeScript and modern tooling, and happy to own features from design review to
+release.
+Work history. Frontend Developer, Bright Studio, 2022 - 2024. Rebuilt the customer portal in
+React and TypeScript. Reduced bundle size by half through code splitting. Worked with designers
+on a shared component library. Junior Web Developer, Local Agency, 2020 - 2022. Delivered more
+than thirty marketing sites. Fixed cross browser bugs and improved page load times.
+Education. Bachelor of Fine Arts, Graphic Design, 2020. Certificate in Web Development, 2020.
+Skills. JavaScript, TypeScript, React, Next.js, HTML, CSS, Tailwind, Jest, Figma, Git.""",
+]
+
+@pytest.mark.parametrize("word, syllables", [
+    ("every", 2), ("ratio", 2), ("scenario", 4), ("reliability", 6), ("microservices", 5),
+    ("table", 2), ("code", 1), ("created", 3), ("features", 2), ("closely", 2), ("across", 2)
+])
+def test_count_syllables(word, syllables):
+    assert count_syllables(word) == syllables
+
+def test_counts_match_textstat_tokenization():
+    textstat = pytest.importorskip("textstat")
+    for text in SAMPLE_CVS:
+        statistics = text_statistics.analyze(text)
+        assert statistics['word_count'] == textstat.lexicon_count(text)
+        assert abs(statistics['sentence_count'] - textstat.sentence_count(text)) <= 1
+
+def test_readability_drift_from_textstat_is_bounded():
+    """textstat counts pyphen hyphenation points, which miss syllables ("python", "city", "idea")
+
+    Counting real syllables reads a little harder, never easier; the gap is
+    bounded so the readability thresholds of the format score keep their meaning.
+    """
+    textstat = pytest.importorskip("textstat")
+    for text in SAMPLE_CVS:
+        statistics = text_statistics.analyze(text)
+        assert 1.0 <= statistics['syllable_count'] / textstat.syllable_count(text) <= 1.1
+
+        drift = textstat.flesch_reading_ease(text) - statistics['flesch_reading_ease']
+        assert 0 <= drift <= 15
+        assert abs(statistics['flesch_kincaid_grade'] - textstat.flesch_kincaid_grade(text)) <= 2.5
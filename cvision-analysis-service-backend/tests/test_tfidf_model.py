@@ -0,0 +1,65 @@
+# tests/test_tfidf_model.py
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfTransformer
+
+from app.models import CVFileModel, JobProfileModel
+from app.services.tfidf_model import TfidfCorpusModel
+
+TEXTS = [
+    "Backend engineer building payment services in python and django on postgresql",
+    "Frontend developer shipping react and typescript single page applications",
+    "Data engineer running spark and kafka pipelines, python and sql",
+    "Graphic designer producing brand identity, typography and print layouts"
+]
+N_FEATURES = 2 ** 12
+
+def _add_cvs(db, texts, uploaded_at):
+    for text in texts:
+        db.add(CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf", FileType="pdf",
+                           ParsedText=text, AnalysisStatus="Completed", UploadedAt=uploaded_at))
+    db.commit()
+
+def test_fit_matches_scikit_learn_tfidf(db, tmp_path):
+    _add_cvs(db, TEXTS, datetime(2026, 10, 1))
+    model = TfidfCorpusModel(path=str(tmp_path / "tfidf.npz"), n_features=N_FEATURES)
+    assert model.fit(db)['total_documents'] == len(TEXTS)
+
+    counts = model.vectorizer.transform(TEXTS)
+    expected = TfidfTransformer(smooth_idf=True).fit_transform(counts)
+    np.testing.assert_allclose(model.transform(TEXTS).toarray(), expected.toarray(), rtol=1e-6)
+
+def test_refresh_folds_in_new_cvs_like_a_refit(db, tmp_path):
+    _add_cvs(db, TEXTS[:2], datetime(2026, 10, 1))
+    model = TfidfCorpusModel(path=str(tmp_path / "tfidf.npz"), n_features=N_FEATURES)
+    model.fit(db)
+
+    _add_cvs(db, TEXTS[2:], datetime(2026, 10, 2))
+    assert model.refresh(db)['documents_added'] == 2
+    assert model.refresh(db)['documents_added'] == 0
+
+    refit = TfidfCorpusModel(path=str(tmp_path / "refit.npz"), n_features=N_FEATURES)
+    refit.fit(db)
+    assert model.n_docs == refit.n_docs == len(TEXTS)
+    np.testing.assert_array_equal(model.doc_freq, refit.doc_freq)
+
+def test_saved_model_ranks_profiles_in_another_process(db, tmp_path):
+    _add_cvs(db, TEXTS, datetime(2026, 10, 1))
+    path = str(tmp_path / "tfidf.npz")
+    TfidfCorpusModel(path=path, n_features=N_FEATURES).fit(db)
+
+    profiles = [JobProfileModel(Id=uuid.uuid4(), Title=title, CreatedAt=datetime(2026, 10, 1)) for title in
+                ("Frontend developer", "Backend engineer", "Graphic designer")]
+    for profile, keywords in zip(profiles, (["react", "typescript"], ["python", "django", "postgresql"], ["typography"])):
+        profile.SuggestedKeywords = keywords
+
+    # A fresh instance picks up the saved document frequencies instead of refitting
+    other = TfidfCorpusModel(path=path, n_features=N_FEATURES)
+    other.ensure_loaded()
+    assert other.n_docs == len(TEXTS)
+
+    ranking = other.rank_profiles("Senior python developer, django and postgresql", profiles)
+    assert [profile_id for profile_id, _ in ranking][0] == str(profiles[1].Id)
+    assert ranking[0][1] > ranking[1][1] >= ranking[2][1] >= 0
@@ -0,0 +1,93 @@
+# tests/test_upload_pipeline.py
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.models import CVFileModel, CVAnalysisResultModel, KeywordMatchModel
+from app.services.text_analysis_pool import text_analysis_pool
+from app.services.upload_pipeline import UploadPipeline
+
+CV_TEXT = "Experience: five years of python and docker. Skills: python, docker."
+SAVED = {'file_path': "cv.pdf", 'file_type': "pdf"}
+
+ANALYSIS = {
+    'score': 64,
+    'missing_sections': [],
+    'format_issues': [],
+    'skills_analysis': {'skill_matches': [{'keyword': "python", 'confidence': 0.9}], 'skills_count': 1}
+}
+
+@pytest.fixture
+def pool_calls(monkeypatch):
+    """Record what reaches the worker pool instead of starting worker processes"""
+    calls = []
+
+    async def analyze_file(file_path, file_type, cv_file_id, profile=None):
+        calls.append("file")
+        return (CV_TEXT, dict(ANALYSIS)) if file_path == "cv.pdf" else (None, None)
+
+    async def analyze_text(text, cv_file_id, profile=None):
+        calls.append("text")
+        return dict(ANALYSIS)
+
+    monkeypatch.setattr(text_analysis_pool, "analyze_file", analyze_file)
+    monkeypatch.setattr(text_analysis_pool, "analyze_text", analyze_text)
+    return calls
+
+def _add_cv(db, status="Processing", text=None):
+    cv_file = CVFileModel(Id=uuid.uuid4(), UserId=uuid.uuid4(), FileName="cv.pdf", FilePath="cv.pdf",
+                          FileType="pdf", ParsedText=text, AnalysisStatus=status)
+    db.add(cv_file)
+    db.commit()
+    return cv_file
+
+def _analyze(db, cv_file, extracted_text=None, saved=SAVED):
+    return asyncio.run(UploadPipeline()._analyze(cv_file, saved, extracted_text, db))
+
+def _score(db, cv_file):
+    return db.query(CVAnalysisResultModel.Score).filter(CVAnalysisResultModel.CVFileId == cv_file.Id).scalar()
+
+def test_new_upload_is_analysed_in_the_pool(db, pool_calls):
+    cv_file = _add_cv(db)
+    assert _analyze(db, cv_file)
+
+    assert pool_calls == ["file"]
+    assert (cv_file.AnalysisStatus, cv_file.ParsedText, _score(db, cv_file)) == ("Completed", CV_TEXT, 64)
+    assert db.query(KeywordMatchModel.Keyword).scalar() == "python"
+
+def test_hash_hit_without_an_analysis_to_copy_is_analysed_in_the_pool(db, pool_calls, monkeypatch):
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    cv_file = _add_cv(db)
+    assert _analyze(db, cv_file, extracted_text=CV_TEXT)
+
+    # The reused text is sent to a worker; nothing is analysed in-process
+    assert pool_calls == ["text"]
+    assert _score(db, cv_file) == 64
+
+def test_hash_hit_copies_the_original_analysis(db, pool_calls):
+    original = _add_cv(db)
+    assert _analyze(db, original)
+
+    copy = _add_cv(db)
+    assert _analyze(db, copy, extracted_text=CV_TEXT)
+    assert pool_calls == ["file"]
+    assert _score(db, copy) == 64
+
+def test_unreadable_upload_is_marked_failed(db, pool_calls):
+    cv_file = _add_cv(db)
+    assert not _analyze(db, cv_file, saved={'file_path': "broken.pdf", 'file_type': "pdf"})
+    assert cv_file.AnalysisStatus == "Failed"
+    assert _score(db, cv_file) is None
+
+def test_quick_profile_analyses_are_not_stored(db, pool_calls, monkeypatch):
+    async def analyze_file(file_path, file_type, cv_file_id, profile=None):
+        return CV_TEXT, dict(ANALYSIS, profile="quick")
+    monkeypatch.setattr(text_analysis_pool, "analyze_file", analyze_file)
+
+    # Stages that did not run would be stored as zeroed features
+    cv_file = _add_cv(db)
+    assert not _analyze(db, cv_file)
+    assert cv_file.AnalysisStatus == "Failed"
+    assert _score(db, cv_file) is None